@@ -6,6 +6,7 @@ Reports diverging component structures of composite glyphs, e.g., iacute built w
 """
 
 from GlyphsApp import Glyphs
+from fingerprint import FontFingerprint, diffFingerprints
 
 Font1 = Glyphs.font
 Font2 = Glyphs.fonts[1]
@@ -21,19 +22,24 @@ Glyphs.showMacroWindow()
 
 print("Comparing composites:\nFont 1: %s\nFont 2: %s\n\nFont 1: %s\nFont 2: %s\n" % (fileName1, fileName2, filePath1, filePath2))
 
-for g1 in [g for g in Font1.glyphs if g.export]:
-	glyphname = g1.name
-	g2 = Font2.glyphs[glyphname]
-	if g2:
-		for mi, m1 in enumerate(Font1.masters):
-			m2 = Font2.masters[mi]
-			l1 = g1.layers[m1.id]
-			l2 = g2.layers[m2.id]
+# only glyphs whose component fingerprints differ need a closer look:
+masterCount = min(len(Font1.masters), len(Font2.masters))
+fingerprint1 = FontFingerprint(Font1, aspects=("components", ), masterCount=masterCount)
+fingerprint2 = FontFingerprint(Font2, aspects=("components", ), exportingOnly=False, masterCount=masterCount)
+onlyIn1, onlyIn2, differences = diffFingerprints(fingerprint1, fingerprint2)
+
+for glyphname in fingerprint1.glyphDigests:
+	if glyphname in differences:
+		g1 = Font1.glyphs[glyphname]
+		g2 = Font2.glyphs[glyphname]
+		for mi in differences[glyphname]["components"]:
+			l1 = g1.layers[Font1.masters[mi].id]
+			l2 = g2.layers[Font2.masters[mi].id]
 
 			composite1 = "+".join([c.componentName for c in l1.components])
 			composite2 = "+".join([c.componentName for c in l2.components])
 
 			if composite1 != composite2:
 				print("/%s : %s <> %s" % (glyphname, composite1, composite2))
-	else:
+	elif glyphname in onlyIn1:
 		print("  %s not in ‘%s’" % (glyphname, fileName2))
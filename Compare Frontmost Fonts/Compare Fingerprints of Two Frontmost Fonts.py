@@ -0,0 +1,46 @@
+# MenuTitle: Compare Fingerprints
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+__doc__ = """
+Quick overview of all differences between exporting glyphs of the two frontmost fonts: outlines, components, anchors, widths, sidebearings, kerning groups and Unicodes. Compares content hashes, reports which aspects differ in which masters in the Macro Window, and opens a tab with the differing glyphs.
+"""
+
+from timeit import default_timer as timer
+from GlyphsApp import Glyphs
+from fingerprint import fontFingerprints, diffFingerprints
+
+Font1 = Glyphs.font  # frontmost font
+Font2 = Glyphs.fonts[1]  # other font
+
+# brings macro window to front and clears its log:
+Glyphs.clearLog()
+Glyphs.showMacroWindow()
+print("Comparing fingerprints:\nFont 1: %s\nFont 2: %s\n" % (Font1.filepath, Font2.filepath))
+
+start = timer()
+fingerprint1, fingerprint2 = fontFingerprints(Font1, Font2)
+onlyIn1, onlyIn2, differences = diffFingerprints(fingerprint1, fingerprint2)
+masterNames = [master.name for master in Font1.masters]
+
+if len(Font1.masters) != len(Font2.masters):
+	print("⚠️ Different number of masters, comparing the first %i.\n" % len(fingerprint1.masterIDs))
+
+for glyphName, glyphDifferences in differences.items():
+	aspectReports = []
+	for aspect, masterIndexes in glyphDifferences.items():
+		if masterIndexes:
+			aspectReports.append("%s (%s)" % (aspect, ", ".join(masterNames[i] for i in masterIndexes)))
+		else:
+			aspectReports.append(aspect)
+	print("❌ /%s: %s" % (glyphName, "; ".join(aspectReports)))
+
+if onlyIn1:
+	print("\n⚠️ Only in font 1: %s" % ", ".join(onlyIn1))
+if onlyIn2:
+	print("\n⚠️ Only in font 2: %s" % ", ".join(onlyIn2))
+
+sameCount = len(fingerprint1.glyphDigests) - len(onlyIn1) - len(differences)
+print("\n✅ %i glyphs identical, ❌ %i glyphs differ. (%.1f s)" % (sameCount, len(differences), timer() - start))
+
+if differences:
+	Font1.newTab("/" + "/".join(differences))
@@ -13,16 +13,13 @@ otherFont = Glyphs.fonts[1]  # second font
 thisFileName = thisFont.filepath.pathComponents()[-1]
 otherFileName = otherFont.filepath.pathComponents()[-1]
 
-thisGlyphSet = [g.name for g in thisFont.glyphs if g.export]
-otherGlyphSet = [g.name for g in otherFont.glyphs if g.export]
+thisGlyphNames = [g.name for g in thisFont.glyphs if g.export]
+otherGlyphNames = [g.name for g in otherFont.glyphs if g.export]
 
-for i in range(len(thisGlyphSet))[::-1]:
-	if thisGlyphSet[i] in otherGlyphSet:
-		otherGlyphSet.remove(thisGlyphSet.pop(i))
-
-for i in range(len(otherGlyphSet))[::-1]:
-	if otherGlyphSet[i] in thisGlyphSet:
-		thisGlyphSet.remove(otherGlyphSet.pop(i))
+# glyphs missing in the respective other font, in glyph order:
+thisNameSet, otherNameSet = set(thisGlyphNames), set(otherGlyphNames)
+thisGlyphSet = [glyphName for glyphName in thisGlyphNames if glyphName not in otherNameSet]
+otherGlyphSet = [glyphName for glyphName in otherGlyphNames if glyphName not in thisNameSet]
 
 # brings macro window to front and clears its log:
 Glyphs.clearLog()
@@ -6,12 +6,16 @@ Compares the kerning groups of exporting glyphs in the two frontmost fonts and o
 """
 
 from GlyphsApp import Glyphs
+from fingerprint import FontFingerprint, diffFingerprints
 
 thisFont = Glyphs.fonts[0]  # frontmost font
 otherFont = Glyphs.fonts[1]  # second font
 
-thisGlyphSet = [g.name for g in thisFont.glyphs if g.export]
-commonGlyphSet = [g.name for g in otherFont.glyphs if g.export and g.name in thisGlyphSet]
+# kerning groups only, no layers:
+thisFingerprint = FontFingerprint(thisFont, aspects=("kerningGroups", ), masterCount=0)
+otherFingerprint = FontFingerprint(otherFont, aspects=("kerningGroups", ), masterCount=0)
+onlyInThisFont, onlyInOtherFont, differences = diffFingerprints(thisFingerprint, otherFingerprint)
+commonGlyphSet = [glyphName for glyphName in otherFingerprint.glyphDigests if glyphName in thisFingerprint.glyphDigests]
 
 # brings macro window to front and clears its log:
 Glyphs.clearLog()
@@ -28,9 +32,12 @@ print("-" * len(columnHead))
 sameInBothFonts = []
 differencesBetweenFonts = []
 for glyphName in commonGlyphSet:
+	if glyphName not in differences:
+		sameInBothFonts.append(glyphName)
+		continue
+
 	thisGlyph = thisFont.glyphs[glyphName]
 	otherGlyph = otherFont.glyphs[glyphName]
-
 	leftGroupSame = thisGlyph.leftKerningGroup == otherGlyph.leftKerningGroup
 	rightGroupSame = thisGlyph.rightKerningGroup == otherGlyph.rightKerningGroup
 
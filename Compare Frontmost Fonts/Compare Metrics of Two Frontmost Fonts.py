@@ -6,6 +6,7 @@ Compare widths of two frontmost fonts. Tolerates 2 unit
 """
 
 from GlyphsApp import Glyphs
+from fingerprint import FontFingerprint, diffFingerprints
 
 font1 = Glyphs.font  # frontmost font
 font2 = Glyphs.fonts[1]  # other font
@@ -15,17 +16,22 @@ Glyphs.clearLog()
 Glyphs.showMacroWindow()
 print(f"Comparing:\nFont 1: {font1.filepath}\nFont 2: {font2.filepath}\n")
 
-masterIndexesInBothFonts = range(min(len(font1.masters), len(font2.masters)))
-for g1 in [g for g in font1.glyphs if g.export]:
-	glyphname = g1.name
-	g2 = font2.glyphs[glyphname]
-	if g2:
-		for mi in masterIndexesInBothFonts:
+# only layers whose width fingerprints differ need a closer look:
+masterCount = min(len(font1.masters), len(font2.masters))
+fingerprint1 = FontFingerprint(font1, aspects=("width", ), masterCount=masterCount)
+fingerprint2 = FontFingerprint(font2, aspects=("width", ), exportingOnly=False, masterCount=masterCount)
+onlyIn1, onlyIn2, differences = diffFingerprints(fingerprint1, fingerprint2)
+
+for glyphname in fingerprint1.glyphDigests:
+	if glyphname in differences:
+		g1 = font1.glyphs[glyphname]
+		g2 = font2.glyphs[glyphname]
+		for mi in differences[glyphname]["width"]:
 			m1 = font1.masters[mi]
 			m2 = font2.masters[mi]
 			l1 = g1.layers[m1.id]
 			l2 = g2.layers[m2.id]
 			if abs(l1.width - l2.width) > 2.0:
 				print("/%s : widths: %.1f <> %.1f (%s)" % (glyphname, l1.width, l2.width, m1.name))
-	else:
+	elif glyphname in onlyIn1:
 		print("  %s not in font 2" % (glyphname))
@@ -6,6 +6,7 @@ Compare sidebearings of two frontmost fonts.
 """
 
 from GlyphsApp import Glyphs
+from fingerprint import FontFingerprint, diffFingerprints
 
 Font1 = Glyphs.font  # frontmost font
 Font2 = Glyphs.fonts[1]  # other font
@@ -17,12 +18,19 @@ Glyphs.showMacroWindow()
 
 print("Comparing:\nFont 1: %s\nFont 2: %s\n" % (Font1.filepath, Font2.filepath))
 
+# only layers whose sidebearing fingerprints differ need a closer look:
+masterCount = min(len(Font1.masters), len(Font2.masters))
+fingerprint1 = FontFingerprint(Font1, aspects=("sidebearings", ), masterCount=masterCount)
+fingerprint2 = FontFingerprint(Font2, aspects=("sidebearings", ), exportingOnly=False, masterCount=masterCount)
+onlyIn1, onlyIn2, differences = diffFingerprints(fingerprint1, fingerprint2)
+
 count = 0
-for g1 in [g for g in Font1.glyphs if g.export]:
-	glyphname = g1.name
-	g2 = Font2.glyphs[glyphname]
-	if g2:
-		for mi, m1 in enumerate(Font1.masters):
+for glyphname in fingerprint1.glyphDigests:
+	if glyphname in differences:
+		g1 = Font1.glyphs[glyphname]
+		g2 = Font2.glyphs[glyphname]
+		for mi in differences[glyphname]["sidebearings"]:
+			m1 = Font1.masters[mi]
 			m2 = Font2.masters[mi]
 			l1 = g1.layers[m1.id]
 			l2 = g2.layers[m2.id]
@@ -38,7 +46,7 @@ for g1 in [g for g in Font1.glyphs if g.export]:
 				if reportGlyph:
 					count += 1
 					print("%s  (%s)" % (reportString, m1.name))
-	else:
+	elif glyphname in onlyIn1:
 		print("  %s not in Font 2" % (glyphname))
 
 print("Found %i discrepancies beyond %i units in all masters." % (count, tolerance))
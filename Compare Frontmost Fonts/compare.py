@@ -1,25 +1,29 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function
 
+from collections import Counter
 from GlyphsApp import Glyphs, GSCustomParameter
 
 
 def compareLists(thisSet, otherSet, ignoreEmpty=False):
-	for i in range(len(thisSet))[::-1]:
-		if thisSet[i] in otherSet:
-			otherSet.remove(thisSet.pop(i))
-		elif ignoreEmpty:
-			if not thisSet[i]:
-				thisSet.pop(i)
+	"""
+	Removes the items both lists have in common (counting duplicates) from both lists,
+	and, with ignoreEmpty, also all empty items. Returns the two lists with what is left, in their original order.
+	"""
+	thisCounts, otherCounts = Counter(thisSet), Counter(otherSet)
+	thisSet[:] = remainingItems(thisSet, thisCounts - otherCounts, ignoreEmpty, fromStart=True)
+	otherSet[:] = remainingItems(otherSet, otherCounts - thisCounts, ignoreEmpty, fromStart=False)
+	return thisSet, otherSet
 
-	for i in range(len(otherSet))[::-1]:
-		if otherSet[i] in thisSet:
-			thisSet.remove(otherSet.pop(i))
-		elif ignoreEmpty:
-			if not otherSet[i]:
-				otherSet.pop(i)
 
-	return thisSet, otherSet
+def remainingItems(items, remainingCounts, ignoreEmpty=False, fromStart=True):
+	"""Keeps remainingCounts[item] occurrences of every item, the first ones if fromStart, otherwise the last ones."""
+	remaining = []
+	for item in (items if fromStart else reversed(items)):
+		if remainingCounts[item] > 0 and not (ignoreEmpty and not item):
+			remainingCounts[item] -= 1
+			remaining.append(item)
+	return remaining if fromStart else remaining[::-1]
 
 
 def cleanUpAndShortenParameterContent(thisParameter, maxLength=20):
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+from hashlib import blake2b
+from mekkablue.layernodes import LayerNodes
+
+glyphAspects = ("unicode", "kerningGroups")
+layerAspects = ("outline", "components", "anchors", "width", "sidebearings")
+allAspects = glyphAspects + layerAspects
+
+# (font, glyph ID, lastChange, master IDs) -> (glyph hashes, layer hashes), reused as long as the glyph does not change:
+fingerprintCache = {}
+maxCacheSize = 100000
+
+
+def digest(value):
+	"""Stable 8-byte hash of a tuple of strings and numbers, the same in every session."""
+	return blake2b(repr(value).encode("utf-8"), digest_size=8).digest()
+
+
+def rounded(value, digits=2):
+	return round(value, digits) + 0.0  # + 0.0 turns -0.0 into 0.0
+
+
+def outlineOfLayer(layer):
+	layerNodes = LayerNodes(layer)
+	xs, ys, types, smooth = layerNodes.x, layerNodes.y, layerNodes.types, layerNodes.smooth
+	# string formatting is much faster than rounding every coordinate:
+	return tuple(
+		(bool(closed), " ".join(["%.2f %.2f %d %d" % (xs[i] + 0.0, ys[i] + 0.0, types[i], smooth[i]) for i in range(firstIndex, firstIndex + nodeCount)]))
+		for firstIndex, nodeCount, closed in layerNodes.paths
+	)
+
+
+def componentsOfLayer(layer):
+	return tuple((component.componentName, tuple(rounded(value, 3) for value in component.transform)) for component in layer.components)
+
+
+def anchorsOfLayer(layer):
+	return tuple(sorted((anchor.name, rounded(anchor.position.x), rounded(anchor.position.y)) for anchor in layer.anchors))
+
+
+aspectValue = {
+	"unicode": lambda glyph: tuple(glyph.unicodes or ()),
+	"kerningGroups": lambda glyph: (glyph.leftKerningGroup, glyph.rightKerningGroup),
+	"outline": outlineOfLayer,
+	"components": componentsOfLayer,
+	"anchors": anchorsOfLayer,
+	"width": lambda layer: rounded(layer.width),
+	"sidebearings": lambda layer: (rounded(layer.LSB), rounded(layer.RSB)),
+}
+
+
+def glyphFingerprint(glyph, masterIDs, aspects=allAspects):
+	"""
+	Returns (glyph hashes, layer hashes): {aspect: hash} for the glyph, and one {aspect: hash} per master in masterIDs.
+	Hashes are cached per font until the lastChange of the glyph changes. All layer aspects of composites
+	are always hashed again, because their width, anchors and sidebearings depend on the glyphs
+	the composite is built from, which do not change its lastChange.
+	"""
+	lastChange = getattr(glyph, "lastChange", None)
+	cacheKey = (id(glyph.parent), glyph.id, lastChange, masterIDs)  # copies of the same file share glyph IDs
+	cached = fingerprintCache.get(cacheKey) if lastChange is not None else None
+	if cached is None:
+		cached = ({}, tuple({} for masterID in masterIDs))
+		if lastChange is not None:
+			if len(fingerprintCache) > maxCacheSize:
+				fingerprintCache.clear()
+			fingerprintCache[cacheKey] = cached
+
+	glyphHashes, layerHashes = cached
+	for aspect in aspects:
+		if aspect in glyphAspects:
+			if aspect not in glyphHashes:
+				glyphHashes[aspect] = digest(aspectValue[aspect](glyph))
+			continue
+		for masterID, hashes in zip(masterIDs, layerHashes):
+			if aspect in hashes and not hashes["isComposite"]:
+				continue
+			layer = glyph.layers[masterID]
+			if "isComposite" not in hashes:
+				hashes["isComposite"] = bool(layer.components)
+			hashes[aspect] = digest(aspectValue[aspect](layer))
+	return glyphHashes, layerHashes
+
+
+class FontFingerprint:
+	"""
+	Content hashes of a font, per glyph and per master layer, for the chosen aspects (see allAspects).
+	Masters are compared by index, like in the other Compare scripts; masterCount limits the number of masters.
+	glyphHashes: {glyphName: {aspect: hash}}, layerHashes: {glyphName: ({aspect: hash}, ...)} in master order,
+	glyphDigests: {glyphName: one hash of all chosen aspects}, for finding differing glyphs with set operations.
+	Hashes of unchanged glyphs are reused from previous runs.
+	"""
+
+	def __init__(self, font, aspects=allAspects, exportingOnly=True, masterCount=None):
+		masterIDs = tuple(master.id for master in font.masters)[:masterCount]
+		self.font = font
+		self.aspects = tuple(aspects)
+		self.masterIDs = masterIDs
+		self.glyphHashes = {}
+		self.layerHashes = {}
+		self.glyphDigests = {}
+		glyphAspectsToHash = [aspect for aspect in self.aspects if aspect in glyphAspects]
+		layerAspectsToHash = [aspect for aspect in self.aspects if aspect in layerAspects]
+		for glyph in font.glyphs:
+			if exportingOnly and not glyph.export:
+				continue
+			glyphHashes, layerHashes = glyphFingerprint(glyph, masterIDs, self.aspects)
+			self.glyphHashes[glyph.name] = glyphHashes
+			self.layerHashes[glyph.name] = layerHashes
+			self.glyphDigests[glyph.name] = digest((
+				tuple(glyphHashes[aspect] for aspect in glyphAspectsToHash),
+				tuple(tuple(hashes[aspect] for aspect in layerAspectsToHash) for hashes in layerHashes),
+			))
+
+	def glyphNames(self):
+		return set(self.glyphDigests)
+
+
+def fontFingerprints(font1, font2, aspects=allAspects, exportingOnly=True):
+	"""Fingerprints of two fonts over the masters both have, so layers can be compared by master index."""
+	masterCount = min(len(font1.masters), len(font2.masters))
+	return (
+		FontFingerprint(font1, aspects, exportingOnly, masterCount),
+		FontFingerprint(font2, aspects, exportingOnly, masterCount),
+	)
+
+
+def diffFingerprints(fingerprint1, fingerprint2):
+	"""
+	Compares two FontFingerprint objects made with the same aspects.
+	Returns (only in 1, only in 2, differences), the first two being lists of glyph names, differences being
+	{glyphName: {aspect: master indexes}} for the glyphs both fonts have, in the glyph order of the first font,
+	master indexes being an empty tuple for glyph aspects (unicode, kerning groups).
+	"""
+	names1, names2 = fingerprint1.glyphNames(), fingerprint2.glyphNames()
+	onlyIn1 = [glyphName for glyphName in fingerprint1.glyphDigests if glyphName not in names2]
+	onlyIn2 = [glyphName for glyphName in fingerprint2.glyphDigests if glyphName not in names1]
+
+	# glyphs in both fonts with different digests, everything else is identical:
+	changedNames = set(glyphName for glyphName, glyphDigest in set(fingerprint1.glyphDigests.items()) - set(fingerprint2.glyphDigests.items()))
+	differences = {}
+	for glyphName in fingerprint1.glyphDigests:
+		if glyphName not in changedNames or glyphName not in names2:
+			continue
+		glyphDifferences = {}
+		glyphHashes1, glyphHashes2 = fingerprint1.glyphHashes[glyphName], fingerprint2.glyphHashes[glyphName]
+		layerHashes1, layerHashes2 = fingerprint1.layerHashes[glyphName], fingerprint2.layerHashes[glyphName]
+		for aspect in fingerprint1.aspects:
+			if aspect in glyphAspects:
+				if glyphHashes1[aspect] != glyphHashes2[aspect]:
+					glyphDifferences[aspect] = ()
+			else:
+				masterIndexes = tuple(i for i, (hashes1, hashes2) in enumerate(zip(layerHashes1, layerHashes2)) if hashes1[aspect] != hashes2[aspect])
+				if masterIndexes:
+					glyphDifferences[aspect] = masterIndexes
+		if glyphDifferences:
+			differences[glyphName] = glyphDifferences
+	return onlyIn1, onlyIn2, differences
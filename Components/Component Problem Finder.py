@@ -7,38 +7,9 @@ Find and report possible issues with components and corner components.
 
 import vanilla
 from timeit import default_timer as timer
-from GlyphsApp import Glyphs, Message, CORNER
+from GlyphsApp import Glyphs, Message
 from mekkablue import mekkaObject, camelCaseSplit, reportTimeInNaturalLanguage
-
-
-def orthodoxComponentsForGlyph(thisGlyph):
-	glyphInfo = thisGlyph.glyphInfo
-	if glyphInfo:
-		componentInfo = glyphInfo.components
-		if componentInfo:
-			glyphNameTuple = tuple(c.name for c in componentInfo)
-			return glyphNameTuple
-	return None
-
-
-def nameStrippedOfSuffixes(glyphName):
-	return glyphName[:glyphName.find(".") % (len(glyphName) + 1)]
-
-
-def layerAdheresToStructure(thisLayer, glyphNameTuple):
-	layerComponents = thisLayer.components
-	numOfLayerComponents = len(layerComponents)
-	if numOfLayerComponents != len(glyphNameTuple):
-		return False
-	for i in range(numOfLayerComponents):
-		thisComponentName = thisLayer.components[i].componentName
-		orthodoxComponentName = glyphNameTuple[i]
-		if thisComponentName != orthodoxComponentName:
-			componentBaseName = nameStrippedOfSuffixes(thisComponentName)
-			orthodoxBaseName = nameStrippedOfSuffixes(orthodoxComponentName)
-			if componentBaseName != orthodoxBaseName:
-				return False
-	return True
+from componentrules import RuleEngine
 
 
 class ComponentProblemFinder(mekkaObject):
@@ -202,150 +173,6 @@ class ComponentProblemFinder(mekkaObject):
 
 		self.w.unproportionallyScaledComponents.enable(self.w.scaledComponents.get())
 
-	def callMethodWithArg(self, methodName, arg):
-		method = getattr(self, methodName)
-		return method(arg)
-
-	def glyphHas_composablesWithoutComponents(self, thisGlyph):
-		for thisLayer in thisGlyph.layers:
-			if (thisLayer.isMasterLayer or thisLayer.isSpecialLayer) and not thisLayer.components:
-				info = thisGlyph.glyphInfo
-				if info and info.components:
-					print("\t🙅🏼 missing components %s on layer: %s" % (
-						", ".join([i.name for i in info.components]),
-						thisLayer.name,
-					))
-					return True
-		return False
-
-	def glyphHas_unusualComponents(self, thisGlyph):
-		componentStructure = orthodoxComponentsForGlyph(thisGlyph)
-		if componentStructure:
-			for thisLayer in thisGlyph.layers:
-				if not layerAdheresToStructure(thisLayer, componentStructure):
-					print("\t🔒 unusual components %s on layer: %s" % (
-						", ".join([c.name for c in thisLayer.components]),
-						thisLayer.name,
-					))
-					return True
-		return False
-
-	def glyphHas_lockedComponents(self, thisGlyph):
-		for thisLayer in thisGlyph.layers:
-			for thisComponent in thisLayer.components:
-				if thisComponent.locked:
-					print("\t🔒 locked component %s on layer: %s" % (thisComponent.componentName, thisLayer.name))
-					return True
-		return False
-
-	def glyphHas_nestedComponents(self, thisGlyph):
-		for thisLayer in thisGlyph.layers:
-			for thisComponent in thisLayer.components:
-				originalLayer = thisComponent.componentLayer
-				if originalLayer and originalLayer.components:
-					print("\t🪆 nested component %s on layer: %s" % (thisComponent.componentName, thisLayer.name))
-					return True
-		return False
-
-	def glyphHas_orphanedComponents(self, thisGlyph):
-		for thisLayer in thisGlyph.layers:
-			for thisComponent in thisLayer.components:
-				if thisComponent.component is None:
-					print("\t🫥 orphaned component %s on layer: %s" % (thisComponent.componentName, thisLayer.name))
-					return True
-		return False
-
-	def glyphHas_emptyComponents(self, thisGlyph):
-		for thisLayer in thisGlyph.layers:
-			theseComponents = thisLayer.components
-			if theseComponents:
-				for thisComponent in theseComponents:
-					if thisComponent.componentLayer and not thisComponent.componentLayer.shapes:
-						print("\t🫙 empty component %s on layer: %s" % (thisComponent.componentName, thisLayer.name))
-						return True
-		return False
-
-	def glyphHas_unalignedComponents(self, thisGlyph):
-		for thisLayer in thisGlyph.layers:
-			theseComponents = thisLayer.components
-			if theseComponents:
-				for thisComponent in theseComponents:
-					if thisComponent.alignment == -1:
-						print("\t🤪 unaligned component %s on layer: %s" % (thisComponent.componentName, thisLayer.name))
-						return True
-		return False
-
-	def glyphHas_scaledComponents(self, thisGlyph, unproportional=False):
-		for thisLayer in thisGlyph.layers:
-			for thisComponent in thisLayer.components:
-				if thisComponent.rotation == 0.0:
-					hScale, vScale = thisComponent.scale
-					scaled = (hScale * vScale > 0.0) and (abs(hScale) != 1.0 or abs(vScale) != 1.0)
-					if scaled:
-						if unproportional:
-							unproportionallyScaled = abs(hScale) != abs(vScale)
-							if unproportionallyScaled:
-								print("\t🤪 unproportionally scaled component %s on layer: %s" % (thisComponent.componentName, thisLayer.name))
-								return True
-						else:
-							print("\t📏 scaled component %s on layer: %s" % (thisComponent.componentName, thisLayer.name))
-							return True
-		return False
-
-	def glyphHas_unproportionallyScaledComponents(self, thisGlyph):
-		return self.glyphHas_scaledComponents(thisGlyph, unproportional=True)
-
-	def glyphHas_rotatedComponents(self, thisGlyph):
-		for thisLayer in thisGlyph.layers:
-			for thisComponent in thisLayer.components:
-				hScale, vScale = thisComponent.scale
-				rotatedByScaling = hScale == vScale and hScale < 0 and vScale < 0
-				if thisComponent.rotation or rotatedByScaling:
-					print("\t🎡 rotated component %s on layer: %s" % (thisComponent.componentName, thisLayer.name))
-					return True
-		return False
-
-	def glyphHas_mirroredComponents(self, thisGlyph):
-		for thisLayer in thisGlyph.layers:
-			for thisComponent in thisLayer.components:
-				hScale, vScale = thisComponent.scale
-				if hScale * vScale < 0:
-					print("\t🪞 mirrored component %s on layer: %s" % (thisComponent.componentName, thisLayer.name))
-					return True
-		return False
-
-	def glyphHas_shiftedComponents(self, thisGlyph):
-		for thisLayer in thisGlyph.layers:
-			for thisComponent in thisLayer.components:
-				hScale, vScale = thisComponent.scale
-				degrees = thisComponent.rotation
-				if hScale == 1.0 and vScale == 1.0 and degrees == 0.0:
-					x, y = thisComponent.position
-					if x != 0 or y != 0:
-						print("\t🏗 shifted component %s on layer: %s" % (thisComponent.componentName, thisLayer.name))
-						return True
-		return False
-
-	def glyphHas_detachedCornerComponents(self, thisGlyph):
-		for thisLayer in thisGlyph.layers:
-			for h in thisLayer.hints:
-				if h.type == CORNER:
-					if not h.originNode:
-						print("\t🚨 detached corner component %s on layer: %s" % (h.name, thisLayer.name))
-						return True
-		return False
-
-	def glyphHas_transformedCornerComponents(self, thisGlyph):
-		for thisLayer in thisGlyph.layers:
-			for thisHint in thisLayer.hints:
-				if thisHint.type == CORNER:
-					if abs(thisHint.scale.x) != 1.0 or abs(thisHint.scale.y) != 1.0:
-						thisLayer.selection = None
-						thisHint.selected = True
-						print("\t🦄 transformed corner component %s on layer: %s" % (thisHint.name, thisLayer.name))
-						return True
-		return False
-
 	def ComponentProblemFinderMain(self, sender=None):
 		try:
 			# clear macro window log:
@@ -381,6 +208,9 @@ class ComponentProblemFinder(mekkaObject):
 
 				shouldIncludeNonExporting = self.pref("includeNonExporting")
 
+				# reads every glyph once, with only the facts the enabled checks need:
+				ruleEngine = RuleEngine(thisFont, enabledPrefNames)
+
 				glyphCount = len(glyphs)
 				for i, thisGlyph in enumerate(glyphs):
 					self.w.progress.set(100 * i / glyphCount)
@@ -390,13 +220,10 @@ class ComponentProblemFinder(mekkaObject):
 						self.w.status.set(report)
 
 					if shouldIncludeNonExporting or thisGlyph.export:
-						for prefName in enabledPrefNames:
-							if Glyphs.defaults[self.domain(prefName)]:
-								methodName = "glyphHas_%s" % prefName
-								isAffected = self.callMethodWithArg(methodName, thisGlyph)
-								if isAffected:
-									glyphDict[prefName].append(thisGlyph.name)
-				
+						for rule, finding in ruleEngine.check(thisGlyph):
+							print("\t" + rule.message % finding)
+							glyphDict[rule.prefName].append(thisGlyph.name)
+
 				report = ""
 				for prefName in enabledPrefNames:
 					affectedGlyphs = glyphDict[prefName]
@@ -419,6 +246,7 @@ class ComponentProblemFinder(mekkaObject):
 				end = timer()
 				timereport = reportTimeInNaturalLanguage(end - start)
 				print("Time elapsed: %s" % timereport)
+				print("\n".join(ruleEngine.timingReport()))
 
 				self.w.status.set("✅ Done. %s." % timereport)
 				self.w.progress.set(100)
@@ -8,6 +8,7 @@ Goes through all glyphs of the frontmost font (or all open fonts), and checks fo
 import vanilla
 from GlyphsApp import Glyphs, Message, GSGlyph, GSComponent
 from mekkablue import mekkaObject, UpdateButton
+from componentgraph import ComponentGraph, suffixIndex
 
 defaultSuffixes = ".dnom, .numr, .subs, .sups, .sinf, .case, .tf, .tosf, .osf"
 
@@ -116,25 +117,23 @@ class CompositeConsistencer(mekkaObject):
 		else:
 			glyphsToCheck = list(thisFont.glyphs)
 
+		componentGraph = ComponentGraph(thisFont)
+		variantsOfName = suffixIndex(allNames)
+
 		results = []
 		for glyphIndex, thisGlyph in enumerate(glyphsToCheck):
 			self.w.progress.set(int(100 * glyphIndex / max(len(glyphsToCheck), 1)))
 			# Union composites across all masters so incompatible glyphs are fully covered
 			compositesByNorm = {}  # normalized name → actual name (first seen)
-			for master in thisFont.masters:
-				composites = thisFont.glyphsContainingComponentWithName_masterId_(thisGlyph.name, master.id)
-				if composites:
-					for g in composites:
-						normName = normalizedSuffixOrder(g.name) if not suffixOrderMatters else g.name
-						if normName not in compositesByNorm:
-							compositesByNorm[normName] = g.name
+			for compositeName in componentGraph.compositesOf(thisGlyph.name):
+				normName = normalizedSuffixOrder(compositeName) if not suffixOrderMatters else compositeName
+				if normName not in compositesByNorm:
+					compositesByNorm[normName] = compositeName
 
 			if not compositesByNorm:
 				continue
 
-			for otherName in allNames:
-				if not otherName.startswith(thisGlyph.name + "."):
-					continue
+			for otherName in variantsOfName.get(thisGlyph.name, ()):
 				otherSuffix = otherName[len(thisGlyph.name) + 1:]
 				if any(s in otherSuffix.split(".") for s in ignoredSuffixes):
 					continue
@@ -16,6 +16,7 @@ from AppKit import NSAlert
 from Foundation import NSPoint
 from GlyphsApp import Glyphs, CORNER, CAP, Message
 from mekkablue import mekkaObject, UpdateButton
+from componentgraph import ComponentGraph
 
 
 SPECIAL_PREFIXES = ("_cap.", "_corner.", "_segment.", "_brush.")
@@ -185,15 +186,7 @@ class FindReplaceComponents(mekkaObject):
 		if not thisFont:
 			return []
 
-		used = set()
-		for glyph in thisFont.glyphs:
-			for layer in glyph.layers:
-				for comp in layer.components:
-					used.add(comp.componentName)
-				for hint in layer.hints:
-					name = getattr(hint, "name", None)
-					if name:
-						used.add(name)
+		used = ComponentGraph(thisFont).usedNames()
 
 		specials = set(
 			g.name for g in thisFont.glyphs
@@ -428,8 +421,11 @@ class FindReplaceComponents(mekkaObject):
 				if glyph and glyph.id not in seenIDs:
 					seenIDs[glyph.id] = glyph
 			glyphs = list(seenIDs.values())
-		else:
+		elif includeBackgrounds:
 			glyphs = list(thisFont.glyphs)
+		else:
+			# only glyphs that use the component on any layer:
+			glyphs = [thisFont.glyphs[name] for name in ComponentGraph(thisFont).glyphsUsing(findName)]
 
 		thisFont.disableUpdateInterface()
 		try:
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+
+
+def suffixIndex(glyphNames):
+	"""
+	{name: [names starting with name + '.']} for every name particle before a dot, in the order of glyphNames,
+	e.g. 'a' -> ['a.sc', 'a.sc.ss01'] and 'a.sc' -> ['a.sc.ss01']. Replaces a startswith() scan over all names.
+	"""
+	variants = {}
+	for name in glyphNames:
+		dot = name.find(".", 1)
+		while dot > 0:
+			variants.setdefault(name[:dot], []).append(name)
+			dot = name.find(".", dot + 1)
+	return variants
+
+
+class ComponentGraph:
+	"""
+	Which glyphs use which components, built in one pass over all layers of a font.
+	compositesOfBase: {masterID: {baseName: [composite names]}} from the master layers, in font order.
+	basesOfComposite: {compositeName: set of base names} from all layers.
+	usersOfName: {component or corner component name: [glyph names]} from all layers, in font order.
+	suffixVariants: dot-suffixed variants of every glyph name, see suffixIndex().
+	"""
+
+	def __init__(self, font):
+		self.font = font
+		self.masterIDs = [master.id for master in font.masters]
+		self.glyphNames = []
+		self.layerComponents = {}  # glyphName -> [(layer name, master ID, component names)]
+		self.compositesOfBase = {masterID: {} for masterID in self.masterIDs}
+		self.basesOfComposite = {}
+		self.usersOfName = {}
+		self.masterLayersWithComponents = set()  # (glyphName, masterID)
+		self.nestingDepths = {}
+
+		for glyph in font.glyphs:
+			glyphName = glyph.name
+			self.glyphNames.append(glyphName)
+			layerComponents = []
+			usedNames = set()
+			for layer in glyph.layers:
+				componentNames = tuple(component.componentName for component in layer.components)
+				usedNames.update(hint.name for hint in layer.hints if getattr(hint, "name", None))
+				if not componentNames:
+					continue
+				usedNames.update(componentNames)
+				layerComponents.append((layer.name, layer.associatedMasterId, componentNames))
+				if layer.isMasterLayer and layer.layerId in self.compositesOfBase:
+					self.masterLayersWithComponents.add((glyphName, layer.layerId))
+					compositesOfBase = self.compositesOfBase[layer.layerId]
+					for baseName in set(componentNames):
+						compositesOfBase.setdefault(baseName, []).append(glyphName)
+			if layerComponents:
+				self.layerComponents[glyphName] = layerComponents
+				self.basesOfComposite[glyphName] = set(name for layerName, masterID, names in layerComponents for name in names)
+			for usedName in usedNames:
+				self.usersOfName.setdefault(usedName, []).append(glyphName)
+
+		self.glyphNameSet = set(self.glyphNames)
+		self.suffixVariants = suffixIndex(self.glyphNames)
+
+	def compositesOf(self, baseName, masterIDs=None):
+		"""Names of glyphs that use baseName as a component in any of the master layers of masterIDs (default: all masters), in master order."""
+		composites = {}
+		for masterID in masterIDs or self.masterIDs:
+			for compositeName in self.compositesOfBase[masterID].get(baseName, ()):
+				composites.setdefault(compositeName, None)
+		return list(composites)
+
+	def glyphsUsing(self, name):
+		"""Names of glyphs with a component or corner component called name on any layer."""
+		return self.usersOfName.get(name, [])
+
+	def usedNames(self):
+		"""Names of all components and corner components used in the font."""
+		return set(self.usersOfName)
+
+	def nestingDepth(self, glyphName):
+		"""0 for glyphs without components, 1 for composites of simple glyphs, and so on. Cyclic references count once."""
+		depth = self.nestingDepths.get(glyphName)
+		if depth is None:
+			self.nestingDepths[glyphName] = 0  # guard against cycles
+			bases = [name for name in self.basesOfComposite.get(glyphName, ()) if name in self.glyphNameSet]
+			if glyphName in self.basesOfComposite:
+				depth = 1 + max([self.nestingDepth(name) for name in bases] + [0])
+			else:
+				depth = 0
+			self.nestingDepths[glyphName] = depth
+		return depth
+
+	def nestedComponents(self, glyphName):
+		"""[(layer name, component name)] for components whose base glyph has components itself in the same master."""
+		return [
+			(layerName, componentName)
+			for layerName, masterID, componentNames in self.layerComponents.get(glyphName, ())
+			for componentName in componentNames
+			if (componentName, masterID) in self.masterLayersWithComponents
+		]
+
+	def orphanedComponents(self, glyphName):
+		"""[(layer name, component name)] for components referencing glyphs that do not exist in the font."""
+		return [
+			(layerName, componentName)
+			for layerName, masterID, componentNames in self.layerComponents.get(glyphName, ())
+			for componentName in componentNames
+			if componentName not in self.glyphNameSet
+		]
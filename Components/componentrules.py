@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+
+from timeit import default_timer as timer
+from GlyphsApp import CORNER
+from componentgraph import ComponentGraph
+
+
+def nameStrippedOfSuffixes(glyphName):
+	return glyphName[:glyphName.find(".") % (len(glyphName) + 1)]
+
+
+def componentNamesAdhereToStructure(componentNames, glyphNameTuple):
+	if len(componentNames) != len(glyphNameTuple):
+		return False
+	for thisComponentName, orthodoxComponentName in zip(componentNames, glyphNameTuple):
+		if thisComponentName != orthodoxComponentName:
+			if nameStrippedOfSuffixes(thisComponentName) != nameStrippedOfSuffixes(orthodoxComponentName):
+				return False
+	return True
+
+
+def orthodoxComponentNames(glyph):
+	glyphInfo = glyph.glyphInfo
+	if glyphInfo and glyphInfo.components:
+		return tuple(c.name for c in glyphInfo.components)
+	return None
+
+
+def isEmptyComponent(component):
+	componentLayer = component.componentLayer
+	return bool(componentLayer) and not componentLayer.shapes
+
+
+# fact name -> getter; rules declare which facts they need, and only those are read from the font:
+glyphFactGetters = {
+	"orthodoxComponents": lambda glyph, engine: orthodoxComponentNames(glyph),
+	"nestedComponents": lambda glyph, engine: engine.componentGraph().nestedComponents(glyph.name),
+	"orphanedComponents": lambda glyph, engine: engine.componentGraph().orphanedComponents(glyph.name),
+}
+layerFactGetters = {
+	"name": lambda layer: layer.name,
+	"isMasterOrSpecial": lambda layer: layer.isMasterLayer or layer.isSpecialLayer,
+	"componentNames": lambda layer: tuple(component.componentName for component in layer.components),
+}
+componentFactGetters = {
+	"name": lambda component: component.componentName,
+	"scale": lambda component: tuple(component.scale),
+	"rotation": lambda component: component.rotation,
+	"position": lambda component: tuple(component.position),
+	"alignment": lambda component: component.alignment,
+	"locked": lambda component: component.locked,
+	"isEmpty": isEmptyComponent,
+}
+cornerFactGetters = {
+	"name": lambda hint: hint.name,
+	"isDetached": lambda hint: not hint.originNode,
+	"scale": lambda hint: (hint.scale.x, hint.scale.y),
+}
+
+
+class LayerRecord:
+	__slots__ = ("layer", "facts", "components", "corners")
+
+	def __init__(self, layer, facts, components, corners):
+		self.layer = layer
+		self.facts = facts  # {fact: value}
+		self.components = components  # [{fact: value}], one per component
+		self.corners = corners  # [{fact: value, 'hint': GSHint}], one per corner component
+
+
+class GlyphRecord:
+	__slots__ = ("glyph", "facts", "layers")
+
+	def __init__(self, glyph, facts, layers):
+		self.glyph = glyph
+		self.facts = facts
+		self.layers = layers
+
+
+class ComponentRule:
+	"""
+	A check of Component Problem Finder, named like its checkbox pref.
+	Declares the facts it needs, and check(record) returns (item name, layer name) of the first problem in a GlyphRecord, or None.
+	"""
+	prefName = None
+	message = "%s on layer: %s"
+	glyphFacts = ()
+	layerFacts = ("name", )
+	componentFacts = ()
+	cornerFacts = ()
+
+	def check(self, record):
+		return None
+
+	def found(self, record, finding):
+		"""Called for every glyph the rule flags, after reporting."""
+		pass
+
+
+class ComponentsRule(ComponentRule):
+	"""Flags the first component for which isProblem(component facts) is true."""
+
+	def isProblem(self, component):
+		return False
+
+	def check(self, record):
+		for layerRecord in record.layers:
+			for component in layerRecord.components:
+				if self.isProblem(component):
+					return component["name"], layerRecord.facts["name"]
+		return None
+
+
+class ComposablesWithoutComponents(ComponentRule):
+	prefName = "composablesWithoutComponents"
+	message = "🙅🏼 missing components %s on layer: %s"
+	glyphFacts = ("orthodoxComponents", )
+	layerFacts = ("name", "isMasterOrSpecial", "componentNames")
+
+	def check(self, record):
+		orthodoxComponents = record.facts["orthodoxComponents"]
+		if orthodoxComponents:
+			for layerRecord in record.layers:
+				if layerRecord.facts["isMasterOrSpecial"] and not layerRecord.facts["componentNames"]:
+					return ", ".join(orthodoxComponents), layerRecord.facts["name"]
+		return None
+
+
+class UnusualComponents(ComponentRule):
+	prefName = "unusualComponents"
+	message = "🔒 unusual components %s on layer: %s"
+	glyphFacts = ("orthodoxComponents", )
+	layerFacts = ("name", "componentNames")
+
+	def check(self, record):
+		orthodoxComponents = record.facts["orthodoxComponents"]
+		if orthodoxComponents:
+			for layerRecord in record.layers:
+				componentNames = layerRecord.facts["componentNames"]
+				if not componentNamesAdhereToStructure(componentNames, orthodoxComponents):
+					return ", ".join(componentNames), layerRecord.facts["name"]
+		return None
+
+
+class LockedComponents(ComponentsRule):
+	prefName = "lockedComponents"
+	message = "🔒 locked component %s on layer: %s"
+	componentFacts = ("name", "locked")
+
+	def isProblem(self, component):
+		return component["locked"]
+
+
+class GraphRule(ComponentRule):
+	"""Reports the first (layer name, component name) of a list the ComponentGraph keeps for the glyph."""
+
+	def check(self, record):
+		findings = record.facts[self.glyphFacts[0]]
+		if findings:
+			layerName, componentName = findings[0]
+			return componentName, layerName
+		return None
+
+
+class NestedComponents(GraphRule):
+	prefName = "nestedComponents"
+	message = "🪆 nested component %s on layer: %s"
+	glyphFacts = ("nestedComponents", )
+	layerFacts = ()
+
+
+class OrphanedComponents(GraphRule):
+	prefName = "orphanedComponents"
+	message = "🫥 orphaned component %s on layer: %s"
+	glyphFacts = ("orphanedComponents", )
+	layerFacts = ()
+
+
+class EmptyComponents(ComponentsRule):
+	prefName = "emptyComponents"
+	message = "🫙 empty component %s on layer: %s"
+	componentFacts = ("name", "isEmpty")
+
+	def isProblem(self, component):
+		return component["isEmpty"]
+
+
+class UnalignedComponents(ComponentsRule):
+	prefName = "unalignedComponents"
+	message = "🤪 unaligned component %s on layer: %s"
+	componentFacts = ("name", "alignment")
+
+	def isProblem(self, component):
+		return component["alignment"] == -1
+
+
+class ScaledComponents(ComponentsRule):
+	prefName = "scaledComponents"
+	message = "📏 scaled component %s on layer: %s"
+	componentFacts = ("name", "scale", "rotation")
+
+	def isProblem(self, component):
+		if component["rotation"] != 0.0:
+			return False
+		hScale, vScale = component["scale"]
+		return (hScale * vScale > 0.0) and (abs(hScale) != 1.0 or abs(vScale) != 1.0)
+
+
+class UnproportionallyScaledComponents(ScaledComponents):
+	prefName = "unproportionallyScaledComponents"
+	message = "🤪 unproportionally scaled component %s on layer: %s"
+
+	def isProblem(self, component):
+		hScale, vScale = component["scale"]
+		return ScaledComponents.isProblem(self, component) and abs(hScale) != abs(vScale)
+
+
+class RotatedComponents(ComponentsRule):
+	prefName = "rotatedComponents"
+	message = "🎡 rotated component %s on layer: %s"
+	componentFacts = ("name", "scale", "rotation")
+
+	def isProblem(self, component):
+		hScale, vScale = component["scale"]
+		rotatedByScaling = hScale == vScale and hScale < 0 and vScale < 0
+		return bool(component["rotation"] or rotatedByScaling)
+
+
+class MirroredComponents(ComponentsRule):
+	prefName = "mirroredComponents"
+	message = "🪞 mirrored component %s on layer: %s"
+	componentFacts = ("name", "scale")
+
+	def isProblem(self, component):
+		hScale, vScale = component["scale"]
+		return hScale * vScale < 0
+
+
+class ShiftedComponents(ComponentsRule):
+	prefName = "shiftedComponents"
+	message = "🏗 shifted component %s on layer: %s"
+	componentFacts = ("name", "scale", "rotation", "position")
+
+	def isProblem(self, component):
+		hScale, vScale = component["scale"]
+		if hScale == 1.0 and vScale == 1.0 and component["rotation"] == 0.0:
+			x, y = component["position"]
+			return x != 0 or y != 0
+		return False
+
+
+class CornersRule(ComponentRule):
+	"""Flags the first corner component for which isProblem(corner facts) is true."""
+
+	def isProblem(self, corner):
+		return False
+
+	def check(self, record):
+		for layerRecord in record.layers:
+			for corner in layerRecord.corners:
+				if self.isProblem(corner):
+					self.foundCorner = (layerRecord.layer, corner["hint"])
+					return corner["name"], layerRecord.facts["name"]
+		return None
+
+
+class DetachedCornerComponents(CornersRule):
+	prefName = "detachedCornerComponents"
+	message = "🚨 detached corner component %s on layer: %s"
+	cornerFacts = ("name", "isDetached")
+
+	def isProblem(self, corner):
+		return corner["isDetached"]
+
+
+class TransformedCornerComponents(CornersRule):
+	prefName = "transformedCornerComponents"
+	message = "🦄 transformed corner component %s on layer: %s"
+	cornerFacts = ("name", "scale")
+
+	def isProblem(self, corner):
+		scaleX, scaleY = corner["scale"]
+		return abs(scaleX) != 1.0 or abs(scaleY) != 1.0
+
+	def found(self, record, finding):
+		# select the corner component, so it is easy to find in the tab:
+		layer, hint = self.foundCorner
+		layer.selection = None
+		hint.selected = True
+
+
+ruleClasses = (
+	ComposablesWithoutComponents,
+	UnusualComponents,
+	LockedComponents,
+	NestedComponents,
+	OrphanedComponents,
+	EmptyComponents,
+	UnalignedComponents,
+	ScaledComponents,
+	UnproportionallyScaledComponents,
+	RotatedComponents,
+	MirroredComponents,
+	ShiftedComponents,
+	DetachedCornerComponents,
+	TransformedCornerComponents,
+)
+ruleClassForPrefName = {ruleClass.prefName: ruleClass for ruleClass in ruleClasses}
+
+
+class RuleEngine:
+	"""
+	Runs component rules on glyphs of a font. Reads each glyph once, extracting only the facts
+	the enabled rules declare into a GlyphRecord, and evaluates all rules on that record.
+	ruleTimes and factTimes count the seconds spent per rule and per fact, for finding the slow checks.
+	"""
+
+	def __init__(self, font, prefNames):
+		self.font = font
+		self.rules = [ruleClassForPrefName[prefName]() for prefName in prefNames if prefName in ruleClassForPrefName]
+		self.graph = None
+		self.glyphFacts = self.neededFacts("glyphFacts")
+		self.layerFacts = self.neededFacts("layerFacts")
+		self.componentFacts = self.neededFacts("componentFacts")
+		self.cornerFacts = self.neededFacts("cornerFacts")
+		self.needsLayers = bool(self.layerFacts or self.componentFacts or self.cornerFacts)
+		if self.needsLayers and "name" not in self.layerFacts:
+			self.layerFacts.insert(0, "name")
+		self.ruleTimes = {rule.prefName: 0.0 for rule in self.rules}
+		self.factTimes = {}
+
+	def neededFacts(self, factKind):
+		facts = []
+		for rule in self.rules:
+			for fact in getattr(rule, factKind):
+				if fact not in facts:
+					facts.append(fact)
+		return facts
+
+	def componentGraph(self):
+		if self.graph is None:
+			self.graph = ComponentGraph(self.font)
+		return self.graph
+
+	def extract(self, factKind, getters, factNames, *args):
+		facts = {}
+		factTimes = self.factTimes
+		for factName in factNames:
+			start = timer()
+			facts[factName] = getters[factName](*args)
+			timeKey = "%s.%s" % (factKind, factName)
+			factTimes[timeKey] = factTimes.get(timeKey, 0.0) + timer() - start
+		return facts
+
+	def record(self, glyph):
+		"""GlyphRecord of glyph with all facts the rules need, read in a single traversal."""
+		layerRecords = []
+		if self.needsLayers:
+			for layer in glyph.layers:
+				components = []
+				if self.componentFacts:
+					components = [self.extract("component", componentFactGetters, self.componentFacts, component) for component in layer.components]
+				corners = []
+				if self.cornerFacts:
+					for hint in layer.hints:
+						if hint.type == CORNER:
+							corner = self.extract("corner", cornerFactGetters, self.cornerFacts, hint)
+							corner["hint"] = hint
+							corners.append(corner)
+				layerFacts = self.extract("layer", layerFactGetters, self.layerFacts, layer)
+				layerRecords.append(LayerRecord(layer, layerFacts, components, corners))
+		glyphFacts = self.extract("glyph", glyphFactGetters, self.glyphFacts, glyph, self)
+		return GlyphRecord(glyph, glyphFacts, layerRecords)
+
+	def check(self, glyph):
+		"""Yields (rule, finding) for every rule that flags glyph, in the order of the rules."""
+		record = self.record(glyph)
+		ruleTimes = self.ruleTimes
+		for rule in self.rules:
+			start = timer()
+			finding = rule.check(record)
+			if finding:
+				rule.found(record, finding)
+			ruleTimes[rule.prefName] += timer() - start
+			if finding:
+				yield rule, finding
+
+	def timingReport(self):
+		"""Lines with the time spent per rule and per fact, slowest first."""
+		lines = ["Rules:"]
+		lines.extend("  %8.3f s  %s" % (seconds, name) for name, seconds in sorted(self.ruleTimes.items(), key=lambda item: -item[1]))
+		lines.append("Facts read from the font:")
+		lines.extend("  %8.3f s  %s" % (seconds, name) for name, seconds in sorted(self.factTimes.items(), key=lambda item: -item[1]))
+		return lines
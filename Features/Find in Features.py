@@ -6,15 +6,17 @@ Finds expressions (glyph, lookup or class names) in OT Features, Prefixes and Cl
 """
 
 import vanilla
-from fnmatch import fnmatchcase
 from AppKit import NSFont, NSFontFeatureSettingsAttribute, NSFontFeatureTypeIdentifierKey, NSFontFeatureSelectorIdentifierKey
 from GlyphsApp import Glyphs
 from mekkablue import mekkaObject, UpdateButton, getLegibleFont
+from mekkablue.featurecode import FeatureIndex, isWildcard
 
 
 class FindInFeatures(mekkaObject):
 
 	def __init__(self):
+		self.featureIndex = None
+
 		# Window 'self.w':
 		windowWidth = 180
 		windowHeight = 200
@@ -78,19 +80,13 @@ class FindInFeatures(mekkaObject):
 
 		return fullList
 
-	def codeClean(self, code):
-		# get rid of comments:
-		lines = code.splitlines()
-		for i, line in enumerate(lines):
-			if "#" in line:
-				lines[i] = line[:line.find("#")]
-		code = "\n".join(lines)
-
-		# get rid of control chars:
-		removeThese = "[];{}()'"
-		for removeThis in removeThese:
-			code = code.replace(removeThis, " ").replace("  ", " ")
-		return code
+	def featureIndexForFont(self, font):
+		# built once per font, afterwards only features with changed code are re-indexed:
+		if self.featureIndex is None or self.featureIndex.font != font:
+			self.featureIndex = FeatureIndex(font)
+		else:
+			self.featureIndex.refresh()
+		return self.featureIndex
 
 	def FindInFeaturesMain(self, sender=None):
 		try:
@@ -98,22 +94,22 @@ class FindInFeatures(mekkaObject):
 			if thisFont is None:
 				return
 
+			featureIndex = self.featureIndexForFont(thisFont)
 			searchfor = sender.get()
-			isWildcard = '*' in searchfor or '?' in searchfor
+			wildcard = isWildcard(searchfor)
+			matchingTokens = featureIndex.matchingTokens(searchfor)
 
 			# Find in Classes:
 			classReportText = "OT CLASSES\n"
-			classes = []
-			for c in thisFont.classes:
-				if any(fnmatchcase(word, searchfor) for word in self.codeClean(c.code).split()):
-					classes.append(c.name)
-
+			classSources = sorted(set(
+				sourceKey for token in matchingTokens for sourceKey, lineNumbers in featureIndex.occurrences(token, kinds=("class", ))
+			))
+			classes = [featureIndex.name(sourceKey) for sourceKey in classSources]
+			classNames = list(dict.fromkeys(classes))
 			if not classes:
 				classReportText += "\t(nothing found)\n"
-				classSet = None
 			else:
-				classSet = set(classes)
-				for className in classSet:
+				for className in classNames:
 					classReportText += "\t%s" % className
 					if classes.count(className) > 1:
 						classReportText += " (%i×)" % classes.count(className)
@@ -121,45 +117,46 @@ class FindInFeatures(mekkaObject):
 
 			# Find in Prefixes and Features:
 			prefixAndFeatures = (
-				(thisFont.featurePrefixes, "\nOT PREFIXES\n"),
-				(thisFont.features, "\nOT FEATURES\n"),
+				("prefix", "\nOT PREFIXES\n"),
+				("feature", "\nOT FEATURES\n"),
 			)
 
 			glyphFeatures = {}  # {glyphName: [featureTag, ...]} — for the overview
 			prefixFeatureReportText = ""
-			foundInFeaturesCount = 0
-			for featureSet in prefixAndFeatures:
-				originalFeatureCount = foundInFeaturesCount
-				prefixFeatureReportText += featureSet[1]
-				for feature in featureSet[0]:
-					if feature.active:
-						cleanCode = self.codeClean(feature.code)
-						for i, l in enumerate(cleanCode.splitlines()):
-							split = l.split()
-							matchedWords = list(dict.fromkeys(w for w in split if fnmatchcase(w, searchfor)))
-							if matchedWords:
-								prefixFeatureReportText += "\t%s, line %i (%s)\n" % (feature.name, i + 1, ", ".join(matchedWords))
-								foundInFeaturesCount += 1
-								if isWildcard:
-									for w in matchedWords:
-										if w not in glyphFeatures:
-											glyphFeatures[w] = []
-										if feature.name not in glyphFeatures[w]:
-											glyphFeatures[w].append(feature.name)
-
-							# also find the classes the term appears in:
-							if classSet:
-								for otclass in classSet:
-									if "@%s" % otclass in split:
-										prefixFeatureReportText += "\t%s, line %i (@%s)\n" % (feature.name, i + 1, otclass)
-										foundInFeaturesCount += 1
-
-				if foundInFeaturesCount == originalFeatureCount:
+			for kind, title in prefixAndFeatures:
+				prefixFeatureReportText += title
+				foundLines = {}  # {source: {lineNumber: ([matched words], [matched classes])}}
+				for token in matchingTokens:
+					for sourceKey, lineNumbers in featureIndex.occurrences(token, kinds=(kind, ), activeOnly=True):
+						sourceLines = foundLines.setdefault(sourceKey, {})
+						for lineNumber in lineNumbers:
+							sourceLines.setdefault(lineNumber, ([], []))[0].append(token)
+						if wildcard:
+							featureNames = glyphFeatures.setdefault(token, [])
+							if featureIndex.name(sourceKey) not in featureNames:
+								featureNames.append(featureIndex.name(sourceKey))
+
+				# also find the classes the term appears in:
+				for className in classNames:
+					classToken = "@%s" % className
+					for sourceKey, lineNumbers in featureIndex.occurrences(classToken, kinds=(kind, ), activeOnly=True):
+						sourceLines = foundLines.setdefault(sourceKey, {})
+						for lineNumber in lineNumbers:
+							sourceLines.setdefault(lineNumber, ([], []))[1].append(classToken)
+
+				if not foundLines:
 					prefixFeatureReportText += "\t(nothing found)\n"
+				for sourceKey in sorted(foundLines):
+					featureName = featureIndex.name(sourceKey)
+					for lineNumber, (matchedWords, matchedClasses) in sorted(foundLines[sourceKey].items()):
+						if matchedWords:
+							prefixFeatureReportText += "\t%s, line %i (%s)\n" % (featureName, lineNumber, ", ".join(matchedWords))
+						for classToken in matchedClasses:
+							prefixFeatureReportText += "\t%s, line %i (%s)\n" % (featureName, lineNumber, classToken)
 
 			# Assemble report:
 			reportText = ""
-			if isWildcard and glyphFeatures:
+			if wildcard and glyphFeatures:
 				reportText += "GLYPH OVERVIEW\n"
 				for glyphName in sorted(glyphFeatures.keys()):
 					reportText += "\t%s: %s\n" % (glyphName, ", ".join(glyphFeatures[glyphName]))
@@ -12,35 +12,22 @@ Manage and sync ascender, descender and linegap values for hhea, OS/2 sTypo and
 import vanilla, string
 from GlyphsApp import Glyphs, Message, GetOpenFile, GSUppercase, GSLowercase, GSGlyph, GSLayer
 from mekkablue import mekkaObject, UpdateButton
+from mekkablue.metricstable import metricsTableForFont
 from AppKit import NSRightTextAlignment
 
 
-def topEdge(rect):
-	return rect.origin.y + rect.size.height
+def glyphHeight(metricsTable, glyphName):
+	return max(metricsTable.values("yMax", metricsTable.rowsOfGlyph(glyphName)))
 
 
-def bottomEdge(rect):
-	return rect.origin.y
+def glyphDepth(metricsTable, glyphName):
+	return min(metricsTable.values("yMin", metricsTable.rowsOfGlyph(glyphName)))
 
 
-def glyphHeight(glyph):
-	return max([topEdge(l.bounds) for l in glyph.layers if l.isMasterLayer or l.isSpecialLayer])
-
-
-def glyphDepth(glyph):
-	return min([bottomEdge(l.bounds) for l in glyph.layers if l.isMasterLayer or l.isSpecialLayer])
-
-
-def markHeight(glyph):
-	height = 0
-	for l in glyph.layers:
-		if not l.isMasterLayer and not l.isSpecialLayer:
-			continue
-		if l.anchors["_top"]:
-			thisHeight = l.bounds.origin.x + l.bounds.size.height - l.anchors["_top"].position.y
-			if thisHeight > height:
-				height = thisHeight
-	return height
+def markHeight(metricsTable, glyphName):
+	yMax, topAnchor = metricsTable.columns["yMax"], metricsTable.columns["_top"]
+	heights = [yMax[row] - topAnchor[row] for row in metricsTable.rowsOfGlyph(glyphName) if topAnchor[row] == topAnchor[row]]  # skip NaN
+	return max(heights + [0])
 
 
 def cleanInt(numberString):
@@ -381,59 +368,49 @@ class VerticalMetricsManager(mekkaObject):
 				if allOpenFonts and len(theseFonts) > 1:
 					fontReport = f"{i+1}. {thisFont.familyName}, "
 				currentMaster = thisFont.selectedFontMaster
-				for thisGlyph in thisFont.allGlyphs():
-					if not thisGlyph.export and ignoreNonExporting:
-						continue
-					scriptCheckOK = not shouldLimitToScript or thisGlyph.script == selectedScript  # needed for respectMarkToBaseOffset
-
-					for thisLayer in thisGlyph.layers:
-						belongsToCurrentMaster = thisLayer.associatedFontMaster() == currentMaster
-						if not(belongsToCurrentMaster or includeAllMasters or allOpenFonts):
-							continue
-						if not thisLayer.isSpecialLayer and not thisLayer.isMasterLayer:
-							continue
-						lowestPointInLayer = bottomEdge(thisLayer.bounds)
-						highestPointInLayer = topEdge(thisLayer.bounds)
-						if lowestPointInLayer < lowest:
-							lowest = lowestPointInLayer
-							lowestGlyph = f"{fontReport}{thisGlyph.name}, layer: {thisLayer.name}"
-						if highestPointInLayer > highest:
-							highest = highestPointInLayer
-							highestGlyph = f"{fontReport}{thisGlyph.name}, layer: {thisLayer.name}"
-
-						# respectMarkToBaseOffset:
-						if respectMarkToBaseOffset and scriptCheckOK:
-							allAnchors = thisLayer.anchorsTraversingComponents()
-							if not allAnchors:
-								continue
-							if thisGlyph.category == "Mark":
-								topAnchors = [a for a in allAnchors if a.name == "_top"]
-								if topAnchors:
-									topAnchor = topAnchors[0]
-									topSpan = highestPointInLayer - topAnchor.y
-									if topSpan > largestTopMark:
-										largestTopMark = topSpan
-										largestTopMarkGlyph = f"{fontReport}{thisGlyph.name}, layer: {thisLayer.name}"
-								bottomAnchors = [a for a in allAnchors if a.name == "_bottom"]
-								if bottomAnchors:
-									bottomAnchor = bottomAnchors[0]
-									bottomSpan = abs(lowestPointInLayer - bottomAnchor.y)
-									if bottomSpan > largestBottomMark:
-										largestBottomMark = bottomSpan
-										largestBottomMarkGlyph = f"{fontReport}{thisGlyph.name}, layer: {thisLayer.name}"
-							else:
-								topAnchors = [a for a in allAnchors if a.name == "top"]
-								if topAnchors:
-									topAnchor = topAnchors[0]
-									if topAnchor.y > highestTopAnchor:
-										highestTopAnchor = topAnchor.y
-										highestTopAnchorGlyph = f"{fontReport}{thisGlyph.name}, layer: {thisLayer.name}"
-								bottomAnchors = [a for a in allAnchors if a.name == "bottom"]
-								if bottomAnchors:
-									bottomAnchor = bottomAnchors[0]
-									if bottomAnchor.y < lowestBottomAnchor:
-										lowestBottomAnchor = bottomAnchor.y
-										lowestBottomAnchorGlyph = f"{fontReport}{thisGlyph.name}, layer: {thisLayer.name}"
+				metricsTable = metricsTableForFont(thisFont)
+				masterIDs = None if (includeAllMasters or allOpenFonts) else (currentMaster.id, )
+				rows = metricsTable.rows(masterIDs=masterIDs, exportingOnly=ignoreNonExporting)
+
+				def layerReport(row):
+					return f"{fontReport}{metricsTable.glyphName(row)}, layer: {metricsTable.layerName(row)}"
+
+				lowestPointInFont, lowestRow = metricsTable.extreme("yMin", rows, largest=False)
+				if lowestRow is not None and lowestPointInFont < lowest:
+					lowest = lowestPointInFont
+					lowestGlyph = layerReport(lowestRow)
+				highestPointInFont, highestRow = metricsTable.extreme("yMax", rows)
+				if highestRow is not None and highestPointInFont > highest:
+					highest = highestPointInFont
+					highestGlyph = layerReport(highestRow)
+
+				# respectMarkToBaseOffset:
+				if respectMarkToBaseOffset:
+					if shouldLimitToScript:
+						rows = [row for row in rows if metricsTable.info(row).script == selectedScript]
+					markRows = [row for row in rows if metricsTable.info(row).category == "Mark"]
+					baseRows = [row for row in rows if metricsTable.info(row).category != "Mark"]
+					yMin, yMax, topMarkAnchor, bottomMarkAnchor = (metricsTable.columns[name] for name in ("yMin", "yMax", "_top", "_bottom"))
+
+					# NaN spans (no anchor) never win a comparison:
+					for row in markRows:
+						topSpan = yMax[row] - topMarkAnchor[row]
+						if topSpan > largestTopMark:
+							largestTopMark = topSpan
+							largestTopMarkGlyph = layerReport(row)
+						bottomSpan = abs(yMin[row] - bottomMarkAnchor[row])
+						if bottomSpan > largestBottomMark:
+							largestBottomMark = bottomSpan
+							largestBottomMarkGlyph = layerReport(row)
+
+					topAnchorInFont, topAnchorRow = metricsTable.extreme("top", baseRows)
+					if topAnchorRow is not None and topAnchorInFont > highestTopAnchor:
+						highestTopAnchor = topAnchorInFont
+						highestTopAnchorGlyph = layerReport(topAnchorRow)
+					bottomAnchorInFont, bottomAnchorRow = metricsTable.extreme("bottom", baseRows, largest=False)
+					if bottomAnchorRow is not None and bottomAnchorInFont < lowestBottomAnchor:
+						lowestBottomAnchor = bottomAnchorInFont
+						lowestBottomAnchorGlyph = layerReport(bottomAnchorRow)
 
 			print("Highest relevant glyph:")
 			print(f"- {highestGlyph} (highest)")
@@ -526,21 +503,17 @@ class VerticalMetricsManager(mekkaObject):
 				currentMaster = thisFont.selectedFontMaster
 
 				# ascender & descender calculation:
-				for thisGlyph in self.chosenGlyphs(thisFont):
-					for thisLayer in thisGlyph.layers:
-						belongsToCurrentMaster = thisLayer.associatedFontMaster() == currentMaster
-						if not(belongsToCurrentMaster or includeAllMasters or allOpenFonts):
-							continue
-						if not thisLayer.isSpecialLayer and not thisLayer.isMasterLayer:
-							continue
-						lowestPointInLayer = bottomEdge(thisLayer.bounds)
-						highestPointInLayer = topEdge(thisLayer.bounds)
-						if lowestPointInLayer < lowest:
-							lowest = lowestPointInLayer
-							lowestGlyph = f"{fontReport}{thisGlyph.name}, layer: {thisLayer.name}"
-						if highestPointInLayer > highest:
-							highest = highestPointInLayer
-							highestGlyph = f"{fontReport}{thisGlyph.name}, layer: {thisLayer.name}"
+				metricsTable = metricsTableForFont(thisFont)
+				masterIDs = None if (includeAllMasters or allOpenFonts) else (currentMaster.id, )
+				rows = metricsTable.rows(masterIDs=masterIDs, glyphNames=[glyph.name for glyph in self.chosenGlyphs(thisFont)])
+				lowestPointInFont, lowestRow = metricsTable.extreme("yMin", rows, largest=False)
+				if lowestRow is not None and lowestPointInFont < lowest:
+					lowest = lowestPointInFont
+					lowestGlyph = f"{fontReport}{metricsTable.glyphName(lowestRow)}, layer: {metricsTable.layerName(lowestRow)}"
+				highestPointInFont, highestRow = metricsTable.extreme("yMax", rows)
+				if highestRow is not None and highestPointInFont > highest:
+					highest = highestPointInFont
+					highestGlyph = f"{fontReport}{metricsTable.glyphName(highestRow)}, layer: {metricsTable.layerName(highestRow)}"
 
 			print("Highest relevant glyph:")
 			print(f"- {highestGlyph} ({highest})\n")
@@ -680,9 +653,10 @@ class VerticalMetricsManager(mekkaObject):
 			if ascender < capHeight:
 				ascender = capHeight
 			
+			metricsTable = metricsTableForFont(thisFont)
 			for glyph in self.chosenGlyphs(thisFont):
-				glyphAscender = capHeight + (glyphHeight(glyph) - capHeight) * 0.92
-				glyphDescender = glyphDepth(glyph)
+				glyphAscender = capHeight + (glyphHeight(metricsTable, glyph.name) - capHeight) * 0.92
+				glyphDescender = glyphDepth(metricsTable, glyph.name)
 				if glyph.case != GSLowercase and glyphAscender > ascender:
 					ascender = glyphAscender
 				elif glyph.case != GSUppercase and len(glyph.layers[0].components)==0 and glyphDescender < descender:
@@ -803,11 +777,11 @@ class VerticalMetricsManager(mekkaObject):
 		descender = 0
 		
 		for thisFont in theseFonts:
+			metricsTable = metricsTableForFont(thisFont)
 			for name in string.ascii_letters:
-				thisGlyph = thisFont.glyphs[name]
-				if not thisGlyph:
+				if not metricsTable.rowsOfGlyph(name):
 					continue
-				descender = min(descender, glyphDepth(thisGlyph))
+				descender = min(descender, glyphDepth(metricsTable, name))
 		
 		if shouldRound:
 			descender = roundUpByValue(descender, roundValue)
@@ -842,24 +816,17 @@ class VerticalMetricsManager(mekkaObject):
 			capHeight = max([m.capHeight for m in thisFont.masters] + [capHeight])
 			# print(capHeight, type(capHeight), roundValue, type(roundValue))
 
-			abreveacute = thisFont.glyphs["Abreveacute"]
-			agrave = thisFont.glyphs["Agrave"]
-			if abreveacute:
-				abreveacuteHeight = glyphHeight(abreveacute)
-			elif agrave:
-				abreveacuteHeight = glyphHeight(agrave)
-				acute = thisFont.glyphs["acutecomb.case"] or thisFont.glyphs["acutecomb"]
-				if acute:
-					abreveacuteHeight += markHeight(acute)
+			metricsTable = metricsTableForFont(thisFont)
+			if metricsTable.rowsOfGlyph("Abreveacute"):
+				abreveacuteHeight = glyphHeight(metricsTable, "Abreveacute")
+			elif metricsTable.rowsOfGlyph("Agrave"):
+				abreveacuteHeight = glyphHeight(metricsTable, "Agrave")
+				acuteName = "acutecomb.case" if thisFont.glyphs["acutecomb.case"] else "acutecomb"
+				if metricsTable.rowsOfGlyph(acuteName):
+					abreveacuteHeight += markHeight(metricsTable, acuteName)
 			else:
-				abreveacuteHeight = 0
-				for glyph in thisFont.glyphs:
-					if ignoreNonExporting and not glyph.export:
-						continue
-					if glyph.category == "Letter":
-						thisGlyphHeight = glyphHeight(glyph)
-						if thisGlyphHeight > abreveacuteHeight:
-							abreveacuteHeight = thisGlyphHeight
+				letterRows = metricsTable.rows(exportingOnly=ignoreNonExporting, glyphFilter=lambda info: info.category == "Letter")
+				abreveacuteHeight = max(metricsTable.values("yMax", letterRows) + [0])
 				if abreveacuteHeight < capHeight:
 					abreveacuteHeight = capHeight
 
@@ -869,12 +836,11 @@ class VerticalMetricsManager(mekkaObject):
 				descender *= -1
 			
 			# sanity check: descender must go below all actual descenders
-			for glyph in thisFont.glyphs:
-				if glyph.category != "Letter":
-					continue
-				if glyphDepth(glyph) < descender:
-					descender = glyphDepth(glyph)
-					ascender = max(ascender, capHeight + abs(descender))
+			letterRows = metricsTable.rows(glyphFilter=lambda info: info.category == "Letter")
+			letterDepth = min(metricsTable.values("yMin", letterRows) + [descender])
+			if letterDepth < descender:
+				descender = letterDepth
+				ascender = max(ascender, capHeight + abs(descender))
 
 		# center caps again:
 		distance = max(abs(descender), ascender - capHeight)
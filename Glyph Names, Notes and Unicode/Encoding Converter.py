@@ -2,13 +2,14 @@
 # -*- coding: utf-8 -*-
 from __future__ import division, print_function, unicode_literals
 __doc__ = """
-Converts old expert 8-bit encodings into Glyphs nice names.
+Converts old expert 8-bit encodings into Glyphs nice names. Optionally updates the glyph names in OT features, prefixes and classes.
 """
 
 import vanilla
 import codecs
 from GlyphsApp import Glyphs, GSGlyph, GSComponent, Message, GetSaveFile, GetOpenFile
 from mekkablue import mekkaObject, getLegibleFont
+from mekkablue.featurecode import FeatureRenamer
 
 AXtDefault = """
 Syntax:
@@ -365,7 +366,8 @@ def readFileFromLocation(filePath="~/Desktop/test.txt"):
 
 class EncodingConverter(mekkaObject):
 	prefDict = {
-		"recipe": AXtDefault.strip()
+		"recipe": AXtDefault.strip(),
+		"updateFeatures": 1,
 	}
 
 	def __init__(self):
@@ -385,7 +387,9 @@ class EncodingConverter(mekkaObject):
 		# UI elements:
 		linePos, inset, lineHeight = 8, 15, 22
 
-		self.w.descriptionText = vanilla.TextBox((inset, linePos + 2, -inset, 14), "Enter conversion text (see tooltips):", sizeStyle='small', selectable=True)
+		self.w.descriptionText = vanilla.TextBox((inset, linePos + 2, -230, 14), "Enter conversion text (see tooltips):", sizeStyle='small', selectable=True)
+		self.w.updateFeatures = vanilla.CheckBox((-220, linePos, -inset, 20), "Update names in OT features", value=True, callback=self.SavePreferences, sizeStyle='small')
+		self.w.updateFeatures.setToolTip("Also renames the glyphs in Font Info > Features: features, prefixes and classes. Automatic features are left alone, they get regenerated.")
 		linePos += lineHeight
 
 		self.w.recipe = vanilla.TextEditor((1, linePos, -1, -inset * 3), text="", callback=self.SavePreferences, checksSpelling=False)
@@ -463,8 +467,8 @@ class EncodingConverter(mekkaObject):
 				return self.freeGlyphName(increasedGlyphName, glyphNameList)
 		return glyphName
 
-	def glyphRename(self, source, target, font):
-		"""Renames source to target."""
+	def glyphRename(self, source, target, font, featureRenamer=None):
+		"""Renames source to target, and records the renaming in featureRenamer."""
 		thisGlyph = font.glyphs[source]
 		existingGlyphNames = [g.name for g in font.glyphs]
 		targetString = self.freeGlyphName(target, existingGlyphNames)
@@ -474,6 +478,8 @@ class EncodingConverter(mekkaObject):
 				thisGlyph.unicode = None
 			thisGlyph.name = targetString
 			thisGlyph.export = targetString[0] != "_"
+			if featureRenamer:
+				featureRenamer.addRename(source, targetString)
 			print("🙌 Renamed glyph: %s → %s" % (source, targetString))
 			return 1
 		except Exception as e:
@@ -491,9 +497,10 @@ class EncodingConverter(mekkaObject):
 				return False
 		return True
 
-	def convertEncoding(self, thisFont, nameChangeString):
+	def convertEncoding(self, thisFont, nameChangeString, updateFeatures=False):
 		countRenames = 0
 		countRecipes = 0
+		featureRenamer = FeatureRenamer()
 
 		# parse lines of nameChangeString:
 		for line in nameChangeString.splitlines():
@@ -505,7 +512,7 @@ class EncodingConverter(mekkaObject):
 				sourceName = nameList[0].strip()
 				targetName = nameList[1].strip()
 				if sourceName != targetName:
-					countRenames += self.glyphRename(sourceName, targetName, thisFont)
+					countRenames += self.glyphRename(sourceName, targetName, thisFont, featureRenamer)
 
 			# GLYPH RECIPE:
 			elif "=" in line and " " not in line:
@@ -534,6 +541,10 @@ class EncodingConverter(mekkaObject):
 							comp = GSComponent(compName)
 							layer.components.append(comp)
 				countRecipes += 1
+
+		if updateFeatures:
+			for kind, name, changedLines, renamedCount in featureRenamer.renameInFont(thisFont):
+				print("🕹️ Updated %i glyph name%s in %s %s." % (renamedCount, "" if renamedCount == 1 else "s", kind, name))
 		return countRenames, countRecipes
 
 	def EncodingConverterMain(self, sender=None):
@@ -559,7 +570,7 @@ class EncodingConverter(mekkaObject):
 				try:
 					thisFont.setDisablesNiceNames_(1)
 					nameChangeString = self.pref("recipe")
-					countRenames, countRecipes = self.convertEncoding(thisFont, nameChangeString)
+					countRenames, countRecipes = self.convertEncoding(thisFont, nameChangeString, updateFeatures=self.pref("updateFeatures"))
 
 				except Exception as e:
 					Glyphs.showMacroWindow()
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import division, print_function, unicode_literals
 __doc__ = """
-Takes a list of oldglyphname=newglyphname pairs and renames glyphs in the font accordingly, much like the Rename Glyphs parameter.
+Takes a list of oldglyphname=newglyphname pairs and renames glyphs in the font accordingly, much like the Rename Glyphs parameter. Optionally updates the glyph names in OT features, prefixes and classes.
 """
 
 import vanilla
@@ -10,6 +10,7 @@ import uuid
 from AppKit import NSFont
 from GlyphsApp import Glyphs
 from mekkablue import mekkaObject
+from mekkablue.featurecode import FeatureRenamer
 
 
 class RenameGlyphs(mekkaObject):
@@ -17,6 +18,7 @@ class RenameGlyphs(mekkaObject):
 		# "prefName": defaultValue,
 		"renameList": "oldname=newname",
 		"allFonts": 0,
+		"updateFeatures": 1,
 	}
 
 	def __init__(self):
@@ -35,12 +37,14 @@ class RenameGlyphs(mekkaObject):
 
 		# UI elements:
 		self.w.text_1 = vanilla.TextBox((10, 12 + 2, -10, 14), "Add lines like oldname=newname:", sizeStyle='small')
-		self.w.renameList = vanilla.TextEditor((1, 40, -1, -40), "oldname=newname", callback=self.SavePreferences)
+		self.w.renameList = vanilla.TextEditor((1, 40, -1, -60), "oldname=newname", callback=self.SavePreferences)
 		self.w.renameList.getNSTextView().setFont_(NSFont.userFixedPitchFontOfSize_(-1.0))
 		self.w.renameList.getNSTextView().turnOffLigatures_(1)
 		self.w.renameList.getNSTextView().useStandardLigatures_(0)
 		self.w.renameList.selectAll()
 
+		self.w.updateFeatures = vanilla.CheckBox((10, -57, -10, 20), "Update glyph names in OT features", value=True, callback=self.SavePreferences, sizeStyle="small")
+		self.w.updateFeatures.setToolTip("Also renames the glyphs in Font Info > Features: features, prefixes and classes. Automatic features are left alone, they get regenerated.")
 		self.w.allFonts = vanilla.CheckBox((10, -35, 100, 20), "⚠️ ALL Fonts", value=False, callback=self.SavePreferences, sizeStyle="small")
 
 		# Run Button:
@@ -68,6 +72,7 @@ class RenameGlyphs(mekkaObject):
 				theseFonts = [Glyphs.font, ]
 
 			for thisFont in theseFonts:
+				featureRenamer = FeatureRenamer()
 				for thisLine in self.pref("renameList").splitlines():
 					if thisLine.strip():
 						glyphNameLeft = thisLine.split("=")[0].strip()
@@ -85,11 +90,17 @@ class RenameGlyphs(mekkaObject):
 								glyphLeftExport = glyphLeft.export
 								glyphLeft.export = glyphRight.export
 								glyphRight.export = glyphLeftExport
+								featureRenamer.addSwap(glyphNameLeft, glyphNameRight)
 							else:
 								glyphLeft.name = glyphNameRight
+								featureRenamer.addRename(glyphNameLeft, glyphNameRight)
 						else:
 							print(f"Warning: {glyphNameLeft} not in font.")
 
+				if self.pref("updateFeatures"):
+					for kind, name, changedLines, renamedCount in featureRenamer.renameInFont(thisFont):
+						print(f"Updated {renamedCount} glyph name{'' if renamedCount == 1 else 's'} in {kind} {name} ({thisFont.familyName}).")
+
 			self.SavePreferences()
 
 			self.w.close()  # delete if you want window to stay open
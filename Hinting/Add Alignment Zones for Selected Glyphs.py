@@ -9,6 +9,7 @@ import vanilla
 from Foundation import NSMaxY, NSMinY
 from GlyphsApp import Glyphs, GSMetric, GSMetricValue, GSAlignmentZone, Message
 from mekkablue import mekkaObject
+from zonecoverage import ZoneSet, zonesOfMaster
 
 
 # function for adding Metrics to master in Glyphs3
@@ -86,18 +87,9 @@ class CreateAlignmentZonesforSelectedGlyphs(mekkaObject):
 		self.w.open()
 		self.w.makeKey()
 
-	def zoneIsOverlappingWithExistingOne(self, zonePosition, zoneSize, master, blueFuzz=0):
-		requiredDistance = 1 + 2 * blueFuzz
+	def addZoneToMaster(self, zonePosition, zoneSize, master, zoneSet, blueFuzz=0, isTop=True, masterIndex=0):
 		zoneLow, zoneHigh = sorted((zonePosition, zonePosition + zoneSize))
-		for zone in master.alignmentZones:
-			lowEnd, highEnd = sorted((zone.position, zone.position + zone.size))
-			for zoneBorder in (zoneLow, zoneHigh):
-				if lowEnd - requiredDistance < zoneBorder < highEnd + requiredDistance:
-					return True
-		return False
-
-	def addZoneToMaster(self, zonePosition, zoneSize, master, blueFuzz=0, isTop=True, masterIndex=0):
-		if self.zoneIsOverlappingWithExistingOne(zonePosition, zoneSize, master, blueFuzz=0):
+		if zoneSet.isOverlapping(zoneLow, zoneHigh, distance=1 + 2 * blueFuzz):
 			print("❌ Zone p:%i s:%i cannot be added to master ‘%s’: existing zone in the way." % (zonePosition, zoneSize, master.name))
 			return 0
 		else:
@@ -118,6 +110,7 @@ class CreateAlignmentZonesforSelectedGlyphs(mekkaObject):
 				z.position = zonePosition
 				master.alignmentZones.append(z)
 				print("✅ Zone p:%i s:%i added to master ‘%s’." % (zonePosition, zoneSize, master.name))
+			zoneSet.add(zonePosition, zoneSize)
 			return 1
 
 	def CreateAlignmentZonesforSelectedGlyphsMain(self, sender):
@@ -163,9 +156,9 @@ class CreateAlignmentZonesforSelectedGlyphs(mekkaObject):
 				for i, master in enumerate(thisFont.masters):
 
 					print("\nFont Master %i: %s" % (i + 1, master.name))
-					if master.alignmentZones:
-						largestSize = max([abs(z.size) for z in master.alignmentZones])
-					else:
+					zoneSet = ZoneSet(zonesOfMaster(master))
+					largestSize = zoneSet.largestSize()
+					if not largestSize:
 						largestSize = 100  # unrealistic high value to allow any size if there are no existing zones
 
 					if top:
@@ -181,7 +174,7 @@ class CreateAlignmentZonesforSelectedGlyphs(mekkaObject):
 						if not dontExceed or size <= largestSize:
 							zoneSize = max(1, size)
 							zonePosition = minHeight
-							addedZoneCount += self.addZoneToMaster(zonePosition, zoneSize, master, blueFuzz, isTop=True, masterIndex=i)
+							addedZoneCount += self.addZoneToMaster(zonePosition, zoneSize, master, zoneSet, blueFuzz, isTop=True, masterIndex=i)
 
 					if bottom:
 						allDepths = []
@@ -196,7 +189,7 @@ class CreateAlignmentZonesforSelectedGlyphs(mekkaObject):
 						if not dontExceed or abs(size) <= largestSize:
 							zonePosition = minDepth
 							zoneSize = min(-1, size)
-							addedZoneCount += self.addZoneToMaster(zonePosition, zoneSize, master, blueFuzz, isTop=False, masterIndex=i)
+							addedZoneCount += self.addZoneToMaster(zonePosition, zoneSize, master, zoneSet, blueFuzz, isTop=False, masterIndex=i)
 
 					if Glyphs.versionNumber >= 3:
 						# GLYPHS 3
@@ -2,12 +2,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import division, print_function, unicode_literals
 __doc__ = """
-Extends all alignment zones (except for the baseline zone that should stay at 0).
+Extends all alignment zones (except for the baseline zone that should stay at 0). Skips zones that would overlap a neighbouring zone.
 """
 
 import vanilla
 from GlyphsApp import Glyphs
 from mekkablue import mekkaObject
+from zonecoverage import ZoneSet
 
 windowHeight = 110
 
@@ -45,18 +46,37 @@ class BlueFuzzer(mekkaObject):
 			else:
 				masterList = [Font.selectedFontMaster]
 
+			skippedCount = 0
 			for m in masterList:
-				numOfZones = len(m.alignmentZones)
-				for i in range(numOfZones):
-					thisZone = m.alignmentZones[i]
+				fuzzedZones = []
+				for thisZone in m.alignmentZones:
 					factor = 1
 					if thisZone.size < 0:  # negative zone
 						factor = -1
 					if thisZone.position == 0 and factor == -1:  # baseline zone must stay where it is
-						thisZone.setSize_(thisZone.size + fuzzValue * factor)
+						fuzzedZones.append((thisZone, thisZone.position, thisZone.size + fuzzValue * factor))
 					else:
-						thisZone.setPosition_(thisZone.position - fuzzValue * factor)
-						thisZone.setSize_(thisZone.size + (fuzzValue * 2) * factor)
+						fuzzedZones.append((thisZone, thisZone.position - fuzzValue * factor, thisZone.size + (fuzzValue * 2) * factor))
+
+				# zones that would touch or overlap after fuzzing stay as they are:
+				clashingZones = set()
+				for zone, otherZone in ZoneSet((position, size) for thisZone, position, size in fuzzedZones).overlappingZones(distance=1):
+					for clashingZone in (zone, otherZone):
+						clashingZones.add((clashingZone.position, clashingZone.size))
+
+				for thisZone, position, size in fuzzedZones:
+					if (position, size) in clashingZones:
+						skippedCount += 1
+						print("⚠️ Master ‘%s’: zone p:%i s:%i not extended, it would overlap a neighbouring zone." % (m.name, thisZone.position, thisZone.size))
+						continue
+					thisZone.setPosition_(position)
+					thisZone.setSize_(size)
+
+			if skippedCount:
+				Glyphs.showNotification(
+					"BlueFuzzer: %i zone%s skipped" % (skippedCount, "" if skippedCount == 1 else "s"),
+					"Zones too close to their neighbours were not extended. Details in Macro Window.",
+				)
 
 			self.SavePreferences()
 			self.w.close()
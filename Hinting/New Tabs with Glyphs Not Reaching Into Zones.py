@@ -2,13 +2,15 @@
 # -*- coding: utf-8 -*-
 from __future__ import division, print_function, unicode_literals
 __doc__ = """
-Opens a new tab with all glyphs that do NOT reach into any top or bottom alignment zone. Only counts glyphs that contain paths in the current master. Ignores empty glyphs and compounds.
+Opens a new tab with all glyphs that do NOT reach into any top or bottom alignment zone, listed under the closest zone. Only counts glyphs that contain paths in the current master. Ignores empty glyphs and compounds. Optionally reports overshoots that miss a zone, and glyphs reaching different zones in different masters.
 """
 
+import re
 from collections import OrderedDict
 import vanilla
 from GlyphsApp import Glyphs
 from mekkablue import mekkaObject, newLineControlLayer
+from zonecoverage import ZoneCoverageIndex, zoneTitle
 
 
 class NewTabsWithGlyphsNotReachingIntoZones(mekkaObject):
@@ -19,12 +21,15 @@ class NewTabsWithGlyphsNotReachingIntoZones(mekkaObject):
 		"includeMarks": 0,
 		"includeSymbols": 0,
 		"includePunctuation": 0,
+		"reportOvershoots": 1,
+		"maxOvershoot": 10,
+		"reportZoneMismatches": 0,
 	}
 
 	def __init__(self):
 		# Window 'self.w':
 		windowWidth = 350
-		windowHeight = 175
+		windowHeight = 219
 		windowWidthResize = 300  # user can resize width by this value
 		windowHeightResize = 0  # user can resize height by this value
 		self.w = vanilla.FloatingWindow(
@@ -56,6 +61,16 @@ class NewTabsWithGlyphsNotReachingIntoZones(mekkaObject):
 		self.w.includePunctuation = vanilla.CheckBox((inset + 60 * 3, linePos - 1, -inset, 20), u"Punctuation", value=False, callback=self.SavePreferences, sizeStyle='small')
 		linePos += lineHeight
 
+		self.w.reportOvershoots = vanilla.CheckBox((inset + 2, linePos - 1, 240, 20), u"Report edges missing a zone by up to", value=True, callback=self.SavePreferences, sizeStyle='small')
+		self.w.maxOvershoot = vanilla.EditText((inset + 240, linePos - 1, -inset - 25, 19), "10", callback=self.SavePreferences, sizeStyle='small')
+		self.w.maxOvershootText = vanilla.TextBox((-inset - 22, linePos + 2, -inset, 14), u"u", sizeStyle='small', selectable=True)
+		self.w.reportOvershoots.setToolTip(u"Lists glyph layers in the Macro Window whose top edge is slightly above a top zone, or bottom edge slightly below a bottom zone, i.e., overshoots that are too big for the zone.")
+		linePos += lineHeight
+
+		self.w.reportZoneMismatches = vanilla.CheckBox((inset + 2, linePos - 1, -inset, 20), u"Report glyphs reaching different zones in other masters", value=False, callback=self.SavePreferences, sizeStyle='small')
+		self.w.reportZoneMismatches.setToolTip(u"Lists glyphs in the Macro Window whose edge falls into a different zone (counted from the baseline) in one master than in another. Always compares all masters.")
+		linePos += lineHeight
+
 		# Run Button:
 		self.w.runButton = vanilla.Button((-120 - inset, -20 - inset, -inset, -inset), "Open Tabs", callback=self.NewTabsWithGlyphsNotReachingIntoZonesMain)
 		self.w.setDefaultButton(self.w.runButton)
@@ -67,16 +82,47 @@ class NewTabsWithGlyphsNotReachingIntoZones(mekkaObject):
 		self.w.open()
 		self.w.makeKey()
 
+	def appendTextToTab(self, tab, text, font, masterID):
+		# parse extra text in tab as layers because otherwise
+		# previously inserted layers would be converted to mere tabtext
+		# and special layers would get lost:
+		for glyphName, char in re.findall(r"/(\S+) ?|(.)", text, re.DOTALL):
+			if char == "\n":
+				tab.layers.append(newLineControlLayer())
+				continue
+			glyphName = glyphName or Glyphs.niceGlyphName(char)
+			if glyphName and font.glyphs[glyphName]:
+				layer = font.glyphs[glyphName].layers[masterID]
+				if layer:
+					tab.layers.append(layer)
+
+	def glyphFilter(self):
+		ignoreGlyphs = [n.strip() for n in self.pref("ignoreGlyphs").split(",") if n.strip()]
+		excludedCategories = [
+			category for category, included in (
+				("Mark", self.pref("includeMarks")),
+				("Symbol", self.pref("includeSymbols")),
+				("Punctuation", self.pref("includePunctuation")),
+			) if not included
+		]
+
+		def layerFilter(thisGlyph, thisLayer):
+			if not thisGlyph.layers[thisLayer.associatedMasterId].paths:
+				return False
+			# exclude diacritic compounds:
+			isDiacriticCompound = (
+				thisGlyph.category == "Letter" and len(thisLayer.paths) == 0 and len(thisLayer.components) > 0
+				# and thisLayer.components[0].component.category=="Letter"
+			)
+			return not isDiacriticCompound
+
+		glyphs = [
+			g for g in Glyphs.font.glyphs
+			if g.export and g.category not in excludedCategories and not any(namePart in g.name for namePart in ignoreGlyphs)
+		]
+		return glyphs, layerFilter
+
 	def NewTabsWithGlyphsNotReachingIntoZonesMain(self, sender):
-		if Glyphs.versionNumber >= 3:
-			# Glyphs 3 code
-			self.glyphs3solution()
-			# self.glyphs2solution()
-		else:
-			# Glyphs 2 code
-			self.glyphs2solution()
-
-	def glyphs2solution(self):
 		try:
 			# update settings to the latest user input:
 			self.SavePreferences()
@@ -87,204 +133,87 @@ class NewTabsWithGlyphsNotReachingIntoZones(mekkaObject):
 			print()
 
 			allMastersInSeparateTabs = self.pref("allMastersInSeparateTabs")
-			includeSpecialLayers = self.pref("includeSpecialLayers")
-			ignoreGlyphs = self.pref("ignoreGlyphs")
-			includeMarks = self.pref("includeMarks")
-			includeSymbols = self.pref("includeSymbols")
-			includePunctuation = self.pref("includePunctuation")
+			reportOvershoots = self.pref("reportOvershoots")
+			maxOvershoot = self.prefInt("maxOvershoot")
+			reportZoneMismatches = self.pref("reportZoneMismatches")
 
 			if allMastersInSeparateTabs:
 				masters = thisFont.masters
 			else:
 				masters = (thisFont.selectedFontMaster, )
 
+			# zone mismatches are a comparison across masters:
+			glyphs, layerFilter = self.glyphFilter()
+			index = ZoneCoverageIndex(
+				thisFont,
+				masters=thisFont.masters if reportZoneMismatches else masters,
+				glyphs=glyphs,
+				includeSpecialLayers=self.pref("includeSpecialLayers"),
+				layerFilter=layerFilter,
+			)
+
+			warningCount = 0
 			for thisFontMaster in masters:
-				bottomZones = sorted([z for z in thisFontMaster.alignmentZones if z.size < 0.0], key=lambda thisZone: -thisZone.position)
-				topZones = sorted([z for z in thisFontMaster.alignmentZones if z.size > 0.0], key=lambda thisZone: thisZone.position)
-				exportingGlyphs = [g for g in thisFont.glyphs if g.export and len(g.layers[thisFontMaster.id].paths) > 0]
-
-				# opens new Edit tab:
+				masterZoneSet = index.masterZoneSets[thisFontMaster.id]
 				masterTab = thisFont.newTab()
-
-				# set the master for the tab:
-				i = -1
 				for i, m in enumerate(thisFont.masters):
 					if m is thisFontMaster:
-						mIndex = i
-				if i >= 0:
-					masterTab.masterIndex = mIndex
-
-				masterTab.text += "Master: %s" % thisFontMaster.name
-
-				for zoneGroupInfo in ((bottomZones, False), (topZones, True)):
-					zones = zoneGroupInfo[0]
-					isTopZone = zoneGroupInfo[1]
-					if isTopZone:
-						zoneType = "top"
-					else:
-						zoneType = "bottom"
-
-					# parse exrta text in tab as layers because otherwise
-					# previously inserted layers would be converted to mere tabtext
-					# and special layers would get lost:
-					extraTabText = "\n\nNo %s zone:\n" % zoneType
-					for char in extraTabText:
-						if char == "\n":
-							masterTab.layers.append(newLineControlLayer())
+						masterTab.masterIndex = i
+				masterTab.text = "Master: %s" % thisFontMaster.name
+
+				for isTopZone in (False, True):
+					# all master zones as headings, listing each layer under the zone closest to its edge:
+					zoneData = OrderedDict((zoneTitle(zone), []) for zone in masterZoneSet.sortedZones(isTopZone))
+					for item, nearestZone in index.notReaching(thisFontMaster.id, isTopZone):
+						if nearestZone:
+							heading = zoneTitle(nearestZone)
 						else:
-							glyphName = Glyphs.niceGlyphName(char)
-							if glyphName and thisFont.glyphs[glyphName]:
-								layer = thisFont.glyphs[glyphName].layers[thisFontMaster.id]
-								if layer:
-									masterTab.layers.append(layer)
-
-					for thisGlyph in exportingGlyphs:
-						passMarksTest = includeMarks or thisGlyph.category != "Mark"
-						passSymbolsTest = includeSymbols or thisGlyph.category != "Symbol"
-						passPunctuationTest = includePunctuation or thisGlyph.category != "Punctuation"
-						passNameTest = True
-						for namePart in [n.strip() for n in ignoreGlyphs.split(",")]:
-							if namePart in thisGlyph.name:
-								passNameTest = False
-
-						if passMarksTest and passSymbolsTest and passPunctuationTest and passNameTest:
-							if includeSpecialLayers:
-								theseLayers = [layer for layer in thisGlyph.layers if (layer.isSpecialLayer or layer.isMasterLayer) and layer.associatedMasterId == thisFontMaster.id]
-							else:
-								theseLayers = (thisGlyph.layers[thisFontMaster.id], )
-
-							for thisLayer in theseLayers:
-
-								# exclude diacritic compounds:
-								isDiacriticCompound = (
-									thisGlyph.category == "Letter" and len(thisLayer.paths) == 0 and len(thisLayer.components) > 0
-									# and thisLayer.components[0].component.category=="Letter"
+							heading = "\n\nNo %s zone:\n" % ("top" if isTopZone else "bottom")
+						zoneData.setdefault(heading, []).append(item.layer)
+
+					for heading, layers in zoneData.items():
+						self.appendTextToTab(masterTab, heading, thisFont, thisFontMaster.id)
+						for thisLayer in layers:
+							masterTab.layers.append(thisLayer)
+
+					if reportOvershoots:
+						for item, zone, distance in index.overshooting(thisFontMaster.id, isTopZone, maxOvershoot):
+							warningCount += 1
+							print(
+								"⚠️ %s, layer ‘%s’: %s edge %i misses %s zone %i+%i by %i unit%s." % (
+									item.glyph.name,
+									item.layer.name,
+									"top" if isTopZone else "bottom",
+									index.edge(item, isTopZone),
+									"top" if isTopZone else "bottom",
+									zone.position,
+									zone.size,
+									distance,
+									"" if distance == 1 else "s",
 								)
+							)
 
-								if thisLayer.bounds.size.height and not isDiacriticCompound:
-									doesNotReachZone = True
-									if isTopZone:
-										topEdge = thisLayer.bounds.origin.y + thisLayer.bounds.size.height
-										for thisZone in zones:
-											if topEdge >= thisZone.position and topEdge <= (thisZone.position + thisZone.size):
-												doesNotReachZone = False
-									else:
-										bottomEdge = thisLayer.bounds.origin.y
-										for thisZone in zones:
-											if bottomEdge <= thisZone.position and bottomEdge >= (thisZone.position + thisZone.size):
-												doesNotReachZone = False
-									if doesNotReachZone:
-										masterTab.layers.append(thisLayer)  # += "/%s" % thisGlyph.name
-
-			self.w.close()  # delete if you want window to stay open
-		except Exception as e:
-			# brings macro window to front and reports error:
-			Glyphs.showMacroWindow()
-			print("New Tabs with Glyphs Not Reaching Into Zones Error: %s" % e)
-			import traceback
-			print(traceback.format_exc())
-
-	def glyphs3solution(self):
-		try:
-			# update settings to the latest user input:
-			self.SavePreferences()
-
-			thisFont = Glyphs.font  # frontmost font
-			print("New Tabs with Glyphs Not Reaching Into Zones Report for %s" % thisFont.familyName)
-			print(thisFont.filepath)
-			print()
-
-			allMastersInSeparateTabs = self.pref("allMastersInSeparateTabs")
-			includeSpecialLayers = self.pref("includeSpecialLayers")
-			ignoreGlyphs = self.pref("ignoreGlyphs")
-			includeMarks = self.pref("includeMarks")
-			includeSymbols = self.pref("includeSymbols")
-			includePunctuation = self.pref("includePunctuation")
-			zoneDataList = OrderedDict()
-			if allMastersInSeparateTabs:
-				masters = thisFont.masters
-			else:
-				masters = (thisFont.selectedFontMaster, )
-
-			for thisFontMaster in masters:
-				zoneData = OrderedDict()
-				exportingGlyphs = [g for g in thisFont.glyphs if g.export and len(g.layers[thisFontMaster.id].paths) > 0]
-
-				# set the master for the tab:
-
-				# masterTab.text += "Master: %s" % thisFontMaster.name
-
-				for thisGlyph in exportingGlyphs:
-					passMarksTest = includeMarks or thisGlyph.category != "Mark"
-					passSymbolsTest = includeSymbols or thisGlyph.category != "Symbol"
-					passPunctuationTest = includePunctuation or thisGlyph.category != "Punctuation"
-					passNameTest = True
-					for namePart in [n.strip() for n in ignoreGlyphs.split(",")]:
-						if namePart in thisGlyph.name:
-							passNameTest = False
-
-					if passMarksTest and passSymbolsTest and passPunctuationTest and passNameTest:
-						if includeSpecialLayers:
-							theseLayers = [layer for layer in thisGlyph.layers if (layer.isSpecialLayer or layer.isMasterLayer) and layer.associatedMasterId == thisFontMaster.id]
-						else:
-							theseLayers = (thisGlyph.layers[thisFontMaster.id], )
-
-						for thisLayer in theseLayers:
-							bottomZones = sorted([z for z in thisLayer.metrics if z.size < 0.0], key=lambda thisZone: -thisZone.position)
-							topZones = sorted([z for z in thisLayer.metrics if z.size > 0.0], key=lambda thisZone: thisZone.position)
-							# exclude diacritic compounds:
-							isDiacriticCompound = (
-								thisGlyph.category == "Letter" and len(thisLayer.paths) == 0 and len(thisLayer.components) > 0
-								# and thisLayer.components[0].component.category=="Letter"
+			if reportZoneMismatches:
+				for isTopZone in (False, True):
+					for glyphName, reachedZones in index.inconsistentZones(isTopZone).items():
+						warningCount += 1
+						print(
+							"❓ %s: %s edge in different zones: %s" % (
+								glyphName,
+								"top" if isTopZone else "bottom",
+								", ".join(
+									"%s %s" % (
+										thisFont.masters[masterID].name,
+										"%i+%i" % (zone.position, zone.size) if zone else "none",
+									) for masterID, zone in reachedZones
+								),
 							)
+						)
 
-							for zones, isTopZone in ((bottomZones, False), (topZones, True)):
-								for thisZone in zones:
-									zoneType = "bottom"
-									if isTopZone:
-										zoneType = "top"
-									zoneDescription = (
-										"\n\n%s %i+%i:\n" % (zoneType, thisZone.position, thisZone.size)
-									).replace("+-", "/minus ").replace("-", "/minus ").replace("bottom 0", "baseline 0")
-									if zoneDescription not in zoneData.keys():
-										zoneData[zoneDescription] = []
-
-									if thisLayer.bounds.size.height and not isDiacriticCompound:
-										doesNotReachZone = True
-										if isTopZone:
-											topEdge = thisLayer.bounds.origin.y + thisLayer.bounds.size.height
-											for thisZone in zones:
-												if topEdge >= thisZone.position and topEdge <= (thisZone.position + thisZone.size):
-													doesNotReachZone = False
-										else:
-											bottomEdge = thisLayer.bounds.origin.y
-											for thisZone in zones:
-												if bottomEdge <= thisZone.position and bottomEdge >= (thisZone.position + thisZone.size):
-													doesNotReachZone = False
-										if doesNotReachZone:
-											zoneData[zoneDescription].append(thisLayer)
-				tabText = "Master: %s" % thisFontMaster.name
-				i = -1
-				for i, m in enumerate(thisFont.masters):
-					if m is thisFontMaster:
-						mIndex = i
-				# if i >= 0:
-				# 	masterTab.masterIndex = mIndex
-
-				zoneDataList[(tabText, i)] = zoneData
-			# putting collected data into tab's text
-			for key, zoneData in zoneDataList.items():
-				tabText, masterIndex = key
-				# opens new Edit tab:
-				masterTab = thisFont.newTab()
-				if masterIndex >= 0:
-					masterTab.masterIndex = mIndex
-				masterTab.text = tabText
-
-				for key, layers in zoneData.items():
-					masterTab.text += key
-					for thisLayer in layers:
-						masterTab.layers.append(thisLayer)
+			if warningCount:
+				Glyphs.showMacroWindow()
+			elif reportOvershoots or reportZoneMismatches:
+				print("✅ No overshoot or zone problems found.")
 
 			self.w.close()  # delete if you want window to stay open
 		except Exception as e:
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+from GlyphsApp import Glyphs
+
+Zone = namedtuple("Zone", ("low", "high", "position", "size"))  # low and high first, so zones sort by their lower edge
+LayerCoverage = namedtuple("LayerCoverage", ("glyph", "layer", "masterID", "bottom", "top", "zoneSet"))
+
+
+def zonesOfMaster(master):
+	return [(zone.position, zone.size) for zone in master.alignmentZones]
+
+
+def zoneTitle(zone):
+	"""Heading for a zone in tab texts, e.g. 'top 500+12:' or 'baseline 0/minus 12:'."""
+	zoneType = "top" if zone.size > 0 else "bottom"
+	return ("\n\n%s %i+%i:\n" % (zoneType, zone.position, zone.size)).replace("+-", "/minus ").replace("-", "/minus ").replace("bottom 0", "baseline 0")
+
+
+class ZoneSet:
+	"""
+	Alignment zones of a master or layer, sorted once by their lower edge, top zones (positive size)
+	and bottom zones (negative size) separately, for binary searches. Zones of size 0 are ignored.
+	"""
+
+	def __init__(self, zones=()):
+		self.zones = {True: [], False: []}
+		for position, size in zones:
+			if size:
+				low, high = sorted((position, position + size))
+				self.zones[size > 0].append(Zone(low, high, position, size))
+		for zoneList in self.zones.values():
+			zoneList.sort()
+		self.update()
+
+	def add(self, position, size):
+		if not size:
+			return
+		low, high = sorted((position, position + size))
+		insort(self.zones[size > 0], Zone(low, high, position, size))
+		self.update()
+
+	def update(self):
+		self.lows, self.maxHighs = {}, {}
+		for isTop, zones in self.zones.items():
+			self.lows[isTop] = [zone.low for zone in zones]
+			maxHighs, maxHigh = [], float("-inf")
+			for zone in zones:
+				maxHigh = max(maxHigh, zone.high)
+				maxHighs.append(maxHigh)
+			self.maxHighs[isTop] = maxHighs
+
+	def allZones(self):
+		return self.zones[True] + self.zones[False]
+
+	def sortedZones(self, isTop):
+		"""Top zones from bottom to top, bottom zones from top to bottom, i.e., from the baseline outwards."""
+		zones = self.zones[isTop]
+		return list(zones) if isTop else sorted(zones, key=lambda zone: -zone.position)
+
+	def zoneContaining(self, y, isTop):
+		"""The zone with y between its edges (with the highest lower edge if zones overlap), or None."""
+		zones, maxHighs = self.zones[isTop], self.maxHighs[isTop]
+		for index in range(bisect_right(self.lows[isTop], y) - 1, -1, -1):
+			if maxHighs[index] < y:
+				break  # no zone further down reaches y
+			if zones[index].high >= y:
+				return zones[index]
+		return None
+
+	def zoneBelow(self, y, isTop):
+		"""The zone with the highest upper edge below y, or None."""
+		below = [zone for zone in self.zones[isTop][:bisect_right(self.lows[isTop], y)] if zone.high < y]
+		return max(below, key=lambda zone: zone.high) if below else None
+
+	def zoneAbove(self, y, isTop):
+		"""The zone with the lowest lower edge above y, or None."""
+		zones = self.zones[isTop]
+		index = bisect_right(self.lows[isTop], y)
+		return zones[index] if index < len(zones) else None
+
+	def nearestZone(self, y, isTop):
+		"""The zone closest to y, or None if there are no zones of this type."""
+		candidates = [zone for zone in (self.zoneContaining(y, isTop), self.zoneBelow(y, isTop), self.zoneAbove(y, isTop)) if zone]
+		return min(candidates, key=lambda zone: max(zone.low - y, y - zone.high, 0)) if candidates else None
+
+	def isOverlapping(self, low, high, distance=0):
+		"""True if any zone, extended by distance on both sides, overlaps the range from low to high, edges excluded."""
+		for isTop in (True, False):
+			zones, maxHighs = self.zones[isTop], self.maxHighs[isTop]
+			for index in range(bisect_left(self.lows[isTop], high + distance) - 1, -1, -1):
+				if maxHighs[index] + distance <= low:
+					break
+				if zones[index].high + distance > low:
+					return True
+		return False
+
+	def overlappingZones(self, distance=0):
+		"""Pairs of zones closer to each other than distance, in order of their lower edges."""
+		zones = sorted(self.allZones())
+		pairs = []
+		for index, zone in enumerate(zones):
+			for otherZone in zones[index + 1:]:
+				if otherZone.low - zone.high >= distance:
+					break
+				pairs.append((zone, otherZone))
+		return pairs
+
+	def largestSize(self):
+		return max([abs(zone.size) for zone in self.allZones()] or [0])
+
+
+class ZoneCoverageIndex:
+	"""
+	Vertical extremes of the master (and optionally special) layers of glyphs, for all masters in one pass,
+	with the zones of every master sorted once into a ZoneSet. Special layers with their own zones
+	(Glyphs 3: layer.metrics) get a ZoneSet per distinct set of zones. Empty layers are left out.
+	coverage: {masterID: [LayerCoverage, ...]} in glyph order, then layer order.
+	layerFilter(glyph, layer) can exclude layers, e.g. compounds.
+	"""
+
+	def __init__(self, font, masters=None, glyphs=None, includeSpecialLayers=False, layerFilter=None):
+		self.font = font
+		masters = masters or font.masters
+		self.masterIDs = [master.id for master in masters]
+		self.zoneSets = {}  # tuple of (position, size) -> ZoneSet
+		self.masterZoneSets = {master.id: self.zoneSetFor(zonesOfMaster(master)) for master in masters}
+		self.coverage = {masterID: [] for masterID in self.masterIDs}
+
+		for glyph in font.glyphs if glyphs is None else glyphs:
+			for layer in glyph.layers:
+				masterID = layer.associatedMasterId
+				if masterID not in self.coverage:
+					continue
+				if layer.isMasterLayer:
+					zoneSet = self.masterZoneSets[masterID]
+				elif includeSpecialLayers and layer.isSpecialLayer:
+					zoneSet = self.zoneSetOfLayer(layer, masterID)
+				else:
+					continue
+				if layerFilter and not layerFilter(glyph, layer):
+					continue
+				bounds = layer.bounds
+				if not bounds.size.height:
+					continue
+				bottom = bounds.origin.y
+				self.coverage[masterID].append(LayerCoverage(glyph, layer, masterID, bottom, bottom + bounds.size.height, zoneSet))
+
+	def zoneSetFor(self, zones):
+		key = tuple(sorted(zones))
+		if key not in self.zoneSets:
+			self.zoneSets[key] = ZoneSet(key)
+		return self.zoneSets[key]
+
+	def zoneSetOfLayer(self, layer, masterID):
+		if Glyphs.versionNumber >= 3:
+			return self.zoneSetFor([(zone.position, zone.size) for zone in layer.metrics])
+		return self.masterZoneSets[masterID]
+
+	@staticmethod
+	def edge(item, isTop):
+		return item.top if isTop else item.bottom
+
+	def reachedZone(self, item, isTop):
+		"""The zone the top (or bottom) edge of a LayerCoverage reaches into, or None."""
+		return item.zoneSet.zoneContaining(self.edge(item, isTop), isTop)
+
+	def notReaching(self, masterID, isTop):
+		"""[(LayerCoverage, nearest zone)] for layers whose top (or bottom) edge is in no zone of this type."""
+		return [
+			(item, item.zoneSet.nearestZone(self.edge(item, isTop), isTop))
+			for item in self.coverage[masterID]
+			if not self.reachedZone(item, isTop)
+		]
+
+	def reaching(self, masterID, isTop):
+		"""[(LayerCoverage, zone)] for layers whose top (or bottom) edge is in a zone of this type."""
+		results = []
+		for item in self.coverage[masterID]:
+			zone = self.reachedZone(item, isTop)
+			if zone:
+				results.append((item, zone))
+		return results
+
+	def overshooting(self, masterID, isTop, maxDistance):
+		"""
+		[(LayerCoverage, zone, distance)] for layers whose top edge is above a top zone (or bottom edge below a bottom zone)
+		by up to maxDistance units, i.e., overshoots that miss the zone.
+		"""
+		results = []
+		for item in self.coverage[masterID]:
+			y = self.edge(item, isTop)
+			if self.reachedZone(item, isTop):
+				continue
+			if isTop:
+				zone = item.zoneSet.zoneBelow(y, True)
+				distance = y - zone.high if zone else None
+			else:
+				zone = item.zoneSet.zoneAbove(y, False)
+				distance = zone.low - y if zone else None
+			if zone and distance <= maxDistance:
+				results.append((item, zone, distance))
+		return results
+
+	def inconsistentZones(self, isTop):
+		"""
+		{glyph name: [(master ID, zone or None), ...]} for glyphs whose master layers reach into zones
+		with different indexes (counted from the baseline outwards) in different masters.
+		"""
+		reachedIndexes = {}
+		for masterID in self.masterIDs:
+			for item in self.coverage[masterID]:
+				if not item.layer.isMasterLayer:
+					continue
+				zone = self.reachedZone(item, isTop)
+				zoneIndex = item.zoneSet.sortedZones(isTop).index(zone) if zone else None
+				reachedIndexes.setdefault(item.glyph.name, []).append((masterID, zone, zoneIndex))
+		return {
+			glyphName: [(masterID, zone) for masterID, zone, zoneIndex in reached]
+			for glyphName, reached in reachedIndexes.items()
+			if len(set(zoneIndex for masterID, zone, zoneIndex in reached if zoneIndex is not None)) > 1
+		}
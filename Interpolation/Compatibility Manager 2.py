@@ -10,6 +10,7 @@ corner components.
 
 import math
 import vanilla
+from array import array
 from mekkablue import mekkaObject
 from GlyphsApp import Glyphs, GSPath, GSComponent, GSAnchor, OFFCURVE, CORNER, SEGMENT, CAP
 from AppKit import NSPoint
@@ -29,52 +30,99 @@ def normalizedPositions(path, italicAngle=0.0):
 	Return list of NSPoint, each in [0,1]×[0,1], derived from path nodes
 	de-slanted by italicAngle and normalised within the path's own bounding box.
 	"""
-	nodes = path.nodes
-	if not nodes:
-		return []
-	pts = [deSlant(n.position, italicAngle) for n in nodes]
-	xs = [p.x for p in pts]
-	ys = [p.y for p in pts]
-	w = (max(xs) - min(xs)) or 1.0
-	h = (max(ys) - min(ys)) or 1.0
-	ox, oy = min(xs), min(ys)
-	return [NSPoint((p.x - ox) / w, (p.y - oy) / h) for p in pts]
+	signature = PathSignature(path, italicAngle)
+	return [NSPoint(x, y) for x, y in zip(signature.x, signature.y)]
 
 
-def _pointsTravel(pos1, pos2):
-	return sum(math.hypot(a.x - b.x, a.y - b.y) for a, b in zip(pos1, pos2))
-
-
-def minTravelForPaths(path, refPath, italicAngle, refItalicAngle):
+class PathSignature:
 	"""
-	Return (minTravel, bestOffset) over all start-point rotations of path
-	whose node-type sequence matches refPath exactly.
+	Everything the travel calculation needs from a path, read from its nodes once:
+	typeString: one character per node type, e.g. 'looc' for line, offcurve, offcurve, curve
+	typeKey: typeString sorted, equal for paths with the same node types in any order
+	x, y: arrays of the normalised, de-slanted node positions (see normalizedPositions)
+	"""
+	__slots__ = ("typeString", "typeKey", "x", "y")
+
+	typeCharacters = {}
+
+	def __init__(self, path, italicAngle=0.0):
+		nodes = path.nodes
+		types = [nd.type for nd in nodes]
+		for nodeType in set(types):
+			if nodeType not in self.typeCharacters:
+				self.typeCharacters[nodeType] = chr(ord("a") + len(self.typeCharacters))
+		self.typeString = "".join(self.typeCharacters[t] for t in types)
+		self.typeKey = "".join(sorted(self.typeString))
+		pts = [deSlant(nd.position, italicAngle) for nd in nodes]
+		xs = [p.x for p in pts]
+		ys = [p.y for p in pts]
+		if pts:
+			w = (max(xs) - min(xs)) or 1.0
+			h = (max(ys) - min(ys)) or 1.0
+			ox, oy = min(xs), min(ys)
+			xs = [(x - ox) / w for x in xs]
+			ys = [(y - oy) / h for y in ys]
+		self.x = array("d", xs)
+		self.y = array("d", ys)
+
+	def __len__(self):
+		return len(self.typeString)
+
+
+def shapeSignatures(layer):
+	"""List aligned with layer.shapes: a PathSignature for every path, None for other shapes."""
+	italicAngle = layer.italicAngle
+	return [PathSignature(shape, italicAngle) if isinstance(shape, GSPath) else None for shape in layer.shapes]
+
+
+def matchingRotations(signature, refSignature):
+	"""Start offsets of signature whose rotated node-type sequence equals refSignature's."""
+	n = len(signature)
+	doubled = signature.typeString * 2
+	offsets = []
+	off = doubled.find(refSignature.typeString)
+	while 0 <= off < n:
+		offsets.append(off)
+		off = doubled.find(refSignature.typeString, off + 1)
+	return offsets
+
+
+def minTravelForSignatures(signature, refSignature):
+	"""
+	Return (minTravel, bestOffset) over all start-point rotations of signature
+	whose node-type sequence matches refSignature exactly.
 	Returns (inf, 0) when no compatible rotation exists.
 	"""
-	n = len(path.nodes)
-	if n != len(refPath.nodes) or n == 0:
-		return float('inf'), 0
-
-	myTypes = [nd.type for nd in path.nodes]
-	refTypes = [nd.type for nd in refPath.nodes]
-	if sorted(myTypes) != sorted(refTypes):
+	n = len(signature)
+	if n != len(refSignature) or n == 0 or signature.typeKey != refSignature.typeKey:
 		return float('inf'), 0
 
-	myPos = normalizedPositions(path, italicAngle)
-	refPos = normalizedPositions(refPath, refItalicAngle)
-
+	myX, myY, refX, refY = signature.x, signature.y, refSignature.x, refSignature.y
+	hypot = math.hypot
 	best = float('inf')
 	bestOff = 0
-	for off in range(n):
-		if myTypes[off:] + myTypes[:off] != refTypes:
-			continue
-		travel = _pointsTravel(myPos[off:] + myPos[:off], refPos)
+	for off in matchingRotations(signature, refSignature):
+		travel = 0.0
+		for i in range(n):
+			j = i + off - n if i + off >= n else i + off
+			travel += hypot(myX[j] - refX[i], myY[j] - refY[i])
+			if travel >= best:
+				break  # cannot beat the best rotation anymore
 		if travel < best:
 			best = travel
 			bestOff = off
 	return best, bestOff
 
 
+def minTravelForPaths(path, refPath, italicAngle, refItalicAngle):
+	"""
+	Return (minTravel, bestOffset) over all start-point rotations of path
+	whose node-type sequence matches refPath exactly.
+	Returns (inf, 0) when no compatible rotation exists.
+	"""
+	return minTravelForSignatures(PathSignature(path, italicAngle), PathSignature(refPath, refItalicAngle))
+
+
 def applyStartOffset(path, offset):
 	"""
 	Rotate path so that nodes[offset] becomes the new first node.
@@ -98,28 +146,91 @@ def normalizedCenter(shape, layer, italicAngle):
 	return NSPoint((pt.x - lb.origin.x) / lw, (pt.y - lb.origin.y) / lh)
 
 
-def shapeCost(shape, refShape, layer, refLayer):
+def shapeCost(shape, refShape, layer, refLayer, signature=None, refSignature=None):
 	"""
 	Travel cost for matching shape to refShape. Returns inf for incompatible types/names.
 	Component travel is only calculated when auto-alignment is off (pixel fonts).
+	For paths, precomputed PathSignatures can be passed to avoid re-reading the nodes.
 	"""
+	return shapeCostAndOffset(shape, refShape, layer, refLayer, signature, refSignature)[0]
+
+
+def shapeCostAndOffset(shape, refShape, layer, refLayer, signature=None, refSignature=None):
+	"""Like shapeCost, but returns (cost, bestStartOffset); the offset is 0 for components."""
 	if type(shape) is not type(refShape):
-		return float('inf')
+		return float('inf'), 0
 
 	if isinstance(shape, GSPath):
-		travel, _ = minTravelForPaths(shape, refShape, layer.italicAngle, refLayer.italicAngle)
-		return travel
+		if signature is None:
+			signature = PathSignature(shape, layer.italicAngle)
+		if refSignature is None:
+			refSignature = PathSignature(refShape, refLayer.italicAngle)
+		return minTravelForSignatures(signature, refSignature)
 
 	if isinstance(shape, GSComponent):
 		if shape.componentName != refShape.componentName:
-			return float('inf')
+			return float('inf'), 0
 		if shape.automaticAlignment:
-			return 0.0
+			return 0.0, 0
 		c1 = normalizedCenter(shape, layer, layer.italicAngle)
 		c2 = normalizedCenter(refShape, refLayer, refLayer.italicAngle)
-		return math.hypot(c1.x - c2.x, c1.y - c2.y)
+		return math.hypot(c1.x - c2.x, c1.y - c2.y), 0
+
+	return float('inf'), 0
 
-	return float('inf')
+
+def optimalAssignment(costs):
+	"""
+	Hungarian algorithm (Kuhn-Munkres, O(n²·m)) for a cost matrix with n rows and m >= n columns,
+	all costs finite. Returns a list with the column assigned to each row,
+	so that the sum of the assigned costs is minimal.
+	"""
+	n = len(costs)
+	m = len(costs[0]) if n else 0
+	inf = float('inf')
+	u = [0.0] * (n + 1)
+	v = [0.0] * (m + 1)
+	rowOfColumn = [0] * (m + 1)  # 1-based row assigned to each column, 0 = none
+	way = [0] * (m + 1)
+	for row in range(1, n + 1):
+		rowOfColumn[0] = row
+		j0 = 0
+		minv = [inf] * (m + 1)
+		used = [False] * (m + 1)
+		while True:
+			used[j0] = True
+			i0 = rowOfColumn[j0]
+			rowCosts = costs[i0 - 1]
+			delta = inf
+			j1 = 0
+			for j in range(1, m + 1):
+				if not used[j]:
+					cur = rowCosts[j - 1] - u[i0] - v[j]
+					if cur < minv[j]:
+						minv[j] = cur
+						way[j] = j0
+					if minv[j] < delta:
+						delta = minv[j]
+						j1 = j
+			for j in range(m + 1):
+				if used[j]:
+					u[rowOfColumn[j]] += delta
+					v[j] -= delta
+				else:
+					minv[j] -= delta
+			j0 = j1
+			if rowOfColumn[j0] == 0:
+				break
+		while j0:
+			j1 = way[j0]
+			rowOfColumn[j0] = rowOfColumn[j1]
+			j0 = j1
+
+	assignment = [None] * n
+	for column in range(1, m + 1):
+		if rowOfColumn[column]:
+			assignment[rowOfColumn[column] - 1] = column - 1
+	return assignment
 
 
 # ─── layer operations ────────────────────────────────────────────────────────
@@ -147,27 +258,69 @@ def resetStartPointsInLayer(layer):
 			path.makeNodeFirst_(path.nodes[idx - 1])
 
 
-def reorderShapes(layer, refLayer):
+def shapeMatchKey(shape, signature):
+	"""Shapes with different keys can never be matched, so their cost is not even calculated."""
+	if signature is not None:
+		return (GSPath, signature.typeKey)
+	if isinstance(shape, GSComponent):
+		return (GSComponent, shape.componentName)
+	return (type(shape), None)
+
+
+def reorderShapes(layer, refLayer, refSignatures=None):
 	"""
-	Greedily reorder layer.shapes to match refLayer.shapes by lowest shapeCost.
-	Returns True on success, False when a shape has no compatible match.
+	Reorder layer.shapes to match refLayer.shapes with the lowest total shapeCost
+	(optimal assignment, not greedy). refSignatures: shapeSignatures(refLayer), if already known.
+	Returns the best start offsets for layer.paths in their new order,
+	or None when a shape has no compatible match.
 	"""
-	remaining = list(layer.shapes)
-	newOrder = []
-	for refShape in refLayer.shapes:
-		bestIdx = None
-		bestCost = float('inf')
-		for i, shape in enumerate(remaining):
-			cost = shapeCost(shape, refShape, layer, refLayer)
-			if cost < bestCost:
-				bestCost = cost
-				bestIdx = i
-		if bestIdx is None or math.isinf(bestCost):
-			return False
-		newOrder.append(remaining.pop(bestIdx))
-	newOrder.extend(remaining)
+	shapes = list(layer.shapes)
+	refShapes = list(refLayer.shapes)
+	if len(shapes) < len(refShapes):
+		return None
+	signatures = shapeSignatures(layer)
+	if refSignatures is None:
+		refSignatures = shapeSignatures(refLayer)
+	keys = [shapeMatchKey(shape, signature) for shape, signature in zip(shapes, signatures)]
+
+	# cost matrix, rows = reference shapes, columns = shapes:
+	inf = float('inf')
+	costs = []
+	offsets = []
+	for refShape, refSignature in zip(refShapes, refSignatures):
+		refKey = shapeMatchKey(refShape, refSignature)
+		rowCosts = []
+		rowOffsets = []
+		for shape, signature, key in zip(shapes, signatures, keys):
+			if key != refKey:
+				cost, offset = inf, 0
+			else:
+				cost, offset = shapeCostAndOffset(shape, refShape, layer, refLayer, signature, refSignature)
+			rowCosts.append(cost)
+			rowOffsets.append(offset)
+		if all(math.isinf(cost) for cost in rowCosts):
+			return None
+		costs.append(rowCosts)
+		offsets.append(rowOffsets)
+
+	# impossible pairs get a cost higher than any complete finite assignment,
+	# and among equally cheap assignments, the current order wins (e.g. identical dots):
+	finiteCosts = [cost for rowCosts in costs for cost in rowCosts if not math.isinf(cost)]
+	impossible = (sum(finiteCosts) + 1.0) * 2.0
+	assignment = optimalAssignment([
+		[impossible if math.isinf(cost) else cost + (1e-9 if row != column else 0.0) for column, cost in enumerate(rowCosts)]
+		for row, rowCosts in enumerate(costs)
+	])
+	if any(math.isinf(costs[row][column]) for row, column in enumerate(assignment)):
+		return None
+
+	assigned = set(assignment)
+	newOrder = [shapes[column] for column in assignment]
+	newOrder.extend(shape for column, shape in enumerate(shapes) if column not in assigned)
+	startOffsets = [offsets[row][column] for row, column in enumerate(assignment) if signatures[column] is not None]
+	startOffsets.extend(0 for column, signature in enumerate(signatures) if column not in assigned and signature is not None)
 	layer.shapes = newOrder
-	return True
+	return startOffsets
 
 
 def propagateCornerComponents(glyph, refLayer):
@@ -537,9 +690,10 @@ class CompatibilityManager2(mekkaObject):
 
 		# 4. make each subsequent layer compatible with refLayer
 		errorReason = None
+		refSignatures = shapeSignatures(refLayer)
 		for layer in layers[1:]:
 			removeEmptyPaths(layer)
-			reason = self._makeLayerCompatible(layer, refLayer, verbose=verbose)
+			reason = self._makeLayerCompatible(layer, refLayer, verbose=verbose, refSignatures=refSignatures)
 			if reason and errorReason is None:
 				errorReason = reason
 
@@ -569,9 +723,10 @@ class CompatibilityManager2(mekkaObject):
 
 		return errorReason or True
 
-	def _makeLayerCompatible(self, layer, refLayer, verbose=False):
+	def _makeLayerCompatible(self, layer, refLayer, verbose=False, refSignatures=None):
 		"""
 		Attempt to make layer compatible with refLayer.
+		refSignatures: shapeSignatures(refLayer), computed once per glyph by the caller.
 		Returns None on success, or an explanatory error string on failure.
 		"""
 		if layer.compareString() == refLayer.compareString():
@@ -584,15 +739,14 @@ class CompatibilityManager2(mekkaObject):
 		if reason:
 			return reason
 
-		# reorder shapes (paths + components together) by shortest travel
-		if not reorderShapes(layer, refLayer):
+		# reorder shapes (paths + components together) by lowest total travel,
+		# the assignment already knows the best start point for each path pair:
+		startOffsets = reorderShapes(layer, refLayer, refSignatures)
+		if startOffsets is None:
 			return incompatibilityReason(layer, refLayer) or "shape reordering failed"
 
 		# set best start point for each path pair
-		for pathIdx, (path, refPath) in enumerate(zip(layer.paths, refLayer.paths)):
-			travel, offset = minTravelForPaths(path, refPath, layer.italicAngle, refLayer.italicAngle)
-			if math.isinf(travel):
-				return f"incompatible path #{pathIdx}: no valid start-point rotation found"
+		for path, offset in zip(layer.paths, startOffsets):
 			applyStartOffset(path, offset)
 
 		# final confirmation
@@ -8,6 +8,7 @@ Finds glyphs that change the number of visible shapes and countershapes while in
 import vanilla
 from GlyphsApp import Glyphs, GSInstance, Message
 from mekkablue import mekkaObject
+from deltamodel import MasterCoordinates, layerWithCoordinates, roundedCoordinates, weightsOfInstance
 
 tempMarker = "###DELETEME###"
 
@@ -253,6 +254,10 @@ class FindShapeshiftingGlyphs(mekkaObject):
 
 				print("\n\nFinding potential shapeshifters...\n")
 
+				# master weights of every instance, for interpolating compatible glyphs without instance proxies:
+				masterIDs = [m.id for m in thisFont.masters]
+				instanceWeights = [weightsOfInstance(i, masterIDs) for i in self.instances]
+
 				# iterate through glyphs:
 				affectedGlyphNames = []
 				numOfGlyphs = len(glyphNamesToBeChecked)
@@ -262,8 +267,18 @@ class FindShapeshiftingGlyphs(mekkaObject):
 
 					# collect number of paths for every instance:
 					pathCounts = []
-					for thisInstance in self.instances:
-						interpolation = glyphInterpolation(thisGlyphName, thisInstance)
+					thisGlyph = thisFont.glyphs[thisGlyphName]
+					masterCoordinates = MasterCoordinates(thisGlyph, masterIDs)
+					if masterCoordinates.compatible and not masterCoordinates.hasComponents:
+						masterLayer = thisGlyph.layers[masterIDs[0]]
+						interpolations = []
+						for coordinates in masterCoordinates.interpolateMany(instanceWeights):
+							if thisFont.gridLength == 1.0:
+								coordinates = roundedCoordinates(coordinates)
+							interpolations.append(layerWithCoordinates(masterLayer, coordinates))
+					else:
+						interpolations = [glyphInterpolation(thisGlyphName, thisInstance) for thisInstance in self.instances]
+					for thisInstance, interpolation in zip(self.instances, interpolations):
 						if interpolation:
 							# only decompose and remove overlap when necessary, should speed things up:
 							if interpolation.components:
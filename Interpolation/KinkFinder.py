@@ -6,10 +6,13 @@ Finds kinks in interpolation space, reports them in the Macro window and opens a
 """
 
 import vanilla
+import time
 from math import hypot
 from Foundation import NSPoint, NSHeight
 from GlyphsApp import Glyphs, GSInstance, GSAnnotation, CIRCLE, GSSMOOTH, GSOFFCURVE, Message, subtractPoints
 from mekkablue import mekkaObject
+from mekkablue.layernodes import LayerNodes
+from deltamodel import DesignspaceModel, MasterCoordinates, pathRangesOfStructure, roundedCoordinates, weightsOfInstance
 
 tempMarker = "###DELETEME###"
 nodeMarker = "⛔️"
@@ -53,6 +56,25 @@ def orthogonalDistance(pivot, A, B):
 		return 0
 
 
+def kinkSize(coordinates, index, prevIndex, nextIndex):
+	"""
+	Like orthogonalDistance() for nodes in an array of x, y coordinates:
+	distance of node index from the line through its previous and next node.
+	"""
+	x, y = coordinates[2 * index], coordinates[2 * index + 1]
+	ax, ay = coordinates[2 * prevIndex], coordinates[2 * prevIndex + 1]
+	bx, by = coordinates[2 * nextIndex], coordinates[2 * nextIndex + 1]
+	return kinkSizeOfPoints(x, y, ax, ay, bx, by)
+
+
+def kinkSizeOfPoints(x, y, ax, ay, bx, by):
+	"""Distance of x, y from the line through ax, ay and bx, by."""
+	length = hypot(bx - ax, by - ay)
+	if not length:
+		return 0.0
+	return abs((bx - ax) * (y - ay) - (by - ay) * (x - ax)) / length
+
+
 """
 g = Layer.parent
 for i in range(0,105,5):
@@ -72,6 +94,9 @@ class KinkFinder(mekkaObject):
 		"exportingOnly": 1,
 		"markKinks": 0,
 		"findKinksWhere": 0,
+		"sweepSampling": 0,
+		"sweepSamples": 5,
+		"sweepTimeBudget": 60,
 		"reportIncompatibilities": 0,
 		"bringMacroWindowToFront": 0,
 	}
@@ -81,7 +106,7 @@ class KinkFinder(mekkaObject):
 	def __init__(self):
 		# Window 'self.w':
 		windowWidth = 350
-		windowHeight = 265
+		windowHeight = 287
 		windowWidthResize = 200  # user can resize width by this value
 		windowHeightResize = 0  # user can resize height by this value
 		self.w = vanilla.FloatingWindow(
@@ -108,11 +133,22 @@ class KinkFinder(mekkaObject):
 			"in all current active instances",
 			"in all current active and inactive instances",
 			"in masters instead (not in interpolations)",
+			"in a designspace sweep (see below)",
 		)
 		self.w.findKinksWhereText = vanilla.TextBox((inset, linePos + 2, 60, 14), "Find kinks", sizeStyle='small', selectable=True)
 		self.w.findKinksWhere = vanilla.PopUpButton((inset + 60, linePos, -inset, 17), self.findKinksWhereOptions, sizeStyle='small', callback=self.SavePreferences)
 		linePos += lineHeight
 
+		self.w.sweepText = vanilla.TextBox((inset, linePos + 2, 40, 14), "Sweep", sizeStyle='small', selectable=True)
+		self.w.sweepSampling = vanilla.PopUpButton((inset + 40, linePos, 110, 17), ("grid, steps/axis:", "Latin hypercube:"), sizeStyle='small', callback=self.SavePreferences)
+		self.w.sweepSampling.setToolTip("Grid: evenly spaced steps on every axis, including the extremes, in every combination (steps to the power of the number of axes). Latin hypercube: the given number of randomly combined locations, evenly spread over the range of every axis.")
+		self.w.sweepSamples = vanilla.EditText((inset + 153, linePos - 1, 35, 19), "5", sizeStyle='small', callback=self.SavePreferences)
+		self.w.sweepSamples.setToolTip("Grid: number of steps per axis. Latin hypercube: number of locations.")
+		self.w.sweepTimeBudgetText = vanilla.TextBox((inset + 193, linePos + 2, 65, 14), "time limit (s):", sizeStyle='small', selectable=True)
+		self.w.sweepTimeBudget = vanilla.EditText((inset + 260, linePos - 1, -inset, 19), "60", sizeStyle='small', callback=self.SavePreferences)
+		self.w.sweepTimeBudget.setToolTip("Stops the sweep after this many seconds and reports the glyphs that were not checked.")
+		linePos += lineHeight
+
 		# self.w.betweenAdjacentMastersOnly.setToolTip("If checked, will look for kinks between masters 0+1, 1+2, 1+3, but NOT between 0+2, 1+3 or 0+3. Makes sense if you have only one axis (e.g. weight) and more than two masters in interpolation order (lightest through boldest).")
 
 		self.w.allGlyphs = vanilla.CheckBox((inset + 2, linePos - 1, -inset, 20), "Process all glyphs in font (ignore selection)", value=False, callback=self.SavePreferences, sizeStyle='small')
@@ -157,11 +193,17 @@ class KinkFinder(mekkaObject):
 		# 3: in all current active and inactive instances
 		# 4: in masters instead (not in interpolations)
 
+		# 5: in a designspace sweep
+
 		if self.pref("findKinksWhere") == 4:
 			self.w.markKinks.setTitle("Mark kinky nodes")
 		else:
 			self.w.markKinks.setTitle("Mark kinky nodes in first layer")
 
+		sweep = self.pref("findKinksWhere") == 5
+		for sweepSetting in (self.w.sweepSampling, self.w.sweepSamples, self.w.sweepTimeBudget):
+			sweepSetting.enable(sweep)
+
 		if self.pref("allGlyphs"):
 			self.w.runButton.setTitle("Open Tab")
 		else:
@@ -198,6 +240,92 @@ class KinkFinder(mekkaObject):
 			return None
 
 
+	def interpolatedOutlines(self, thisGlyph, thisFont, firstInstance):
+		"""
+		Returns (path ranges, smooth flags, first coordinates, [coordinates per instance]) of thisGlyph,
+		interpolated from an array of its master coordinates, or through instance proxies if its masters are
+		not plainly compatible (e.g., brace or bracket layers). Coordinates are None for instances that
+		cannot be interpolated. Returns None if the first master cannot be interpolated.
+		"""
+		masterIDs = [m.id for m in thisFont.masters]
+		roundToGrid = thisFont.gridLength == 1.0
+		masterCoordinates = MasterCoordinates(thisGlyph, masterIDs)
+		if masterCoordinates.compatible:
+			weightRows = [weightsOfInstance(i, masterIDs) for i in [firstInstance] + self.instances]
+			allCoordinates = masterCoordinates.interpolateMany(weightRows)
+			if roundToGrid:
+				allCoordinates = [roundedCoordinates(coordinates) for coordinates in allCoordinates]
+			return masterCoordinates.pathRanges(), masterCoordinates.smooth, allCoordinates[0], allCoordinates[1:]
+
+		firstLayer = self.glyphInterpolation(thisGlyph.name, firstInstance)
+		if not firstLayer:
+			return None
+		firstNodes = LayerNodes(firstLayer)
+		structure, smooth, firstCoordinates = firstNodes.structure(), firstNodes.smooth, firstNodes.coordinates()
+		kinkCoordinates = []
+		for thisInstance in self.instances:
+			instanceName = thisInstance.name.replace(tempMarker, "")
+			kinkLayer = self.glyphInterpolation(thisGlyph.name, thisInstance)
+			if not kinkLayer:
+				if self.pref("reportIncompatibilities"):
+					print("⚠️ ERROR: Could not calculate interpolation for: %s (%s)" % (thisGlyph.name, instanceName))
+				kinkCoordinates.append(None)
+				continue
+			kinkNodes = LayerNodes(kinkLayer)
+			if kinkNodes.structure() != structure:
+				if self.pref("reportIncompatibilities"):
+					print("⚠️ interpolation incompatible for glyph %s: %s (most likely cause: cap or corner components, bracket layers)" % (thisGlyph.name, instanceName))
+					print(firstLayer, firstLayer.shapes, firstLayer.anchors)
+					print(kinkLayer, kinkLayer.shapes, kinkLayer.anchors)
+				kinkCoordinates.append(None)
+				continue
+			kinkCoordinates.append(kinkNodes.coordinates())
+		return pathRangesOfStructure(structure), smooth, firstCoordinates, kinkCoordinates
+
+	def sweepKinksOfGlyph(self, masterCoordinates, weightRows, roundToGrid):
+		"""
+		Yields (path index, node index, coordinate index, largest kink, index of its weight row) for every smooth node.
+		Per node, only the node and its two neighbours are interpolated for all weight rows at once,
+		as weighted sums of their master coordinates, instead of interpolating whole outlines.
+		"""
+		sparseRows = [[(masterIndex, weight) for masterIndex, weight in enumerate(weights) if weight] for weights in weightRows]
+		for pathIndex, (closed, nodeTypes, firstIndex) in enumerate(masterCoordinates.pathRanges()):
+			nodeCount = len(nodeTypes)
+			lastIndex = nodeCount - 1
+			for nodeIndex in range(nodeCount):
+				if nodeTypes[nodeIndex] == GSOFFCURVE:
+					continue
+				if not masterCoordinates.smooth[firstIndex + nodeIndex]:
+					continue
+				if not closed and nodeIndex in (0, lastIndex):
+					continue
+
+				index = firstIndex + nodeIndex
+				prevIndex = firstIndex + (nodeIndex - 1) % nodeCount
+				nextIndex = firstIndex + (nodeIndex + 1) % nodeCount
+				masterPoints = [
+					(c[2 * index], c[2 * index + 1], c[2 * prevIndex], c[2 * prevIndex + 1], c[2 * nextIndex], c[2 * nextIndex + 1])
+					for c in masterCoordinates.masterCoordinates
+				]
+				largestKink, largestKinkRow = 0.0, 0
+				for rowIndex, row in enumerate(sparseRows):
+					x = y = ax = ay = bx = by = 0.0
+					for masterIndex, weight in row:
+						points = masterPoints[masterIndex]
+						x += weight * points[0]
+						y += weight * points[1]
+						ax += weight * points[2]
+						ay += weight * points[3]
+						bx += weight * points[4]
+						by += weight * points[5]
+					if roundToGrid:
+						x, y, ax, ay, bx, by = round(x), round(y), round(ax), round(ay), round(bx), round(by)
+					thisKink = kinkSizeOfPoints(x, y, ax, ay, bx, by)
+					if thisKink > largestKink:
+						largestKink, largestKinkRow = thisKink, rowIndex
+				yield pathIndex, nodeIndex, index, largestKink, largestKinkRow
+
+
 	def buildInstance(self, name, interpolationDict, font):
 		instance = GSInstance()
 		if Glyphs.buildNumber > 3198:
@@ -347,7 +475,24 @@ class KinkFinder(mekkaObject):
 
 			# prepare instances:
 			findKinksInMastersInstead = self.pref("findKinksWhere") == 4
-			if not findKinksInMastersInstead:
+			findKinksInSweep = self.pref("findKinksWhere") == 5
+			if findKinksInSweep:
+				try:
+					designspace = DesignspaceModel(thisFont)
+				except ValueError as e:
+					print("⚠️ Cannot sweep the designspace, %s. Checking interpolations between masters instead.\n" % e)
+					findKinksInSweep = False
+			if findKinksInSweep:
+				firstInstance = None
+				if self.pref("sweepSampling") == 0:
+					sweepLocations = designspace.gridLocations(max(2, self.prefInt("sweepSamples")))
+				else:
+					sweepLocations = designspace.latinHypercubeLocations(max(1, self.prefInt("sweepSamples")))
+				sweepWeights = [designspace.masterWeights(location) for location in sweepLocations]
+				sweepDeadline = time.time() + self.prefFloat("sweepTimeBudget")
+				notSweptGlyphNames = []
+				print(f"Sweeping {len(sweepLocations)} location{'s' if len(sweepLocations) != 1 else ''} in the designspace.\n")
+			elif not findKinksInMastersInstead:
 				self.buildHalfWayInstances(thisFont)
 
 				# instance for first layer:
@@ -410,70 +555,92 @@ class KinkFinder(mekkaObject):
 								if self.pref("markKinks"):
 									kinkNode.name = "%.1f %s" % (thisKink, nodeMarker)
 
+				# OPTION C: find kinks in a DESIGNSPACE SWEEP
+				elif findKinksInSweep:
+					if not thisGlyph.layers[0].paths:
+						skippedGlyphNames.append(thisGlyph.name)
+						continue
+					if time.time() > sweepDeadline:
+						notSweptGlyphNames.append(thisGlyph.name)
+						continue
+
+					masterCoordinates = MasterCoordinates(thisGlyph, designspace.masterIDs)
+					if not masterCoordinates.compatible:
+						if self.pref("reportIncompatibilities"):
+							print("⚠️ Cannot sweep %s: incompatible masters, or brace or bracket layers." % thisGlyph.name)
+						continue
+
+					firstCoordinates = masterCoordinates.masterCoordinates[0]
+					for pathIndex, nodeIndex, index, thisKink, locationIndex in self.sweepKinksOfGlyph(masterCoordinates, sweepWeights, thisFont.gridLength == 1.0):
+						if thisKink <= maxKink:
+							continue
+						nodeX, nodeY = firstCoordinates[2 * index], firstCoordinates[2 * index + 1]
+						kinkyGlyphNames.append(thisGlyph.name)
+						print(
+							"%s Kink in %s at %s, path %i, node %i: %.1f units (%.1f, %.1f)" % (
+								nodeMarker, thisGlyph.name, designspace.describeLocation(sweepLocations[locationIndex]),
+								pathIndex, nodeIndex, thisKink, nodeX, nodeY
+							)
+						)
+						if self.pref("markKinks"):
+							nodeName = "%.1f %s" % (thisKink, nodeMarker)
+							self.markNodeAtPosition(thisGlyph.layers[0], NSPoint(nodeX, nodeY), nodeName)
+
 				# OPTION B: find kinks in INTERPOLATIONS
 				else:
 					if not thisGlyph.layers[0].paths:
 						skippedGlyphNames.append(thisGlyph.name)
 						continue
 
-					firstLayer = self.glyphInterpolation(thisGlyph.name, firstInstance)
-					if not firstLayer:
+					outlines = self.interpolatedOutlines(thisGlyph, thisFont, firstInstance)
+					if not outlines:
 						print("⚠️ Could not determine primary layer of %s, most likely cause: no paths." % thisGlyph.name)
 						continue
 
-					kinkLayers = [self.glyphInterpolation(thisGlyph.name, i) for i in self.instances]
+					pathRanges, smooth, firstCoordinates, kinkCoordinates = outlines
 					instanceNames = [i.name.replace(tempMarker, "") for i in self.instances]
-					for pathIndex in range(len(firstLayer.paths)):
-						thisPath = firstLayer.paths[pathIndex]
-						nodeCount = len(thisPath.nodes)
+					for pathIndex, (closed, nodeTypes, firstIndex) in enumerate(pathRanges):
+						nodeCount = len(nodeTypes)
 						lastIndex = nodeCount - 1
 						for nodeIndex in range(nodeCount):
-							thisNode = thisPath.nodes[nodeIndex]
-
-							if thisNode.type == GSOFFCURVE:
+							if nodeTypes[nodeIndex] == GSOFFCURVE:
 								continue
-							if thisNode.connection != GSSMOOTH:
+							if not smooth[firstIndex + nodeIndex]:
 								continue
-							if not thisPath.closed and nodeIndex in (0, lastIndex):
+							if not closed and nodeIndex in (0, lastIndex):
 								continue
 
+							index = firstIndex + nodeIndex
+							prevIndex = firstIndex + (nodeIndex - 1) % nodeCount
+							nextIndex = firstIndex + (nodeIndex + 1) % nodeCount
+							nodeX, nodeY = firstCoordinates[2 * index], firstCoordinates[2 * index + 1]
 							thisNodeMaxKink = 0
-							for kinkLayer, instanceName in zip(kinkLayers, instanceNames):
-								if not kinkLayer:
-									if self.pref("reportIncompatibilities"):
-										print("⚠️ ERROR: Could not calculate interpolation for: %s (%s)" % (thisGlyph.name, instanceName))
-									continue
-								elif not thisGlyph.mastersCompatibleForLayers_((firstLayer, kinkLayer)):
-									if self.pref("reportIncompatibilities"):
-										print("⚠️ interpolation incompatible for glyph %s: %s (most likely cause: cap or corner components, bracket layers)" % (thisGlyph.name, instanceName))
-										print(firstLayer, firstLayer.shapes, firstLayer.anchors)
-										print(kinkLayer, kinkLayer.shapes, kinkLayer.anchors)
+							for coordinates, instanceName in zip(kinkCoordinates, instanceNames):
+								if coordinates is None:
 									continue
 
-								kinkNode = kinkLayer.paths[pathIndex].nodes[nodeIndex]
-								thisKink = self.kinkSizeForNode(kinkNode)
+								thisKink = kinkSize(coordinates, index, prevIndex, nextIndex)
 								if thisKink > maxKink:
 									kinkyGlyphNames.append(thisGlyph.name)
 									print(
 										"%s Kink in %s between masters %s, path %i, node %i: %.1f units (%.1f, %.1f)" % (
 											nodeMarker, thisGlyph.name, " and ".join(instanceName.split("-")[:2]),
-											pathIndex, nodeIndex, thisKink, thisNode.x, thisNode.y
+											pathIndex, nodeIndex, thisKink, nodeX, nodeY
 										)
 									)
 									if self.pref("markKinks"):
 										if thisKink > thisNodeMaxKink:
 											thisNodeMaxKink = thisKink
 										nodeName = "%.1f %s" % (thisNodeMaxKink, nodeMarker)
-										self.markNodeAtPosition(thisGlyph.layers[0], thisNode.position, nodeName)
-
-								elif self.pref("markKinks"):
-									thisNode.name = None
+										self.markNodeAtPosition(thisGlyph.layers[0], NSPoint(nodeX, nodeY), nodeName)
 
 			# Progress bar 100%
 			self.w.progress.set(100.0)
 
 			if skippedGlyphNames:
 				print("\nSkipped %i glyphs:\n%s" % (len(skippedGlyphNames), ", ".join(skippedGlyphNames)))
+			if findKinksInSweep and notSweptGlyphNames:
+				print("\n⏱️ Time limit reached, did not sweep %i glyphs:\n%s" % (len(notSweptGlyphNames), ", ".join(notSweptGlyphNames)))
 			uniqueKinkyGlyphNames = set(kinkyGlyphNames)
 
 			if kinkyLayers:
@@ -482,6 +649,18 @@ class KinkFinder(mekkaObject):
 			elif uniqueKinkyGlyphNames:
 				tabText = "/" + "/".join(uniqueKinkyGlyphNames)
 				thisFont.newTab(tabText)
+			elif findKinksInSweep and notSweptGlyphNames:
+				Message(
+					title="Sweep Incomplete ⏱️",
+					message="No kinks larger than %.1f units found so far in the %s sweep of %s, but the time limit was reached before %i glyph%s could be swept. See the Macro Window for details." % (
+						maxKink,
+						"grid" if self.pref("sweepSampling") == 0 else "Latin hypercube",
+						thisFont.familyName,
+						len(notSweptGlyphNames),
+						"" if len(notSweptGlyphNames) == 1 else "s",
+					),
+					OKButton=None,
+				)
 			else:
 				Message(
 					title="No Kinks Found 🎉",
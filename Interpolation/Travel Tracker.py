@@ -6,9 +6,9 @@ Finds interpolations in which points travel more than they should, i.e., can fin
 """
 
 import vanilla
-from GlyphsApp import Glyphs, GSOFFCURVE, Message, distance
+from GlyphsApp import Glyphs, Message
 from mekkablue import mekkaObject
-from mekkablue.geometry import angle
+from nodetravel import GlyphTravel, RotationSettings, relevantLayersOfGlyph
 
 
 def setCurrentTabToShowAllInstances(font):
@@ -151,141 +151,13 @@ class TravelTracker(mekkaObject):
 		)))
 		self.w.thresholdAngle.enable(self.w.segmentRotation.get())
 
-	def maxSegmentRotationForLayers(self, layer, otherLayer):
-		maxSegmentRotation = 0.0
-		maxDeorthogonalization = 0.0
-
-		thresholdAngle = self.prefFloat("thresholdAngle")
-		checkForSegmentRotation = self.prefBool("segmentRotation")
-		checkForOrthogonalToNonOrthogonal = self.prefBool("orthogonalToNonOrthogonal")
-		checkForShortSegments = self.prefBool("ignoreShortSegments")
-		thresholdLength = self.prefFloat("ignoreShortSegmentsThreshold")
-
-		layer.selection = None
-		otherLayer.selection = None
-		for pi, p1 in enumerate(layer.paths):
-			p2 = otherLayer.paths[pi]
-			for ni, n1 in enumerate(p1.nodes):
-				if n1.type == GSOFFCURVE and n1.nextNode.type == GSOFFCURVE or (checkForShortSegments and thresholdLength >= distance(n1.position, n1.nextNode.position)):
-					continue
-					# skip, we are not interested in BCP to BCP rotation
-				n2 = p2.nodes[ni]
-				angle1 = angle(n1, n1.nextNode) % 360
-				angle2 = angle(n2, n2.nextNode) % 360
-				rotation = abs(angle1 - angle2)
-				if rotation > 180:
-					rotation = 180 - rotation
-
-				# update max rotation:
-				if maxSegmentRotation < rotation < 360 - maxSegmentRotation:
-					maxSegmentRotation = rotation
-
-				# orthogonal check:
-				losingOrthogonalAngle = False
-				if checkForOrthogonalToNonOrthogonal:
-					losingOrthogonalAngle = losingOrthogonalAngle or ((angle1 % 90 == 0 and angle2 % 90 != 0) or (angle1 % 90 != 0 and angle2 % 90 == 0))
-					if losingOrthogonalAngle:
-						maxDeorthogonalization = max(maxDeorthogonalization, rotation)
-
-				# select affected nodes if beyond threshold:
-				if (checkForSegmentRotation and rotation > thresholdAngle) or losingOrthogonalAngle:
-					for node in (n1, n1.nextNode):
-						if node not in layer.selection:
-							layer.selection.append(node)
-					for node in (n2, n2.nextNode):
-						if node not in otherLayer.selection:
-							otherLayer.selection.append(node)
-
-		return maxSegmentRotation, maxDeorthogonalization
-
-	def maxNodeTravelRatioForLayers(self, layer, otherLayer, pathNormalization=True, layerNormalization=True):
-		maxTravelRatio = 0.0
-		maxPossibleTravel = 2**0.5
-
-		normalizeShape = self.pref("normalizeShape")
-		normalizeGlyph = self.pref("normalizeGlyph")
-
-		# glyph bounds
-		l1offset = layer.bounds.origin
-		l2offset = otherLayer.bounds.origin
-		l1Width, l1Height = layer.bounds.size
-		l2Width, l2Height = otherLayer.bounds.size
-		layerHasExtension = all((l1Width, l1Height, l2Width, l2Height))
-
-		if not layerHasExtension:
-			return 0.0
-
-		for pi, p1 in enumerate(layer.paths):
-			p2 = otherLayer.paths[pi]
-			p1offset = p1.bounds.origin
-			p2offset = p2.bounds.origin
-			p1Width, p1Height = p1.bounds.size
-			p2Width, p2Height = p2.bounds.size
-			pathHasExtension = all((p1Width, p1Height, p2Width, p2Height))
-
-			for ni, n1 in enumerate(p1.nodes):
-				n2 = p2.nodes[ni]
-
-				# SHAPE NORMALIZATION
-				if pathHasExtension and normalizeShape:  # avoid zero width or zero height
-					n1NormalizedX, n1NormalizedY = (n1.x - p1offset.x) / p1Width, (n1.y - p1offset.y) / p1Height
-					n2NormalizedX, n2NormalizedY = (n2.x - p2offset.x) / p2Width, (n2.y - p2offset.y) / p2Height
-					nodeDistance = distance(
-						(n1NormalizedX, n1NormalizedY),
-						(n2NormalizedX, n2NormalizedY),
-					)
-					maxTravelRatio = max(nodeDistance / maxPossibleTravel, maxTravelRatio)
-
-				# LAYER NORMALIZATION
-				if normalizeGlyph:
-					n1NormalizedX, n1NormalizedY = (n1.x - l1offset.x) / l1Width, (n1.y - l1offset.y) / l1Height
-					n2NormalizedX, n2NormalizedY = (n2.x - l2offset.x) / l2Width, (n2.y - l2offset.y) / l2Height
-					nodeDistance = distance(
-						(n1NormalizedX, n1NormalizedY),
-						(n2NormalizedX, n2NormalizedY),
-					)
-					maxTravelRatio = max(nodeDistance / maxPossibleTravel, maxTravelRatio)
-		return maxTravelRatio
-
-	def relevantLayersOfGlyph(self, glyph):
-		relevantLayers = [layer for layer in glyph.layers if (layer.layerId == layer.associatedMasterId or layer.isSpecialLayer) and layer.paths]
-		return relevantLayers
-
 	def hasInterpolatingPaths(self, glyph):
-		relevantLayers = self.relevantLayersOfGlyph(glyph)
+		relevantLayers = relevantLayersOfGlyph(glyph)
 		if len(relevantLayers) < 2:
 			return False
 		else:
 			return True
 
-	def maxSegmentRotationForGlyph(self, relevantGlyph):
-		maxSegmentRotation = 0.0
-		deorthogonalization = 0.0
-		relevantLayers = self.relevantLayersOfGlyph(relevantGlyph)
-		numOfLayers = len(relevantLayers)
-		for i in range(numOfLayers - 1):
-			firstLayer = relevantLayers[i]
-			for j in range(i + 1, numOfLayers):
-				secondLayer = relevantLayers[j]
-				if relevantGlyph.mastersCompatibleForLayers_((firstLayer, secondLayer)):
-					thisSegmentRotation, thisDeorthogonalization = self.maxSegmentRotationForLayers(firstLayer, secondLayer)
-					maxSegmentRotation = max(maxSegmentRotation, thisSegmentRotation)
-					deorthogonalization = max(deorthogonalization, thisDeorthogonalization)
-		return maxSegmentRotation, deorthogonalization
-
-	def maxNodeTravelRatioForGlyph(self, relevantGlyph):
-		maxTravelRatio = 0.0
-		relevantLayers = self.relevantLayersOfGlyph(relevantGlyph)
-		numOfLayers = len(relevantLayers)
-		for i in range(numOfLayers - 1):
-			firstLayer = relevantLayers[i]
-			for j in range(i + 1, numOfLayers):
-				secondLayer = relevantLayers[j]
-				if relevantGlyph.mastersCompatibleForLayers_((firstLayer, secondLayer)):
-					thisTravelRatio = self.maxNodeTravelRatioForLayers(firstLayer, secondLayer)
-					maxTravelRatio = max(maxTravelRatio, thisTravelRatio)
-		return maxTravelRatio
-
 	def TravelTrackerMain(self, sender):
 		try:
 			Glyphs.clearLog()
@@ -303,6 +175,15 @@ class TravelTracker(mekkaObject):
 			shouldCheckNodeTravel = self.prefBool("normalizeGlyph") or self.prefBool("normalizeShape")
 			shouldCheckRotation = self.prefBool("segmentRotation") and self.prefBool("thresholdAngle")
 			shouldCheckOrthogonals = self.prefBool("orthogonalToNonOrthogonal")
+			normalizeShape = self.prefBool("normalizeShape")
+			normalizeGlyph = self.prefBool("normalizeGlyph")
+			rotationSettings = RotationSettings(
+				checkRotation=self.prefBool("segmentRotation"),
+				thresholdAngle=self.prefFloat("thresholdAngle"),
+				checkOrthogonals=shouldCheckOrthogonals,
+				ignoreShortSegments=self.prefBool("ignoreShortSegments"),
+				thresholdLength=self.prefFloat("ignoreShortSegmentsThreshold"),
+			)
 
 			if not Glyphs.font:
 				Message(title="No Font Error", message="This script requires at least one font open.", OKButton=None)
@@ -344,9 +225,12 @@ class TravelTracker(mekkaObject):
 					fontSector = 100 / len(theseFonts)
 					self.w.progress.set(int(j * fontSector + i / numOfGlyphs * fontSector))
 
+					# all relevant layers of the glyph, read once:
+					glyphTravel = GlyphTravel(relevantGlyph)
+
 					# NODE TRAVEL
 					if shouldCheckNodeTravel:
-						travelRatioInThisGlyph = self.maxNodeTravelRatioForGlyph(relevantGlyph)
+						travelRatioInThisGlyph = glyphTravel.maxNodeTravelRatio(normalizeShape, normalizeGlyph)
 						if travelRatioInThisGlyph > acceptableTravelRatio:
 							affectedGlyphInfosNodeTravel.append((relevantGlyph.name, travelRatioInThisGlyph), )
 							if verbose:
@@ -356,7 +240,8 @@ class TravelTracker(mekkaObject):
 
 					# ROTATION AND DEORTH
 					if shouldCheckRotation or shouldCheckOrthogonals:
-						maxRotationInThisGlyph, maxDeorthogonalization = self.maxSegmentRotationForGlyph(relevantGlyph)
+						maxRotationInThisGlyph, maxDeorthogonalization = glyphTravel.maxSegmentRotation(rotationSettings)
+						glyphTravel.selectAffectedNodes()
 						if maxRotationInThisGlyph > acceptableRotation:
 							affectedGlyphInfosRotation.append((relevantGlyph.name, maxRotationInThisGlyph))
 							if verbose:
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+from array import array
+from itertools import product
+from random import Random
+from Foundation import NSPoint
+from mekkablue.layernodes import LayerNodes
+
+
+def originMasterOfFont(font):
+	originMaster = font.masters[0]
+	originParameter = font.customParameters["Variable Font Origin"]
+	if originParameter and font.masters[originParameter]:
+		originMaster = font.masters[originParameter]
+	return originMaster
+
+
+def pathRangesOfStructure(structure):
+	"""(closed, node types, index of first node) for every path of a structure returned by LayerNodes.structure()."""
+	ranges = []
+	firstIndex = 0
+	for closed, nodeTypes in structure:
+		ranges.append((closed, nodeTypes, firstIndex))
+		firstIndex += len(nodeTypes)
+	return ranges
+
+
+def weightsOfInstance(instance, masterIDs):
+	"""Master weights of a GSInstance in the order of masterIDs, as calculated by Glyphs."""
+	interpolations = instance.instanceInterpolations
+	return [float(interpolations.get(masterID, 0.0)) for masterID in masterIDs]
+
+
+def layerWithCoordinates(layer, coordinates):
+	"""Copy of layer with its path nodes moved to coordinates, e.g. an interpolation from MasterCoordinates."""
+	newLayer = layer.copy()
+	index = 0
+	for path in newLayer.paths:
+		for node in path.nodes:
+			node.position = NSPoint(coordinates[index], coordinates[index + 1])
+			index += 2
+	return newLayer
+
+
+def roundedCoordinates(coordinates):
+	"""Like layer.roundCoordinates() for a grid of 1 unit."""
+	return array("d", [float(round(value)) for value in coordinates])
+
+
+class DesignspaceModel:
+	"""
+	Master weights for any location in the designspace of a font, like GSInstance.instanceInterpolations.
+	Locations are tuples of internal axis values in the order of font.axes.
+	Uses the variation model of fontTools, with the origin master as default.
+	"""
+
+	def __init__(self, font):
+		from fontTools.varLib.models import VariationModel
+
+		self.font = font
+		self.masterIDs = [master.id for master in font.masters]
+		self.axisCount = len(font.axes)
+		self.masterLocations = [tuple(master.axes)[:self.axisCount] for master in font.masters]
+		collisions = self.collidingMasterNames()
+		if collisions:
+			# VariationModel cannot tell masters at the same location apart:
+			raise ValueError("masters at the same designspace location: %s" % "; ".join(" and ".join(names) for names in collisions))
+		origin = originMasterOfFont(font).axes
+		self.axisTriples = []
+		for axisIndex in range(self.axisCount):
+			values = [location[axisIndex] for location in self.masterLocations]
+			self.axisTriples.append((min(values), origin[axisIndex], max(values)))
+		self.variationModel = VariationModel(
+			[self.normalizedLocation(location) for location in self.masterLocations],
+			axisOrder=list(range(self.axisCount)),
+		)
+
+	def collidingMasterNames(self):
+		"""[[master name, ...], ...] for every location shared by more than one master."""
+		mastersAtLocation = {}
+		for master, location in zip(self.font.masters, self.masterLocations):
+			mastersAtLocation.setdefault(location, []).append(master.name)
+		return [names for names in mastersAtLocation.values() if len(names) > 1]
+
+	def normalizedLocation(self, location):
+		from fontTools.varLib.models import normalizeValue
+		return {axisIndex: normalizeValue(value, triple) for axisIndex, (value, triple) in enumerate(zip(location, self.axisTriples))}
+
+	def masterWeights(self, location):
+		"""Weights of the masters at location, in master order."""
+		return self.variationModel.getMasterScalars(self.normalizedLocation(location))
+
+	def gridLocations(self, steps=3):
+		"""Every combination of steps evenly spaced values between the extremes of each axis."""
+		axisValues = []
+		for axisMin, axisDefault, axisMax in self.axisTriples:
+			if steps < 2 or axisMin == axisMax:
+				axisValues.append((axisDefault, ))
+			else:
+				axisValues.append(tuple(axisMin + (axisMax - axisMin) * step / (steps - 1) for step in range(steps)))
+		return list(product(*axisValues))
+
+	def latinHypercubeLocations(self, count=50, seed=0):
+		"""
+		count locations, each axis range split into count strata with one location in every stratum,
+		combined randomly across axes. The same seed gives the same locations.
+		"""
+		random = Random(seed)
+		axisValues = []
+		for axisMin, axisDefault, axisMax in self.axisTriples:
+			strata = list(range(count))
+			random.shuffle(strata)
+			axisValues.append([axisMin + (axisMax - axisMin) * (stratum + random.random()) / count for stratum in strata])
+		return list(zip(*axisValues))
+
+	def describeLocation(self, location):
+		"""e.g. 'wght=400, wdth=75'"""
+		return ", ".join("%s=%g" % (axis.axisTag, round(value, 1)) for axis, value in zip(self.font.axes, location))
+
+
+class MasterCoordinates:
+	"""
+	Node coordinates of all master layers of a glyph, extracted once into one array('d') per master.
+	interpolate() and interpolateMany() compute the outline at any set of master weights in pure Python,
+	as sum(weight * master coordinates), without an interpolated font proxy.
+	compatible is False if the masters differ in path structure, or if the glyph has brace or bracket layers,
+	which the master weights cannot express. Components are not included.
+	"""
+
+	def __init__(self, glyph, masterIDs):
+		self.glyphName = glyph.name
+		self.masterIDs = list(masterIDs)
+		self.hasComponents = False
+		self.structure = None
+		self.smooth = None
+		self.masterCoordinates = []
+		self.compatible = not any(layer.isSpecialLayer for layer in glyph.layers)
+		if not self.compatible:
+			return
+		for masterID in self.masterIDs:
+			layer = glyph.layers[masterID]
+			layerNodes = LayerNodes(layer)
+			structure = layerNodes.structure()
+			self.hasComponents = self.hasComponents or bool(layer.components)
+			if self.structure is None:
+				self.structure, self.smooth = structure, layerNodes.smooth
+			elif structure != self.structure:
+				self.compatible = False
+				return
+			self.masterCoordinates.append(layerNodes.coordinates())
+
+	def pathRanges(self):
+		return pathRangesOfStructure(self.structure)
+
+	def interpolate(self, weights):
+		"""Coordinates for the master weights (in master order), as an array('d') x0, y0, x1, y1, ..."""
+		result = None
+		for weight, coordinates in zip(weights, self.masterCoordinates):
+			if not weight:
+				continue
+			if result is None:
+				result = [weight * value for value in coordinates]
+			else:
+				result = [total + weight * value for total, value in zip(result, coordinates)]
+		if result is None:
+			result = [0.0] * len(self.masterCoordinates[0])
+		return array("d", result)
+
+	def interpolateMany(self, weightRows):
+		"""interpolate() for every row of master weights, e.g. for a grid of locations."""
+		return [self.interpolate(weights) for weights in weightRows]
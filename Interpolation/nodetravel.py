@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+from collections import namedtuple
+from math import atan2, degrees, hypot
+from GlyphsApp import GSOFFCURVE
+from mekkablue.layernodes import LayerNodes
+from deltamodel import pathRangesOfStructure
+
+RotationSettings = namedtuple("RotationSettings", ("checkRotation", "thresholdAngle", "checkOrthogonals", "ignoreShortSegments", "thresholdLength"))
+maxPossibleTravel = 2**0.5
+
+
+def relevantLayersOfGlyph(glyph):
+	"""Master and special layers with paths."""
+	return [layer for layer in glyph.layers if (layer.layerId == layer.associatedMasterId or layer.isSpecialLayer) and layer.paths]
+
+
+def normalizedCoordinates(coordinates, firstIndex, nodeCount, bounds):
+	"""x, y of nodes firstIndex to firstIndex + nodeCount, relative to bounds (x, y, width, height)."""
+	x, y, width, height = bounds
+	values = coordinates[2 * firstIndex:2 * (firstIndex + nodeCount)]
+	return [(value - x) / width for value in values[0::2]], [(value - y) / height for value in values[1::2]]
+
+
+class LayerOutline:
+	"""
+	The path nodes of one layer, read once: coordinates, structure, the bounds of the layer and of every path.
+	Per-node values that every comparison with another layer needs (segment angles, normalized positions)
+	are computed once per layer, not once per layer pair.
+	"""
+
+	def __init__(self, layer):
+		self.layer = layer
+		layerNodes = LayerNodes(layer)
+		self.structure, self.smooth, self.coordinates = layerNodes.structure(), layerNodes.smooth, layerNodes.coordinates()
+		self.pathRanges = pathRangesOfStructure(self.structure)
+		self.nodeCount = len(self.coordinates) // 2
+		bounds = layer.bounds
+		self.layerBounds = (bounds.origin.x, bounds.origin.y, bounds.size.width, bounds.size.height)
+		self.pathBounds = []
+		for path in layer.paths:
+			bounds = path.bounds
+			self.pathBounds.append((bounds.origin.x, bounds.origin.y, bounds.size.width, bounds.size.height))
+		self._segments = None
+		self._normalized = {}
+
+	def hasExtension(self):
+		return bool(self.layerBounds[2] and self.layerBounds[3])
+
+	def segments(self):
+		"""(angles, lengths, BCP-to-BCP flags) of the line from every node to its next node, in node order."""
+		if self._segments is None:
+			coordinates = self.coordinates
+			angles, lengths, betweenHandles = [], [], []
+			for closed, nodeTypes, firstIndex in self.pathRanges:
+				nodeCount = len(nodeTypes)
+				for nodeIndex in range(nodeCount):
+					nextIndex = (nodeIndex + 1) % nodeCount
+					i, j = 2 * (firstIndex + nodeIndex), 2 * (firstIndex + nextIndex)
+					dx, dy = coordinates[j] - coordinates[i], coordinates[j + 1] - coordinates[i + 1]
+					angles.append(degrees(atan2(dy, dx)) % 360)
+					lengths.append(hypot(dx, dy))
+					betweenHandles.append(nodeTypes[nodeIndex] == GSOFFCURVE and nodeTypes[nextIndex] == GSOFFCURVE)
+			self._segments = (angles, lengths, betweenHandles)
+		return self._segments
+
+	def normalized(self, perShape):
+		"""
+		(xs, ys) of all nodes relative to the bounds of their path (perShape=True) or of the layer.
+		Paths without width or height get None instead of coordinates.
+		"""
+		if perShape not in self._normalized:
+			if perShape:
+				normalized = []
+				for (closed, nodeTypes, firstIndex), bounds in zip(self.pathRanges, self.pathBounds):
+					if bounds[2] and bounds[3]:
+						normalized.append(normalizedCoordinates(self.coordinates, firstIndex, len(nodeTypes), bounds))
+					else:
+						normalized.append(None)
+			else:
+				normalized = normalizedCoordinates(self.coordinates, 0, self.nodeCount, self.layerBounds)
+			self._normalized[perShape] = normalized
+		return self._normalized[perShape]
+
+
+def maxDistance(xs1, ys1, xs2, ys2):
+	return max([hypot(x1 - x2, y1 - y2) for x1, y1, x2, y2 in zip(xs1, ys1, xs2, ys2)] or [0.0])
+
+
+class GlyphTravel:
+	"""
+	All relevant layers of a glyph (see relevantLayersOfGlyph), read once, compared in every pair with the same path structure.
+	maxNodeTravelRatio() and maxSegmentRotation() work on the extracted arrays only,
+	selectAffectedNodes() then selects the nodes of rotating segments in one update per layer.
+	"""
+
+	def __init__(self, glyph):
+		self.outlines = [LayerOutline(layer) for layer in relevantLayersOfGlyph(glyph)]
+		self.pairs = [
+			(outline1, outline2)
+			for i, outline1 in enumerate(self.outlines)
+			for outline2 in self.outlines[i + 1:]
+			if outline1.structure == outline2.structure
+		]
+		self.affectedNodes = {}  # LayerOutline -> set of node indexes
+
+	def maxNodeTravelRatio(self, normalizeShape=True, normalizeGlyph=True):
+		"""Largest distance a node travels between two layers, relative to the diagonal of its path and/or the glyph bounds."""
+		maxTravel = 0.0
+		for outline1, outline2 in self.pairs:
+			if not (outline1.hasExtension() and outline2.hasExtension()):
+				continue
+			if normalizeShape:
+				for shape1, shape2 in zip(outline1.normalized(True), outline2.normalized(True)):
+					if shape1 and shape2:
+						maxTravel = max(maxTravel, maxDistance(shape1[0], shape1[1], shape2[0], shape2[1]))
+			if normalizeGlyph:
+				glyph1, glyph2 = outline1.normalized(False), outline2.normalized(False)
+				maxTravel = max(maxTravel, maxDistance(glyph1[0], glyph1[1], glyph2[0], glyph2[1]))
+		return maxTravel / maxPossibleTravel
+
+	def maxSegmentRotation(self, settings):
+		"""
+		Returns (max rotation, max rotation of segments going from orthogonal to non-orthogonal or back)
+		of the lines between consecutive nodes, in degrees, and collects the nodes of segments
+		rotating beyond settings.thresholdAngle for selectAffectedNodes().
+		"""
+		maxRotation = 0.0
+		maxDeorthogonalization = 0.0
+		for outline1, outline2 in self.pairs:
+			angles1, lengths1, betweenHandles1 = outline1.segments()
+			angles2 = outline2.segments()[0]
+			affected1 = self.affectedNodes.setdefault(outline1, set())
+			affected2 = self.affectedNodes.setdefault(outline2, set())
+			for index, (angle1, angle2, length1, betweenHandles) in enumerate(zip(angles1, angles2, lengths1, betweenHandles1)):
+				# skip, we are not interested in BCP to BCP rotation:
+				if betweenHandles or (settings.ignoreShortSegments and settings.thresholdLength >= length1):
+					continue
+				rotation = abs(angle1 - angle2)
+				if rotation > 180:
+					rotation = 360 - rotation
+				maxRotation = max(maxRotation, rotation)
+
+				losingOrthogonalAngle = settings.checkOrthogonals and ((angle1 % 90 == 0) != (angle2 % 90 == 0))
+				if losingOrthogonalAngle:
+					maxDeorthogonalization = max(maxDeorthogonalization, rotation)
+
+				if (settings.checkRotation and rotation > settings.thresholdAngle) or losingOrthogonalAngle:
+					affected1.add(index)
+					affected2.add(index)
+		return maxRotation, maxDeorthogonalization
+
+	def selectAffectedNodes(self):
+		"""Selects the nodes of all affected segments (both ends) found by maxSegmentRotation(), replacing the previous selection."""
+		for outline, indexes in self.affectedNodes.items():
+			nodes = []
+			if indexes:
+				for (closed, nodeTypes, firstIndex), path in zip(outline.pathRanges, outline.layer.paths):
+					nodeCount = len(nodeTypes)
+					pathIndexes = set()
+					for nodeIndex in range(nodeCount):
+						if firstIndex + nodeIndex in indexes:
+							pathIndexes.add(nodeIndex)
+							pathIndexes.add((nodeIndex + 1) % nodeCount)
+					if pathIndexes:
+						pathNodes = path.nodes
+						nodes.extend(pathNodes[nodeIndex] for nodeIndex in sorted(pathIndexes))
+			outline.layer.selection = nodes or None
@@ -8,7 +8,7 @@ Specify a minimum distance, left and right glyphs, and Auto Bumper will add the
 import vanilla
 from mekkablue import mekkaObject, reportTimeInNaturalLanguage
 from timeit import default_timer as timer
-from kernanalysis import intervalList, minDistanceBetweenTwoLayers, sortedIntervalsFromString, stringToListOfGlyphsForFont, effectiveKerning, distanceFromEntry, bubbleLayer
+from kernanalysis import intervalList, sortedIntervalsFromString, stringToListOfGlyphsForFont, effectiveKerning, distanceFromEntry, bubbleLayer, SidebearingProfileCache, maskedProfile, minDistanceMatrix
 from AppKit import NSColor
 from GlyphsApp import Glyphs, Message
 
@@ -405,10 +405,21 @@ class Bumper(mekkaObject):
 
 				# CREATE KERNING DATA:
 
-				# precompute bubble layers if requested (avoids recomputing per pair):
-				if useBubble:
-					leftBubbleLayers = {g.name: bubbleLayer(g.layers[thisMasterID], offset=bubbleOffsetValue) for g in firstGlyphList}
-					rightBubbleLayers = {g.name: bubbleLayer(g.layers[thisMasterID], offset=bubbleOffsetValue) for g in secondGlyphList}
+				# measure every glyph (or its bubble) only once, and apply ignore intervals once per glyph:
+				profileCache = SidebearingProfileCache(thisFont, thisMasterID, interval=step, persistent=True)
+
+				def profileForGlyph(glyph):
+					measuredLayer = glyph.layers[thisMasterID]
+					if useBubble:
+						measuredLayer = bubbleLayer(measuredLayer, offset=bubbleOffsetValue)
+					return maskedProfile(profileCache.profileForLayer(measuredLayer), ignoreIntervals)
+
+				profiles = {}
+				for glyph in firstGlyphList + secondGlyphList:
+					if glyph.name not in profiles:
+						profiles[glyph.name] = profileForGlyph(glyph)
+				rightProfiles = [profiles[g.name] for g in secondGlyphList]
+				profileCache.save()
 
 				tabString = ""
 				kernCount = 0
@@ -418,7 +429,7 @@ class Bumper(mekkaObject):
 					self.w.bar.set(int(100 * (float(index) / numOfGlyphs)))
 					# determine left glyph:
 					leftGlyph = firstGlyphList[index]
-					leftLayer = leftGlyph.layers[thisMasterID]
+					unkernedDistances = minDistanceMatrix((profiles[leftGlyph.name], ), rightProfiles)[0]
 					leftGroup = leftGlyph.rightKerningGroup
 					if leftIsGroups:
 						if leftGroup:
@@ -432,8 +443,7 @@ class Bumper(mekkaObject):
 					# only continue if we could establish a left side:
 					if leftSide:
 						# cycle through right glyphs:
-						for rightGlyph in secondGlyphList:
-							rightLayer = rightGlyph.layers[thisMasterID]
+						for rightGlyph, unkernedDistance in zip(secondGlyphList, unkernedDistances):
 							rightGroup = rightGlyph.leftKerningGroup
 							if rightIsGroups:
 								if rightGroup:
@@ -455,11 +465,7 @@ class Bumper(mekkaObject):
 										thisFont.removeKerningForPair(thisMasterID, leftGlyph.name, rightGlyph.name)
 
 								kerning = effectiveKerning(leftGlyph.name, rightGlyph.name, thisFont, thisMasterID)
-								measureLeft = leftBubbleLayers[leftGlyph.name] if useBubble else leftLayer
-								measureRight = rightBubbleLayers[rightGlyph.name] if useBubble else rightLayer
-								distanceBetweenShapes = minDistanceBetweenTwoLayers(
-									measureLeft, measureRight, interval=step, kerning=kerning, report=False, ignoreIntervals=ignoreIntervals
-								)
+								distanceBetweenShapes = None if unkernedDistance is None else unkernedDistance + kerning
 
 								# positive kerning (if desired):
 								if minDistance and (distanceBetweenShapes is not None) and (distanceBetweenShapes < minDistance):
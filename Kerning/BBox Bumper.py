@@ -8,7 +8,7 @@ Like Auto Bumper, but with the bounding box of a group of glyphs, and the kernin
 import vanilla
 import math
 from Foundation import NSRect, NSUnionRect, NSIsEmptyRect, NSInsetRect, NSStringFromRect, NSAffineTransform, NSAffineTransformStruct
-from kernanalysis import stringToListOfGlyphsForFont, minDistanceBetweenTwoLayers
+from kernanalysis import stringToListOfGlyphsForFont, sidebearingProfileForLayer, minDistanceBetweenProfiles
 from GlyphsApp import Glyphs, GSFeature, GSLayer, GSPath, Message
 from mekkablue import mekkaObject, UpdateButton
 
@@ -449,20 +449,18 @@ class BBoxBumperKerning(mekkaObject):
 						bboxLayer.LSB = smallestLSB - bboxBubbleExtension
 						bboxLayer.RSB = smallestRSB - bboxBubbleExtension
 						bboxKey = "@%s" % otClassName
+						bboxProfile = sidebearingProfileForLayer(bboxLayer, interval=2, decompose=False)
 
 						print("  📐 Measuring distances with %i other glyphs..." % len(otherGlyphs))
 						for otherGlyph in otherGlyphs:
 							processedSteps += 1
 							self.w.bar.set(100 * processedSteps // totalSteps)
 							self.w.status.set("Measuring %s…" % otherGlyph.name)
-							otherLayerStraightened = straightenedLayer(otherGlyph.layers[thisMaster.id])
+							# one measurement serves both sides:
+							otherProfile = sidebearingProfileForLayer(straightenedLayer(otherGlyph.layers[thisMaster.id]), interval=2)
 							if otherGlyphsOnLeftSide:
 								otherKey = None
-								dist = minDistanceBetweenTwoLayers(
-									otherLayerStraightened,
-									bboxLayer,
-									interval=2,
-								)
+								dist = minDistanceBetweenProfiles(otherProfile, bboxProfile)
 								if otherGlyph.rightKerningGroup:
 									otherKey = "@MMK_L_%s" % otherGlyph.rightKerningGroup
 								elif allowKerningExceptions:
@@ -472,11 +470,7 @@ class BBoxBumperKerning(mekkaObject):
 
 							if otherGlyphsOnRightSide:
 								otherKey = None
-								dist = minDistanceBetweenTwoLayers(
-									bboxLayer,
-									otherLayerStraightened,
-									interval=2,
-								)
+								dist = minDistanceBetweenProfiles(bboxProfile, otherProfile)
 								if otherGlyph.leftKerningGroup:
 									otherKey = "@MMK_R_%s" % otherGlyph.leftKerningGroup
 								elif allowKerningExceptions:
@@ -8,6 +8,7 @@ Report differences in kerning structures between two masters.
 import vanilla
 from GlyphsApp import Glyphs, Message
 from mekkablue import mekkaObject, newLineControlLayer, reportFontName, UpdateButton
+from kerningindex import KerningIndex, kerningConsistency
 
 
 class CompareKerningBetweenMasters(mekkaObject):
@@ -110,37 +111,8 @@ class CompareKerningBetweenMasters(mekkaObject):
 		else:
 			self.w.runButton.enable(True)
 
-	def namesForGroupName(self, groupName, font, isLeft=True):
-		names = []
-		for g in font.glyphs:
-			if isLeft:  # left side = right group
-				if groupName[7:] == g.rightKerningGroup:
-					names.append(g.name)
-			else:
-				if groupName[7:] == g.leftKerningGroup:
-					names.append(g.name)
-		return names
-
-	def glyphNameForKerningName(self, name, font, isLeft=True):
-		glyphName = None
-		if name[0] == "@":
-			names = self.namesForGroupName(name, font, isLeft=isLeft)
-			if name.startswith("@MMK_"):
-				glyphName = name.split("_")[2]
-				if glyphName == "KO":
-					glyphName = name.split("_")[3]
-				if not font.glyphs[glyphName] or glyphName not in names:
-					glyphName = None
-			if not glyphName:
-				for name in names:
-					if font.glyphs[name]:
-						glyphName = name
-						break
-		else:
-			glyph = font.glyphForId_(name)
-			if glyph:
-				glyphName = glyph.name
-
+	def glyphNameForKerningName(self, name, kerningIndex, isLeft=True):
+		glyphName = kerningIndex.glyphNameForKernSide(name, isLeftSide=isLeft)
 		if glyphName:
 			return glyphName
 		else:
@@ -182,12 +154,10 @@ class CompareKerningBetweenMasters(mekkaObject):
 				firstMasterChoice = self.w.firstMaster.getItems()[firstMaster]
 				firstMasterID = firstMasterChoice.split("(ID: ")[1][:-1]
 				firstMaster = thisFont.masters[firstMasterID]
-				firstKerning = thisFont.kerning[firstMaster.id]
 
 				secondMasterChoice = self.w.secondMaster.getItems()[secondMaster]
 				secondMasterID = secondMasterChoice.split("(ID: ")[1][:-1]
 				secondMaster = thisFont.masters[secondMasterID]
-				secondKerning = thisFont.kerning[secondMaster.id]
 
 				spaceGlyph = thisFont.glyphs["space"]
 				if spaceGlyph is None:
@@ -198,79 +168,65 @@ class CompareKerningBetweenMasters(mekkaObject):
 				missingKernCount = 0
 				skippedCount = 0
 
-				for L in set(list(firstKerning.keys()) + list(secondKerning.keys())):
+				# glyph IDs, groups and the kerning of both masters, collected once:
+				kerningIndex = KerningIndex(thisFont, (firstMasterID, secondMasterID))
+
+				# only pairs missing in one of the two masters:
+				for pairIndex, mastersWithoutPair in kerningConsistency(kerningIndex)["missing"]:
+					L, R = kerningIndex.pairs[pairIndex]
 					LisGroup = L[0] == "@"
-					RKeys = []
-					for kerning in (firstKerning, secondKerning):
-						if L in kerning.keys():
-							RKeys.extend(list(kerning[L].keys()))
-					for R in set(RKeys):
-						RisGroup = R[0] == "@"
-
-						# Guard against stale glyph IDs
-						if LisGroup:
-							Lname = L
-						else:
-							Lglyph = thisFont.glyphForId_(L)
-							if Lglyph is None:
+					RisGroup = R[0] == "@"
+
+					# Guard against stale glyph IDs
+					if kerningIndex.nameForKey(L) is None or kerningIndex.nameForKey(R) is None:
+						skippedCount += 1
+						continue
+
+					missingInFirstMaster = firstMasterID in mastersWithoutPair
+					missingInSecondMaster = secondMasterID in mastersWithoutPair
+					if missingInFirstMaster or missingInSecondMaster:
+						missingKernCount += 1
+						targetList = None
+						if LisGroup and RisGroup and group2group:
+							if missingInFirstMaster:
+								targetList = group2groupLayersMissingFirst
+							if missingInSecondMaster:
+								targetList = group2groupLayersMissingSecond
+						if LisGroup and not RisGroup and group2glyph:
+							if missingInFirstMaster:
+								targetList = group2glyphLayersMissingFirst
+							if missingInSecondMaster:
+								targetList = group2glyphLayersMissingSecond
+						if not LisGroup and not RisGroup and glyph2glyph:
+							if missingInFirstMaster:
+								targetList = glyph2glyphLayersMissingFirst
+							if missingInSecondMaster:
+								targetList = glyph2glyphLayersMissingSecond
+						if not LisGroup and RisGroup and glyph2group:
+							if missingInFirstMaster:
+								targetList = glyph2groupLayersMissingFirst
+							if missingInSecondMaster:
+								targetList = glyph2groupLayersMissingSecond
+
+						if targetList is not None:
+							glyphNameOnLSide = self.glyphNameForKerningName(L, kerningIndex, isLeft=True)
+							glyphNameOnRSide = self.glyphNameForKerningName(R, kerningIndex, isLeft=False)
+							if glyphNameOnLSide is None or glyphNameOnRSide is None:
 								skippedCount += 1
 								continue
-							Lname = Lglyph.name
 
-						if RisGroup:
-							Rname = R
-						else:
-							Rglyph = thisFont.glyphForId_(R)
-							if Rglyph is None:
+							glyphOnLSide = thisFont.glyphs[glyphNameOnLSide]
+							glyphOnRSide = thisFont.glyphs[glyphNameOnRSide]
+							if glyphOnLSide is None or glyphOnRSide is None:
 								skippedCount += 1
 								continue
-							Rname = Rglyph.name
-
-						kerningInFirstMaster = thisFont.kerningForPair(firstMasterID, Lname, Rname)
-						kerningInSecondMaster = thisFont.kerningForPair(secondMasterID, Lname, Rname)
-						if kerningInFirstMaster is None or kerningInSecondMaster is None:
-							missingKernCount += 1
-							targetList = None
-							if LisGroup and RisGroup and group2group:
-								if kerningInFirstMaster is None:
-									targetList = group2groupLayersMissingFirst
-								if kerningInSecondMaster is None:
-									targetList = group2groupLayersMissingSecond
-							if LisGroup and not RisGroup and group2glyph:
-								if kerningInFirstMaster is None:
-									targetList = group2glyphLayersMissingFirst
-								if kerningInSecondMaster is None:
-									targetList = group2glyphLayersMissingSecond
-							if not LisGroup and not RisGroup and glyph2glyph:
-								if kerningInFirstMaster is None:
-									targetList = glyph2glyphLayersMissingFirst
-								if kerningInSecondMaster is None:
-									targetList = glyph2glyphLayersMissingSecond
-							if not LisGroup and RisGroup and glyph2group:
-								if kerningInFirstMaster is None:
-									targetList = glyph2groupLayersMissingFirst
-								if kerningInSecondMaster is None:
-									targetList = glyph2groupLayersMissingSecond
-
-							if targetList is not None:
-								glyphNameOnLSide = self.glyphNameForKerningName(L, thisFont, isLeft=True)
-								glyphNameOnRSide = self.glyphNameForKerningName(R, thisFont, isLeft=False)
-								if glyphNameOnLSide is None or glyphNameOnRSide is None:
-									skippedCount += 1
-									continue
-
-								glyphOnLSide = thisFont.glyphs[glyphNameOnLSide]
-								glyphOnRSide = thisFont.glyphs[glyphNameOnRSide]
-								if glyphOnLSide is None or glyphOnRSide is None:
-									skippedCount += 1
-									continue
-
-								targetList.append(glyphOnLSide.layers[firstMaster.id])
-								targetList.append(glyphOnRSide.layers[firstMaster.id])
-								targetList.append(spaceGlyph.layers[firstMaster.id])
-								targetList.append(glyphOnLSide.layers[secondMaster.id])
-								targetList.append(glyphOnRSide.layers[secondMaster.id])
-								targetList.append(newLineControlLayer())
+
+							targetList.append(glyphOnLSide.layers[firstMaster.id])
+							targetList.append(glyphOnRSide.layers[firstMaster.id])
+							targetList.append(spaceGlyph.layers[firstMaster.id])
+							targetList.append(glyphOnLSide.layers[secondMaster.id])
+							targetList.append(glyphOnRSide.layers[secondMaster.id])
+							targetList.append(newLineControlLayer())
 
 				if skippedCount:
 					print(f"⚠️ Skipped {skippedCount} pairs with stale or missing glyph IDs.")
@@ -9,6 +9,7 @@ import vanilla
 from AppKit import NSBeep
 from GlyphsApp import Glyphs, Message
 from mekkablue import mekkaObject
+from kerningindex import KerningIndex
 
 
 class DeleteExceptionsTooCloseToGroupKerning(mekkaObject):
@@ -88,29 +89,20 @@ class DeleteExceptionsTooCloseToGroupKerning(mekkaObject):
 		else:
 			self.w.runButton.setTitle("Clean")
 
-	def glyphNameForKernSide(self, thisFont, kernSideName, isTheLeftSide=True):
+	def glyphNameForKernSide(self, kerningIndex, kernSideName, isTheLeftSide=True):
+		glyphName = kerningIndex.glyphNameForKernSide(kernSideName, isLeftSide=isTheLeftSide)
+		if glyphName:
+			return glyphName
 		if kernSideName.startswith("@"):
-			groupName = kernSideName.replace("@MMK_L_", "").replace("@MMK_R_", "").replace("@", "")
-			for thisGlyph in thisFont.glyphs:
-				if isTheLeftSide:
-					if thisGlyph.rightKerningGroup == groupName:
-						return thisGlyph.name
-				else:
-					if thisGlyph.leftKerningGroup == groupName:
-						return thisGlyph.name
 			print(
 				"⚠️ No glyph found for %s group: @%s" % (
 					"right" if isTheLeftSide else "left",  # if it is on the left side, we are looking for the right group and vice versa
-					groupName,
+					kerningIndex.groupNameOfKey(kernSideName),
 				)
 			)
-			return None
 		else:
-			if thisFont.glyphs[kernSideName]:
-				return kernSideName
-			else:
-				print("⚠️ Glyph not found: %s" % kernSideName)
-				return None
+			print("⚠️ Glyph not found: %s" % kernSideName)
+		return None
 
 	def DeleteExceptionsTooCloseToGroupKerningMain(self, sender):
 		try:
@@ -129,9 +121,9 @@ class DeleteExceptionsTooCloseToGroupKerning(mekkaObject):
 			if onlySelectedGlyphs:
 				selection = thisFont.selectedLayers
 				if selection:
-					selectedGlyphs = [layer.parent for layer in selection]
-					selectedLeftGlyphGroups = [glyph.rightKerningGroup for glyph in selectedGlyphs]
-					selectedRightGlyphGroups = [glyph.leftKerningGroup for glyph in selectedGlyphs]
+					selectedGlyphs = set(layer.parent.name for layer in selection)
+					selectedLeftGlyphGroups = set(layer.parent.rightKerningGroup for layer in selection)
+					selectedRightGlyphGroups = set(layer.parent.leftKerningGroup for layer in selection)
 				else:
 					Message(
 						title="Selection Error",
@@ -151,114 +143,105 @@ class DeleteExceptionsTooCloseToGroupKerning(mekkaObject):
 			print("Master: %s" % thisMaster.name)
 			print()
 
+			# glyph IDs, groups and kerning values, collected once:
+			kerningIndex = KerningIndex(thisFont, (thisMasterID, ))
+
 			# collect unnecessary kerning exceptions:
 			unnecessaryKernPairs = []
-			for leftSide in thisFont.kerning[thisMasterID].keys():
+			for leftSide, rightSide in kerningIndex.pairs:
+				exceptionKerning = kerningIndex.valueForPair(thisMasterID, leftSide, rightSide)
 				if leftSide.startswith("@"):
 					# group on the left side
+					if rightSide.startswith("@"):
+						continue
 
+					# right side is exception:
 					leftGlyphGroup = leftSide.replace("@MMK_L_", "")
-					leftGlyphGroupMMK = leftSide
+					rightGlyphName = kerningIndex.nameForID.get(rightSide)
 
-					for rightSide in thisFont.kerning[thisMasterID][leftSide].keys():
+					if onlySelectedGlyphs:
+						okToContinue = (leftGlyphGroup in selectedLeftGlyphGroups) or (rightGlyphName in selectedGlyphs)
+					else:
+						okToContinue = True
 
-						if not rightSide.startswith("@"):
-							# right side is exception:
-							rightGlyph = thisFont.glyphForId_(rightSide)
+					if okToContinue:
+						if not rightGlyphName:
+							# found orphaned kerning, report and abort:
+							print("- Warning: could not find glyph for ID %s, consider cleaning up kerning" % rightSide)
+						else:
+							rightGlyphGroup = kerningIndex.leftGroupOfGlyph.get(rightGlyphName)
 
-							if onlySelectedGlyphs:
-								okToContinue = (leftGlyphGroup in selectedLeftGlyphGroups) or (rightGlyph in selectedGlyphs)
+							if not rightGlyphGroup:
+								# no corresponding kerning group, report and abort:
+								print("- Note: Glyph '%s' has no left group; skipping." % rightGlyphName)
 							else:
-								okToContinue = True
-
-							if okToContinue:
-								if not rightGlyph:
-									# found orphaned kerning, report and abort:
-									print("- Warning: could not find glyph for ID %s, consider cleaning up kerning" % rightSide)
-								else:
-									rightGlyphGroup = rightGlyph.leftKerningGroup
-
-									if not rightGlyphGroup:
-										# no corresponding kerning group, report and abort:
-										print("- Note: Glyph '%s' has no left group; skipping." % rightGlyph.name)
-									else:
-										rightGlyphGroupMMK = "@MMK_R_%s" % rightGlyphGroup
-										exceptionKerning = thisFont.kerning[thisMasterID][leftSide][rightSide]
-										groupKerning = thisFont.kerningForPair(thisMasterID, leftGlyphGroupMMK, rightGlyphGroupMMK)
-										if groupKerning is None or groupKerning > 100000:  # NSNotFound
-											groupKerning = 0
-										if abs(exceptionKerning - groupKerning) < threshold:
-											print(
-												"- Insignificant exception @%s-%s: %i vs. @%s-@%s: %i" % (
-													leftGlyphGroup,
-													rightGlyph.name,
-													exceptionKerning,
-													leftGlyphGroup,
-													rightGlyphGroup,
-													groupKerning,
-												)
-											)
-											unnecessaryKernPairs.append(("@%s" % leftGlyphGroup, rightGlyph.name))
+								groupKerning = kerningIndex.valueForPair(thisMasterID, leftSide, "@MMK_R_%s" % rightGlyphGroup) or 0
+								if abs(exceptionKerning - groupKerning) < threshold:
+									print(
+										"- Insignificant exception @%s-%s: %i vs. @%s-@%s: %i" % (
+											leftGlyphGroup,
+											rightGlyphName,
+											exceptionKerning,
+											leftGlyphGroup,
+											rightGlyphGroup,
+											groupKerning,
+										)
+									)
+									unnecessaryKernPairs.append(("@%s" % leftGlyphGroup, rightGlyphName))
 
 				else:
 					# left side is exception
-					leftGlyph = thisFont.glyphForId_(leftSide)
-					okToContinue = (not onlySelectedGlyphs or leftGlyph in selectedGlyphs)
-					if not leftGlyph:
+					leftGlyphName = kerningIndex.nameForID.get(leftSide)
+					okToContinue = (not onlySelectedGlyphs or leftGlyphName in selectedGlyphs)
+					if not leftGlyphName:
 						# found orphaned kerning, report and abort:
 						if okToContinue:
 							print("- Warning: could not find glyph for ID %s, consider cleaning up kerning" % leftSide)
 
-					elif leftGlyph.export:
+					elif leftGlyphName in kerningIndex.exportingNames:
 						# only proceed if the glyph is set to export:
-						leftGlyphGroup = leftGlyph.rightKerningGroup
+						leftGlyphGroup = kerningIndex.rightGroupOfGlyph.get(leftGlyphName)
 
 						if not leftGlyphGroup:
 							# no corresponding kerning group, report and abort:
 							if okToContinue:
-								print("- Note: Glyph '%s' has no right group; skipping." % leftGlyph.name)
+								print("- Note: Glyph '%s' has no right group; skipping." % leftGlyphName)
 
 						else:
-							# step through exceptions:
 							leftGlyphGroupMMK = "@MMK_L_%s" % leftGlyphGroup
+							if rightSide.startswith("@"):
+								# exception-group:
+								rightGlyphName = None
+								rightGlyphGroupMMK = rightSide
+								rightGlyphGroup = rightSide.replace("@MMK_R_", "")
+								okToContinue = okToContinue or (not onlySelectedGlyphs or rightGlyphGroup in selectedRightGlyphGroups)
+							else:
+								# exception-exception:
+								rightGlyphName = kerningIndex.nameForID.get(rightSide)
+								rightGlyphGroup = kerningIndex.leftGroupOfGlyph.get(rightGlyphName)
+								rightGlyphGroupMMK = "@MMK_R_%s" % rightGlyphGroup
+								okToContinue = okToContinue or (not onlySelectedGlyphs or rightGlyphName in selectedGlyphs)
 
-							for rightSide in thisFont.kerning[thisMasterID][leftSide].keys():
-								if rightSide.startswith("@"):
-									# exception-group:
-									rightGlyph = None
-									rightGlyphGroupMMK = rightSide
-									rightGlyphGroup = rightSide.replace("@MMK_R_", "")
-									okToContinue = okToContinue or (not onlySelectedGlyphs or rightGlyphGroup in selectedRightGlyphGroups)
-								else:
-									# exception-exception:
-									rightGlyph = thisFont.glyphForId_(rightSide)
-									rightGlyphGroup = rightGlyph.leftKerningGroup
-									rightGlyphGroupMMK = "@MMK_R_%s" % rightGlyphGroup
-									okToContinue = okToContinue or (not onlySelectedGlyphs or rightGlyph in selectedGlyphs)
-
-								if okToContinue:
-									exceptionKerning = thisFont.kerning[thisMasterID][leftSide][rightSide]
-									groupKerning = thisFont.kerningForPair(thisMasterID, leftGlyphGroupMMK, rightGlyphGroupMMK)
-									if groupKerning is None or groupKerning > 100000:  # NSNotFound
-										groupKerning = 0
-
-									if abs(exceptionKerning - groupKerning) < threshold:
-										if rightGlyph:
-											rightSideName = rightGlyph.name
-										else:
-											rightSideName = "@%s" % rightGlyphGroup
-
-										print(
-											"- Found unnecessary exception %s-%s: %i vs. @%s-@%s: %i" % (
-												leftGlyph.name,
-												rightSideName,
-												exceptionKerning,
-												leftGlyphGroup,
-												rightGlyphGroup,
-												groupKerning,
-											)
+							if okToContinue:
+								groupKerning = kerningIndex.valueForPair(thisMasterID, leftGlyphGroupMMK, rightGlyphGroupMMK) or 0
+
+								if abs(exceptionKerning - groupKerning) < threshold:
+									if rightGlyphName:
+										rightSideName = rightGlyphName
+									else:
+										rightSideName = "@%s" % rightGlyphGroup
+
+									print(
+										"- Found unnecessary exception %s-%s: %i vs. @%s-@%s: %i" % (
+											leftGlyphName,
+											rightSideName,
+											exceptionKerning,
+											leftGlyphGroup,
+											rightGlyphGroup,
+											groupKerning,
 										)
-										unnecessaryKernPairs.append((leftGlyph.name, rightSideName))
+									)
+									unnecessaryKernPairs.append((leftGlyphName, rightSideName))
 
 			if not unnecessaryKernPairs:
 				Message(
@@ -285,8 +268,8 @@ class DeleteExceptionsTooCloseToGroupKerning(mekkaObject):
 						thisFont.removeKerningForPair(thisMasterID, leftSide, rightSide)
 
 					# COLLECT FOR REPORT
-					leftGlyphName = self.glyphNameForKernSide(thisFont, leftSide, isTheLeftSide=True)
-					rightGlyphName = self.glyphNameForKernSide(thisFont, rightSide, isTheLeftSide=False)
+					leftGlyphName = self.glyphNameForKernSide(kerningIndex, leftSide, isTheLeftSide=True)
+					rightGlyphName = self.glyphNameForKernSide(kerningIndex, rightSide, isTheLeftSide=False)
 					if leftGlyphName is not None and rightGlyphName is not None:
 						tabString += "/%s/%s " % (leftGlyphName, rightGlyphName)
 
@@ -0,0 +1,35 @@
+# MenuTitle: Export Kerning Snapshot
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+__doc__ = """
+Saves glyph IDs, kerning groups and the kerning of all masters of the frontmost font as a JSON snapshot. Reports missing, sign-flipped and outlier pairs across masters (values more than 100 units off the median, with three or more masters) in the Macro Window. Snapshots can be compared without Glyphs, e.g. in CI: python3 kerningindex.py old.json new.json
+"""
+
+import os
+from GlyphsApp import Glyphs, GetSaveFile, Message
+from kerningindex import KerningIndex, kerningConsistency
+
+outlierTolerance = 100  # units a master may deviate from the median of all masters before it is reported
+
+thisFont = Glyphs.font  # frontmost font
+if not thisFont:
+	Message(title="No Font Open", message="The script requires a font. Open a font and run the script again.", OKButton=None)
+else:
+	proposedFileName = "%s.kerning.json" % (os.path.splitext(os.path.basename(thisFont.filepath))[0] if thisFont.filepath else thisFont.familyName)
+	filePath = GetSaveFile(message="Save Kerning Snapshot", ProposedFileName=proposedFileName, filetypes=("json"))
+	if filePath:
+		Glyphs.clearLog()
+		kerningIndex = KerningIndex(thisFont)
+		kerningIndex.saveSnapshot(filePath)
+		print("💾 Saved kerning snapshot of %s: %i pairs in %i masters\n%s\n" % (thisFont.familyName, len(kerningIndex.pairs), len(kerningIndex.masterIDs), filePath))
+
+		report = kerningConsistency(kerningIndex, outlierTolerance=outlierTolerance)
+		print("⚠️ Pairs missing in some masters: %i" % len(report["missing"]))
+		print("↕️ Pairs with flipped signs between masters: %i" % len(report["signFlips"]))
+		for pairIndex in report["signFlips"]:
+			print("   %s %s" % kerningIndex.namedPair(pairIndex))
+		print("📈 Values more than %i units off the median of all masters: %i" % (outlierTolerance, len(report["outliers"])))
+		for pairIndex, masterID, value, median in report["outliers"]:
+			print("   %s %s: %i in %s (median %i)" % (kerningIndex.namedPair(pairIndex) + (value, kerningIndex.masterNames.get(masterID, masterID), median)))
+		print("\n✅ Done.")
+		Glyphs.showMacroWindow()
@@ -10,7 +10,7 @@ from timeit import default_timer as timer
 from Foundation import NSNotFound
 from GlyphsApp import Glyphs, Message
 from mekkablue import mekkaObject, caseDict
-from kernanalysis import distanceFromEntry
+from kernanalysis import distanceFromEntry, SidebearingProfileCache, minDistanceMatrix
 
 
 intervalList = (1, 3, 5, 10, 20)
@@ -191,37 +191,6 @@ class GapFinder(mekkaObject):
 
 		return returnList
 
-	def measureLayerAtHeightFromLeftOrRight(self, thisLayer, height, leftSide=True):
-		try:
-			if leftSide:
-				measurement = thisLayer.lsbAtHeight_(height)
-			else:
-				measurement = thisLayer.rsbAtHeight_(height)
-			if measurement < NSNotFound:
-				return measurement
-			else:
-				return None
-		except:
-			return None
-
-	def minDistanceBetweenTwoLayers(self, leftLayer, rightLayer, interval=5.0, kerning=0.0, report=False):
-		# correction = leftLayer.RSB+rightLayer.LSB
-		topY = min(leftLayer.bounds.origin.y + leftLayer.bounds.size.height, rightLayer.bounds.origin.y + rightLayer.bounds.size.height)
-		bottomY = max(leftLayer.bounds.origin.y, rightLayer.bounds.origin.y)
-		distance = topY - bottomY
-		minDist = None
-		for i in range(int(distance // interval)):
-			height = bottomY + i * interval
-			left = self.measureLayerAtHeightFromLeftOrRight(leftLayer, height, leftSide=False)
-			right = self.measureLayerAtHeightFromLeftOrRight(rightLayer, height, leftSide=True)
-			try:  # avoid gaps like in i or j
-				total = left + right + kerning  # +correction
-				if minDist is None or minDist > total:
-					minDist = total
-			except:
-				pass
-		return minDist
-
 	def queryPrefs(self):
 		script = self.pref("popupScript")
 		firstCategory, firstSubCategory = self.splitString(self.w.popupLeftCat.getItems()[self.pref("popupLeftCat")])
@@ -279,6 +248,11 @@ class GapFinder(mekkaObject):
 				print("Left glyphs:\n%s\n" % ", ".join(firstList))
 				print("Right glyphs:\n%s\n" % ", ".join(secondList))
 
+			# measure every glyph only once:
+			profiles = SidebearingProfileCache(thisFont, thisFontMasterID, interval=step, persistent=True)
+			rightProfiles = [profiles[name] for name in secondList]
+
+			prefilterStatistics = {}
 			tabString = "\n"
 			gapCount = 0
 			numOfGlyphs = len(firstList)
@@ -287,13 +261,11 @@ class GapFinder(mekkaObject):
 				self.w.bar.set(int(100 * (float(index) / numOfGlyphs)))
 				# determine left glyph:
 				firstGlyphName = firstList[index]
-				leftLayer = thisFont.glyphs[firstGlyphName].layers[thisFontMasterID]
+				kernings = [self.effectiveKerning(firstGlyphName, secondGlyphName, thisFont, thisFontMasterID) for secondGlyphName in secondList]
+				distances = minDistanceMatrix((profiles[firstGlyphName], ), rightProfiles, kerningMatrix=(kernings, ), statistics=prefilterStatistics)[0]
 
 				# cycle through right glyphs:
-				for secondGlyphName in secondList:
-					rightLayer = thisFont.glyphs[secondGlyphName].layers[thisFontMasterID]
-					kerning = self.effectiveKerning(firstGlyphName, secondGlyphName, thisFont, thisFontMasterID)
-					distanceBetweenShapes = self.minDistanceBetweenTwoLayers(leftLayer, rightLayer, interval=step, kerning=kerning, report=False)
+				for secondGlyphName, distanceBetweenShapes in zip(secondList, distances):
 					if distanceBetweenShapes is not None and distanceBetweenShapes > maxDistance:
 						gapCount += 1
 						tabString += f"/{firstGlyphName}/{secondGlyphName}/space"
@@ -301,6 +273,12 @@ class GapFinder(mekkaObject):
 							print("- %s %s: %i" % (firstGlyphName, secondGlyphName, distanceBetweenShapes))
 				tabString += "\n"
 
+			# keep measurements for the next run:
+			profiles.save()
+			if self.pref("reportGapsInMacroWindow"):
+				print(f"\nMeasured {profiles.sampledCount} glyphs, reused {profiles.reusedCount} unchanged glyphs from previous runs.")
+				print(f"Skipped {prefilterStatistics['bounds']} pairs without vertical overlap, measured {prefilterStatistics['measured']} pairs.")
+
 			# clean up the tab string:
 			tabString = tabString[:-6].replace("/space\n", "\n")
 			while "\n\n" in tabString:
@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 from __future__ import division, print_function, unicode_literals
 __doc__ = """
-Choose an .fea file containing a kern feature in AFDKO code, and this script will attempt to import the kerning values into the frontmost font master (see Window > Kerning).
+Choose an .fea file containing a kern feature in AFDKO code, and this script will attempt to import the kerning values into the frontmost font master (see Window > Kerning). Understands multi-line class definitions, inline classes, enum pos, value records, lookups and subtables. Report in Macro Window.
+
+Hold down OPTION for a dry run: reports new and changed pairs and groups without changing the font.
 """
 
 """
@@ -12,12 +14,40 @@ Copyright (c) 2010 schriftgestaltung.de. All rights reserved.
 """
 
 import os
+from AppKit import NSEvent, NSEventModifierFlagOption  # noqa: E402
 from GlyphsApp import Glyphs, Message, GetOpenFile
+from feakerning import FeaKerning, buildKerning  # noqa: E402
+
+
+def glyphKeyFinder(font):
+	def glyphKeyForName(glyphName):
+		glyph = font.glyphs[Glyphs.niceGlyphName(glyphName)] or font.glyphs[glyphName]
+		return glyph.id if glyph else None
+	return glyphKeyForName
+
+
+def nameForKey(font, key):
+	if key.startswith("@"):
+		return key
+	glyph = font.glyphForId_(key)
+	return glyph.name if glyph else key
+
+
+def kerningDiff(oldKerning, newKerning):
+	"""Returns (added, changed) lists of (leftKey, rightKey, oldValue, newValue) for newKerning merged into oldKerning."""
+	added, changed = [], []
+	for leftKey, rightKerning in newKerning.items():
+		oldRightKerning = oldKerning.get(leftKey) or {}
+		for rightKey, value in rightKerning.items():
+			oldValue = oldRightKerning.get(rightKey)
+			if oldValue is None:
+				added.append((leftKey, rightKey, None, value))
+			elif oldValue != value:
+				changed.append((leftKey, rightKey, oldValue, value))
+	return added, changed
 
-leftSideMarkers = ("MMK_L_", "_1ST", "_first")
-rightSideMarkers = ("MMK_R_", "_2ND", "_second")
 
-def importFeaFileToCurrentMaster(font, filePath):
+def importFeaFileToCurrentMaster(font, filePath, dryRun=False):
 	master = font.selectedFontMaster
 	if not master:
 		Message(
@@ -34,73 +64,77 @@ def importFeaFileToCurrentMaster(font, filePath):
 			OKButton=None,
 			)
 		return
-		
-	kerningLines = []
-	feaFile = open(filePath)
-	currentLine = feaFile.readline()
-	groupNameDict = {}
-	while (currentLine != ""): # end of file
-		if (currentLine[0] == "@"):
-			while "  " in currentLine:
-				currentLine = currentLine.replace("  ", " ")
-			groupName = currentLine[currentLine.find("@"):currentLine.find("=")].strip()
-			glyphNames = currentLine[currentLine.find("[")+1:currentLine.find("]")].strip().split(" ")
-			left = True
-			right = True
-			if any(subString in groupName for subString in leftSideMarkers):
-				right = False
-			elif any(subString in groupName for subString in rightSideMarkers):
-				left = False
-			oldGroupName = groupName
-			for nameParticle in leftSideMarkers + rightSideMarkers + ("@", "."):
-				groupName = groupName.replace(nameParticle, "")
-			# groupName = Glyphs.niceGlyphName(groupName)
-			for glyphName in glyphNames:
-				glyphName = Glyphs.niceGlyphName(glyphName)
-				glyph = font.glyphs[glyphName]
-				if glyph:
-					if left:
-						glyph.rightKerningGroup = groupName
-					if right:
-						glyph.leftKerningGroup = groupName
-			newGroupName = f"@MMK_{'L' if left else 'R'}_{groupName}"
-			groupNameDict[oldGroupName] = newGroupName
-		elif currentLine.strip().find("pos") == 0:
-			kerningLines.append(currentLine.strip())
-		currentLine = feaFile.readline() # read the next line
-
-	if len(kerningLines) > 0:
-		for i in range(len(kerningLines)-1, -1, -1):
-			line = kerningLines[i]
-			keys = line.split(" ")
-			leftKey = keys[1]
-			rightKey = keys[2]
-			kernValue = keys[3]
-
-			if leftKey[0] == "@":
-				if leftKey in groupNameDict.keys():
-					leftKey = groupNameDict[leftKey]
-			else:
-				leftKey = leftKey.strip("[]")
-				leftKey = font.glyphs[leftKey].id
 
-			if rightKey[0] == "@":
-				if rightKey in groupNameDict.keys():
-					rightKey = groupNameDict[rightKey]
+	Glyphs.clearLog()
+	print(f"Import Kerning from .fea File{' (dry run)' if dryRun else ''}")
+	print(f"📄 {filePath}")
+	print(f"🔠 {font.familyName}, master ‘{master.name}’\n")
+
+	feaKerning = FeaKerning(filePath)
+	kerning, rightGroupOfGlyph, leftGroupOfGlyph, report = buildKerning(feaKerning, glyphKeyFinder(font))
+	print(f"Parsed {len(feaKerning.classes)} classes and {len(feaKerning.pairs)} pairs in {feaKerning.lookupCount} lookups, {feaKerning.subtableCount} subtable breaks.")
+	if feaKerning.duplicateCount:
+		print(f"⚠️ Ignored {feaKerning.duplicateCount} repeated pairs, first definition wins.")
+	for reason, count in feaKerning.skipped.items():
+		print(f"⚠️ Skipped {count}× {reason}.")
+	if report["missingGlyphs"]:
+		print(f"⚠️ {len(report['missingGlyphs'])} glyphs not in font: {', '.join(sorted(report['missingGlyphs']))}")
+	if report["undefinedClasses"]:
+		print(f"⚠️ {len(report['undefinedClasses'])} undefined classes: {', '.join(sorted(report['undefinedClasses']))}")
+	if report["droppedPairs"]:
+		print(f"⚠️ Dropped {report['droppedPairs']} pairs with missing glyphs or classes on one side.")
+	if report["groupConflicts"]:
+		print(f"⚠️ {report['groupConflicts']} glyphs in more than one class of the same side: kept first group, added exceptions.")
+
+	oldKerning = font.kerning.get(master.id) or {}
+	added, changed = kerningDiff(oldKerning, kerning)
+	groupChanges = [
+		(glyphID, "right", groupName) for glyphID, groupName in rightGroupOfGlyph.items() if font.glyphForId_(glyphID).rightKerningGroup != groupName
+		] + [
+		(glyphID, "left", groupName) for glyphID, groupName in leftGroupOfGlyph.items() if font.glyphForId_(glyphID).leftKerningGroup != groupName
+		]
+	print(f"\n{len(added)} new pairs, {len(changed)} changed pairs, {len(groupChanges)} changed kerning groups.")
+
+	if dryRun:
+		for glyphID, side, groupName in groupChanges:
+			print(f"  group {nameForKey(font, glyphID)} {side}: {groupName}")
+		for leftKey, rightKey, oldValue, value in added + changed:
+			oldValueText = "" if oldValue is None else f"{oldValue:g} → "
+			print(f"  {nameForKey(font, leftKey)} {nameForKey(font, rightKey)}: {oldValueText}{value:g}")
+		print("\nDry run, nothing changed.")
+		Glyphs.showMacroWindow()
+		return
+
+	font.disableUpdateInterface()
+	try:
+		for glyphID, side, groupName in groupChanges:
+			glyph = font.glyphForId_(glyphID)
+			if side == "right":
+				glyph.rightKerningGroup = groupName
 			else:
-				rightKey = rightKey.strip("[]")
-				rightKey = font.glyphs[rightKey].id
+				glyph.leftKerningGroup = groupName
 
-			kernValue = float(kernValue.replace(";", ""))
-			font.setKerningForPair(
-				master.id, # fontMasterId (str) – The id of the FontMaster
-				leftKey, # leftKey (str) – either a glyph name or a class name
-				rightKey, # rightKey (str) – either a glyph name or a class name
-				kernValue, # value (float) – kerning value
-				)
+		# merge into the master kerning and set the kerning of all masters at once:
+		newKerning = {}
+		for thisMaster in font.masters:
+			masterKerning = font.kerning.get(thisMaster.id) or {}
+			newKerning[thisMaster.id] = {leftKey: dict(rightKerning) for leftKey, rightKerning in masterKerning.items()}
+		masterKerning = newKerning[master.id]
+		for leftKey, rightKerning in kerning.items():
+			masterKerning.setdefault(leftKey, {}).update(rightKerning)
+		font.kerning = newKerning
+	finally:
+		font.enableUpdateInterface()
+	print("✅ Done.")
+	Glyphs.showNotification(
+		f"Imported kerning into {master.name}",
+		f"{len(added)} new, {len(changed)} changed pairs. Details in Macro Window.",
+		)
 
 
 def main():
+	keysPressed = NSEvent.modifierFlags()
+	dryRun = keysPressed & NSEventModifierFlagOption == NSEventModifierFlagOption
 	font = Glyphs.font
 	if font:
 		feaFile = GetOpenFile(
@@ -110,7 +144,7 @@ def main():
 			path=os.path.dirname(font.filepath) if font.filepath else None,
 			)
 		if feaFile is not None:
-			importFeaFileToCurrentMaster(font, feaFile)
+			importFeaFileToCurrentMaster(font, feaFile, dryRun=dryRun)
 	else:
 		Message(
 			title="No Font Open",
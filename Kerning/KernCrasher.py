@@ -8,7 +8,7 @@ Opens a new tab with Kerning Combos that crash in the current fontmaster.
 import vanilla
 from timeit import default_timer as timer
 from Foundation import NSNotFound
-from kernanalysis import intervalList, categoryList, sortedIntervalsFromString, effectiveKerning, minDistanceBetweenTwoLayers, distanceFromEntry
+from kernanalysis import intervalList, categoryList, sortedIntervalsFromString, effectiveKerning, distanceFromEntry, SidebearingProfileCache, maskedProfile, minDistanceMatrix
 from GlyphsApp import Glyphs, Message
 from mekkablue import mekkaObject, caseDict, UpdateButton
 
@@ -326,6 +326,11 @@ class KernCrasher(mekkaObject):
 				print("Left glyphs:\n%s\n" % ", ".join(firstList))
 				print("Right glyphs:\n%s\n" % ", ".join(secondList))
 
+			# decompose and measure every glyph only once, and apply ignore intervals once per glyph:
+			profiles = SidebearingProfileCache(thisFont, thisFontMasterID, interval=step, persistent=True)
+			rightProfiles = [maskedProfile(profiles[name], ignoreIntervals) for name in secondList]
+
+			prefilterStatistics = {}
 			tabString = "\n"
 			crashCount = 0
 			numOfGlyphs = len(firstList)
@@ -334,15 +339,12 @@ class KernCrasher(mekkaObject):
 				self.w.bar.set(int(100 * (float(index) / numOfGlyphs)))
 				# determine left glyph:
 				firstGlyphName = firstList[index]
-				leftLayer = thisFont.glyphs[firstGlyphName].layers[thisFontMasterID].copyDecomposedLayer()
-				leftLayer.decomposeSmartOutlines()
+				leftProfile = maskedProfile(profiles[firstGlyphName], ignoreIntervals)
+				kernings = [effectiveKerning(firstGlyphName, secondGlyphName, thisFont, thisFontMasterID, directionSensitive) for secondGlyphName in secondList]
+				distances = minDistanceMatrix((leftProfile, ), rightProfiles, kerningMatrix=(kernings, ), cutoff=minDistance, statistics=prefilterStatistics)[0]
 
 				# cycle through right glyphs:
-				for secondGlyphName in secondList:
-					rightLayer = thisFont.glyphs[secondGlyphName].layers[thisFontMasterID].copyDecomposedLayer()
-					rightLayer.decomposeSmartOutlines()
-					kerning = effectiveKerning(firstGlyphName, secondGlyphName, thisFont, thisFontMasterID, directionSensitive)
-					distanceBetweenShapes = minDistanceBetweenTwoLayers(leftLayer, rightLayer, interval=step, kerning=kerning, report=False, ignoreIntervals=ignoreIntervals)
+				for secondGlyphName, distanceBetweenShapes in zip(secondList, distances):
 					if distanceBetweenShapes is not None and distanceBetweenShapes < minDistance:
 						crashCount += 1
 						tabString += "/%s/%s/space" % (firstGlyphName, secondGlyphName)
@@ -350,6 +352,14 @@ class KernCrasher(mekkaObject):
 							print("- %s %s: %i" % (firstGlyphName, secondGlyphName, distanceBetweenShapes))
 				tabString += "\n"
 
+			# keep measurements for the next run:
+			profiles.save()
+			if self.pref("reportCrashesInMacroWindow"):
+				print(f"\nMeasured {profiles.sampledCount} glyphs, reused {profiles.reusedCount} unchanged glyphs from previous runs.")
+				print(
+					f"Skipped {prefilterStatistics['bounds']} pairs by bounding box, {prefilterStatistics['hull']} pairs by convex hull, measured {prefilterStatistics['measured']} pairs."
+				)
+
 			# clean up the tab string:
 			tabString = tabString[:-6].replace("/space\n", "\n")
 			while "\n\n" in tabString:
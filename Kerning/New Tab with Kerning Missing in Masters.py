@@ -6,6 +6,7 @@ Opens New Tabs for each master showing kerning missing in this master but presen
 """
 
 from GlyphsApp import Glyphs, Message
+from kerningindex import KerningIndex, kerningConsistency
 
 thisFont = Glyphs.font  # frontmost font
 
@@ -22,60 +23,31 @@ else:
 	for thisMaster in thisFont.masters:
 		tabStrings[thisMaster.id] = "Kerning missing in %s:\n" % thisMaster.name
 
-	# prepare defaultGlyphs:
-	leftGroupDefaults = {}
-	rightGroupDefaults = {}
-	for thisGlyph in thisFont.glyphs[::-1]:
-		if thisGlyph.leftKerningGroup:
-			leftGroupDefaults[thisGlyph.leftKerningGroup] = thisGlyph.name
-		if thisGlyph.rightKerningGroup:
-			rightGroupDefaults[thisGlyph.rightKerningGroup] = thisGlyph.name
-
-	for thisMaster in thisFont.masters:
-		masterID = thisMaster.id
-		otherMasterIDs = [m.id for m in thisFont.masters if m != thisMaster]
-		masterKerning = thisFont.kerning[masterID]
-		for leftSide in masterKerning.keys():
-
-			for rightSide in masterKerning[leftSide].keys():
-				for otherID in otherMasterIDs:
-
-					try:
-						probeValue = thisFont.kerning[otherID][leftSide][rightSide]
-					except:
-						# kerning does not exist:
-
-						leftSideGlyphName, rightSideGlyphName = None, None
-						if not leftSide[0] == "@":
-							leftSideGlyph = thisFont.glyphForId_(leftSide)
-							if leftSideGlyph:
-								leftSideGlyphName = leftSideGlyph.name
-							else:
-								print(u"❌ Glyph %s: Orphaned LEFT glyph ID in kerning. No corresponding glyph in font." % leftSide)
-						elif leftSide[7:] not in rightGroupDefaults:
-							print(u"❌ @%s: Orphaned LEFT SIDE of kern pair. No corresponding RIGHT GROUP in glyphs." % leftSide[7:])
-							Glyphs.showMacroWindow()
-						elif rightGroupDefaults[leftSide[7:]]:
-							leftSideGlyphName = rightGroupDefaults[leftSide[7:]]
-						else:
-							print(u"🤷🏻‍♀️ Cannot convert left side name:", leftSide)
-
-						if not rightSide[0] == "@":
-							rightSideGlyph = thisFont.glyphForId_(rightSide)
-							if rightSideGlyph:
-								rightSideGlyphName = rightSideGlyph.name
-							else:
-								print(u"❌ Glyph %s: Orphaned RIGHT glyph ID in kerning. No corresponding glyph in font." % rightSide)
-						elif rightSide[7:] not in leftGroupDefaults:
-							print(u"❌ @%s: Orphaned RIGHT SIDE of kern pair. No corresponding LEFT GROUP in glyphs." % rightSide[7:])
-							Glyphs.showMacroWindow()
-						elif leftGroupDefaults[rightSide[7:]]:
-							rightSideGlyphName = leftGroupDefaults[rightSide[7:]]
-						else:
-							print(u"🤷🏻‍♀️ Cannot convert right side name:", rightSide)
-
-						if leftSideGlyphName and rightSideGlyphName:
-							tabStrings[otherID] += "/%s/%s  " % (leftSideGlyphName, rightSideGlyphName)
+	# glyph IDs, groups and kerning of all masters, collected once:
+	kerningIndex = KerningIndex(thisFont)
+
+	# pairs that do not exist in some masters:
+	for pairIndex, mastersWithoutPair in kerningConsistency(kerningIndex)["missing"]:
+		leftSide, rightSide = kerningIndex.pairs[pairIndex]
+		leftSideGlyphName = kerningIndex.glyphNameForKernSide(leftSide, isLeftSide=True)
+		if not leftSideGlyphName:
+			if not leftSide[0] == "@":
+				print(u"❌ Glyph %s: Orphaned LEFT glyph ID in kerning. No corresponding glyph in font." % leftSide)
+			else:
+				print(u"❌ @%s: Orphaned LEFT SIDE of kern pair. No corresponding RIGHT GROUP in glyphs." % leftSide[7:])
+				Glyphs.showMacroWindow()
+
+		rightSideGlyphName = kerningIndex.glyphNameForKernSide(rightSide, isLeftSide=False)
+		if not rightSideGlyphName:
+			if not rightSide[0] == "@":
+				print(u"❌ Glyph %s: Orphaned RIGHT glyph ID in kerning. No corresponding glyph in font." % rightSide)
+			else:
+				print(u"❌ @%s: Orphaned RIGHT SIDE of kern pair. No corresponding LEFT GROUP in glyphs." % rightSide[7:])
+				Glyphs.showMacroWindow()
+
+		if leftSideGlyphName and rightSideGlyphName:
+			for otherID in mastersWithoutPair:
+				tabStrings[otherID] += "/%s/%s  " % (leftSideGlyphName, rightSideGlyphName)
 	if tabStrings:
 		print("\nOrphaned groups and glyph IDs: consider cleaning up kerning on Window > Kerning.")
 	for masterID in tabStrings:
@@ -8,17 +8,7 @@ Specify a kerning value, and every kerning in the current master smaller than th
 import vanilla
 from GlyphsApp import Glyphs
 from mekkablue import mekkaObject
-
-
-def nameForID(Font, ID):
-	"""Return the name of a group or glyph for a given kerning ID."""
-	try:
-		if ID[0] == "@":  # is a group
-			return ID
-		else:  # is a glyph
-			return Font.glyphForId_(ID).name
-	except Exception as e:
-		raise e
+from kerningindex import KerningIndex
 
 
 class DeleteSmallKerningPairs(mekkaObject):
@@ -119,7 +109,7 @@ class DeleteSmallKerningPairs(mekkaObject):
 			thisFont = Glyphs.font  # frontmost font
 			thisFontMaster = thisFont.selectedFontMaster  # active master
 			thisFontMasterID = thisFontMaster.id  # active master ID
-			thisFontMasterKernDict = thisFont.kerning[thisFontMasterID]  # kerning dictionary
+			kerningIndex = KerningIndex(thisFont, (thisFontMasterID, ))  # glyph IDs and kerning values, collected once
 
 			if ((shouldRemovePositive or shouldRemoveNegative) and maxKernValue) or shouldRemoveZero:
 				willRemove = "kernings smaller than %i" % maxKernValue
@@ -132,32 +122,35 @@ class DeleteSmallKerningPairs(mekkaObject):
 				countZero = 0
 				countPositive = 0
 				countNegative = 0
-				for leftGlyphID in thisFontMasterKernDict.keys():
-					for rightGlyphID in thisFontMasterKernDict[leftGlyphID].keys():
-
-						countClasses = 0
-						if leftGlyphID.startswith("@"):
-							countClasses += 1
-						if rightGlyphID.startswith("@"):
-							countClasses += 1
-
-						if (shouldRemoveGlyphToGlyph and countClasses == 0) or \
-							(shouldRemoveGlyphToClass and countClasses == 1) or \
-							(shouldRemoveClassToClass and countClasses == 2):
-
-							kerningValue = thisFontMasterKernDict[leftGlyphID][rightGlyphID]
-							leftName = nameForID(thisFont, leftGlyphID)
-							rightName = nameForID(thisFont, rightGlyphID)
-
-							if shouldRemoveZero and kerningValue == 0.0:
-								kernpairsToBeRemoved.append((leftName, rightName))
-								countZero += 1
-							elif shouldRemovePositive and 0.0 < kerningValue < maxKernValue:
-								kernpairsToBeRemoved.append((leftName, rightName))
-								countPositive += 1
-							elif shouldRemoveNegative and 0.0 > kerningValue > -maxKernValue:
-								kernpairsToBeRemoved.append((leftName, rightName))
-								countNegative += 1
+				kerningValues = kerningIndex.values[thisFontMasterID]
+				for pairIndex, (leftGlyphID, rightGlyphID) in enumerate(kerningIndex.pairs):
+
+					countClasses = 0
+					if leftGlyphID.startswith("@"):
+						countClasses += 1
+					if rightGlyphID.startswith("@"):
+						countClasses += 1
+
+					if (shouldRemoveGlyphToGlyph and countClasses == 0) or \
+						(shouldRemoveGlyphToClass and countClasses == 1) or \
+						(shouldRemoveClassToClass and countClasses == 2):
+
+						kerningValue = kerningValues[pairIndex]
+						leftName = kerningIndex.nameForKey(leftGlyphID)
+						rightName = kerningIndex.nameForKey(rightGlyphID)
+						if leftName is None or rightName is None:
+							print("   ⚠️ Orphaned glyph ID in pair %s-%s, skipping." % (leftGlyphID, rightGlyphID))
+							continue
+
+						if shouldRemoveZero and kerningValue == 0.0:
+							kernpairsToBeRemoved.append((leftName, rightName))
+							countZero += 1
+						elif shouldRemovePositive and 0.0 < kerningValue < maxKernValue:
+							kernpairsToBeRemoved.append((leftName, rightName))
+							countPositive += 1
+						elif shouldRemoveNegative and 0.0 > kerningValue > -maxKernValue:
+							kernpairsToBeRemoved.append((leftName, rightName))
+							countNegative += 1
 
 				# remove the pairs:
 				thisFont.disableUpdateInterface()
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+
+import os
+import re
+
+leftSideMarkers = ("MMK_L_", "_1ST", "_first")
+rightSideMarkers = ("MMK_R_", "_2ND", "_second")
+
+# strings first, so a '#' inside a string does not start a comment:
+tokenPattern = re.compile(r'"[^"\n]*"|#.*|[\[\]{}();=,\'<>]|[^\s\[\]{}();=,\'<>#"]+')
+positionKeywords = ("pos", "position")
+enumKeywords = ("enum", "enumerate")
+
+
+def iterFeaTokens(filePath):
+	"""Yields the tokens of an AFDKO feature file one by one, without comments, reading the file line by line."""
+	with open(filePath, encoding="utf-8", errors="replace") as feaFile:
+		for line in feaFile:
+			for token in tokenPattern.findall(line):
+				if not token.startswith("#"):
+					yield token
+
+
+def iterFeaStatements(filePath, includeDepth=0):
+	"""
+	Yields (tokens, terminator) for every statement in an AFDKO feature file,
+	terminator being ';', '{' or '}'. Statements may span any number of lines.
+	include() statements are followed, relative to the including file.
+	"""
+	tokens = []
+	for token in iterFeaTokens(filePath):
+		if token in ";{}":
+			if token == ";" and tokens and tokens[0] == "include" and includeDepth < 50:
+				includePath = "".join(tokens[1:]).strip("()").strip()
+				if not os.path.isabs(includePath):
+					includePath = os.path.join(os.path.dirname(filePath), includePath)
+				if os.path.isfile(includePath):
+					for statement in iterFeaStatements(includePath, includeDepth + 1):
+						yield statement
+				tokens = []
+				continue
+			yield tokens, token
+			tokens = []
+		else:
+			tokens.append(token)
+	if tokens:
+		yield tokens, None
+
+
+def groupNameForFeaClass(className):
+	"""Kerning group name as used in Glyphs, e.g. '@MMK_L_A' -> 'A', '@T_1ST' -> 'T'."""
+	groupName = className
+	for nameParticle in leftSideMarkers + rightSideMarkers + ("@", "."):
+		groupName = groupName.replace(nameParticle, "")
+	return groupName
+
+
+def numberOrNone(token):
+	try:
+		return float(token)
+	except ValueError:
+		return None
+
+
+class FeaKerning:
+	"""
+	Kerning parsed from an AFDKO feature file: glyph class definitions and pair positioning
+	statements, including multi-line classes, inline [classes], enum pos, value records,
+	lookup blocks and subtable breaks. Glyph names are kept as written in the file.
+	pairs: {(left, right): (value, enumerated)}, sides being a glyph name, a '@class' or a tuple of glyph names.
+	As in OpenType, the first definition of a pair wins, later ones are counted as duplicates.
+	"""
+
+	def __init__(self, filePath=None):
+		self.classes = {}
+		self.pairs = {}
+		self.lookupCount = 0
+		self.subtableCount = 0
+		self.duplicateCount = 0
+		self.skipped = {}  # reason -> count of skipped statements
+		if filePath:
+			self.parseFile(filePath)
+
+	def skip(self, reason):
+		self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+	def parseFile(self, filePath):
+		for tokens, terminator in iterFeaStatements(filePath):
+			if not tokens:
+				continue
+			keyword = tokens[0]
+			if terminator == "{":
+				if keyword == "lookup":
+					self.lookupCount += 1
+			elif terminator == "}":
+				continue
+			elif keyword.startswith("@") and len(tokens) > 1 and tokens[1] == "=":
+				self.parseClassDefinition(tokens)
+			elif keyword in positionKeywords:
+				self.parsePosition(tokens[1:], enumerated=False)
+			elif keyword in enumKeywords and len(tokens) > 1 and tokens[1] in positionKeywords:
+				self.parsePosition(tokens[2:], enumerated=True)
+			elif keyword == "subtable":
+				self.subtableCount += 1
+			elif keyword == "ignore" and len(tokens) > 1 and tokens[1] in positionKeywords:
+				self.skip("ignore pos")
+		return self
+
+	def glyphNamesOfTokens(self, tokens):
+		"""Glyph names of the contents of a glyph class, with nested @classes resolved."""
+		glyphNames = []
+		for token in tokens:
+			if token.startswith("@"):
+				glyphNames.extend(self.classes.get(token, ()))
+			elif token not in "[]":
+				glyphNames.append(token.lstrip("\\"))
+		return glyphNames
+
+	def parseClassDefinition(self, tokens):
+		# @name = [a b c]; or @name = @other;
+		self.classes[tokens[0]] = self.glyphNamesOfTokens(tokens[2:])
+
+	def parseGlyphOrClass(self, tokens, i):
+		"""Returns (side, next index) for the glyph, @class or [inline class] at tokens[i]."""
+		token = tokens[i]
+		if token == "[":
+			end = tokens.index("]", i)
+			glyphNames = self.glyphNamesOfTokens(tokens[i + 1:end])
+			if len(glyphNames) == 1:
+				return glyphNames[0], end + 1
+			return tuple(glyphNames), end + 1
+		if token.startswith("@"):
+			return token, i + 1
+		return token.lstrip("\\"), i + 1
+
+	def parseValue(self, tokens):
+		"""Horizontal advance adjustment of a number or a <xPla yPla xAdv yAdv> value record, or None."""
+		if len(tokens) == 1:
+			return numberOrNone(tokens[0])
+		if tokens[0] == "<" and tokens[-1] == ">":
+			numbers = [numberOrNone(token) for token in tokens[1:-1]]
+			if len(numbers) == 1:
+				return numbers[0]
+			if len(numbers) == 4 and None not in numbers:
+				return numbers[2]
+		return None
+
+	def parsePosition(self, tokens, enumerated):
+		if "'" in tokens:
+			self.skip("contextual pos")
+			return
+		try:
+			left, i = self.parseGlyphOrClass(tokens, 0)
+			if tokens[i] == "<":
+				self.skip("single pos or pair pos with two value records")
+				return
+			right, i = self.parseGlyphOrClass(tokens, i)
+		except (IndexError, ValueError):
+			self.skip("incomplete pos")
+			return
+		value = self.parseValue(tokens[i:])
+		if value is None:
+			self.skip("pos without usable value")
+			return
+		pair = (left, right)
+		if pair in self.pairs:
+			self.duplicateCount += 1
+		else:
+			self.pairs[pair] = (value, enumerated)
+
+
+def buildKerning(feaKerning, glyphKeyForName):
+	"""
+	Translates parsed .fea kerning into Glyphs kerning groups and one kerning dictionary.
+	glyphKeyForName(feaGlyphName) returns the glyph key (glyph ID) in the target font, or None if there is no such glyph.
+	Classes become kerning groups on the side(s) they are used on; enumerated pairs and inline classes
+	become glyph pairs. If a glyph is in several classes for the same side, it keeps its first one and the pairs
+	of the other classes become exceptions for it, so no pair gets lost.
+	Returns (kerning, rightGroupOfGlyph, leftGroupOfGlyph, report):
+	kerning = {leftKey: {rightKey: value}}, rightGroupOfGlyph/leftGroupOfGlyph = {glyphKey: groupName},
+	report = {'missingGlyphs': set, 'undefinedClasses': set, 'droppedPairs': int, 'groupConflicts': int}.
+	"""
+	missingGlyphs = set()
+	keyForName = {}
+
+	def glyphKey(glyphName):
+		if glyphName not in keyForName:
+			key = glyphKeyForName(glyphName)
+			keyForName[glyphName] = key
+			if key is None:
+				missingGlyphs.add(glyphName)
+		return keyForName[glyphName]
+
+	def glyphKeys(glyphNames):
+		keys = (glyphKey(glyphName) for glyphName in glyphNames)
+		return [key for key in keys if key is not None]
+
+	# which side is every class used on:
+	classSides = {}
+	for (left, right), (value, enumerated) in feaKerning.pairs.items():
+		if not enumerated:
+			for side, isLeft in ((left, True), (right, False)):
+				if isinstance(side, str) and side.startswith("@"):
+					classSides.setdefault(side, set()).add(isLeft)
+
+	# assign groups, first class wins for every glyph and side:
+	rightGroupOfGlyph = {}  # kerning group of glyphs on the left side of a pair
+	leftGroupOfGlyph = {}
+	groupedMembers = {}  # (className, isLeft) -> glyph keys that carry the group
+	strayMembers = {}  # (className, isLeft) -> glyph keys already in another group
+	for className, sides in classSides.items():
+		groupName = groupNameForFeaClass(className)
+		for isLeft in sides:
+			groupOfGlyph = rightGroupOfGlyph if isLeft else leftGroupOfGlyph
+			grouped, stray = [], []
+			for key in glyphKeys(feaKerning.classes.get(className, ())):
+				if groupOfGlyph.setdefault(key, groupName) == groupName:
+					grouped.append(key)
+				else:
+					stray.append(key)
+			groupedMembers[className, isLeft] = grouped
+			strayMembers[className, isLeft] = stray
+
+	def keysOfSide(side, isLeft, enumerated):
+		"""Returns (kern keys for the grouped members or glyph, glyph keys that need exceptions)."""
+		if isinstance(side, tuple):
+			return glyphKeys(side), []
+		if side.startswith("@"):
+			if enumerated:
+				return glyphKeys(feaKerning.classes.get(side, ())), []
+			prefix = "@MMK_L_" if isLeft else "@MMK_R_"
+			groupKeys = [prefix + groupNameForFeaClass(side)] if groupedMembers.get((side, isLeft)) else []
+			return groupKeys, strayMembers.get((side, isLeft), [])
+		key = glyphKey(side)
+		return ([key] if key is not None else []), []
+
+	kerning = {}
+	exceptions = []
+	droppedPairs = 0
+	groupConflicts = sum(len(stray) for stray in strayMembers.values())
+	for (left, right), (value, enumerated) in feaKerning.pairs.items():
+		leftKeys, leftStray = keysOfSide(left, True, enumerated)
+		rightKeys, rightStray = keysOfSide(right, False, enumerated)
+		if not (leftKeys or leftStray) or not (rightKeys or rightStray):
+			droppedPairs += 1
+			continue
+		for leftKey in leftKeys:
+			leftKerning = kerning.setdefault(leftKey, {})
+			for rightKey in rightKeys:
+				leftKerning.setdefault(rightKey, value)
+		# glyphs that belong to another group of the same side get exceptions:
+		for leftKey in leftStray:
+			exceptions.extend((leftKey, rightKey, value) for rightKey in rightKeys + rightStray)
+		for rightKey in rightStray:
+			exceptions.extend((leftKey, rightKey, value) for leftKey in leftKeys)
+
+	# exceptions never override pairs defined explicitly:
+	for leftKey, rightKey, value in exceptions:
+		kerning.setdefault(leftKey, {}).setdefault(rightKey, value)
+
+	undefinedClasses = {
+		side for pair in feaKerning.pairs for side in pair
+		if isinstance(side, str) and side.startswith("@") and side not in feaKerning.classes
+		}
+	report = {
+		"missingGlyphs": missingGlyphs,
+		"undefinedClasses": undefinedClasses,
+		"droppedPairs": droppedPairs,
+		"groupConflicts": groupConflicts,
+	}
+	return kerning, rightGroupOfGlyph, leftGroupOfGlyph, report
@@ -3,8 +3,15 @@ from __future__ import print_function
 
 from AppKit import NSPoint, NSNotFound
 from mekkablue import caseDict
-from GlyphsApp import Glyphs, GSLayer, GSPath, GSNode, GSLINE
+from mekkablue.geometry import FlatOutline
+from GlyphsApp import Glyphs, GSGlyphsInfo, GSLayer, GSPath, GSNode, GSLINE
+from array import array
+from bisect import bisect_left
+from operator import add
+import hashlib
 import math
+import os
+import pickle
 
 if Glyphs.versionNumber >= 3.0:
 	from GlyphsApp import LTR
@@ -244,6 +251,354 @@ def minDistanceBetweenTwoLayers(leftLayer, rightLayer, interval=5.0, kerning=0.0
 	return minDist
 
 
+def decomposedLayer(layer):
+	"""Returns a copy of layer with components and smart outlines decomposed."""
+	workLayer = layer.copyDecomposedLayer()
+	workLayer.decomposeSmartOutlines()
+	return workLayer
+
+
+def verticalExtentOfLayer(layer):
+	"""Returns (bottomY, topY) of the layer bounds."""
+	if Glyphs.versionNumber >= 3.2:
+		bounds = layer.fastBounds()
+	else:
+		bounds = layer.bounds
+	return bounds.origin.y, bounds.origin.y + bounds.size.height
+
+
+class SidebearingProfile:
+	"""
+	Left and right sidebearings of a layer, sampled once at every multiple of interval.
+	lsb[i] and rsb[i] are measured at height (firstIndex + i) * interval.
+	Heights without outline (e.g. between i and its dot) are stored as infinity,
+	so they never win a min() comparison.
+	hullLSB and hullRSB are the sidebearings of the convex hull of the outline,
+	as (heights, sidebearings) breakpoints, or None if the layer has no hull.
+	"""
+	__slots__ = ("interval", "firstIndex", "lsb", "rsb", "hullLSB", "hullRSB", "minLSB", "minRSB")
+
+	def __init__(self, interval, firstIndex, lsb, rsb, hullLSB=None, hullRSB=None):
+		self.interval = interval
+		self.firstIndex = firstIndex
+		self.lsb = lsb
+		self.rsb = rsb
+		self.hullLSB = hullLSB
+		self.hullRSB = hullRSB
+		self.minLSB = min(lsb, default=math.inf)
+		self.minRSB = min(rsb, default=math.inf)
+
+	def __len__(self):
+		return len(self.lsb)
+
+	@property
+	def lastIndex(self):
+		return self.firstIndex + len(self.lsb) - 1
+
+	def heightForIndex(self, index):
+		return index * self.interval
+
+
+def sidebearingChainsOfHull(hull, width):
+	"""
+	Splits a counter-clockwise convex hull into its left and right side, and returns both
+	as (heights, sidebearings) breakpoints with strictly increasing heights:
+	(lsbChain, rsbChain), or (None, None) if the hull is degenerate.
+	"""
+	if len(hull) < 3:
+		return None, None
+	bottom = min(range(len(hull)), key=lambda i: hull[i][1])
+	top = max(range(len(hull)), key=lambda i: hull[i][1])
+	if hull[bottom][1] == hull[top][1]:
+		return None, None
+	count = len(hull)
+	rightSide = [hull[(bottom + i) % count] for i in range((top - bottom) % count + 1)]
+	leftSide = [hull[(top + i) % count] for i in range((bottom - top) % count + 1)][::-1]
+
+	def chain(points, sidebearing):
+		heights, sidebearings = array("d"), array("d")
+		for x, y in points:
+			if heights and heights[-1] == y:  # horizontal edge: keep the more extreme point
+				sidebearings[-1] = min(sidebearings[-1], sidebearing(x))
+			else:
+				heights.append(y)
+				sidebearings.append(sidebearing(x))
+		return heights, sidebearings
+
+	return chain(leftSide, lambda x: x), chain(rightSide, lambda x: width - x)
+
+
+def sidebearingOfChainAtHeight(chain, height):
+	"""Linear interpolation of a (heights, sidebearings) hull chain at height."""
+	heights, sidebearings = chain
+	index = bisect_left(heights, height)
+	if index == 0:
+		return sidebearings[0]
+	if index == len(heights):
+		return sidebearings[-1]
+	loY, hiY = heights[index - 1], heights[index]
+	loValue, hiValue = sidebearings[index - 1], sidebearings[index]
+	return loValue + (hiValue - loValue) * (height - loY) / (hiY - loY)
+
+
+def sidebearingProfileForLayer(layer, interval=5.0, decompose=True):
+	"""
+	Measures lsb and rsb of layer at every multiple of interval within its vertical extent,
+	and the sidebearings of the convex hull around all its nodes.
+	All heights are probed in one pass over a FlatOutline of the layer. All sidebearings are reduced
+	by its flattening tolerance, so they never over-report the distance to a curve.
+	Set decompose=False if layer already is a decomposed copy.
+	"""
+	if decompose:
+		layer = decomposedLayer(layer)
+	bottomY, topY = verticalExtentOfLayer(layer)
+	firstIndex = math.ceil(bottomY / interval)
+	lastIndex = math.floor(topY / interval)
+	lsb, rsb = array("d"), array("d")
+	heights = [index * interval for index in range(firstIndex, lastIndex + 1)]
+	width = layer.width
+	outline = FlatOutline(layer)
+	# flattened curves can lie up to the tolerance inside the real outline, so pad the extents to stay conservative:
+	padding = outline.tolerance
+	for extent in outline.horizontalExtents(heights):
+		if extent is None:
+			lsb.append(math.inf)
+			rsb.append(math.inf)
+		else:
+			lsb.append(extent[0] - padding)
+			rsb.append(width - extent[1] - padding)
+	points = [(node.x, node.y) for path in layer.paths for node in path.nodes]
+	hullLSB, hullRSB = sidebearingChainsOfHull(convexHull(points), layer.width)
+	return SidebearingProfile(interval, firstIndex, lsb, rsb, hullLSB, hullRSB)
+
+
+def layerContentHash(layer):
+	"""Returns a hex digest of the outline (node positions, node types, open/closed) of a decomposed layer."""
+	coordinates = array("d")
+	nodeTypes = []
+	for path in layer.paths:
+		nodeTypes.append("closed" if path.closed else "open")
+		for node in path.nodes:
+			coordinates.append(node.x)
+			coordinates.append(node.y)
+			nodeTypes.append(str(node.type))
+	digest = hashlib.sha1(coordinates.tobytes())
+	digest.update(" ".join(nodeTypes).encode("utf-8"))
+	return digest.hexdigest()
+
+
+def profileCacheFilePath():
+	"""Returns the path of the on-disk cache file for sidebearing profiles, creating its folder if necessary."""
+	cacheFolder = os.path.join(GSGlyphsInfo.applicationSupportPath(), "Temp", "mekkablue")
+	if not os.path.isdir(cacheFolder):
+		os.makedirs(cacheFolder)
+	return os.path.join(cacheFolder, "SidebearingProfiles.pickle")
+
+
+class SidebearingProfileCache:
+	"""
+	Decomposes and samples every layer only once per master and interval.
+	Usage:
+		profiles = SidebearingProfileCache(font, masterID, interval=5)
+		distance = minDistanceBetweenProfiles(profiles["A"], profiles["V"], kerning=-80)
+	With persistent=True, profiles are also stored on disk, keyed by a hash of the decomposed
+	outline, the layer width, the master ID and the interval. A later run (call save() at the end) only
+	needs to re-sample layers whose outlines have changed in the meantime.
+	"""
+	fileFormatVersion = 5  # 3: profiles sampled on flattened outlines, 4: layer width in the key, 5: padded by the flattening tolerance
+	maxStoredProfiles = 100000  # least recently used profiles are dropped beyond this
+
+	def __init__(self, font, masterID, interval=5.0, persistent=False, cacheFilePath=None):
+		self.font = font
+		self.masterID = masterID
+		self.interval = interval
+		self.profiles = {}
+		self.persistent = persistent
+		self.cacheFilePath = cacheFilePath
+		self.storedProfiles = {}
+		self.sampledCount = 0
+		self.reusedCount = 0
+		if persistent:
+			self.load()
+
+	def __getitem__(self, glyphName):
+		profile = self.profiles.get(glyphName)
+		if profile is None:
+			profile = self.profileForLayer(self.font.glyphs[glyphName].layers[self.masterID])
+			self.profiles[glyphName] = profile
+		return profile
+
+	def profileForLayer(self, layer):
+		"""Returns the SidebearingProfile for any layer, taking it from the on-disk cache if possible."""
+		workLayer = decomposedLayer(layer)
+		if not self.persistent:
+			self.sampledCount += 1
+			return sidebearingProfileForLayer(workLayer, interval=self.interval, decompose=False)
+		key = (layerContentHash(workLayer), workLayer.width, self.masterID, self.interval)  # rsb values depend on the width
+		storedProfile = self.storedProfiles.pop(key, None)  # re-inserted below, keeps most recently used last
+		if storedProfile is None:
+			self.sampledCount += 1
+			profile = sidebearingProfileForLayer(workLayer, interval=self.interval, decompose=False)
+			storedProfile = (profile.firstIndex, profile.lsb, profile.rsb, profile.hullLSB, profile.hullRSB)
+		else:
+			self.reusedCount += 1
+			profile = SidebearingProfile(self.interval, *storedProfile)
+		self.storedProfiles[key] = storedProfile
+		return profile
+
+	def invalidate(self, glyphName=None):
+		"""Forgets the profile of glyphName, or all profiles if no glyph name is given."""
+		if glyphName is None:
+			self.profiles.clear()
+		else:
+			self.profiles.pop(glyphName, None)
+
+	def load(self):
+		if self.cacheFilePath is None:
+			self.cacheFilePath = profileCacheFilePath()
+		try:
+			with open(self.cacheFilePath, "rb") as cacheFile:
+				version, storedProfiles = pickle.load(cacheFile)
+			if version == self.fileFormatVersion:
+				self.storedProfiles = storedProfiles
+		except FileNotFoundError:
+			pass
+		except Exception as e:
+			print(f"⚠️ Ignoring unreadable profile cache {self.cacheFilePath}: {e}")
+
+	def save(self):
+		"""Writes the profiles to the cache file. Does nothing unless the cache is persistent."""
+		if not self.persistent or not self.sampledCount:
+			return
+		excess = len(self.storedProfiles) - self.maxStoredProfiles
+		if excess > 0:
+			for key in list(self.storedProfiles)[:excess]:
+				del self.storedProfiles[key]
+		temporaryFilePath = self.cacheFilePath + ".tmp"
+		try:
+			with open(temporaryFilePath, "wb") as cacheFile:
+				pickle.dump((self.fileFormatVersion, self.storedProfiles), cacheFile, protocol=pickle.HIGHEST_PROTOCOL)
+			os.replace(temporaryFilePath, self.cacheFilePath)
+		except OSError as e:
+			print(f"⚠️ Could not write profile cache {self.cacheFilePath}: {e}")
+
+
+def maskedProfile(profile, ignoreIntervals):
+	"""
+	Returns a copy of profile with all heights inside ignoreIntervals set to infinity,
+	so the mask is applied once per profile rather than once per pair and height.
+	"""
+	if not ignoreIntervals:
+		return profile
+	lsb, rsb = array("d", profile.lsb), array("d", profile.rsb)
+	for loEnd, hiEnd in ignoreIntervals:
+		start = max(math.ceil(loEnd / profile.interval) - profile.firstIndex, 0)
+		end = min(math.floor(hiEnd / profile.interval) - profile.firstIndex + 1, len(lsb))
+		if start < end:
+			gap = array("d", (math.inf, )) * (end - start)
+			lsb[start:end] = gap
+			rsb[start:end] = gap
+	return SidebearingProfile(profile.interval, profile.firstIndex, lsb, rsb, profile.hullLSB, profile.hullRSB)
+
+
+def _minDistanceBetweenMaskedProfiles(leftProfile, rightProfile):
+	firstIndex = max(leftProfile.firstIndex, rightProfile.firstIndex)
+	count = min(leftProfile.lastIndex, rightProfile.lastIndex) - firstIndex + 1
+	if count < 1:
+		return None
+	leftOffset = firstIndex - leftProfile.firstIndex
+	rightOffset = firstIndex - rightProfile.firstIndex
+	minDist = min(map(
+		add,
+		leftProfile.rsb[leftOffset:leftOffset + count],
+		rightProfile.lsb[rightOffset:rightOffset + count],
+	))
+	if minDist == math.inf:  # only gaps, like in i or j
+		return None
+	return minDist
+
+
+def _hullDistanceBetweenProfiles(leftProfile, rightProfile):
+	"""
+	Lower bound for the unkerned distance of two profiles, derived from their convex hulls.
+	The hull sidebearings are piecewise linear and their sum is convex,
+	so the minimum lies on one of the breakpoints or at the ends of the overlap.
+	"""
+	interval = leftProfile.interval
+	bottomY = max(leftProfile.firstIndex, rightProfile.firstIndex) * interval
+	topY = min(leftProfile.lastIndex, rightProfile.lastIndex) * interval
+	heights = [bottomY, topY]
+	heights.extend(y for y in leftProfile.hullRSB[0] if bottomY < y < topY)
+	heights.extend(y for y in rightProfile.hullLSB[0] if bottomY < y < topY)
+	return min(sidebearingOfChainAtHeight(leftProfile.hullRSB, y) + sidebearingOfChainAtHeight(rightProfile.hullLSB, y) for y in heights)
+
+
+def _prefilterStage(leftProfile, rightProfile, threshold):
+	"""
+	Returns the name of the stage that proves two profiles cannot come closer than threshold
+	(unkerned): 'bounds' (no vertical overlap, or sidebearing extremes), 'hull' (convex hulls),
+	or None if the pair has to be measured.
+	"""
+	if max(leftProfile.firstIndex, rightProfile.firstIndex) > min(leftProfile.lastIndex, rightProfile.lastIndex):
+		return "bounds"
+	if threshold is None:
+		return None
+	if leftProfile.minRSB + rightProfile.minLSB >= threshold:
+		return "bounds"
+	if leftProfile.hullRSB and rightProfile.hullLSB and _hullDistanceBetweenProfiles(leftProfile, rightProfile) >= threshold:
+		return "hull"
+	return None
+
+
+def minDistanceBetweenProfiles(leftProfile, rightProfile, kerning=0.0, ignoreIntervals=[]):
+	"""
+	Same as minDistanceBetweenTwoLayers, but compares two SidebearingProfiles
+	(sampled with the same interval) over their overlapping height window.
+	Returns None if the profiles do not overlap.
+	"""
+	minDist = _minDistanceBetweenMaskedProfiles(
+		maskedProfile(leftProfile, ignoreIntervals),
+		maskedProfile(rightProfile, ignoreIntervals),
+	)
+	if minDist is None:
+		return None
+	return minDist + kerning
+
+
+def minDistanceMatrix(leftProfiles, rightProfiles, kerningMatrix=None, ignoreIntervals=[], cutoff=None, statistics=None):
+	"""
+	Returns the N×M min distances between every left and every right profile
+	as a list of N rows, with None for pairs that do not overlap vertically.
+	kerningMatrix: N×M nested sequence of kerning values, or None for no kerning.
+	ignoreIntervals: as returned by sortedIntervalsFromString(), applied once per profile.
+	cutoff: if set, pairs that provably cannot come closer than cutoff are returned as None too.
+		They are rejected by their vertical extents and sidebearing extremes first, then by
+		their convex hulls. Only the remaining pairs are compared height by height.
+	statistics: optional dict, counts pairs pruned by 'bounds', by 'hull', and 'measured' pairs.
+	"""
+	if statistics is None:
+		statistics = {}
+	for stage in ("bounds", "hull", "measured"):
+		statistics.setdefault(stage, 0)
+	leftProfiles = [maskedProfile(p, ignoreIntervals) for p in leftProfiles]
+	rightProfiles = [maskedProfile(p, ignoreIntervals) for p in rightProfiles]
+	distances = []
+	for i, leftProfile in enumerate(leftProfiles):
+		kernings = kerningMatrix[i] if kerningMatrix is not None else (0.0, ) * len(rightProfiles)
+		row = []
+		for rightProfile, kerning in zip(rightProfiles, kernings):
+			prunedBy = _prefilterStage(leftProfile, rightProfile, None if cutoff is None else cutoff - kerning)
+			if prunedBy:
+				statistics[prunedBy] += 1
+				row.append(None)
+				continue
+			statistics["measured"] += 1
+			minDist = _minDistanceBetweenMaskedProfiles(leftProfile, rightProfile)
+			row.append(None if minDist is None else minDist + kerning)
+		distances.append(row)
+	return distances
+
+
 def sortedIntervalsFromString(intervals="", font=None, mID=None):
 	ignoreIntervals = []
 	if intervals:
@@ -309,48 +664,78 @@ def distanceFromEntry(entry, font, masterID, default=0.0):
 			glyphs.append(glyphs[0])
 		elif len(glyphs) == 0:
 			return default
-		leftLayer = glyphs[0].layers[masterID]
-		rightLayer = glyphs[1].layers[masterID]
-		distance = minDistanceBetweenTwoLayers(leftLayer, rightLayer, interval=2.0) + correction
+		leftProfile = sidebearingProfileForLayer(glyphs[0].layers[masterID], interval=2.0)
+		rightProfile = sidebearingProfileForLayer(glyphs[1].layers[masterID], interval=2.0)
+		distance = minDistanceBetweenProfiles(leftProfile, rightProfile) + correction
 		print(f"‘{entry}’ = {distance}")
 	return distance
 
 
-def bubbleForLayer(layer, offset=10.0):
-	def boxIsInsideBox(smallBox, bigBox):
-		if bigBox.size.width * bigBox.size.height == 0.0:
-			return False
-		if smallBox.size.width > bigBox.size.width:
-			return False
-		if smallBox.size.height > bigBox.size.height:
-			return False
-		if smallBox.origin.x < bigBox.origin.x:
-			return False
-		if smallBox.origin.y < bigBox.origin.y:
-			return False
-		if smallBox.origin.x + smallBox.size.width > bigBox.origin.x + bigBox.size.width:
-			return False
-		if smallBox.origin.y + smallBox.size.height > bigBox.origin.y + bigBox.size.height:
-			return False
-		return True
-	
-	# just keep the relevant paths:
-	workLayer = layer.copyDecomposedLayer()
-	workLayer.removeOverlap()
-	collectedPoints = []
-	for path in workLayer.paths:
-		if boxIsInsideBox(path.bounds, workLayer.bounds):
-			continue
-		collectedPoints.extend([(p.x, p.y) for p in path.nodes])
-	
-	bubbleCoordinates = bubble(collectedPoints, offset=offset)
+_hullCache = {}  # content hash of decomposed layer → convex hull, survives between script runs, least recently used first
+_hullCacheByChange = {}  # (glyph ID, layer ID, lastChange) → convex hull, for layers without components
+_maxCachedHulls = 20000
+
+
+def recalledHull(cache, key):
+	"""The hull stored under key, or None. Moves it to the end, so the least recently used hulls stay first."""
+	hull = cache.pop(key, None)
+	if hull is not None:
+		cache[key] = hull
+	return hull
+
+
+def rememberHull(cache, key, hull):
+	"""Stores hull under key, dropping the least recently used hull beyond _maxCachedHulls."""
+	cache.pop(key, None)
+	cache[key] = hull
+	if len(cache) > _maxCachedHulls:
+		del cache[next(iter(cache))]
+
+
+def changeKeyForLayer(layer):
+	"""
+	Returns (glyph ID, layer ID, lastChange) for a layer of a glyph, or None if the key cannot tell whether the outline changed:
+	layers with components (their base glyphs may change), and layers without a glyph or time stamp.
+	"""
+	glyph = layer.parent
+	lastChange = getattr(glyph, "lastChange", None) if glyph else None
+	if lastChange is None or layer.components:
+		return None
+	return (glyph.id, layer.layerId, lastChange)
+
+
+def convexHullForLayer(layer):
+	"""
+	Returns the convex hull (counter-clockwise list of (x, y) tuples) around all shapes of layer.
+	Hulls are cached by the lastChange of the glyph, or else by outline content, so every glyph
+	only pays for decomposition and hull computation once, no matter how many pairs it is in.
+	"""
+	changeKey = changeKeyForLayer(layer)
+	hull = recalledHull(_hullCacheByChange, changeKey) if changeKey else None
+	if hull is not None:
+		return hull
+
+	workLayer = decomposedLayer(layer)
+	key = layerContentHash(workLayer)
+	hull = recalledHull(_hullCache, key)
+	if hull is None:
+		# counters and other inner nodes never end up on the hull, so all nodes can go in:
+		hull = convexHull([(node.x, node.y) for path in workLayer.paths for node in path.nodes])
+		rememberHull(_hullCache, key, hull)
+	if changeKey:
+		rememberHull(_hullCacheByChange, changeKey, hull)
+	return hull
+
+
+def bubbleForLayer(layer, offset=10.0, join="round"):
+	bubbleCoordinates = offsetConvexPolygon(convexHullForLayer(layer), offset=offset, join=join)
 	bubblePath = GSPath()
 	for coord in bubbleCoordinates:
 		newNode = GSNode()
 		newNode.position = NSPoint(*coord)
 		newNode.type = GSLINE
 		bubblePath.nodes.append(newNode)
-	
+
 	bubblePath.closed = True
 	return bubblePath
 
@@ -371,77 +756,114 @@ def bubbleLayer(layer, offset=0):
 	return newLayer
 
 
-def bubble(points, offset=0.0):
+def convexHull(points):
 	"""
-	Creates a counter-clockwise winding polygon with only left angles around a list of NSPoints.
-	:param points: List of NSPoints (each NSPoint is represented as a tuple of (x, y)).
-	:param offset: Padding distance, default is 0.0.
-	:return: List of NSPoints representing the outer polygon.
+	Returns the convex hull of points (tuples of x, y) as a counter-clockwise list of points,
+	starting with the bottom-most of the leftmost points, without collinear points.
+	Andrew's monotone chain algorithm, O(n log n).
 	"""
-	offset *= -1
-	
+	points = sorted(set(points))
 	if len(points) < 3:
 		return points
 
-	# Calculate convex hull using Gift Wrapping algorithm
-	hull = []
-	leftMost = min(points, key=lambda p: p[0])
-	pointOnHull = leftMost
-
-	while True:
-		hull.append(pointOnHull)
-		nextPoint = points[0]
-		for candidate in points[1:]:
-			# Check if candidate forms a left turn
-			if nextPoint == pointOnHull or _calculateCrossProduct(pointOnHull, nextPoint, candidate) < 0:
-				nextPoint = candidate
-		if nextPoint == leftMost:
-			break
-		pointOnHull = nextPoint
-
-	# Create offset points
+	lowerHull = []
+	for point in points:
+		while len(lowerHull) >= 2 and _calculateCrossProduct(lowerHull[-2], lowerHull[-1], point) <= 0:
+			lowerHull.pop()
+		lowerHull.append(point)
+
+	upperHull = []
+	for point in reversed(points):
+		while len(upperHull) >= 2 and _calculateCrossProduct(upperHull[-2], upperHull[-1], point) <= 0:
+			upperHull.pop()
+		upperHull.append(point)
+
+	# last point of each half is the first point of the other:
+	return lowerHull[:-1] + upperHull[:-1]
+
+
+def offsetConvexPolygon(polygon, offset=0.0, join="round", miterLimit=4.0, roundStep=15.0):
+	"""
+	Returns polygon (counter-clockwise, convex, as returned by convexHull) offset outward by offset units.
+	:param join: 'round' (every point of the result is exactly offset away from the polygon),
+		or 'miter' (sharp corners, bevelled where the miter would exceed miterLimit × offset).
+		Negative offsets shrink the polygon and always use miter joins.
+	:param roundStep: maximum angle in degrees between two nodes of a round join.
+	"""
+	count = len(polygon)
+	if count < 3 or not offset:
+		return list(polygon)
+
+	# outward unit normals of all edges, edge i going from polygon[i] to polygon[i+1]:
+	normals = []
+	for i in range(count):
+		(x1, y1), (x2, y2) = polygon[i], polygon[(i + 1) % count]
+		length = math.hypot(x2 - x1, y2 - y1)
+		normals.append(((y2 - y1) / length, (x1 - x2) / length))
+
 	offsetPoints = []
-	
-	# Process each edge of the hull
-	for i in range(len(hull)):
-		p1 = hull[i]
-		p2 = hull[(i + 1) % len(hull)]
-		
-		# Calculate direction and normal vectors
-		deltaX = p2[0] - p1[0]
-		deltaY = p2[1] - p1[1]
-		length = (deltaX * deltaX + deltaY * deltaY) ** 0.5
-		
-		# Normalize and create perpendicular vector
-		normalX = -deltaY / length
-		normalY = deltaX / length
-		
-		# Create offset points
-		offsetPoints.append((
-			p1[0] + normalX * offset,
-			p1[1] + normalY * offset
-		))
-		offsetPoints.append((
-			p2[0] + normalX * offset,
-			p2[1] + normalY * offset
-		))
-
-	# Remove duplicates and sort counter-clockwise
-	offsetPoints = list(set(offsetPoints))
-	center = _calculateCenter(offsetPoints)
-	offsetPoints.sort(key=lambda p: _calculateAngle(p, center))
+	for i in range(count):
+		x, y = polygon[i]
+		previousNormal, nextNormal = normals[i - 1], normals[i]
+		cosine = previousNormal[0] * nextNormal[0] + previousNormal[1] * nextNormal[1]
+		sweep = math.acos(max(-1.0, min(1.0, cosine)))  # angle between the two normals
+		if offset < 0 or join == "miter":
+			if offset < 0 or 2.0 / (1.0 + cosine) <= miterLimit * miterLimit:
+				factor = offset / (1.0 + cosine)
+				offsetPoints.append((x + (previousNormal[0] + nextNormal[0]) * factor, y + (previousNormal[1] + nextNormal[1]) * factor))
+				continue
+			steps = 1  # bevel
+		else:
+			steps = max(1, math.ceil(math.degrees(sweep) / roundStep))
+		startAngle = math.atan2(previousNormal[1], previousNormal[0])
+		for step in range(steps + 1):
+			angle = startAngle + sweep * step / steps
+			offsetPoints.append((x + math.cos(angle) * offset, y + math.sin(angle) * offset))
 	return offsetPoints
 
 
-def _calculateCrossProduct(o, a, b):
-	return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+def bubble(points, offset=0.0, join="round"):
+	"""
+	Creates a counter-clockwise winding polygon with only left angles around a list of NSPoints.
+	:param points: List of NSPoints (each NSPoint is represented as a tuple of (x, y)).
+	:param offset: Padding distance, default is 0.0.
+	:param join: How corners are offset, 'round' (default) or 'miter', see offsetConvexPolygon().
+	:return: List of NSPoints representing the outer polygon.
+	"""
+	return offsetConvexPolygon(convexHull(points), offset=offset, join=join)
 
 
-def _calculateCenter(points):
-	x = sum(p[0] for p in points) / len(points)
-	y = sum(p[1] for p in points) / len(points)
-	return (x, y)
+def _calculateCrossProduct(o, a, b):
+	return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
 
 
-def _calculateAngle(p, center):
-	return math.atan2(p[1] - center[1], p[0] - center[0])
+def benchmarkBubble(pointCounts=(100, 1000, 10000, 100000), offset=10.0, repeat=3):
+	"""
+	Times convexHull() and bubble() on random point clouds and checks the results.
+	Run it in the Macro Window after adding the Kerning folder to sys.path:
+		from kernanalysis import benchmarkBubble
+		benchmarkBubble()
+	"""
+	import random
+	from timeit import default_timer as timer
+	randomizer = random.Random(0)
+	print("Bubble benchmark, best of %i runs:" % repeat)
+	for pointCount in pointCounts:
+		# ring-shaped cloud, so that many points end up near the hull, like with ornate outlines:
+		points = []
+		for _ in range(pointCount):
+			angle = randomizer.uniform(0, 2 * math.pi)
+			radius = 500 * math.sqrt(randomizer.uniform(0.8, 1.0))
+			points.append((radius * math.cos(angle), radius * math.sin(angle)))
+		for name, function in (("hull", lambda: convexHull(points)), ("bubble", lambda: bubble(points, offset=offset))):
+			bestTime = None
+			for _ in range(repeat):
+				start = timer()
+				result = function()
+				elapsed = timer() - start
+				bestTime = elapsed if bestTime is None else min(bestTime, elapsed)
+			print("  %7i points, %-6s %5i nodes: %8.2f ms" % (pointCount, name, len(result), bestTime * 1000))
+		hull = convexHull(points)
+		isConvex = all(_calculateCrossProduct(hull[i - 2], hull[i - 1], hull[i]) > 0 for i in range(len(hull)))
+		containsAll = all(_calculateCrossProduct(hull[i - 1], hull[i], point) >= 0 for i in range(len(hull)) for point in points[::max(1, pointCount // 1000)])
+		print("  %s convex, %s contains all points" % ("✅" if isConvex else "❌", "✅" if containsAll else "❌"))
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+
+from array import array
+import json
+import statistics
+
+leftGroupPrefix = "@MMK_L_"  # left side of a pair = right kerning group of the glyph
+rightGroupPrefix = "@MMK_R_"  # right side of a pair = left kerning group of the glyph
+missingValue = float("nan")
+
+
+class KerningIndex:
+	"""
+	Everything the kerning scripts look up again and again, built once per font:
+	glyph ID <-> name maps, group -> members maps for both sides,
+	and a dense value matrix (one array per master over all pairs of all masters).
+	Kern side keys are what font.kerning uses: glyph IDs or '@MMK_L_'/'@MMK_R_' group keys.
+	All queries are dictionary or array lookups, no scans over font.glyphs or font.kerning.
+	Build a new index after changing kerning or groups.
+	"""
+
+	def __init__(self, font, masterIDs=None):
+		self.font = font
+		masters = font.masters
+		self.masterIDs = list(masterIDs) if masterIDs else [m.id for m in masters]
+		self.masterNames = {m.id: m.name for m in masters}
+		self._indexGlyphs((glyph.id, glyph.name, glyph.leftKerningGroup, glyph.rightKerningGroup, glyph.export) for glyph in font.glyphs)
+		self._indexKerning({masterID: font.kerning.get(masterID) or {} for masterID in self.masterIDs})
+
+	@classmethod
+	def fromSnapshot(cls, snapshot, masterIDs=None):
+		"""Builds the index from a dict made by snapshot(), e.g. loaded from JSON, without a font."""
+		index = cls.__new__(cls)
+		index.font = None
+		index.masterIDs = list(masterIDs) if masterIDs else [masterID for masterID, name in snapshot["masters"]]
+		index.masterNames = {masterID: name for masterID, name in snapshot["masters"]}
+		index._indexGlyphs(snapshot["glyphs"])
+		index._indexKerning({masterID: snapshot["kerning"].get(masterID, {}) for masterID in index.masterIDs})
+		return index
+
+	def _indexGlyphs(self, glyphRecords):
+		"""glyphRecords: iterable of (glyphID, name, leftKerningGroup, rightKerningGroup, export)"""
+		self.glyphRecords = []
+		self.nameForID = {}
+		self.idForName = {}
+		self.exportingNames = set()
+		self.leftGroupOfGlyph = {}  # glyph name -> leftKerningGroup (pair key @MMK_R_)
+		self.rightGroupOfGlyph = {}  # glyph name -> rightKerningGroup (pair key @MMK_L_)
+		self.leftGroupMembers = {}  # leftKerningGroup -> glyph names in font order
+		self.rightGroupMembers = {}  # rightKerningGroup -> glyph names in font order
+		for glyphID, name, leftGroup, rightGroup, export in glyphRecords:
+			self.glyphRecords.append((glyphID, name, leftGroup, rightGroup, bool(export)))
+			self.nameForID[glyphID] = name
+			self.idForName[name] = glyphID
+			if export:
+				self.exportingNames.add(name)
+			if leftGroup:
+				self.leftGroupOfGlyph[name] = leftGroup
+				self.leftGroupMembers.setdefault(leftGroup, []).append(name)
+			if rightGroup:
+				self.rightGroupOfGlyph[name] = rightGroup
+				self.rightGroupMembers.setdefault(rightGroup, []).append(name)
+
+	def _indexKerning(self, kerningForMaster):
+		"""kerningForMaster: {masterID: {leftKey: {rightKey: value}}}, e.g. font.kerning"""
+		self.pairs = []  # (leftKey, rightKey)
+		self.pairIndex = {}  # (leftKey, rightKey) -> index in self.pairs
+		masterPairs = {}
+		for masterID in self.masterIDs:
+			masterKerning = kerningForMaster[masterID]
+			entries = []
+			for leftKey in masterKerning.keys():
+				rightDict = masterKerning[leftKey]
+				for rightKey in rightDict.keys():
+					pair = (leftKey, rightKey)
+					index = self.pairIndex.get(pair)
+					if index is None:
+						index = len(self.pairs)
+						self.pairIndex[pair] = index
+						self.pairs.append(pair)
+					entries.append((index, rightDict[rightKey]))
+			masterPairs[masterID] = entries
+		self.values = {}
+		for masterID, entries in masterPairs.items():
+			values = array("d", [missingValue]) * len(self.pairs)
+			for index, value in entries:
+				values[index] = value
+			self.values[masterID] = values
+
+	# snapshots:
+
+	def snapshot(self):
+		"""Plain, JSON-compatible dict of glyphs, groups and kerning, for fromSnapshot()."""
+		kerning = {}
+		for masterID in self.masterIDs:
+			values = self.values[masterID]
+			masterKerning = kerning[masterID] = {}
+			for (leftKey, rightKey), value in zip(self.pairs, values):
+				if value == value:
+					masterKerning.setdefault(leftKey, {})[rightKey] = value
+		return {
+			"masters": [[masterID, self.masterNames.get(masterID, masterID)] for masterID in self.masterIDs],
+			"glyphs": [list(record) for record in self.glyphRecords],
+			"kerning": kerning,
+		}
+
+	def saveSnapshot(self, filePath):
+		with open(filePath, "w", encoding="utf-8") as f:
+			json.dump(self.snapshot(), f, ensure_ascii=False, indent=0, sort_keys=True)
+
+	@classmethod
+	def loadSnapshot(cls, filePath, masterIDs=None):
+		with open(filePath, encoding="utf-8") as f:
+			return cls.fromSnapshot(json.load(f), masterIDs=masterIDs)
+
+	# kern side keys:
+
+	@staticmethod
+	def isGroupKey(key):
+		return key.startswith("@")
+
+	@staticmethod
+	def groupNameOfKey(key):
+		"""'@MMK_L_A' -> 'A'"""
+		if key.startswith(leftGroupPrefix) or key.startswith(rightGroupPrefix):
+			return key[7:]
+		return key[1:]
+
+	def keyForGlyphName(self, glyphName):
+		return self.idForName.get(glyphName)
+
+	def nameForKey(self, key):
+		"""Group key unchanged, glyph name for a glyph ID, None for an orphaned glyph ID."""
+		if key.startswith("@"):
+			return key
+		return self.nameForID.get(key)
+
+	def groupKeyForGlyphName(self, glyphName, isLeftSide=True):
+		"""The group key under which glyphName is kerned on the left or right side of a pair, or None."""
+		if isLeftSide:
+			group = self.rightGroupOfGlyph.get(glyphName)
+			return leftGroupPrefix + group if group else None
+		group = self.leftGroupOfGlyph.get(glyphName)
+		return rightGroupPrefix + group if group else None
+
+	def membersOfKey(self, key, isLeftSide=True):
+		"""Glyph names in a group key (font order), or the one glyph name of a glyph ID key."""
+		if key.startswith("@"):
+			groups = self.rightGroupMembers if isLeftSide else self.leftGroupMembers
+			return groups.get(self.groupNameOfKey(key), [])
+		name = self.nameForID.get(key)
+		return [name] if name else []
+
+	def glyphNameForKernSide(self, key, isLeftSide=True):
+		"""A representative glyph name for a kern side (first member of a group), or None if orphaned."""
+		if not key.startswith("@"):
+			return self.nameForID.get(key)
+		members = self.membersOfKey(key, isLeftSide)
+		if key.startswith("@MMK_"):
+			# the key may name its preferred glyph, e.g. @MMK_L_A or @MMK_L_KO_A (KernOn):
+			parts = key.split("_")
+			glyphName = parts[3] if len(parts) > 3 and parts[2] == "KO" else parts[2]
+			if glyphName in members:
+				return glyphName
+		return members[0] if members else None
+
+	def isOrphanedKey(self, key, isLeftSide=True):
+		"""True if no glyph in the font carries the group, or the glyph ID does not exist."""
+		return not self.membersOfKey(key, isLeftSide)
+
+	def isException(self, leftKey, rightKey):
+		"""True if at least one side is a glyph that also belongs to a group on that side."""
+		if not leftKey.startswith("@") and self.rightGroupOfGlyph.get(self.nameForID.get(leftKey)):
+			return True
+		if not rightKey.startswith("@") and self.leftGroupOfGlyph.get(self.nameForID.get(rightKey)):
+			return True
+		return False
+
+	# values:
+
+	def valueForPair(self, masterID, leftKey, rightKey):
+		"""Kerning value stored for exactly this pair of keys, or None."""
+		index = self.pairIndex.get((leftKey, rightKey))
+		if index is None:
+			return None
+		value = self.values[masterID][index]
+		return None if value != value else value  # NaN = missing
+
+	def mastersWithPair(self, leftKey, rightKey):
+		"""IDs of the masters that have a value for this pair."""
+		index = self.pairIndex.get((leftKey, rightKey))
+		if index is None:
+			return []
+		return [masterID for masterID in self.masterIDs if self.values[masterID][index] == self.values[masterID][index]]
+
+	def groupValueForPair(self, masterID, leftGlyphName, rightGlyphName):
+		"""Group-to-group kerning of the groups of two glyphs, or None."""
+		leftKey = self.groupKeyForGlyphName(leftGlyphName, isLeftSide=True)
+		rightKey = self.groupKeyForGlyphName(rightGlyphName, isLeftSide=False)
+		if not leftKey or not rightKey:
+			return None
+		return self.valueForPair(masterID, leftKey, rightKey)
+
+	def effectiveKerning(self, masterID, leftGlyphName, rightGlyphName):
+		"""
+		Kerning that applies between two glyphs, in order of precedence:
+		glyph-glyph, glyph-group, group-glyph, group-group. 0.0 if there is none.
+		"""
+		leftID = self.idForName.get(leftGlyphName)
+		rightID = self.idForName.get(rightGlyphName)
+		leftGroupKey = self.groupKeyForGlyphName(leftGlyphName, isLeftSide=True)
+		rightGroupKey = self.groupKeyForGlyphName(rightGlyphName, isLeftSide=False)
+		for leftKey, rightKey in ((leftID, rightID), (leftID, rightGroupKey), (leftGroupKey, rightID), (leftGroupKey, rightGroupKey)):
+			if leftKey and rightKey:
+				value = self.valueForPair(masterID, leftKey, rightKey)
+				if value is not None:
+					return value
+		return 0.0
+
+	def namedPair(self, pairIndex):
+		"""(left, right) of a pair with glyph IDs replaced by glyph names, so it can be compared across files."""
+		leftKey, rightKey = self.pairs[pairIndex]
+		return self.nameForKey(leftKey) or leftKey, self.nameForKey(rightKey) or rightKey
+
+
+def kerningConsistency(kerningIndex, outlierTolerance=None):
+	"""
+	One pass over the aligned value arrays of all masters of kerningIndex. Returns a dict:
+	"missing": [(pairIndex, [masterIDs without the pair]), ...] for pairs present in some masters only,
+	"signFlips": [pairIndex, ...] for pairs that are positive in one master and negative in another,
+	"outliers": [(pairIndex, masterID, value, median), ...] for values further than outlierTolerance
+	from the median of all masters (only with three or more masters, and if outlierTolerance is set).
+	"""
+	masterIDs = kerningIndex.masterIDs
+	columns = [kerningIndex.values[masterID] for masterID in masterIDs]
+	checkOutliers = outlierTolerance is not None and len(masterIDs) > 2
+	missing, signFlips, outliers = [], [], []
+	for pairIndex, row in enumerate(zip(*columns)):
+		present = [value for value in row if value == value]
+		if len(present) < len(row):
+			missing.append((pairIndex, [masterID for masterID, value in zip(masterIDs, row) if value != value]))
+		if len(present) > 1:
+			if min(present) < 0 < max(present):
+				signFlips.append(pairIndex)
+			if checkOutliers and len(present) > 2:
+				median = statistics.median(present)
+				for masterID, value in zip(masterIDs, row):
+					if value == value and abs(value - median) > outlierTolerance:
+						outliers.append((pairIndex, masterID, value, median))
+	return {
+		"missing": missing,
+		"signFlips": signFlips,
+		"outliers": outliers,
+	}
+
+
+def kerningDiff(oldIndex, newIndex, tolerance=0.0):
+	"""
+	Compares two KerningIndex objects, e.g. snapshots of two commits.
+	Masters are matched by ID, or by name if the ID is not in oldIndex; pairs by glyph and group names.
+	Returns {masterName: {"added": [(pair, value)], "removed": [(pair, value)], "changed": [(pair, oldValue, newValue)]}}
+	with changes larger than tolerance; masters only present in one of the indexes are listed
+	with all their pairs as added or removed.
+	"""
+	oldIDForName = {name: masterID for masterID, name in oldIndex.masterNames.items()}
+	diff = {}
+	matchedOldIDs = set()
+	for newID in newIndex.masterIDs:
+		masterName = newIndex.masterNames.get(newID, newID)
+		oldID = newID if newID in oldIndex.values else oldIDForName.get(masterName)
+		newValues = {newIndex.namedPair(i): value for i, value in enumerate(newIndex.values[newID]) if value == value}
+		oldValues = {}
+		if oldID in oldIndex.values:
+			matchedOldIDs.add(oldID)
+			oldValues = {oldIndex.namedPair(i): value for i, value in enumerate(oldIndex.values[oldID]) if value == value}
+		diff[masterName] = {
+			"added": sorted((pair, value) for pair, value in newValues.items() if pair not in oldValues),
+			"removed": sorted((pair, value) for pair, value in oldValues.items() if pair not in newValues),
+			"changed": sorted(
+				(pair, oldValues[pair], value) for pair, value in newValues.items()
+				if pair in oldValues and abs(oldValues[pair] - value) > tolerance
+			),
+		}
+	for oldID in oldIndex.masterIDs:
+		if oldID not in matchedOldIDs:
+			removed = sorted((oldIndex.namedPair(i), value) for i, value in enumerate(oldIndex.values[oldID]) if value == value)
+			diff[oldIndex.masterNames.get(oldID, oldID)] = {"added": [], "removed": removed, "changed": []}
+	return diff
+
+
+if __name__ == "__main__":
+	# command line, e.g. for CI, works on snapshots saved with KerningIndex.saveSnapshot():
+	# python3 kerningindex.py font.kerning.json                  ... consistency report
+	# python3 kerningindex.py old.kerning.json new.kerning.json  ... diff between two snapshots
+	import sys
+	from argparse import ArgumentParser
+
+	parser = ArgumentParser(description="Kerning consistency report for one kerning snapshot, or diff between two snapshots. Exits with 1 if anything was found.")
+	parser.add_argument("snapshots", nargs="+", metavar="snapshot.json", help="One or two JSON kerning snapshots.")
+	parser.add_argument("-t", "--tolerance", type=float, default=0.0, help="Diff: ignore value changes up to this amount (default: 0).")
+	parser.add_argument("-o", "--outliers", type=float, default=None, metavar="UNITS", help="Report: flag values further than UNITS from the median of all masters (needs 3+ masters).")
+	arguments = parser.parse_args()
+	if len(arguments.snapshots) > 2:
+		parser.error("Pass one snapshot for a report, or two for a diff.")
+
+	foundSomething = False
+	if len(arguments.snapshots) == 1:
+		kerningIndex = KerningIndex.loadSnapshot(arguments.snapshots[0])
+		report = kerningConsistency(kerningIndex, outlierTolerance=arguments.outliers)
+		for pairIndex, masterIDs in report["missing"]:
+			print("Missing: %s %s in %s" % (*kerningIndex.namedPair(pairIndex), ", ".join(kerningIndex.masterNames.get(m, m) for m in masterIDs)))
+		for pairIndex in report["signFlips"]:
+			print("Sign flip: %s %s" % kerningIndex.namedPair(pairIndex))
+		for pairIndex, masterID, value, median in report["outliers"]:
+			print("Outlier: %s %s in %s: %g (median %g)" % (*kerningIndex.namedPair(pairIndex), kerningIndex.masterNames.get(masterID, masterID), value, median))
+		foundSomething = any(report.values())
+	else:
+		oldIndex, newIndex = (KerningIndex.loadSnapshot(filePath) for filePath in arguments.snapshots)
+		for masterName, changes in kerningDiff(oldIndex, newIndex, tolerance=arguments.tolerance).items():
+			for (left, right), value in changes["added"]:
+				print("%s: + %s %s %g" % (masterName, left, right, value))
+			for (left, right), value in changes["removed"]:
+				print("%s: - %s %s %g" % (masterName, left, right, value))
+			for (left, right), oldValue, newValue in changes["changed"]:
+				print("%s: ~ %s %s %g -> %g" % (masterName, left, right, oldValue, newValue))
+			foundSomething = foundSomething or any(changes.values())
+	sys.exit(1 if foundSomething else 0)
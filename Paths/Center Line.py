@@ -8,6 +8,7 @@ Will create center lines between selected segments and their opposites. Hold dow
 from AppKit import NSPoint, NSPointInRect, NSEvent, NSNonZeroWindingRule
 from GlyphsApp import GSPath, GSPathSegment, GSBackgroundLayer
 from copy import copy
+from mekkablue.geometry import FlatOutline
 
 Glyphs.clearLog()
 
@@ -141,16 +142,16 @@ def segmentNodesAtPoint(layer, point):
 		nodes.append(copy(nextNode))
 	return nodes
 
-def intersectionsForMeasureRay(segment, layer, t, measureLength):
+def intersectionsForMeasureRay(segment, outline, t, measureLength):
 	"""
 	Fires a measuring ray perpendicular to segment at parameter t and returns the
-	raw list of intersection NSValue objects with the layer outline.
+	list of intersection NSPoints with outline, a FlatOutline of the layer.
 
 	The ray points inward (left-hand normal of the segment direction). measureStart
 	is offset one unit from the midpoint so the ray does not self-intersect with the
 	origin segment. measureEnd extends measureLength units in that direction.
-	The list is passed to layer.intersectionsBetweenPoints() and returned as-is;
-	the caller is responsible for sorting and interpreting the results.
+	Like layer.intersectionsBetweenPoints(), the list starts with measureEnd and ends
+	with measureStart; the caller is responsible for sorting and interpreting the results.
 	"""
 	middleOfSegment = segment.pointAtTime_(t)
 	normalR = segment.normalAtTime_(t)
@@ -158,10 +159,10 @@ def intersectionsForMeasureRay(segment, layer, t, measureLength):
 	# set off a little bit so we don't intersect with the origin segment:
 	measureStart = addPoints(middleOfSegment, normalL)
 	measureEnd = addPoints(middleOfSegment, scalePoint(normalL, measureLength))
-	return layer.intersectionsBetweenPoints(measureEnd, measureStart)
+	return outline.intersectionsBetweenPoints(measureEnd, measureStart)
 
 
-def bestOpposingSegment(layer, original, hits, t, measureLength, rayOrigin=None):
+def bestOpposingSegment(layer, original, hits, t, measureLength, rayOrigin=None, outline=None):
 	"""
 	Given a list of candidate hit points (sorted by distance from the segment midpoint,
 	with hits[0] being the first wall crossing past the ray origin), finds the node list
@@ -186,6 +187,8 @@ def bestOpposingSegment(layer, original, hits, t, measureLength, rayOrigin=None)
 	     bounding-box diagonal length is closest to that of the original segment.
 	     This favours opposing segments of similar size over distant coincidental hits.
 
+	outline: FlatOutline of layer for the reciprocal rays, built from layer if omitted.
+
 	Duplicate-segment artefacts from segmentNodesAtPoint (e.g. 8 nodes that are two
 	identical 4-node segments) are collapsed before filtering.
 	Returns the winning node list, or None if no candidates were found at any hit.
@@ -260,12 +263,15 @@ def bestOpposingSegment(layer, original, hits, t, measureLength, rayOrigin=None)
 		return GSPathSegment.alloc().initWithCurvePoint1_point2_point3_point4_options_(
 			A.position, B.position, C.position, D.position, 0)
 
+	if outline is None:
+		outline = FlatOutline(layer)
+
 	def rayHitsOriginal(seg, tRay):
-		candIntersections = intersectionsForMeasureRay(seg, layer, tRay, measureLength)
+		candIntersections = intersectionsForMeasureRay(seg, outline, tRay, measureLength)
 		if not candIntersections:
 			return False
 		candMid = seg.pointAtTime_(tRay)
-		candHits = sorted([p.pointValue() for p in candIntersections], key=lambda p: distance(p, candMid))
+		candHits = sorted(candIntersections, key=lambda p: distance(p, candMid))
 		for hit in candHits[1:]:
 			hitNodes = segmentNodesAtPoint(layer, hit)
 			if not hitNodes:
@@ -762,8 +768,14 @@ def createCenterLinesForSelectedSegments(layer, t=0.5, inBackground=False, selec
 		layer.bounds.size.height * 0.66,
 		(layer.bounds.size.width**2 + layer.bounds.size.height**2)**0.5 / 2,
 	)
+	fullOutline = None
 	for j, path in enumerate(layer.paths):
 		relevantLayer = buildRelevantLayer(path, layer)
+		if relevantLayer is not layer:
+			relevantOutline = FlatOutline(relevantLayer)
+		else:
+			fullOutline = fullOutline or FlatOutline(layer)
+			relevantOutline = fullOutline
 		preselectedNodes = relevantSegmentStarts(path, layer)
 		for x in preselectedNodes:
 			x.selected=True
@@ -796,16 +808,16 @@ def createCenterLinesForSelectedSegments(layer, t=0.5, inBackground=False, selec
 					D.position,
 					0,
 					)
-			intersections = intersectionsForMeasureRay(segment, relevantLayer, t, measureLength)
+			intersections = intersectionsForMeasureRay(segment, relevantOutline, t, measureLength)
 			middleOfSegment = segment.pointAtTime_(t)
 
 			if intersections and len(intersections) > 2:
-				rayOrigin = intersections[-1].pointValue()
+				rayOrigin = intersections[-1]
 				hits = sorted(
-					[i.pointValue() for i in intersections[1:-1]],
+					intersections[1:-1],
 					key=lambda intersection: distance(intersection, middleOfSegment)
 					)
-				bestHit = bestOpposingSegment(relevantLayer, original=segmentNodes, hits=hits, t=t, measureLength=measureLength, rayOrigin=rayOrigin)
+				bestHit = bestOpposingSegment(relevantLayer, original=segmentNodes, hits=hits, t=t, measureLength=measureLength, rayOrigin=rayOrigin, outline=relevantOutline)
 				if not bestHit:
 					continue
 
@@ -6,14 +6,13 @@ Finds all kinds of potential problems in outlines, and opens a new tab with affe
 """
 
 import vanilla
-import math
 from timeit import default_timer as timer
-from AppKit import NSPoint
-from GlyphsApp import Glyphs, GSPath, GSShapeTypePath, GSLINE, GSCURVE, CURVE, GSOFFCURVE, QCURVE, Message, distance
+from GlyphsApp import Glyphs, Message
 import importlib
 import mekkablue
 importlib.reload(mekkablue)
 from mekkablue import mekkaObject, newLineControlLayer, reportTimeInNaturalLanguage
+from pathanalysis import pathRules, ruleBits, PathChecker  # noqa: E402
 
 
 canHaveOpenOutlines = (
@@ -24,451 +23,6 @@ canHaveOpenOutlines = (
 )
 
 
-def hasStrayPoints(thisLayer):
-	for p in thisLayer.paths:
-		if len(p.nodes) == 1:
-			return True
-	return False
-
-
-def hasDecimalCoordinates(thisLayer):
-	for p in thisLayer.paths:
-		for n in p.nodes:
-			for coord in (n.x, n.y):
-				if coord % 1.0 != 0.0:
-					return True
-	return False
-
-
-def hasQuadraticCurves(thisLayer):
-	for p in thisLayer.paths:
-		for n in p.nodes:
-			if n.type is QCURVE:
-				return True
-	return False
-
-
-def hasOffcurveAsStartPoint(Layer):
-	for p in Layer.paths:
-		scenario1 = p.nodes[0].type == GSOFFCURVE and p.nodes[1].type != GSOFFCURVE
-		scenario2 = p.nodes[0].type == CURVE and p.nodes[-1].type == GSOFFCURVE
-		if scenario1 or scenario2:
-			return True
-	return False
-
-
-def hasShallowCurveSegment(thisLayer, minSize):
-	for thisPath in thisLayer.paths:
-		for thisNode in thisPath.nodes:
-			if thisNode.type == CURVE:
-				thisSegment = (
-					thisNode.prevNode.prevNode.prevNode,
-					thisNode.prevNode.prevNode,
-					thisNode.prevNode,
-					thisNode,
-				)
-				xCoords = [p.x for p in thisSegment]
-				yCoords = [p.y for p in thisSegment]
-				xDist = abs(min(xCoords) - max(xCoords))
-				yDist = abs(min(yCoords) - max(yCoords))
-				if xDist < minSize or yDist < minSize:
-					for affectedNode in thisSegment:
-						thisLayer.selection.append(affectedNode)
-					return True
-	return False
-
-
-def hasZeroHandles(thisLayer):
-	for thisPath in thisLayer.paths:
-		numberOfNodes = len(thisPath.nodes)
-		for i in range(numberOfNodes - 1):
-			thisNode = thisPath.nodes[i]
-			if thisNode.type == GSOFFCURVE:
-				prevNodeIndex = (i - 1) % numberOfNodes
-				nextNodeIndex = (i + 1) % numberOfNodes
-				prevNode = thisPath.nodes[prevNodeIndex]
-				nextNode = thisPath.nodes[nextNodeIndex]
-				if thisNode.position == prevNode.position or thisNode.position == nextNode.position:
-					return True
-	return False
-
-
-def hasTwoPointOutlines(thisLayer):
-	for thisPath in thisLayer.paths:
-		onCurveNodes = [n for n in thisPath.nodes if n.type != GSOFFCURVE]
-		if len(onCurveNodes) < 3:
-			return True
-	return False
-
-
-def hasOpenPaths(thisLayer):
-	for thisPath in thisLayer.paths:
-		if not thisPath.closed:
-			return True
-	return False
-
-
-def hasBadOutlineOrder(thisLayer):
-	firstPath = None
-	if Glyphs.versionNumber >= 3:
-		# GLYPHS 3
-		if thisLayer.shapes:
-			for thisShape in thisLayer.shapes:
-				if isinstance(thisShape, GSPath):
-					firstPath = thisShape
-					break
-	else:
-		# GLYPHS 2
-		if thisLayer.paths:
-			firstPath = thisLayer.paths[0]
-
-	if firstPath and firstPath.direction != -1 and len(thisLayer.paths) > 1:
-		return True
-	else:
-		return False
-
-
-def hasAlmostOrthogonalLines(thisLayer, threshold=3.0, minLength=50, minLengthCheck=False):
-	for thisPath in thisLayer.paths:
-		for i, thisNode in enumerate(thisPath.nodes):
-			if thisNode.type == GSLINE:
-				prevNodeIndex = (i - 1) % len(thisPath.nodes)
-				prevNode = thisPath.nodes[prevNodeIndex]
-				if minLengthCheck:
-					length = distance(thisNode.position, prevNode.position)
-					if length < minLength:
-						continue
-				xDiff = abs(thisNode.x - prevNode.x)
-				yDiff = abs(thisNode.y - prevNode.y)
-				if (0.1 < xDiff and xDiff < threshold) or (0.1 < yDiff and threshold > yDiff):
-					return True
-	return False
-
-
-def hasShortSegment(thisLayer, threshold=8.0):
-	for thisPath in thisLayer.paths:
-		for thisSegment in thisPath.segments:
-			if thisSegment.length() < threshold:
-				return True
-	return False
-
-
-def hasShallowCurve(thisLayer, threshold=5.0):
-	for thisPath in thisLayer.paths:
-		for i, thisNode in enumerate(thisPath.nodes):
-			if thisNode.type == GSCURVE:
-				pointA = thisNode.position
-				pointB = thisPath.nodes[(i - 1) % len(thisPath.nodes)].position
-				pointC = thisPath.nodes[(i - 2) % len(thisPath.nodes)].position
-				pointD = thisPath.nodes[(i - 3) % len(thisPath.nodes)].position
-				for handle in (pointC, pointD):
-					dist, vect = distanceAndRelativePosition(pointA, pointB, handle)
-					if 0.0 < vect < 1.0 and dist < threshold:
-						return True
-	return False
-
-
-def hasBadPathDirections(thisLayer):
-	copyLayer = thisLayer.copy()
-	copyLayer.correctPathDirection()
-	for i in range(len(copyLayer.paths)):
-		originalPath = thisLayer.paths[i]
-		copyPath = copyLayer.paths[i]
-		if copyPath.direction != originalPath.direction:
-			return True
-	return False
-
-
-def hasShallowCurveBBox(thisLayer, threshold=10.0):
-	for thisPath in thisLayer.paths:
-		for i, thisNode in enumerate(thisPath.nodes):
-			if thisNode.type == GSCURVE:
-				pointA = thisNode.position
-				pointD = thisPath.nodes[(i - 3) % len(thisPath.nodes)].position
-				if abs(pointA.x - pointD.x) < threshold or abs(pointA.y - pointD.y) < threshold:
-					minX, maxX = sorted((pointA.x, pointD.x))
-					minY, maxY = sorted((pointA.y, pointD.y))
-					pointB = thisPath.nodes[(i - 1) % len(thisPath.nodes)].position
-					pointC = thisPath.nodes[(i - 2) % len(thisPath.nodes)].position
-					horizontallyWithin = minX - 1 < min(pointB.x, pointC.x) and maxX + 1 > max(pointB.x, pointC.x)
-					verticallyWithin = minY - 1 < min(pointB.y, pointC.y) and maxY + 1 > max(pointB.y, pointC.y)
-					if horizontallyWithin and verticallyWithin:
-						return True
-	return False
-
-
-def angleBetweenPoints(firstPoint, secondPoint):
-	"""
-	Returns the angle (in degrees) of the straight line between firstPoint and secondPoint,
-	0 degrees being the second point to the right of first point.
-	firstPoint, secondPoint: must be NSPoint or GSNode
-	"""
-	xDiff = secondPoint.x - firstPoint.x
-	yDiff = secondPoint.y - firstPoint.y
-	return math.degrees(math.atan2(yDiff, xDiff))
-
-
-def hasAngledHandles(thisLayer, threshold=8):
-	for thisPath in thisLayer.paths:
-		for i, handle in enumerate(thisPath.nodes):
-			if handle.type == GSOFFCURVE:
-				onCurveNodeIndex = (i - 1) % len(thisPath.nodes)
-				onCurveNode = thisPath.nodes[onCurveNodeIndex]
-				if onCurveNode.type == GSOFFCURVE:
-					onCurveNodeIndex = (i + 1) % len(thisPath.nodes)
-					onCurveNode = thisPath.nodes[onCurveNodeIndex]
-				handleIsOrthogonal = handle.x == onCurveNode.x or handle.y == onCurveNode.y
-				if not handleIsOrthogonal:
-					angle = math.fabs(math.fmod(angleBetweenPoints(handle.position, onCurveNode.position), 90.0))
-					if angle < threshold or angle > (90 - threshold):
-						return True
-	return False
-
-
-def hasShortHandles(thisLayer, threshold=10.0):
-	for thisPath in thisLayer.paths:
-		for i, handle in enumerate(thisPath.nodes):
-			if handle.type == GSOFFCURVE:
-				onCurveNodeIndex = (i - 1) % len(thisPath.nodes)
-				onCurveNode = thisPath.nodes[onCurveNodeIndex]
-				if onCurveNode.type == GSOFFCURVE:
-					onCurveNodeIndex = (i + 1) % len(thisPath.nodes)
-					onCurveNode = thisPath.nodes[onCurveNodeIndex]
-				if 0.0 < distance(handle.position, onCurveNode.position) < threshold:
-					return True
-	return False
-
-
-def hasEmptyPaths(thisLayer):
-	for thisShape in thisLayer.shapes:
-		if thisShape.shapeType == GSShapeTypePath and len(thisShape.nodes) == 0:
-			return True
-	return False
-
-
-def intersect(pointA, pointB, pointC, pointD):
-	"""
-	Returns an NSPoint of the intersection AB with CD,
-	or None if there is no intersection.
-	pointA, pointB: NSPoints or GSNodes representing the first line AB,
-	pointC, pointD: NSPoints or GSNodes representing the second line CD.
-	"""
-	xA, yA = pointA.x, pointA.y
-	xB, yB = pointB.x, pointB.y
-	xC, yC = pointC.x, pointC.y
-	xD, yD = pointD.x, pointD.y
-
-	try:
-		slopeAB = (float(yB) - float(yA)) / (float(xB) - float(xA))
-	except:
-		slopeAB = None  # division by zero if vertical
-
-	try:
-		slopeCD = (float(yD) - float(yC)) / (float(xD) - float(xC))
-	except:
-		slopeCD = None  # division by zero if vertical
-
-	if slopeAB == slopeCD:  # parallel, no intersection
-		return None
-	elif slopeAB is None:  # first line is vertical
-		x = xA
-		y = slopeCD * (x - xC) + yC
-	elif slopeCD is None:  # second line is vertical
-		x = xC
-		y = slopeAB * (x - xA) + yA
-	else:  # both lines have different angles other than vertical
-		x = (slopeAB * xA - yA - slopeCD * xC + yC) / (slopeAB - slopeCD)
-		y = slopeAB * (x - xA) + yA
-	return NSPoint(x, y)
-
-
-def hasLargeHandles(thisLayer):
-	for thisPath in thisLayer.paths:
-		for i, thisNode in enumerate(thisPath.nodes):
-			if thisNode.type == GSCURVE:
-				pointA = thisNode.position
-				pointB = thisPath.nodes[(i - 1) % len(thisPath.nodes)].position
-				pointC = thisPath.nodes[(i - 2) % len(thisPath.nodes)].position
-				pointD = thisPath.nodes[(i - 3) % len(thisPath.nodes)].position
-				intersection = intersect(pointA, pointB, pointC, pointD)
-				if intersection:
-					firstHandleTooLong = distance(pointA, pointB) >= distance(pointA, intersection)
-					secondHandleTooLong = distance(pointD, pointC) >= distance(pointD, intersection)
-					if firstHandleTooLong or secondHandleTooLong:
-						return True
-	return False
-
-
-def hasOutwardHandles(thisLayer):
-	for thisPath in thisLayer.paths:
-		for i, thisNode in enumerate(thisPath.nodes):
-			if thisNode.type == GSCURVE:
-				pointA = thisNode.position
-				pointB = thisPath.nodes[(i - 1) % len(thisPath.nodes)].position
-				pointC = thisPath.nodes[(i - 2) % len(thisPath.nodes)].position
-				pointD = thisPath.nodes[(i - 3) % len(thisPath.nodes)].position
-				if isOutside(pointA, pointD, pointB) or isOutside(pointA, pointD, pointC):
-					return True
-	return False
-
-
-def hasCuspingHandles(thisLayer):
-	for thisPath in thisLayer.paths:
-		for n in thisPath.nodes:
-			if n.type == GSOFFCURVE and n.nextNode.type == GSOFFCURVE:
-				distAC = distance(n.prevNode.position, n.nextNode.position)
-				distAB = distance(n.prevNode.position, n.position)
-				distBD = distance(n.position, n.nextNode.nextNode.position)
-				distCD = distance(n.nextNode.position, n.nextNode.nextNode.position)
-				if distAC < distAB and distBD < distCD:
-					thisLayer.selection = (n, n.nextNode)
-					return True
-
-
-def isOutside(p1, p2, p3):
-	"""
-	Returns True if p3 is outside p1-p2.
-	"""
-	deviation, nx = distanceAndRelativePosition(p1, p2, p3)
-	if nx < 0.0 or nx > 1.0:
-		return True
-	return False
-
-
-def distanceAndRelativePosition(p1, p2, p3):
-	"""
-	Returns:
-	1. distance from p3 to nearest point of p1-p2
-	2. relative position (0...1) of p3 between p1 & p2
-	"""
-	x1, y1 = p1.x, p1.y
-	x2, y2 = p2.x, p2.y
-	x3, y3 = p3.x, p3.y
-
-	dx = x2 - x1
-	dy = y2 - y1
-	d2 = dx * dx + dy * dy
-	try:
-		nx = ((x3 - x1) * dx + (y3 - y1) * dy) / d2
-	except:
-		# division by zero
-		nx = 0.0
-
-	deviation = distance(p3, NSPoint(dx * nx + x1, dy * nx + y1))
-	return deviation, nx
-
-
-def curvatureRadiusAtEnd(p1, p2, p3):
-	"""
-	Radius of curvature at the end (t=1) of a cubic Bézier segment P0–P1–P2–P3.
-	P0 is not needed; only P1, P2, P3 are required.
-	Returns the radius as a positive float, or None for degenerate cases.
-	"""
-	# P'(1) = 3*(P3 - P2)
-	dx = 3.0 * (p3.x - p2.x)
-	dy = 3.0 * (p3.y - p2.y)
-	# P''(1) = 6*(P3 - 2*P2 + P1)
-	ddx = 6.0 * (p3.x - 2.0 * p2.x + p1.x)
-	ddy = 6.0 * (p3.y - 2.0 * p2.y + p1.y)
-	denom = (dx * dx + dy * dy) ** 1.5
-	if denom < 1e-6:
-		return None
-	kappa = abs(dx * ddy - dy * ddx) / denom
-	if kappa < 1e-9:
-		return None  # near-straight; skip
-	return 1.0 / kappa
-
-
-def curvatureRadiusAtStart(p0, p1, p2):
-	"""
-	Radius of curvature at the start (t=0) of a cubic Bézier segment P0–P1–P2–P3.
-	P3 is not needed; only P0, P1, P2 are required.
-	Returns the radius as a positive float, or None for degenerate cases.
-	"""
-	# P'(0) = 3*(P1 - P0)
-	dx = 3.0 * (p1.x - p0.x)
-	dy = 3.0 * (p1.y - p0.y)
-	# P''(0) = 6*(P0 - 2*P1 + P2)
-	ddx = 6.0 * (p0.x - 2.0 * p1.x + p2.x)
-	ddy = 6.0 * (p0.y - 2.0 * p1.y + p2.y)
-	denom = (dx * dx + dy * dy) ** 1.5
-	if denom < 1e-6:
-		return None
-	kappa = abs(dx * ddy - dy * ddx) / denom
-	if kappa < 1e-9:
-		return None  # near-straight; skip
-	return 1.0 / kappa
-
-
-def findGreenDiscontinuity(layer, tolerance=0.11):
-	"""
-	Find G2 discontinuities at smooth nodes connecting two cubic curve segments.
-
-	A smooth node (green node in Glyphs) with off-curve neighbors on both sides
-	signals the designer's intent for continuous curvature (G2). This function
-	detects where the curvature radius actually jumps.
-
-	The relative deviation formula |R1 - R2| / (R1 + R2) is scale-independent
-	and matches the standard used by professional CAD tools (CATIA, Rhino, Alias).
-
-	Tolerance guidelines:
-	  0.05 (5%)  — strict, for high-end/display work
-	  0.11 (11%) — standard default, professional work
-	  0.15 (15%) — relaxed, rough QA or small-size fonts
-
-	Args:
-		layer: GSLayer to analyze
-		tolerance: relative curvature deviation threshold (0.0–1.0), default 0.11
-
-	Returns:
-		List of (node, deviationRatio, inRadius, outRadius) tuples where
-		deviationRatio >= tolerance, sorted by deviation descending.
-	"""
-	discontinuities = []
-
-	for path in layer.paths:
-		nodeCount = len(path.nodes)
-
-		for i, node in enumerate(path.nodes):
-			if not node.smooth:
-				continue
-
-			# Indices of the four surrounding nodes
-			iP1in = (i - 2) % nodeCount  # P1 of incoming segment
-			iP2in = (i - 1) % nodeCount  # P2 of incoming segment (handle before node)
-			iP1out = (i + 1) % nodeCount  # P1 of outgoing segment (handle after node)
-			iP2out = (i + 2) % nodeCount  # P2 of outgoing segment
-
-			p2in = path.nodes[iP2in]
-			p1out = path.nodes[iP1out]
-
-			# Both immediate neighbors must be off-curve (curve–curve junction)
-			if p2in.type != GSOFFCURVE or p1out.type != GSOFFCURVE:
-				continue
-
-			p1in = path.nodes[iP1in]
-			p2out = path.nodes[iP2out]
-
-			# The second handles must also be off-curve (full cubic bezier on each side)
-			if p1in.type != GSOFFCURVE or p2out.type != GSOFFCURVE:
-				continue
-
-			inRadius = curvatureRadiusAtEnd(p1in, p2in, node)
-			outRadius = curvatureRadiusAtStart(node, p1out, p2out)
-
-			if inRadius is None or outRadius is None:
-				continue
-
-			# Scale-independent relative deviation
-			deviation = abs(inRadius - outRadius) / (inRadius + outRadius)
-
-			if deviation >= tolerance:
-				discontinuities.append((node, deviation, inRadius, outRadius))
-
-	discontinuities.sort(key=lambda x: x[1], reverse=True)
-	return discontinuities
-
-
 class PathProblemFinder(mekkaObject):
 	title = "Path Problem Finder"
 	prefDict = {
@@ -744,34 +298,14 @@ class PathProblemFinder(mekkaObject):
 		self.SavePreferences()
 
 		# Query user settings:
-		zeroHandles = self.pref("zeroHandles")
-		outwardHandles = self.pref("outwardHandles")
-		cuspingHandles = self.pref("cuspingHandles")
-		largeHandles = self.pref("largeHandles")
-		offcurveAsStartPoint = self.pref("offcurveAsStartPoint")
-		shortHandles = self.pref("shortHandles")
 		shortHandlesThreshold = self.pref("shortHandlesThreshold")
-		angledHandles = self.pref("angledHandles")
 		angledHandlesAngle = float(self.pref("angledHandlesAngle"))
-		shallowCurveBBox = self.pref("shallowCurveBBox")
 		shallowCurveBBoxThreshold = self.pref("shallowCurveBBoxThreshold")
-		shallowCurve = self.pref("shallowCurve")
 		shallowCurveThreshold = self.pref("shallowCurveThreshold")
-		almostOrthogonalLines = self.pref("almostOrthogonalLines")
 		almostOrthogonalLinesThreshold = self.pref("almostOrthogonalLinesThreshold")
 		almostOrthogonalLinesMinLengthCheck = self.pref("almostOrthogonalLinesMinLengthCheck")
 		almostOrthogonalLinesMinLength = self.pref("almostOrthogonalLinesMinLength")
-		shortSegment = self.pref("shortSegment")
 		shortSegmentThreshold = self.pref("shortSegmentThreshold")
-		badOutlineOrder = self.pref("badOutlineOrder")
-		badPathDirections = self.pref("badPathDirections")
-		strayPoints = self.pref("strayPoints")
-		twoPointOutlines = self.pref("twoPointOutlines")
-		openPaths = self.pref("openPaths")
-		emptyPaths = self.pref("emptyPaths")
-		quadraticCurves = self.pref("quadraticCurves")
-		decimalCoordinates = self.pref("decimalCoordinates")
-		greenDiscontinuity = self.pref("greenDiscontinuity")
 		greenDiscontinuityTolerance = float(self.pref("greenDiscontinuityTolerance")) / 100.0
 		includeAllGlyphs = self.pref("includeAllGlyphs")
 		includeAllFonts = self.pref("includeAllFonts")
@@ -828,69 +362,22 @@ class PathProblemFinder(mekkaObject):
 				glyphCount = len(glyphs)
 				print(f"Processing {glyphCount} glyphs:")
 
-				allTestLayers = []
-				allTestReports = []
-
-				layersWithZeroHandles = []
-				allTestLayers.append(layersWithZeroHandles)
-				allTestReports.append("Zero Handles")
-				layersWithOutwardHandles = []
-				allTestLayers.append(layersWithOutwardHandles)
-				allTestReports.append("Outward Handles")
-				layersWithCuspingHandles = []
-				allTestLayers.append(layersWithCuspingHandles)
-				allTestReports.append("Cusping Handles")
-				layersWithLargeHandles = []
-				allTestLayers.append(layersWithLargeHandles)
-				allTestReports.append("Large Handles")
-				layersWithShortHandles = []
-				allTestLayers.append(layersWithShortHandles)
-				allTestReports.append("Short Handles")
-				layersWithAngledHandles = []
-				allTestLayers.append(layersWithAngledHandles)
-				allTestReports.append("Angled Handles")
-				layersWithShallowCurve = []
-				allTestLayers.append(layersWithShallowCurve)
-				allTestReports.append("Shallow Curve")
-				layersWithShallowCurveBBox = []
-				allTestLayers.append(layersWithShallowCurveBBox)
-				allTestReports.append("Small Curve BBox")
-				layersWithAlmostOrthogonalLines = []
-				allTestLayers.append(layersWithAlmostOrthogonalLines)
-				allTestReports.append("Almost Orthogonal Lines")
-				layersWithshortSegments = []
-				allTestLayers.append(layersWithshortSegments)
-				allTestReports.append("Short Line Segments")
-				layersWithBadOutlineOrder = []
-				allTestLayers.append(layersWithBadOutlineOrder)
-				allTestReports.append("Bad Outline Order")
-				layersWithBadPathDirections = []
-				allTestLayers.append(layersWithBadPathDirections)
-				allTestReports.append("Bad Path Orientation")
-				layersWithOffcurveAsStartpoint = []
-				allTestLayers.append(layersWithOffcurveAsStartpoint)
-				allTestReports.append("Off-curve as start point")
-				layersWithStrayPoints = []
-				allTestLayers.append(layersWithStrayPoints)
-				allTestReports.append("Stray Points")
-				layersWithTwoPointOutlines = []
-				allTestLayers.append(layersWithTwoPointOutlines)
-				allTestReports.append("Two-Point Outlines")
-				layersWithOpenPaths = []
-				allTestLayers.append(layersWithOpenPaths)
-				allTestReports.append("Open Paths")
-				layersWithQuadraticCurves = []
-				allTestLayers.append(layersWithQuadraticCurves)
-				allTestReports.append("Quadratic Curves")
-				layersWithDecimalCoordinates = []
-				allTestLayers.append(layersWithDecimalCoordinates)
-				allTestReports.append("Decimal Coordinates")
-				layersWithEmptyPaths = []
-				allTestLayers.append(layersWithEmptyPaths)
-				allTestReports.append("Empty Paths")
-				layersWithGreenDiscontinuity = []
-				allTestLayers.append(layersWithGreenDiscontinuity)
-				allTestReports.append("G2 Discontinuity")
+				checker = PathChecker(
+					[ruleName for ruleName, reportTitle, message in pathRules if self.pref(ruleName)],
+					shortHandlesThreshold=float(shortHandlesThreshold),
+					angledHandlesAngle=angledHandlesAngle,
+					shallowCurveThreshold=float(shallowCurveThreshold),
+					shallowCurveBBoxThreshold=float(shallowCurveBBoxThreshold),
+					almostOrthogonalLinesThreshold=float(almostOrthogonalLinesThreshold),
+					almostOrthogonalLinesMinLengthCheck=almostOrthogonalLinesMinLengthCheck,
+					almostOrthogonalLinesMinLength=float(almostOrthogonalLinesMinLength),
+					shortSegmentThreshold=float(shortSegmentThreshold),
+					greenDiscontinuityTolerance=greenDiscontinuityTolerance,
+				)
+
+				# one list of affected layers per rule, in report order:
+				allTestLayers = [[] for rule in pathRules]
+				allTestReports = [reportTitle for ruleName, reportTitle, message in pathRules]
 
 				progressSteps = glyphCount / 10
 				progressCounter = 0
@@ -905,123 +392,37 @@ class PathProblemFinder(mekkaObject):
 					self.w.status.set(f"{fontIndex}. {thisGlyph.name}...")
 					# print(f"{i + 1}. {thisGlyph.name}")
 
+					allowOpenPaths = any(nameStart in thisGlyph.name for nameStart in canHaveOpenOutlines)
+
 					# step through layers
 					for thisLayer in thisGlyph.layers:
 						if thisLayer.isMasterLayer or thisLayer.isSpecialLayer:
-
-							if zeroHandles and hasZeroHandles(thisLayer):
-								layersWithZeroHandles.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Zero handle(s) on layer: {thisLayer.name}")
-
-							if outwardHandles and hasOutwardHandles(thisLayer):
-								layersWithOutwardHandles.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Outward handle(s) on layer: {thisLayer.name}")
-
-							if cuspingHandles and hasCuspingHandles(thisLayer):
-								layersWithCuspingHandles.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Cusping handle(s) on layer: {thisLayer.name}")
-
-							if largeHandles and hasLargeHandles(thisLayer):
-								layersWithLargeHandles.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Large handle(s) on layer: {thisLayer.name}")
-
-							if offcurveAsStartPoint and hasOffcurveAsStartPoint(thisLayer):
-								layersWithOffcurveAsStartpoint.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Off-curve as start point on layer: {thisLayer.name}")
-
-							if shortHandles and hasShortHandles(thisLayer, threshold=float(shortHandlesThreshold)):
-								layersWithShortHandles.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Short handle(s) on layer: {thisLayer.name}")
-
-							if angledHandles and hasAngledHandles(thisLayer, angledHandlesAngle):
-								layersWithAngledHandles.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Angled handle(s) on layer: {thisLayer.name}")
-
-							if shallowCurve and hasShallowCurve(thisLayer, threshold=float(shallowCurveThreshold)):
-								layersWithShallowCurve.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Shallow curve(s) on layer: {thisLayer.name}")
-
-							if shallowCurveBBox and hasShallowCurveBBox(thisLayer, threshold=float(shallowCurveBBoxThreshold)):
-								layersWithShallowCurveBBox.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Shallow curve bbox(es) on layer: {thisLayer.name}")
-
-							if almostOrthogonalLines and hasAlmostOrthogonalLines(thisLayer, threshold=float(almostOrthogonalLinesThreshold), minLength=float(almostOrthogonalLinesMinLength), minLengthCheck=almostOrthogonalLinesMinLengthCheck):
-								layersWithAlmostOrthogonalLines.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Almost orthogonal line(s) on layer: {thisLayer.name}")
-
-							if shortSegment and hasShortSegment(thisLayer, threshold=float(shortSegmentThreshold)):
-								layersWithshortSegments.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Short line(s) on layer: {thisLayer.name}")
-
-							if badOutlineOrder and hasBadOutlineOrder(thisLayer):
-								layersWithBadOutlineOrder.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Bad outline order(s) on layer: {thisLayer.name}")
-
-							if badPathDirections and hasBadPathDirections(thisLayer):
-								layersWithBadPathDirections.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Bad path direction(s) on layer: {thisLayer.name}")
-
-							if strayPoints and hasStrayPoints(thisLayer):
-								layersWithStrayPoints.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Stray points on layer: {thisLayer.name}")
-
-							if twoPointOutlines and hasTwoPointOutlines(thisLayer):
-								layersWithTwoPointOutlines.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Two-point outline(s) on layer: {thisLayer.name}")
-
-							if openPaths:
-								shouldProcess = True
-								for nameStart in canHaveOpenOutlines:
-									if nameStart in thisGlyph.name:
-										shouldProcess = False
-								if shouldProcess and hasOpenPaths(thisLayer):
-									layersWithOpenPaths.append(thisLayer)
-									if verbose:
-										print(f"  ❌ Open path(s) on layer: {thisLayer.name}")
-
-							if decimalCoordinates and hasDecimalCoordinates(thisLayer):
-								layersWithDecimalCoordinates.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Decimal coordinates in layer: {thisLayer.name}")
-
-							if quadraticCurves and hasQuadraticCurves(thisLayer):
-								layersWithQuadraticCurves.append(thisLayer)
-								if verbose:
-									print(f"  ❌ Quadratic curves in layer: {thisLayer.name}")
-
-							if emptyPaths and hasEmptyPaths(thisLayer):
-								layersWithEmptyPaths.append(thisLayer)
+							issueMask, findings = checker.issuesOfLayer(thisLayer, allowOpenPaths=allowOpenPaths)
+							if not issueMask:
+								continue
+
+							for ruleIndex, (ruleName, reportTitle, message) in enumerate(pathRules):
+								if issueMask & ruleBits[ruleName]:
+									allTestLayers[ruleIndex].append(thisLayer)
+									if verbose and ruleName != "greenDiscontinuity":
+										print(f"  ❌ {message}: {thisLayer.name}")
+
+							for pathIndex, nodeIndex in findings.get("cuspingHandles", [])[:1]:
+								node = checker.nodeOfLayer(thisLayer, pathIndex, nodeIndex)
+								thisLayer.selection = (node, node.nextNode)
+
+							greenIssues = findings.get("greenDiscontinuity")
+							if greenIssues:
+								nodes = [checker.nodeOfLayer(thisLayer, pathIndex, nodeIndex) for pathIndex, nodeIndex, deviation, inRadius, outRadius in greenIssues]
+								for node in nodes:
+									node.selected = True
 								if verbose:
-									print(f"  ❌ Empty paths in layer: {thisLayer.name}")
-
-							if greenDiscontinuity:
-								greenIssues = findGreenDiscontinuity(thisLayer, tolerance=greenDiscontinuityTolerance)
-								if greenIssues:
-									layersWithGreenDiscontinuity.append(thisLayer)
-									for node, deviation, inRadius, outRadius in greenIssues:
-										node.selected = True
-									if verbose:
-										for node, deviation, inRadius, outRadius in greenIssues:
-											print(f"  ❌ G2 {deviation * 100:.1f}% in '{thisGlyph.name}' ({thisLayer.name}) at ({node.x:.0f}, {node.y:.0f})")
-									else:
-										worstDeviation = greenIssues[0][1]
-										nodeCount = len(greenIssues)
-										print(f"  ❌ G2 {worstDeviation * 100:.1f}% (worst of {nodeCount}) in '{thisGlyph.name}' ({thisLayer.name})")
+									for node, (pathIndex, nodeIndex, deviation, inRadius, outRadius) in zip(nodes, greenIssues):
+										print(f"  ❌ G2 {deviation * 100:.1f}% in '{thisGlyph.name}' ({thisLayer.name}) at ({node.x:.0f}, {node.y:.0f})")
+								else:
+									worstDeviation = greenIssues[0][2]
+									nodeCount = len(greenIssues)
+									print(f"  ❌ G2 {worstDeviation * 100:.1f}% (worst of {nodeCount}) in '{thisGlyph.name}' ({thisLayer.name})")
 
 				anyIssueFound = any(allTestLayers)
 				countOfLayers = 0
@@ -9,6 +9,7 @@ import vanilla
 from Foundation import NSPoint
 from GlyphsApp import Glyphs, GSAnnotation, PLUS, Message, distance, subtractPoints, scalePoint, addPoints
 from mekkablue import mekkaObject, UpdateButton
+from mekkablue.geometry import FlatOutline
 
 
 def pointDistance(p1, p2):
@@ -195,45 +196,48 @@ class StraightStemCruncher(mekkaObject):
 
 		self.SavePreferences()
 
-	def stemThicknessAtLine(self, layer, p1, p2, measureLength):
-		h = p2.x - p1.x
-		v = p2.y - p1.y
-		length = (h**2 + v**2)**0.5
-
-		hUnit = h / length
-		vUnit = v / length
-
-		h = hUnit * measureLength
-		v = vUnit * measureLength
-
-		measurePoint1 = middleBetweenTwoPoints(p1, p2)
-		# print "  middle:", measurePoint1, hUnit, vUnit
-		# measurePoint1.x += vUnit*2
-		# measurePoint1.y -= hUnit*2
-
-		measurePoint2 = NSPoint(measurePoint1.x - v, measurePoint1.y + h)
-		intersections = layer.intersectionsBetweenPoints(measurePoint1, measurePoint2)
-
-		if measurePoint1 != intersections[0].pointValue():
-			intersections = intersections[::-1]
-
-		if len(intersections) > 2:
-			# two measurement points:
-			p1 = intersections[0].pointValue()
-			p2 = intersections[1].pointValue()
-
-			# calculate stem width:
-			stemWidth = distance(p1, p2)
-
-			# calculate center of stem:
-			vector = subtractPoints(p2, p1)
-			scaledVector = scalePoint(vector, 0.5)
-			centerOfStem = addPoints(p1, scaledVector)
-
-			# return results:
-			return stemWidth, centerOfStem
-		else:
-			return None
+	def stemThicknessesAtLines(self, outline, lines, measureLength):
+		"""
+		Returns (stem width, center of stem) for every (p1, p2) in lines, measured with a ray from the middle
+		of p1-p2 perpendicular to it, or None where the ray does not hit the opposite side of the stem.
+		outline: FlatOutline of the measured layer, so all rays are cast in one call.
+		"""
+		measureRays = []
+		for p1, p2 in lines:
+			h = p2.x - p1.x
+			v = p2.y - p1.y
+			length = (h**2 + v**2)**0.5
+
+			hUnit = h / length
+			vUnit = v / length
+
+			h = hUnit * measureLength
+			v = vUnit * measureLength
+
+			measurePoint1 = middleBetweenTwoPoints(p1, p2)
+			measurePoint2 = NSPoint(measurePoint1.x - v, measurePoint1.y + h)
+			measureRays.append((measurePoint1, measurePoint2))
+
+		results = []
+		for intersections in outline.intersectionsBetweenPointPairs(measureRays):
+			if len(intersections) > 2:
+				# two measurement points:
+				p1 = intersections[0]
+				p2 = intersections[1]
+
+				# calculate stem width:
+				stemWidth = distance(p1, p2)
+
+				# calculate center of stem:
+				vector = subtractPoints(p2, p1)
+				scaledVector = scalePoint(vector, 0.5)
+				centerOfStem = addPoints(p1, scaledVector)
+
+				# collect results:
+				results.append((stemWidth, centerOfStem))
+			else:
+				results.append(None)
+		return results
 
 	def measureStraighStemsInLayer(self, layer, glyphName=""):
 		try:
@@ -251,7 +255,9 @@ class StraightStemCruncher(mekkaObject):
 		measureLayer = layer.copyDecomposedLayer()
 		measureLayer.parent = layer.parent
 		measureLayer.removeOverlap()
+		measureLength = max(100.0, measureLayer.bounds.size.width + measureLayer.bounds.size.height)
 
+		lines = []
 		for thisPath in measureLayer.paths:
 			nodeCount = len(thisPath.nodes)
 			if nodeCount > 2:
@@ -276,18 +282,21 @@ class StraightStemCruncher(mekkaObject):
 						# if p1.x==p2.x or p1.y==p2.y or not self.pref("ignoreDiagonals"):
 						if check:
 							if pointDistance(p1, p2) >= minLength:
-								measureLength = max(100.0, measureLayer.bounds.size.width + measureLayer.bounds.size.height)
-								results = self.stemThicknessAtLine(measureLayer, p1, p2, measureLength)
-								if results:
-									measurement, centerOfStem = results
-									measurements.append(measurement)
-									centers.append(centerOfStem)
+								lines.append((p1, p2))
 			else:
 				print(u"⚠️ Found path with only %i point%s%s." % (
 					nodeCount,
 					"" if nodeCount == 1 else "s",
 					" in %s" % glyphName if glyphName else "",
 				))
+
+		if lines:
+			outline = FlatOutline(measureLayer)
+			for results in self.stemThicknessesAtLines(outline, lines, measureLength):
+				if results:
+					measurement, centerOfStem = results
+					measurements.append(measurement)
+					centers.append(centerOfStem)
 		return measurements, centers
 
 	def StraightStemCruncherMain(self, sender):
@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+
+from mekkablue.layernodes import LayerNodes, lineCode, curveCode, offcurveCode, qcurveCode
+import math
+
+# (prefName, report title, verbose message), in report order.
+# The position in this tuple is the bit of the rule in an issue mask.
+pathRules = (
+	("zeroHandles", "Zero Handles", "Zero handle(s) on layer"),
+	("outwardHandles", "Outward Handles", "Outward handle(s) on layer"),
+	("cuspingHandles", "Cusping Handles", "Cusping handle(s) on layer"),
+	("largeHandles", "Large Handles", "Large handle(s) on layer"),
+	("shortHandles", "Short Handles", "Short handle(s) on layer"),
+	("angledHandles", "Angled Handles", "Angled handle(s) on layer"),
+	("shallowCurve", "Shallow Curve", "Shallow curve(s) on layer"),
+	("shallowCurveBBox", "Small Curve BBox", "Shallow curve bbox(es) on layer"),
+	("almostOrthogonalLines", "Almost Orthogonal Lines", "Almost orthogonal line(s) on layer"),
+	("shortSegment", "Short Line Segments", "Short line(s) on layer"),
+	("badOutlineOrder", "Bad Outline Order", "Bad outline order(s) on layer"),
+	("badPathDirections", "Bad Path Orientation", "Bad path direction(s) on layer"),
+	("offcurveAsStartPoint", "Off-curve as start point", "Off-curve as start point on layer"),
+	("strayPoints", "Stray Points", "Stray points on layer"),
+	("twoPointOutlines", "Two-Point Outlines", "Two-point outline(s) on layer"),
+	("openPaths", "Open Paths", "Open path(s) on layer"),
+	("quadraticCurves", "Quadratic Curves", "Quadratic curves in layer"),
+	("decimalCoordinates", "Decimal Coordinates", "Decimal coordinates in layer"),
+	("emptyPaths", "Empty Paths", "Empty paths in layer"),
+	("greenDiscontinuity", "G2 Discontinuity", "G2 discontinuity in layer"),
+)
+ruleBits = {rule[0]: 1 << i for i, rule in enumerate(pathRules)}
+
+# rules that need the GSLayer itself, not just its flattened nodes:
+layerRules = ("badOutlineOrder", "badPathDirections")
+
+
+def _dist(x1, y1, x2, y2):
+	return math.hypot(x2 - x1, y2 - y1)
+
+
+def _distanceAndRelativePosition(x1, y1, x2, y2, x3, y3):
+	"""
+	Returns distance from p3 to nearest point of line p1-p2,
+	and relative position (0...1) of p3 between p1 & p2.
+	"""
+	dx = x2 - x1
+	dy = y2 - y1
+	d2 = dx * dx + dy * dy
+	nx = ((x3 - x1) * dx + (y3 - y1) * dy) / d2 if d2 else 0.0
+	return _dist(x3, y3, dx * nx + x1, dy * nx + y1), nx
+
+
+def _intersection(xA, yA, xB, yB, xC, yC, xD, yD):
+	"""Intersection of lines AB and CD, or None if they are parallel."""
+	denominator = (xB - xA) * (yD - yC) - (yB - yA) * (xD - xC)
+	if denominator == 0:
+		return None
+	t = ((xC - xA) * (yD - yC) - (yC - yA) * (xD - xC)) / denominator
+	return xA + t * (xB - xA), yA + t * (yB - yA)
+
+
+def _radiusOfCurvature(dx, dy, ddx, ddy):
+	denom = (dx * dx + dy * dy) ** 1.5
+	if denom < 1e-6:
+		return None
+	kappa = abs(dx * ddy - dy * ddx) / denom
+	if kappa < 1e-9:
+		return None  # near-straight; skip
+	return 1.0 / kappa
+
+
+def _bezierLength(points, tolerance=0.001, depth=0):
+	"""
+	Arc length of a Bézier curve of any degree through points [(x, y), ...],
+	halved with de Casteljau until chord and control polygon agree within tolerance.
+	"""
+	chord = _dist(*(points[0] + points[-1]))
+	polygon = sum(_dist(*(p1 + p2)) for p1, p2 in zip(points, points[1:]))
+	if polygon - chord <= tolerance or depth > 20:
+		return (chord + polygon) / 2
+	firstHalf, secondHalf = [points[0]], [points[-1]]
+	while len(points) > 1:
+		points = [((x1 + x2) / 2, (y1 + y2) / 2) for (x1, y1), (x2, y2) in zip(points, points[1:])]
+		firstHalf.append(points[0])
+		secondHalf.insert(0, points[-1])
+	return _bezierLength(firstHalf, tolerance, depth + 1) + _bezierLength(secondHalf, tolerance, depth + 1)
+
+
+def _segmentLength(xs, ys, indexes, quadratic=False):
+	"""
+	Arc length of a segment through the nodes at indexes, like segment.length() in Glyphs.
+	quadratic: TrueType spline with implied on-curve points between consecutive off-curves.
+	"""
+	points = [(xs[i], ys[i]) for i in indexes]
+	if len(points) == 2:
+		return _dist(*(points[0] + points[1]))
+	if not quadratic or len(points) == 3:
+		return _bezierLength(points)
+	length = 0.0
+	start = points[0]
+	for i in range(1, len(points) - 1):
+		offcurve = points[i]
+		end = points[i + 1] if i == len(points) - 2 else ((offcurve[0] + points[i + 1][0]) / 2, (offcurve[1] + points[i + 1][1]) / 2)
+		length += _bezierLength([start, offcurve, end])
+		start = end
+	return length
+
+
+def _segmentIsShorterThan(xs, ys, indexes, threshold, quadratic=False):
+	"""Like _segmentLength() < threshold, but only measures the arc if chord and control polygon leave it open."""
+	first, last = indexes[0], indexes[-1]
+	if _dist(xs[first], ys[first], xs[last], ys[last]) >= threshold:
+		return False  # the arc is at least as long as the chord
+	if sum(_dist(xs[a], ys[a], xs[b], ys[b]) for a, b in zip(indexes, indexes[1:])) < threshold:
+		return True  # the arc is at most as long as the control polygon
+	return _segmentLength(xs, ys, indexes, quadratic) < threshold
+
+
+class PathChecker:
+	"""
+	Evaluates all enabled pathRules on a layer in a single pass over its flattened nodes.
+	enabledRules: pref names from pathRules
+	thresholds: keyword arguments overriding the defaults below
+	"""
+	defaults = {
+		"shortHandlesThreshold": 10.0,
+		"angledHandlesAngle": 8.0,
+		"shallowCurveThreshold": 5.0,
+		"shallowCurveBBoxThreshold": 10.0,
+		"almostOrthogonalLinesThreshold": 3.0,
+		"almostOrthogonalLinesMinLengthCheck": False,
+		"almostOrthogonalLinesMinLength": 50.0,
+		"shortSegmentThreshold": 8.0,
+		"greenDiscontinuityTolerance": 0.11,
+	}
+
+	def __init__(self, enabledRules, **thresholds):
+		self.enabledRules = set(enabledRules)
+		self.enabledMask = 0
+		for ruleName in self.enabledRules:
+			self.enabledMask |= ruleBits[ruleName]
+		self.settings = dict(self.defaults)
+		self.settings.update(thresholds)
+
+	def issuesOfLayer(self, layer, allowOpenPaths=False):
+		"""
+		Returns (mask, findings) for layer. mask has the bits of all rules in ruleBits
+		that found an issue. findings holds node positions for rules that select nodes:
+		findings["cuspingHandles"]: [(pathIndex, nodeIndex), ...] for the first handle pair,
+		findings["greenDiscontinuity"]: [(pathIndex, nodeIndex, deviation, inRadius, outRadius), ...],
+		sorted by deviation, largest first.
+		"""
+		enabled = self.enabledMask
+		if allowOpenPaths:
+			enabled &= ~ruleBits["openPaths"]
+		findings = {}
+		if not enabled:
+			return 0, findings
+
+		mask = 0
+		if enabled & ruleBits["badOutlineOrder"]:
+			paths = layer.paths
+			if len(paths) > 1 and paths[0].direction != -1:
+				mask |= ruleBits["badOutlineOrder"]
+		if enabled & ruleBits["badPathDirections"]:
+			copyLayer = layer.copy()
+			copyLayer.correctPathDirection()
+			for originalPath, copyPath in zip(layer.paths, copyLayer.paths):
+				if copyPath.direction != originalPath.direction:
+					mask |= ruleBits["badPathDirections"]
+					break
+
+		nodeEnabled = enabled
+		for ruleName in layerRules:
+			nodeEnabled &= ~ruleBits[ruleName]
+		if nodeEnabled:
+			outline = LayerNodes(layer)
+			mask |= self.issuesOfOutline(outline, nodeEnabled, findings)
+		return mask, findings
+
+	def issuesOfOutline(self, outline, enabled, findings):
+		"""
+		The single pass over the LayerNodes of a layer. Returns the issue mask for the enabled bits.
+		Rules that have already found an issue are skipped for the remaining nodes,
+		and the pass ends as soon as every enabled rule has found one.
+		"""
+		settings = self.settings
+		xs, ys, types, smooth = outline.x, outline.y, outline.types, outline.smooth
+		LINE, CURVE, OFF, QUAD = lineCode, curveCode, offcurveCode, qcurveCode
+
+		ZERO = ruleBits["zeroHandles"] & enabled
+		OUTWARD = ruleBits["outwardHandles"] & enabled
+		CUSP = ruleBits["cuspingHandles"] & enabled
+		LARGE = ruleBits["largeHandles"] & enabled
+		SHORTHANDLE = ruleBits["shortHandles"] & enabled
+		ANGLED = ruleBits["angledHandles"] & enabled
+		SHALLOW = ruleBits["shallowCurve"] & enabled
+		SHALLOWBBOX = ruleBits["shallowCurveBBox"] & enabled
+		ORTHO = ruleBits["almostOrthogonalLines"] & enabled
+		SHORTSEGMENT = ruleBits["shortSegment"] & enabled
+		STARTPOINT = ruleBits["offcurveAsStartPoint"] & enabled
+		STRAY = ruleBits["strayPoints"] & enabled
+		TWOPOINT = ruleBits["twoPointOutlines"] & enabled
+		OPEN = ruleBits["openPaths"] & enabled
+		QUADRATIC = ruleBits["quadraticCurves"] & enabled
+		DECIMAL = ruleBits["decimalCoordinates"] & enabled
+		EMPTY = ruleBits["emptyPaths"] & enabled
+		GREEN = ruleBits["greenDiscontinuity"] & enabled
+		nodeRules = ZERO | OUTWARD | CUSP | LARGE | SHORTHANDLE | ANGLED | SHALLOW | SHALLOWBBOX | ORTHO | QUADRATIC | DECIMAL | GREEN
+
+		shortHandlesThreshold = float(settings["shortHandlesThreshold"])
+		angledHandlesAngle = float(settings["angledHandlesAngle"])
+		shallowCurveThreshold = float(settings["shallowCurveThreshold"])
+		shallowCurveBBoxThreshold = float(settings["shallowCurveBBoxThreshold"])
+		orthoThreshold = float(settings["almostOrthogonalLinesThreshold"])
+		orthoMinLengthCheck = bool(settings["almostOrthogonalLinesMinLengthCheck"])
+		orthoMinLength = float(settings["almostOrthogonalLinesMinLength"])
+		shortSegmentThreshold = float(settings["shortSegmentThreshold"])
+		greenTolerance = float(settings["greenDiscontinuityTolerance"])
+
+		mask = 0
+		greenIssues = []
+		for pathIndex, (first, count, closed) in enumerate(outline.paths):
+			# path-level rules:
+			if EMPTY and count == 0:
+				mask |= EMPTY
+			if STRAY and count == 1:
+				mask |= STRAY
+			if TWOPOINT and sum(1 for t in types[first:first + count] if t != OFF) < 3:
+				mask |= TWOPOINT
+			if OPEN and not closed:
+				mask |= OPEN
+			if STARTPOINT and count > 1:
+				startType = types[first]
+				if (startType == OFF and types[first + 1] != OFF) or (startType == CURVE and types[first + count - 1] == OFF):
+					mask |= STARTPOINT
+			if SHORTSEGMENT and not mask & SHORTSEGMENT and count > 1:
+				onCurves = [j for j in range(count) if types[first + j] != OFF]
+				if onCurves:
+					segmentEnds = onCurves if closed else onCurves[1:]
+					for j in segmentEnds:
+						segment = [first + j]
+						k = j
+						while True:
+							k = (k - 1) % count
+							segment.insert(0, first + k)
+							if types[first + k] != OFF or k == j:
+								break
+						if len(segment) > 1 and _segmentIsShorterThan(xs, ys, segment, shortSegmentThreshold, quadratic=types[segment[-1]] == qcurveCode):
+							mask |= SHORTSEGMENT
+							break
+
+			# node-level rules:
+			if not nodeRules & ~mask:
+				continue
+			for j in range(count):
+				pending = nodeRules & ~mask  # GREEN stays pending, it collects all nodes
+				if not pending:
+					break
+				i = first + j
+				nodeType = types[i]
+				x, y = xs[i], ys[i]
+
+				if DECIMAL & pending and (x % 1.0 or y % 1.0):
+					mask |= DECIMAL
+				if QUADRATIC & pending and nodeType == QUAD:
+					mask |= QUADRATIC
+
+				if nodeType == OFF:
+					iPrev = first + (j - 1) % count
+					iNext = first + (j + 1) % count
+					if ZERO & pending and ((x == xs[iPrev] and y == ys[iPrev]) or (x == xs[iNext] and y == ys[iNext])):
+						mask |= ZERO
+					if (SHORTHANDLE | ANGLED) & pending:
+						iOn = iNext if types[iPrev] == OFF else iPrev
+						xOn, yOn = xs[iOn], ys[iOn]
+						if SHORTHANDLE & pending and 0.0 < _dist(x, y, xOn, yOn) < shortHandlesThreshold:
+							mask |= SHORTHANDLE
+						if ANGLED & pending and not (x == xOn or y == yOn):
+							angle = math.fabs(math.fmod(math.degrees(math.atan2(yOn - y, xOn - x)), 90.0))
+							if angle < angledHandlesAngle or angle > (90 - angledHandlesAngle):
+								mask |= ANGLED
+					if CUSP & pending and types[iNext] == OFF:
+						iNextNext = first + (j + 2) % count
+						distAC = _dist(xs[iPrev], ys[iPrev], xs[iNext], ys[iNext])
+						distAB = _dist(xs[iPrev], ys[iPrev], x, y)
+						distBD = _dist(x, y, xs[iNextNext], ys[iNextNext])
+						distCD = _dist(xs[iNext], ys[iNext], xs[iNextNext], ys[iNextNext])
+						if distAC < distAB and distBD < distCD:
+							mask |= CUSP
+							findings.setdefault("cuspingHandles", []).append((pathIndex, j))
+
+				elif nodeType == CURVE and (OUTWARD | LARGE | SHALLOW | SHALLOWBBOX) & pending:
+					iB = first + (j - 1) % count
+					iC = first + (j - 2) % count
+					iD = first + (j - 3) % count
+					xB, yB, xC, yC, xD, yD = xs[iB], ys[iB], xs[iC], ys[iC], xs[iD], ys[iD]
+					if OUTWARD & pending:
+						for xH, yH in ((xB, yB), (xC, yC)):
+							nx = _distanceAndRelativePosition(x, y, xD, yD, xH, yH)[1]
+							if nx < 0.0 or nx > 1.0:
+								mask |= OUTWARD
+								break
+					if LARGE & pending:
+						intersection = _intersection(x, y, xB, yB, xC, yC, xD, yD)
+						if intersection:
+							xI, yI = intersection
+							if _dist(x, y, xB, yB) >= _dist(x, y, xI, yI) or _dist(xD, yD, xC, yC) >= _dist(xD, yD, xI, yI):
+								mask |= LARGE
+					if SHALLOW & pending:
+						for xH, yH in ((xC, yC), (xD, yD)):
+							deviation, nx = _distanceAndRelativePosition(x, y, xB, yB, xH, yH)
+							if 0.0 < nx < 1.0 and deviation < shallowCurveThreshold:
+								mask |= SHALLOW
+								break
+					if SHALLOWBBOX & pending and (abs(x - xD) < shallowCurveBBoxThreshold or abs(y - yD) < shallowCurveBBoxThreshold):
+						minX, maxX = sorted((x, xD))
+						minY, maxY = sorted((y, yD))
+						horizontallyWithin = minX - 1 < min(xB, xC) and maxX + 1 > max(xB, xC)
+						verticallyWithin = minY - 1 < min(yB, yC) and maxY + 1 > max(yB, yC)
+						if horizontallyWithin and verticallyWithin:
+							mask |= SHALLOWBBOX
+
+				elif nodeType == LINE and ORTHO & pending:
+					iPrev = first + (j - 1) % count
+					xPrev, yPrev = xs[iPrev], ys[iPrev]
+					if not orthoMinLengthCheck or _dist(x, y, xPrev, yPrev) >= orthoMinLength:
+						xDiff = abs(x - xPrev)
+						yDiff = abs(y - yPrev)
+						if 0.1 < xDiff < orthoThreshold or 0.1 < yDiff < orthoThreshold:
+							mask |= ORTHO
+
+				if GREEN and smooth[i]:
+					iP2in = first + (j - 1) % count
+					iP1out = first + (j + 1) % count
+					iP1in = first + (j - 2) % count
+					iP2out = first + (j + 2) % count
+					if types[iP2in] == OFF and types[iP1out] == OFF and types[iP1in] == OFF and types[iP2out] == OFF:
+						# curvature at the end of the incoming and at the start of the outgoing segment:
+						inRadius = _radiusOfCurvature(
+							3.0 * (x - xs[iP2in]),
+							3.0 * (y - ys[iP2in]),
+							6.0 * (x - 2.0 * xs[iP2in] + xs[iP1in]),
+							6.0 * (y - 2.0 * ys[iP2in] + ys[iP1in]),
+						)
+						outRadius = _radiusOfCurvature(
+							3.0 * (xs[iP1out] - x),
+							3.0 * (ys[iP1out] - y),
+							6.0 * (x - 2.0 * xs[iP1out] + xs[iP2out]),
+							6.0 * (y - 2.0 * ys[iP1out] + ys[iP2out]),
+						)
+						if inRadius is not None and outRadius is not None:
+							# scale-independent relative deviation:
+							deviation = abs(inRadius - outRadius) / (inRadius + outRadius)
+							if deviation >= greenTolerance:
+								greenIssues.append((pathIndex, j, deviation, inRadius, outRadius))
+
+			if not GREEN and mask == enabled:
+				break
+
+		if greenIssues:
+			mask |= GREEN
+			greenIssues.sort(key=lambda issue: issue[2], reverse=True)
+			findings["greenDiscontinuity"] = greenIssues
+		return mask
+
+	@staticmethod
+	def nodeOfLayer(layer, pathIndex, nodeIndex):
+		return layer.paths[pathIndex].nodes[nodeIndex]
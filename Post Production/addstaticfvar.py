@@ -6,8 +6,11 @@ Exports addFvarToFont() for programmatic use and maintains CLI functionality.
 """
 
 import argparse
-from fontTools.ttLib import TTFont
 from fontTools.fontBuilder import FontBuilder
+from fixLib import openFontForFixing, saveChangedTables
+
+# tables that addFvarToTTFont() changes:
+changedTables = ('fvar', 'name')
 
 def axisNameFromTag(tag):
 	"""
@@ -42,7 +45,18 @@ def addFvarToFont(inputPath, outputPath=None, axes={'wdth':100, 'wght':400, 'ita
 		outputPath: Optional output path (defaults to overwriting input)
 		axes: Dictionary of axis tags to values (e.g. {'wght':700})
 	"""
-	ttFont = TTFont(inputPath)
+	ttFont = openFontForFixing(inputPath)
+	addFvarToTTFont(ttFont, axes)
+	saveChangedTables(ttFont, outputPath if outputPath else inputPath, changedTables)
+
+
+def addFvarToTTFont(ttFont, axes={'wdth': 100, 'wght': 400, 'ital': 0}):
+	"""
+	Same as addFvarToFont, but works on an open TTFont in memory and does not save.
+	Args:
+		ttFont: fontTools TTFont of a static font
+		axes: Dictionary of axis tags to values (e.g. {'wght':700})
+	"""
 	if 'gvar' in ttFont:
 		raise ValueError("Font contains gvar table, hence is not a static font")
 
@@ -76,9 +90,8 @@ def addFvarToFont(inputPath, outputPath=None, axes={'wdth':100, 'wght':400, 'ita
 	if postScriptName:
 		instance['postscriptfontname'] = postScriptName
 
-	# Build and save
+	# Build
 	FontBuilder(font=ttFont).setupFvar(axisList, instances=[instance])
-	ttFont.save(outputPath if outputPath else inputPath)
 
 def main():
 	"""Command-line interface implementation"""
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Shared helpers for the Post Production command line fixers:
+open a font so that only the tables a fixer touches get decompiled,
+and save it so that only the tables a fixer changed get recompiled.
+"""
+
+from fontTools import ttLib
+
+
+def openFontForFixing(fontPath):
+	"""
+	Opens fontPath as a ttLib.TTFont for patching a few tables.
+	Tables are only decompiled when a fixer accesses them, and nothing
+	(bounding boxes, timestamp) is recalculated behind the fixer's back.
+	The file is read into memory, so it can be overwritten when saving.
+	"""
+	return ttLib.TTFont(fontPath, recalcBBoxes=False, recalcTimestamp=False)
+
+
+def saveChangedTables(font, fontPath, changedTables):
+	"""
+	Saves font to fontPath, compiling only the tables listed in changedTables
+	(tags like "GDEF" or "OS/2"). All other tables, including the ones a fixer
+	only inspected, are copied byte for byte from the original file.
+	"""
+	if font.reader is not None:
+		for tag in list(font.tables.keys()):
+			if tag not in changedTables and tag in font.reader:
+				del font.tables[tag]  # forget the decompiled table, the raw data stays in font.reader
+	font.save(fontPath, reorderTables=False)
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+python3 fixfonts.py -h                                     ... help
+python3 fixfonts.py --gdef --psnames --stat *.ttf          ... apply several fixes to all TTFs in current dir
+python3 fixfonts.py --headflags --bit3 1 -j 4 "fonts/*.otf"  ... use 4 processes
+"""
+
+import glob
+import io
+import os
+from argparse import ArgumentParser
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from timeit import default_timer as timer
+
+from fixLib import openFontForFixing, saveChangedTables
+from fixgdef import fixGDEFinFont
+from fixpsnames import fixPSnames
+from fixstat import fixstat
+from winfix import addEmptyFvar
+from addstaticfvar import addFvarToTTFont
+from setBit3 import set_head_flags
+
+
+parser = ArgumentParser(
+	description="Applies any combination of the Post Production fixers in one go: every font is opened once, all selected fixes are applied in memory, and the font is saved once, and only if something changed. Fonts are processed in parallel."
+)
+
+parser.add_argument(
+	"fonts",
+	nargs="+",  # one or more font names or glob patterns, e.g. *.otf
+	metavar="font",
+	help="Any number of OTF or TTF files, or glob patterns.",
+)
+parser.add_argument("--gdef", action="store_true", help="Fix GDEF definition of spacing, non-combining legacy marks (fixgdef.py).")
+parser.add_argument("--psnames", action="store_true", help="Fix double ‘Italic’ in PS names (fixpsnames.py).")
+parser.add_argument("--stat", action="store_true", help="Fix normal STAT entries and Format 1/3 duplicates (fixstat.py).")
+parser.add_argument("--emptyfvar", action="store_true", help="Add an empty fvar table (winfix.py).")
+parser.add_argument("--force", action="store_true", help="With --emptyfvar, overwrite existing fvar tables.")
+parser.add_argument("--staticfvar", nargs="+", metavar="AXIS=VALUE", help="Add an fvar table to a static font, e.g. --staticfvar wght=700 wdth=100 (addstaticfvar.py).")
+parser.add_argument("--headflags", action="store_true", help="Set head.flags bits 3 and 13 (setBit3.py).")
+parser.add_argument("--bit3", type=int, choices=(0, 1), default=1, help="With --headflags: bit 3 ‘integer scaling’ value (default=1).")
+parser.add_argument("--bit13", type=int, choices=(0, 1), default=1, help="With --headflags: bit 13 ‘ClearType’ value (default=1).")
+parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="Number of fonts processed in parallel (default: number of CPUs).")
+
+
+def gdefFix(font, arguments):
+	return fixGDEFinFont(font)
+
+
+def psNamesFix(font, arguments):
+	return fixPSnames(font)
+
+
+def statFix(font, arguments):
+	if "STAT" not in font:
+		print("⚠️ No STAT table found, skipping STAT fix.")
+		return False
+	return fixstat(font)
+
+
+def emptyFvarFix(font, arguments):
+	return addEmptyFvar(font, "font", force=arguments.force)
+
+
+def fvarDescription(font):
+	"""Axes and instances of the fvar table, with name IDs resolved to strings, or None if there is no fvar table."""
+	if "fvar" not in font:
+		return None
+	nameTable = font["name"]
+	fvarTable = font["fvar"]
+	axes = [(axis.axisTag, axis.minValue, axis.defaultValue, axis.maxValue, nameTable.getDebugName(axis.axisNameID)) for axis in fvarTable.axes]
+	instances = [
+		(sorted(instance.coordinates.items()), nameTable.getDebugName(instance.subfamilyNameID), nameTable.getDebugName(instance.postscriptNameID))
+		for instance in fvarTable.instances
+	]
+	return axes, instances
+
+
+def staticFvarFix(font, arguments):
+	axes = {}
+	for axisDefinition in arguments.staticfvar:
+		tag, value = axisDefinition.split("=")
+		axes[tag.strip()] = float(value)
+	# the fvar builder adds name records even if identical ones exist, so keep the old tables if the result is the same:
+	oldTables = {tag: deepcopy(font[tag]) for tag in ("fvar", "name") if tag in font}
+	oldDescription = fvarDescription(font)
+	addFvarToTTFont(font, axes)
+	if fvarDescription(font) == oldDescription:
+		for tag, table in oldTables.items():
+			font[tag] = table
+		print("🤷🏻‍♀️ fvar already up to date, left unchanged.")
+		return False
+	return True
+
+
+def headFlagsFix(font, arguments):
+	return set_head_flags(font, arguments.bit3, arguments.bit13)
+
+
+# in the order in which they are applied, with the tables each fix may change:
+fixes = (
+	("gdef", gdefFix, ("GDEF", )),
+	("psnames", psNamesFix, ("name", )),
+	("stat", statFix, ("name", "STAT")),
+	("emptyfvar", emptyFvarFix, ("fvar", )),
+	("staticfvar", staticFvarFix, ("fvar", "name")),
+	("headflags", headFlagsFix, ("head", )),
+)
+
+
+def selectedFixNames(arguments):
+	return [name for name, fix, tables in fixes if getattr(arguments, name)]
+
+
+def fixFont(fontPath, arguments):
+	"""
+	Opens fontPath once, applies all selected fixes in memory and saves only if anything changed.
+	Only the tables the fixes access are decompiled, and only the changed tables are recompiled.
+	Returns (fontPath, changed, seconds, report), the report being everything the fixers printed.
+	"""
+	start = timer()
+	report = io.StringIO()
+	changedTables = set()
+	with redirect_stdout(report):
+		try:
+			font = openFontForFixing(fontPath)
+			for name, fix, tables in fixes:
+				if getattr(arguments, name):
+					print(f"🔧 {name}")
+					if fix(font, arguments):
+						changedTables.update(tables)
+			if changedTables:
+				saveChangedTables(font, fontPath, changedTables)
+			font.close()
+		except Exception as e:
+			print(f"‼️ Error processing {fontPath}: {e}")
+			changedTables.clear()
+	changed = bool(changedTables)
+	return fontPath, changed, timer() - start, report.getvalue()
+
+
+def reportResult(fontPath, changed, seconds, report):
+	print(f"\n📄 {fontPath}")
+	print(report.rstrip())
+	if changed:
+		print(f"💾 Saved {fontPath} ({seconds:.2f} s)")
+	else:
+		print(f"🤷🏻‍♀️ No changes made. File left unchanged. ({seconds:.2f} s)")
+
+
+if __name__ == "__main__":
+	arguments = parser.parse_args()
+	if not selectedFixNames(arguments):
+		parser.error("No fix selected. Choose at least one of: " + ", ".join(f"--{name}" for name, fix, tables in fixes))
+
+	fontPaths = []
+	for pattern in arguments.fonts:
+		matches = sorted(glob.glob(pattern))
+		fontPaths.extend(matches if matches else [pattern])
+	fontPaths = list(dict.fromkeys(fontPaths))  # remove duplicates, keep order
+
+	start = timer()
+	results = []
+	if arguments.jobs > 1 and len(fontPaths) > 1:
+		with ProcessPoolExecutor(max_workers=arguments.jobs) as executor:
+			futures = [executor.submit(fixFont, fontPath, arguments) for fontPath in fontPaths]
+			for future in as_completed(futures):
+				result = future.result()
+				reportResult(*result)
+				results.append(result)
+	else:
+		for fontPath in fontPaths:
+			result = fixFont(fontPath, arguments)
+			reportResult(*result)
+			results.append(result)
+
+	changedCount = sum(1 for fontPath, changed, seconds, report in results if changed)
+	print(f"\n✅ Done. Applied {', '.join(selectedFixNames(arguments))}. Changed {changedCount} of {len(results)} fonts in {timer() - start:.1f} s.\n")
@@ -4,8 +4,8 @@ python3 fixgdef.py -h     ... help
 python3 fixgdef.py *.ttf  ... apply to all TTFs in current dir
 """
 
-from fontTools import ttLib
 from argparse import ArgumentParser
+from fixLib import openFontForFixing, saveChangedTables
 
 
 parser = ArgumentParser(description="Fix GDEF definition of spacing, non-combining marks. Will switch to class 1 (‘base glyph’, single character, spacing glyph) if necessary.")
@@ -17,6 +17,26 @@ parser.add_argument(
 	help="One or more OTF/TTF files",
 )
 
+# tables that fixGDEFinFont() may change:
+changedTables = ("GDEF", )
+
+legacyMarks = (
+	"dieresis",
+	"dotaccent",
+	"grave",
+	"acute",
+	"hungarumlaut",
+	"circumflex",
+	"caron",
+	"breve",
+	"ring",
+	"tilde",
+	"macron",
+	"cedilla",
+	"ogonek",
+	"uni02BB"
+)
+
 
 def fixGDEFinFont(font):
 	"""Takes a ttLib.TTFont as argument."""
@@ -31,22 +51,6 @@ def fixGDEFinFont(font):
 		print("⚠️ No MarkGlyphSetsDef found in GDEF table.")
 	else:
 		print("Scanning MarkGlyphSetsDef...")
-		legacyMarks = (
-			"dieresis",
-			"dotaccent",
-			"grave",
-			"acute",
-			"hungarumlaut",
-			"circumflex",
-			"caron",
-			"breve",
-			"ring",
-			"tilde",
-			"macron",
-			"cedilla",
-			"ogonek",
-			"uni02BB"
-		)
 		for coverage in gdef.MarkGlyphSetsDef.Coverage:
 			for i in range(len(coverage.glyphs) - 1, -1, -1):
 				glyph = coverage.glyphs[i]
@@ -74,16 +78,17 @@ def fixGDEFinFont(font):
 	return madeChanges
 
 
-arguments = parser.parse_args()
-fonts = arguments.fonts
-for fontpath in fonts:
-	print(f"\n📄 {fontpath}")
-	font = ttLib.TTFont(fontpath)
-	changesMade = fixGDEFinFont(font)
-	if changesMade:
-		font.save(fontpath, reorderTables=False)
-		print(f"💾 Saved {fontpath}\n")
-	else:
-		print("🤷🏻‍♀️ No changes made. File left unchanged.")
+if __name__ == "__main__":
+	arguments = parser.parse_args()
+	fonts = arguments.fonts
+	for fontpath in fonts:
+		print(f"\n📄 {fontpath}")
+		font = openFontForFixing(fontpath)
+		changesMade = fixGDEFinFont(font)
+		if changesMade:
+			saveChangedTables(font, fontpath, changedTables)
+			print(f"💾 Saved {fontpath}\n")
+		else:
+			print("🤷🏻‍♀️ No changes made. File left unchanged.")
 
-print("✅ Done.")
+	print("✅ Done.")
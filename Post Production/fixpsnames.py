@@ -4,8 +4,8 @@ python3 fixpsname.py -h     ... help
 python3 fixpsname.py *.ttf  ... apply to all TTFs in current dir
 """
 
-from fontTools import ttLib
 from argparse import ArgumentParser
+from fixLib import openFontForFixing, saveChangedTables
 parser = ArgumentParser(description="Fix Italic PS Names in fvar when they have a double ‘Italic’ signifier. Will rework the corresponding name table entries.")
 
 parser.add_argument(
@@ -15,6 +15,9 @@ parser.add_argument(
 	help="Any number of OTF or TTF files.",
 )
 
+# tables that fixPSnames() may change:
+changedTables = ("name", )
+
 
 def fixPSnames(otFont):
 	anythingChanged = False
@@ -45,18 +48,19 @@ def fixPSnames(otFont):
 	return anythingChanged
 
 
-arguments = parser.parse_args()
-fonts = arguments.fonts
-changed = 0
-for i, fontpath in enumerate(fonts):
-	print(f"\n📄 {i + 1}. {fontpath}")
-	font = ttLib.TTFont(fontpath)
-	changesMade = fixPSnames(font)
-	if changesMade:
-		changed += 1
-		font.save(fontpath, reorderTables=False)
-		print(f"💾 Saved {fontpath}")
-	else:
-		print("🤷🏻‍♀️ No changes made. File left unchanged.")
-
-print(f"\n✅ Done. Changed {changed} of {i + 1} fonts.\n")
+if __name__ == "__main__":
+	arguments = parser.parse_args()
+	fonts = arguments.fonts
+	changed = 0
+	for i, fontpath in enumerate(fonts):
+		print(f"\n📄 {i + 1}. {fontpath}")
+		font = openFontForFixing(fontpath)
+		changesMade = fixPSnames(font)
+		if changesMade:
+			changed += 1
+			saveChangedTables(font, fontpath, changedTables)
+			print(f"💾 Saved {fontpath}")
+		else:
+			print("🤷🏻‍♀️ No changes made. File left unchanged.")
+
+	print(f"\n✅ Done. Changed {changed} of {i + 1} fonts.\n")
@@ -4,8 +4,8 @@ python3 fixstat.py -h     ... help
 python3 fixstat.py *.ttf  ... apply to all TTFs in current dir
 """
 
-from fontTools import ttLib
 from argparse import ArgumentParser
+from fixLib import openFontForFixing, saveChangedTables
 parser = ArgumentParser(
 	description="For every axis, renames normal STAT entries to ‘Regular’ (also makes changes in name table if necessary), and makes them elidable (Flags=2). Typically only necessary in italic OTVAR exports with 2 or more axes. Also, fixes Format1/3 duplicates (if a Format 3 exists, there must be no equivalent Format 1 entry)."
 )
@@ -17,6 +17,9 @@ parser.add_argument(
 	help="Any number of OTF or TTF files.",
 )
 
+# tables that fixstat() may change:
+changedTables = ("name", "STAT")
+
 
 def fixDuplicatesFormat1and3(axes, statTable, changesMade=False):
 	# remove format 1 if format 3 exists:
@@ -116,18 +119,19 @@ def fixstat(font):
 	return changesMade
 
 
-arguments = parser.parse_args()
-fonts = arguments.fonts
-changed = 0
-for i, fontpath in enumerate(fonts):
-	print(f"\n📄 {i+1}. Fixing STAT: {fontpath}")
-	font = ttLib.TTFont(fontpath)
-	changesMade = fixstat(font)
-	if changesMade:
-		changed += 1
-		font.save(fontpath, reorderTables=False)
-		print(f"💾 Saved {fontpath}")
-	else:
-		print("🤷🏻‍♀️ No changes made. File left unchanged.")
+if __name__ == "__main__":
+	arguments = parser.parse_args()
+	fonts = arguments.fonts
+	changed = 0
+	for i, fontpath in enumerate(fonts):
+		print(f"\n📄 {i+1}. Fixing STAT: {fontpath}")
+		font = openFontForFixing(fontpath)
+		changesMade = fixstat(font)
+		if changesMade:
+			changed += 1
+			saveChangedTables(font, fontpath, changedTables)
+			print(f"💾 Saved {fontpath}")
+		else:
+			print("🤷🏻‍♀️ No changes made. File left unchanged.")
 
-print(f"\n✅ Done. Changed {changed} of {i + 1} fonts.\n")
+	print(f"\n✅ Done. Changed {changed} of {i + 1} fonts.\n")
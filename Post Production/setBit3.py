@@ -1,22 +1,36 @@
 #!/usr/bin/env python3
 import argparse
-from fontTools.ttLib import TTFont
+from fixLib import openFontForFixing, saveChangedTables
 
-def modify_head_flags(font_path, output_path, bit3_value=1, bit13_value=1):
-	with TTFont(font_path) as font:
-		head = font['head']
-		
-		if bit3_value == 1:
-			head.flags |= 1 << 3  # Set bit 3 (value 8)
-		else:
-			head.flags &= ~(1 << 3)  # Clear bit 3
+# tables that set_head_flags() may change:
+CHANGED_TABLES = ('head',)
 
-		if bit13_value == 1:
-			head.flags |= 1 << 13  # Set bit 13 (value 8192)
-		else:
-			head.flags &= ~(1 << 13)  # Clear bit 13
-		
-		font.save(output_path)
+def set_head_flags(font, bit3_value=1, bit13_value=1):
+	"""Sets head.flags bits 3 and 13 in a TTFont. Returns True if the flags changed."""
+	head = font['head']
+	old_flags = head.flags
+
+	if bit3_value == 1:
+		head.flags |= 1 << 3  # Set bit 3 (value 8)
+	else:
+		head.flags &= ~(1 << 3)  # Clear bit 3
+
+	if bit13_value == 1:
+		head.flags |= 1 << 13  # Set bit 13 (value 8192)
+	else:
+		head.flags &= ~(1 << 13)  # Clear bit 13
+
+	return head.flags != old_flags
+
+
+def modify_head_flags(font_path, output_path, bit3_value=1, bit13_value=1):
+	"""Returns True if the file was written, i.e., unless nothing changed in place."""
+	with openFontForFixing(font_path) as font:
+		changed = set_head_flags(font, bit3_value, bit13_value)
+		if not changed and output_path == font_path:
+			return False
+		saveChangedTables(font, output_path, CHANGED_TABLES)
+		return True
 
 if __name__ == "__main__":
 	parser = argparse.ArgumentParser(
@@ -53,8 +67,9 @@ if __name__ == "__main__":
 	
 	for font_path in args.fonts:
 		output = args.output or font_path
-		modify_head_flags(font_path, output, args.bit3, args.bit13)
-		if font_path != output:
+		if not modify_head_flags(font_path, output, args.bit3, args.bit13):
+			print(f"🤷🏻‍♀️ bit3={args.bit3}, bit13={args.bit13} already set in {font_path}, file left unchanged")
+		elif font_path != output:
 			print(f"✅ Updated bit3={args.bit3}, bit13={args.bit13} in {font_path} -> {output}")
 		else:
 			print(f"✅ Updated bit3={args.bit3}, bit13={args.bit13} in {font_path}")
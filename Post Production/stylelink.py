@@ -24,7 +24,7 @@ Examples:
 
 import argparse
 import glob
-from fontTools.ttLib import TTFont
+from fixLib import openFontForFixing, saveChangedTables
 
 BOLD_MASK = 1 << 0		 # head.macStyle bit 0
 ITALIC_MASK = 1 << 1	   # head.macStyle bit 1
@@ -32,6 +32,9 @@ OS2_BOLD_MASK = 1 << 5	 # OS/2.fsSelection bit 5
 OS2_ITALIC_MASK = 1 << 0   # OS/2.fsSelection bit 0
 OS2_REGULAR_MASK = 1 << 6  # OS/2.fsSelection bit 6
 
+# tables that set_style_bits() may change:
+CHANGED_TABLES = ('head', 'OS/2')
+
 def derive_styles_from_name(font):
 	# Try nameID 2, prefer Windows English first
 	for record in font['name'].names:
@@ -51,6 +54,9 @@ def derive_styles_from_name(font):
 		return False, False
 
 def set_style_bits(font, bold=False, italic=False):
+	"""Returns True if any bits changed."""
+	old_bits = (font['head'].macStyle, font['OS/2'].fsSelection)
+
 	# Update head.macStyle
 	macStyle = 0
 	if bold:
@@ -80,6 +86,8 @@ def set_style_bits(font, bold=False, italic=False):
 
 	font['OS/2'].fsSelection = fsSelection
 
+	return (font['head'].macStyle, font['OS/2'].fsSelection) != old_bits
+
 
 if __name__ == "__main__":
 	parser = argparse.ArgumentParser(description="Set Bold/Italic/Regular style bits in font files.")
@@ -95,12 +103,14 @@ if __name__ == "__main__":
 		files_to_process.extend(glob.glob(pattern))
 
 	for fontfile in files_to_process:
-		font = TTFont(fontfile)
+		font = openFontForFixing(fontfile)
 		if args.auto:
 			bold, italic = derive_styles_from_name(font)
 		else:
 			bold, italic = args.bold, args.italic
 
-		set_style_bits(font, bold=bold, italic=italic)
-		font.save(fontfile)
-		print(f"Processed {fontfile}")
+		if set_style_bits(font, bold=bold, italic=italic):
+			saveChangedTables(font, fontfile, CHANGED_TABLES)
+			print(f"Processed {fontfile}")
+		else:
+			print(f"Unchanged {fontfile}")
@@ -3,11 +3,117 @@
 
 import argparse
 import glob
+import io
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from fontTools import subset
 from fontTools.ttLib import TTFont
 
+allFormats = ('woff', 'woff2', 'otf', 'ttf')
+
+
+def readCharsetFile(filePath):
+	"""Returns the set of code points of all characters in a UTF-8 text file, line breaks excluded."""
+	with open(filePath, encoding='utf-8') as fh:
+		return {ord(char) for char in fh.read() if char not in '\r\n'}
+
+
+def parseCharsetSpec(spec):
+	"""
+	Returns a set of code points for a slice spec, either a Unicode-range spec
+	like 'U+0000-007F,U+2010-2027' or '@path/to/charset.txt' for a charset file.
+	"""
+	if spec.startswith('@'):
+		return readCharsetFile(spec[1:])
+	return set(subset.parse_unicodes(spec))
+
+
+def collectUnicodes(args):
+	"""Returns the set of code points requested with -c, -u and --charset-file."""
+	unicodes = {ord(' ')}  # always include space
+	unicodes.update(ord(char) for char in args.charset)
+	for spec in args.unicodes or []:
+		unicodes.update(subset.parse_unicodes(spec))
+	for filePath in args.charset_file or []:
+		unicodes.update(readCharsetFile(filePath))
+	return unicodes
+
+
+def collectSlices(args):
+	"""
+	Returns a list of (suffix, unicodes) tuples, one per output subset.
+	Without --slice, there is a single subset with an empty suffix.
+	"""
+	baseUnicodes = collectUnicodes(args)
+	if not args.slice:
+		return [('', baseUnicodes)]
+	slices = []
+	for sliceDefinition in args.slice:
+		if '=' not in sliceDefinition:
+			raise ValueError(f'Slice must be NAME=SPEC: {sliceDefinition}')
+		name, spec = sliceDefinition.split('=', 1)
+		slices.append((f'-{name.strip()}', baseUnicodes | parseCharsetSpec(spec.strip())))
+	return slices
+
+
+def subsetOptions(webonly=False):
+	options = subset.Options()
+	options.notdef_glyph = True
+	if webonly:
+		options.name_IDs = []  # Drop all name table entries for web-only
+	return options
+
+
+def subsetFont(fontPath, fontName, slices, formats, webonly=False):
+	"""
+	Subsets one font file for every slice and writes every requested format.
+	The source file is read once; for each slice, the glyph closure is computed
+	and the subset is compiled once, and all formats are serialized from that
+	compiled subset without subsetting or recompiling tables again.
+	Returns (outputPaths, messages).
+	"""
+	outputPaths = []
+	messages = []
+	with open(fontPath, 'rb') as fh:
+		fontData = fh.read()
+
+	for suffix, unicodes in slices:
+		options = subsetOptions(webonly)
+		font = TTFont(io.BytesIO(fontData))
+		subsetter = subset.Subsetter(options=options)
+		subsetter.populate(unicodes=unicodes)
+		subsetter.subset(font)
+
+		# compile the subsetted font once as plain sfnt:
+		sfntData = io.BytesIO()
+		font.save(sfntData)
+		font.close()
+
+		for fmt in formats:
+			outPath = f'{fontName}{suffix}.{fmt}'
+			messages.append(f'Writing {outPath}')
+			if fmt in ('woff', 'woff2'):
+				# tables are copied from the compiled subset, only the container changes:
+				sfntData.seek(0)
+				flavoredFont = TTFont(sfntData)
+				flavoredFont.flavor = fmt
+				flavoredFont.save(outPath)
+				flavoredFont.close()
+			else:
+				with open(outPath, 'wb') as fh:
+					fh.write(sfntData.getvalue())
+			outputPaths.append(outPath)
+	return outputPaths, messages
+
+
+def subsetFontSafely(fontPath, fontName, slices, formats, webonly=False):
+	try:
+		return subsetFont(fontPath, fontName, slices, formats, webonly)
+	except Exception as e:
+		return [], [f'Error processing {fontPath}: {e}']
+
+
 def main():
 	parser = argparse.ArgumentParser(
 		description='Subset fonts to specific charset and formats',
@@ -17,29 +123,44 @@ Examples:
   python3 subset.py -c "abcde" font.otf
   python3 subset.py -c "abcde" -f woff2,ttf -w *.ttf
   python3 subset.py -c "abcde fghij" -t -o myfont font.ttf
+  python3 subset.py -u U+0000-007F,U+2000-206F --charset-file extra.txt -f woff,woff2 *.otf
+  python3 subset.py -f woff2 -s latin=U+0000-024F -s cyrillic=U+0400-04FF -s greek=@greek.txt -j 8 fonts/*.ttf
 		"""
 	)
 	parser.add_argument('-c', '--charset', default=' ', help='Characters to include (default: space)')
+	parser.add_argument('-u', '--unicodes', action='append', metavar='RANGES', help='Unicode ranges to include, e.g. U+0000-007F,U+20AC (repeatable)')
+	parser.add_argument('--charset-file', action='append', metavar='FILE', help='UTF-8 text file with characters to include (repeatable)')
+	parser.add_argument('-s', '--slice', action='append', metavar='NAME=SPEC', help='Write a separate subset NAME with Unicode ranges or @charsetfile SPEC added to the charset (repeatable)')
 	parser.add_argument('-f', '--formats', default='otf', help='Output formats: woff,woff2,otf,ttf,*')
 	parser.add_argument('-w', '--webonly', action='store_true', help='Web-only: minimize name table')
 	parser.add_argument('-t', '--test', action='store_true', help='Output minimal test.html')
 	parser.add_argument('-o', '--output', help='Output base filename (default: original-subset)')
+	parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='Number of fonts processed in parallel (default: number of CPUs)')
 	parser.add_argument('fonts', nargs='+', help='TTF/OTF font files or glob patterns')
 	args = parser.parse_args()
 
 	formats = args.formats.split(',')
 	if '*' in formats:
-		formats = ['woff', 'woff2', 'otf', 'ttf']
-	
+		formats = list(allFormats)
+	unknownFormats = [fmt for fmt in formats if fmt not in allFormats]
+	if unknownFormats:
+		parser.error(f'Unknown format(s): {", ".join(unknownFormats)}')
+
+	try:
+		slices = collectSlices(args)
+	except (ValueError, OSError) as e:
+		parser.error(str(e))
+
 	fontFiles = []
 	for pattern in args.fonts:
 		fontFiles.extend(glob.glob(pattern))
-	
+	fontFiles = list(dict.fromkeys(fontFiles))  # remove duplicates, keep order
+
 	if not fontFiles:
 		print('No font files found.', file=sys.stderr)
 		sys.exit(1)
-	
-	outputFonts = []
+
+	jobs = []
 	for fontPath in fontFiles:
 		if not os.path.isfile(fontPath):
 			print(f'Skipping {fontPath}: not a file', file=sys.stderr)
@@ -47,35 +168,28 @@ Examples:
 		if not fontPath.lower().endswith(('.ttf', '.otf')):
 			print(f'Skipping {fontPath}: not TTF/OTF', file=sys.stderr)
 			continue
-		
+
 		if args.output:
 			fontName = args.output
 		else:
 			name, ext = os.path.splitext(os.path.basename(fontPath))
 			fontName = f'{name}-subset'
-		
-		options = subset.Options()
-		options.text = ' ' + args.charset  # Always include space glyph first
-		options.notdef_glyph = True
-		
-		if args.webonly:
-			options.name_IDs = []  # Drop all name table entries for web-only
-		
-		try:
-			font = TTFont(fontPath)
-			subsetter = subset.Subsetter(options=options)
-			subsetter.populate(text=' ' + args.charset)
-			subsetter.subset(font)
-			
-			for fmt in formats:
-				outPath = f'{fontName}.{fmt}'
-				print(f'Writing {outPath}')
-				saveOptions = subset.Options(flavor=fmt if fmt in ('woff', 'woff2') else None)
-				font.save(outPath, saveOptions)
-				outputFonts.append(outPath)
-		except Exception as e:
-			print(f'Error processing {fontPath}: {e}', file=sys.stderr)
-	
+		jobs.append((fontPath, fontName, slices, formats, args.webonly))
+
+	outputFonts = []
+	if args.jobs > 1 and len(jobs) > 1:
+		with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+			futures = [executor.submit(subsetFontSafely, *job) for job in jobs]
+			for future in as_completed(futures):
+				outputPaths, messages = future.result()
+				print('\n'.join(messages), file=sys.stdout if outputPaths else sys.stderr)
+				outputFonts.extend(outputPaths)
+	else:
+		for job in jobs:
+			outputPaths, messages = subsetFontSafely(*job)
+			print('\n'.join(messages), file=sys.stdout if outputPaths else sys.stderr)
+			outputFonts.extend(outputPaths)
+
 	if args.test and outputFonts:
 		htmlPath = 'test.html'
 		fontFaces = '\n'.join([f'	@font-face {{ font-family: "{os.path.splitext(os.path.basename(f))[0]}"; src: url("{f}") format("{os.path.splitext(f)[1][1:].upper()}"); }}' for f in outputFonts])
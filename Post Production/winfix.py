@@ -10,8 +10,8 @@ Options:
 """
 
 import sys
-from fontTools.ttLib import TTFont
 from fontTools.ttLib.tables import _f_v_a_r
+from fixLib import openFontForFixing, saveChangedTables
 
 def addEmptyFvar(ttFont, filename, force=False):
 	if 'fvar' in ttFont and not force:
@@ -54,10 +54,10 @@ def main():
 		if fontPath.startswith('-'):
 			continue
 		try:
-			font = TTFont(fontPath)
+			font = openFontForFixing(fontPath)
 			success = addEmptyFvar(font, fontPath, force=force)
 			if success:
-				font.save(fontPath)
+				saveChangedTables(font, fontPath, ('fvar',))
 				print(f'✅ Added empty fvar in: {fontPath}')
 		except Exception as e:
 			print(f'‼️ Error processing {fontPath}: {e}')
@@ -8,6 +8,7 @@ Checks if all glyph widths in the frontmost font are actually monospaced. Report
 import vanilla
 from GlyphsApp import Glyphs, Message
 from mekkablue import mekkaObject, newLineControlLayer
+from mekkablue.metricstable import metricsTableForFont
 
 
 class MonospaceChecker(mekkaObject):
@@ -102,22 +103,22 @@ class MonospaceChecker(mekkaObject):
 			else:
 				affectedLayers = []
 				deviatingWidthCount = 0
+				metricsTable = metricsTableForFont(thisFont)
+				widths = metricsTable.columns["width"]
 				for thisMaster in thisFont.masters:
 					masterID = thisMaster.id
 					defaultWidth = defaultGlyph.layers[masterID].width
 					print("\nⓂ️ Master %s, default width: %.1f" % (thisMaster.name, defaultWidth))
-					for thisGlyph in thisFont.glyphs:
-						if thisGlyph.export or includeNonExporting:
-							for thisLayer in thisGlyph.layers:
-								if thisLayer.associatedMasterId == masterID and (thisLayer.isMasterLayer or thisLayer.isSpecialLayer):
-									thisWidth = thisLayer.width
-									if thisWidth == 0.0:
-										if reportZeroWidths:
-											print("ℹ️ %s, layer '%s': zero width" % (thisGlyph.name, thisLayer.name))
-									elif not (defaultWidth - tolerance) <= thisWidth <= (defaultWidth + tolerance):
-										affectedLayers.append(thisLayer)
-										deviatingWidthCount += 1
-										print("⛔️ %s, layer '%s': %.1f" % (thisGlyph.name, thisLayer.name, thisWidth))
+					masterRows = metricsTable.rows(masterIDs=(masterID, ), exportingOnly=not includeNonExporting)
+					for row in masterRows:
+						thisWidth = widths[row]
+						if thisWidth == 0.0:
+							if reportZeroWidths:
+								print("ℹ️ %s, layer '%s': zero width" % (metricsTable.glyphName(row), metricsTable.layerName(row)))
+						elif not (defaultWidth - tolerance) <= thisWidth <= (defaultWidth + tolerance):
+							affectedLayers.append(metricsTable.layer(row))
+							deviatingWidthCount += 1
+							print("⛔️ %s, layer '%s': %.1f" % (metricsTable.glyphName(row), metricsTable.layerName(row), thisWidth))
 
 					# add a newline:
 					if affectedLayers:
@@ -8,6 +8,7 @@ Look for glyphs with unusual spacings and open them in a new tab.
 import vanilla
 from GlyphsApp import Glyphs, Message
 from mekkablue import mekkaObject, UpdateButton
+from mekkablue.metricstable import metricsTableForFont
 
 
 class SpacingChecker(mekkaObject):
@@ -125,54 +126,28 @@ class SpacingChecker(mekkaObject):
 
 		self.SavePreferences(sender)
 
-	def isLayerAffected(self, thisLayer):
-		try:
-			if self.pref("asymmetricSBs"):
-				try:
-					asymmetricDifference = self.prefFloat("asymmetricDifference")
-					if abs(thisLayer.LSB - thisLayer.RSB) > asymmetricDifference:
-						return True
-				except Exception as e:
-					raise e
-
-			if self.pref("largeLSB"):
-				try:
-					lsbThreshold = self.prefFloat("lsbThreshold")
-					if thisLayer.LSB > lsbThreshold:
-						return True
-				except Exception as e:
-					raise e
-
-			if self.pref("largeRSB"):
-				try:
-					rsbThreshold = self.prefFloat("rsbThreshold")
-					if thisLayer.RSB > rsbThreshold:
-						return True
-				except Exception as e:
-					raise e
-
-			if self.pref("whiteGlyphs"):
-				try:
-					if not thisLayer.width > 0.0:
-						return False
-					else:
-						whitePercentage = self.prefFloat("whitePercentage")
-						lsb = max(0.0, thisLayer.LSB)
-						rsb = max(0.0, thisLayer.RSB)
-						percentage = (lsb + rsb) / thisLayer.width
-						if percentage > whitePercentage:
-							return True
-				except Exception as e:
-					raise e
-
-			return False
+	def affectedRows(self, metricsTable, rows):
+		"""Rows of the metrics table that fulfil any of the chosen criteria, in the order of rows."""
+		LSB, RSB, width = (metricsTable.columns[name] for name in ("LSB", "RSB", "width"))
+		affected = set()
 
-		except Exception as e:
-			# brings macro window to front and reports error:
-			Glyphs.showMacroWindow()
-			print("Spacing Checker Error while checking glyph '%s', layer '%s':\n%s" % (thisLayer.parent, thisLayer.name, e))
-			import traceback
-			print(traceback.format_exc())
+		if self.pref("asymmetricSBs"):
+			asymmetricDifference = self.prefFloat("asymmetricDifference")
+			affected.update(row for row in rows if abs(LSB[row] - RSB[row]) > asymmetricDifference)
+
+		if self.pref("largeLSB"):
+			lsbThreshold = self.prefFloat("lsbThreshold")
+			affected.update(row for row in rows if LSB[row] > lsbThreshold)
+
+		if self.pref("largeRSB"):
+			rsbThreshold = self.prefFloat("rsbThreshold")
+			affected.update(row for row in rows if RSB[row] > rsbThreshold)
+
+		if self.pref("whiteGlyphs"):
+			whitePercentage = self.prefFloat("whitePercentage")
+			affected.update(row for row in rows if width[row] > 0.0 and (max(0.0, LSB[row]) + max(0.0, RSB[row])) / width[row] > whitePercentage)
+
+		return [row for row in rows if row in affected]
 
 	def SpacingCheckerMain(self, sender):
 		try:
@@ -184,7 +159,6 @@ class SpacingChecker(mekkaObject):
 			print(thisFont.filepath)
 			print()
 
-			collectedLayers = []
 			braceAndBracketIncluded = self.pref("includeBraceAndBracketLayers")
 			if self.pref("allMasters"):
 				mastersToCheck = thisFont.masters
@@ -198,17 +172,15 @@ class SpacingChecker(mekkaObject):
 
 			ignoreNonexportingGlyphs = self.pref("ignoreNonexportingGlyphs")
 
-			numOfGlyphs = len(thisFont.glyphs)
-			for index, thisGlyph in enumerate(thisFont.glyphs):
-				self.w.progress.set(int(100 * (float(index) / numOfGlyphs)))
-				if thisGlyph.export or not ignoreNonexportingGlyphs:
-					for thisLayer in thisGlyph.layers:
-						layerMaster = thisLayer.associatedFontMaster()
-						if thisLayer.name and layerMaster in mastersToCheck:
-							isMasterLayer = layerMaster.id == thisLayer.layerId
-							if isMasterLayer or (braceAndBracketIncluded and thisLayer.isSpecialLayer):
-								if self.isLayerAffected(thisLayer):
-									collectedLayers.append(thisLayer)
+			metricsTable = metricsTableForFont(thisFont)
+			self.w.progress.set(50)
+			rows = metricsTable.rows(
+				masterIDs=[m.id for m in mastersToCheck],
+				exportingOnly=ignoreNonexportingGlyphs,
+				specialLayers=braceAndBracketIncluded,
+			)
+			collectedLayers = [metricsTable.layer(row) for row in self.affectedRows(metricsTable, rows)]
+			self.w.progress.set(100)
 
 			if not collectedLayers:
 				Message(title="No Affected Glyphs Found", message="No glyphs found that fulfil the chosen criteria.", OKButton=u"🙌 High Five!")
@@ -8,6 +8,7 @@ Goes through tabular glyphs and checks if they are monospaced. Reports exception
 import vanilla
 from GlyphsApp import Glyphs
 from mekkablue import mekkaObject
+from mekkablue.metricstable import metricsTableForFont
 
 
 class TabularChecker(mekkaObject):
@@ -115,6 +116,22 @@ class TabularChecker(mekkaObject):
 				print(u"Tabular Checker Report for %s" % Font.familyName)
 				print(Font.filepath)
 				print()
+
+				# measure once per font, then group the widths by master and suffix:
+				metricsTable = metricsTableForFont(Font)
+				widths = metricsTable.columns["width"]
+				rowMasterIDs = metricsTable.rowMasterIDs
+				suffixesOfName = {}
+				for info in metricsTable.glyphInfos(exportingOnly=not includeNonExporting):
+					matchingSuffixes = [suffix for suffix in suffixes if suffix in info.name]
+					if matchingSuffixes:
+						suffixesOfName[info.name] = matchingSuffixes
+				rowsOfMasterAndSuffix = metricsTable.groupBy(
+					metricsTable.rows(specialLayers=False, glyphNames=suffixesOfName.keys()),
+					lambda row: [(rowMasterIDs[row], suffix) for suffix in suffixesOfName[metricsTable.glyphName(row)]],
+					multipleKeys=True,
+				)
+
 				for m in Font.masters:
 					lengths = []
 					glyphnames = []
@@ -129,11 +146,9 @@ class TabularChecker(mekkaObject):
 						reportString = "Testing '%s' in %s..." % (suffix, m.name)
 						self.reportStatus(reportString)
 
-						for g in Font.glyphs:
-							if suffix in g.name and (g.export or includeNonExporting):
-								layer = g.layers[m.id]
-								lengths.append(layer.width)
-								glyphnames.append(g.name)
+						rows = rowsOfMasterAndSuffix.get((m.id, suffix), [])
+						lengths.extend(widths[row] for row in rows)
+						glyphnames.extend(metricsTable.glyphName(row) for row in rows)
 
 						numOfDifferentWidths = len(set(lengths))
 						if allowDifferingWidthsPerSuffix:
@@ -0,0 +1,183 @@
+import re
+from fnmatch import translate
+
+# characters that separate glyph, class and lookup names in feature code, besides whitespace:
+separatorCharacters = "[];{}()'"
+separatorTable = str.maketrans(separatorCharacters, " " * len(separatorCharacters))
+sourceKinds = ("class", "prefix", "feature")
+
+
+def codeWithoutComments(code):
+	"""Returns feature code with all # comments removed, line count unchanged."""
+	return "\n".join(line.split("#", 1)[0] for line in code.splitlines())
+
+
+def tokensOfLine(line):
+	"""Names in one line of comment-free feature code: glyph names, @class names, lookup names, keywords, numbers."""
+	return line.translate(separatorTable).split()
+
+
+def isWildcard(searchString):
+	return "*" in searchString or "?" in searchString
+
+
+class FeatureIndex:
+	"""
+	Inverted index of the OT classes, prefixes and features of a font:
+	token -> {source: [line numbers]}, a source being (kind, index) with kind in sourceKinds,
+	and line numbers counting from 1. Built once, then refresh() re-indexes only
+	the sources whose code changed since the last refresh.
+	"""
+
+	def __init__(self, font):
+		self.font = font
+		self.postings = {}  # token -> {source: [line numbers]}
+		self.sourceTokens = {}  # source -> tokens indexed for it, for removing them again
+		self.sourceCode = {}  # source -> code at the time of indexing
+		self.sourceNames = {}
+		self.sourceActive = {}
+		self.refresh()
+
+	def sourcesOfFont(self):
+		font = self.font
+		for kind, sources in zip(sourceKinds, (font.classes, font.featurePrefixes, font.features)):
+			for index, source in enumerate(sources):
+				yield (kind, index), source
+
+	def refresh(self):
+		"""Re-indexes classes, prefixes and features whose code changed. Returns the number of re-indexed sources."""
+		reindexCount = 0
+		currentSources = set()
+		for sourceKey, source in self.sourcesOfFont():
+			currentSources.add(sourceKey)
+			code = source.code or ""
+			self.sourceNames[sourceKey] = source.name
+			self.sourceActive[sourceKey] = bool(source.active)
+			if self.sourceCode.get(sourceKey) != code:
+				self.removeSource(sourceKey)
+				self.addSource(sourceKey, code)
+				reindexCount += 1
+		for sourceKey in set(self.sourceCode) - currentSources:
+			self.removeSource(sourceKey)
+			del self.sourceNames[sourceKey]
+			del self.sourceActive[sourceKey]
+		return reindexCount
+
+	def addSource(self, sourceKey, code):
+		tokenLines = {}
+		for lineNumber, line in enumerate(codeWithoutComments(code).splitlines(), start=1):
+			for token in tokensOfLine(line):
+				lineNumbers = tokenLines.setdefault(token, [])
+				if not lineNumbers or lineNumbers[-1] != lineNumber:
+					lineNumbers.append(lineNumber)
+		for token, lineNumbers in tokenLines.items():
+			self.postings.setdefault(token, {})[sourceKey] = lineNumbers
+		self.sourceTokens[sourceKey] = tuple(tokenLines)
+		self.sourceCode[sourceKey] = code
+
+	def removeSource(self, sourceKey):
+		for token in self.sourceTokens.pop(sourceKey, ()):
+			sources = self.postings[token]
+			del sources[sourceKey]
+			if not sources:
+				del self.postings[token]
+		self.sourceCode.pop(sourceKey, None)
+
+	def matchingTokens(self, searchString):
+		"""Tokens matching searchString, which may contain the wildcards * and ?. Case-sensitive."""
+		if not isWildcard(searchString):
+			return [searchString] if searchString in self.postings else []
+		matches = re.compile(translate(searchString)).match
+		return sorted(token for token in self.postings if matches(token))
+
+	def occurrences(self, token, kinds=sourceKinds, activeOnly=False):
+		"""Yields (source, line numbers) for all places token appears in, in font order."""
+		sources = self.postings.get(token, {})
+		for sourceKey in sorted(sources):
+			if sourceKey[0] in kinds and (self.sourceActive[sourceKey] or not activeOnly):
+				yield sourceKey, sources[sourceKey]
+
+	def name(self, sourceKey):
+		return self.sourceNames[sourceKey]
+
+
+# one scanner for comments, strings, @class names and glyph names; only glyph names (group 1) get renamed,
+# never the decimal part of a number like 10.5:
+renameScanner = re.compile(r'#[^\n]*|"[^"\n]*"|@[A-Za-z0-9_.-]+|(?<![0-9.])([A-Za-z._][A-Za-z0-9_.-]*)')
+
+
+class FeatureRenamer:
+	"""
+	Rewrites glyph names in OT features, prefixes and classes in one pass per code block.
+	Renames come from a dict {oldName: newName} applied simultaneously, from addRename()/addSwap()
+	calls in the order the glyphs were renamed in the font (chains and swaps are resolved),
+	and, for all other names, from an optional fallback(name) function, called once per name.
+	Comments, strings and @class names stay untouched.
+	"""
+
+	def __init__(self, renameDict=None, fallback=None):
+		self.fallback = fallback
+		self.originalOf = {newName: oldName for oldName, newName in (renameDict or {}).items()}  # current name -> original name
+		self.renameTable = None  # memoized name -> new name, rebuilt after addRename()/addSwap()
+
+	def addRename(self, oldName, newName):
+		self.originalOf[newName] = self.originalOf.pop(oldName, oldName)
+		self.renameTable = None
+
+	def addSwap(self, firstName, secondName):
+		firstOriginal = self.originalOf.pop(firstName, firstName)
+		self.originalOf[firstName] = self.originalOf.pop(secondName, secondName)
+		self.originalOf[secondName] = firstOriginal
+		self.renameTable = None
+
+	def renames(self):
+		"""{oldName: newName} of all renames added so far, without the ones that ended up with their original name."""
+		return {oldName: newName for newName, oldName in self.originalOf.items() if oldName != newName}
+
+	def table(self):
+		if self.renameTable is None:
+			self.renameTable = self.renames()
+		return self.renameTable
+
+	def newName(self, name):
+		newName = self.table().get(name)
+		if newName is None:
+			newName = self.fallback(name) if self.fallback else name
+			self.renameTable[name] = newName or name
+		return newName or name
+
+	def rename(self, code):
+		"""Returns (new code, number of renamed glyph names)."""
+		renamedCount = 0
+
+		def replacement(match):
+			nonlocal renamedCount
+			name = match.group(1)
+			if name is None:
+				return match.group(0)
+			newName = self.newName(name)
+			if newName != name:
+				renamedCount += 1
+			return newName
+
+		if not self.fallback and not self.table():
+			return code, 0
+		return renameScanner.sub(replacement, code), renamedCount
+
+	def renameInFont(self, font, skipAutomatic=True):
+		"""
+		Renames glyph names in all prefixes, features and classes of font, and sets the code only where it changed.
+		Returns a list of (kind, name, changed lines, renamed glyph names) for every changed code block.
+		"""
+		changes = []
+		for kind, sources in (("prefix", font.featurePrefixes), ("feature", font.features), ("class", font.classes)):
+			for source in sources:
+				if skipAutomatic and source.automatic:
+					continue
+				code = source.code or ""
+				newCode, renamedCount = self.rename(code)
+				if newCode != code:
+					changedLines = sum(1 for oldLine, newLine in zip(code.splitlines(), newCode.splitlines()) if oldLine != newLine)
+					source.code = newCode
+					changes.append((kind, source.name, changedLines, renamedCount))
+		return changes
@@ -1,9 +1,11 @@
 
 
 import math
+from array import array
 from math import degrees, atan2
 from Foundation import NSClassFromString, NSPoint
 from AppKit import NSAffineTransform
+from mekkablue.layernodes import LayerNodes, curveCode, offcurveCode
 
 
 def transform(shiftX=0.0, shiftY=0.0, rotate=0.0, skew=0.0, scale=1.0):
@@ -256,3 +258,230 @@ def offsetLayer(thisLayer, offset, makeStroke=False, position=0.5, autoStroke=Fa
 			0,  # NSButtLineCapStyle,  # cap style
 			True,  # keep compatible
 		)
+
+
+def flattenedCurve(x1, y1, x2, y2, x3, y3, x4, y4, tolerance):
+	"""
+	Returns [x, y, x, y, ...] of a polyline after (x1, y1) that stays within tolerance of the curve segment.
+	The number of uniform steps follows from the second differences of the control points.
+	"""
+	ddx = max(abs(x1 - 2 * x2 + x3), abs(x2 - 2 * x3 + x4))
+	ddy = max(abs(y1 - 2 * y2 + y3), abs(y2 - 2 * y3 + y4))
+	steps = max(1, int(math.ceil(math.sqrt(0.75 * math.hypot(ddx, ddy) / tolerance))))
+	points = []
+	for step in range(1, steps):
+		points.extend(bezier(x1, y1, x2, y2, x3, y3, x4, y4, step / steps))
+	points.extend((x4, y4))
+	return points
+
+
+def flattenedQuadraticSpline(x1, y1, offcurves, x4, y4, tolerance):
+	"""Like flattenedCurve(), for a TrueType segment with any number of off-curves and implied on-curves between them."""
+	points = []
+	startX, startY = x1, y1
+	for i, (qx, qy) in enumerate(offcurves):
+		if i + 1 < len(offcurves):
+			endX, endY = (qx + offcurves[i + 1][0]) / 2, (qy + offcurves[i + 1][1]) / 2
+		else:
+			endX, endY = x4, y4
+		points.extend(flattenedCurve(
+			startX, startY,
+			startX + (qx - startX) * 2 / 3, startY + (qy - startY) * 2 / 3,
+			endX + (qx - endX) * 2 / 3, endY + (qy - endY) * 2 / 3,
+			endX, endY,
+			tolerance,
+		))
+		startX, startY = endX, endY
+	return points
+
+
+class FlatOutline:
+	"""
+	The paths of a layer (not its components), read once through LayerNodes and flattened into line segments within tolerance units,
+	packed into array('d') as x1, y1, x2, y2, with a bounding volume hierarchy over the segments.
+	Answers ray casts and horizontal probes in pure Python, without a bridge call per query:
+		outline = FlatOutline(layer)
+		outline.intersectionsBetweenPoints(p1, p2)  # like GSLayer.intersectionsBetweenPoints(), as NSPoints
+		outline.intersectionsBetweenPointPairs([(p1, p2), (p3, p4)])  # many rays in one call
+		outline.horizontalExtents([100, 200, 300])  # leftmost and rightmost outline x at each height
+	Hits are exact for straight segments and within tolerance for curves.
+	"""
+
+	leafSize = 4
+
+	def __init__(self, layer, tolerance=0.1):
+		self.tolerance = tolerance
+		segments = array("d")
+		layerNodes = LayerNodes(layer)
+		xs, ys, types = layerNodes.x, layerNodes.y, layerNodes.types
+		for firstIndex, nodeCount, closed in layerNodes.paths:
+			indexes = range(firstIndex, firstIndex + nodeCount)
+			self.addPath(segments, [(xs[i], ys[i], types[i]) for i in indexes], closed)
+		self.segmentCount = len(segments) // 4
+		self.buildHierarchy(segments)
+
+	def addPath(self, segments, nodes, closed):
+		"""Adds the flattened segments of one path, nodes being (x, y, type code) tuples, see LayerNodes."""
+		onCurveIndexes = [i for i, (x, y, typeCode) in enumerate(nodes) if typeCode != offcurveCode]
+		if not onCurveIndexes:
+			return  # all-off-curve TrueType contours are not supported
+		if closed:
+			first = onCurveIndexes[-1]
+			sequence = nodes[first + 1:] + nodes[:first + 1]
+		else:
+			first = 0
+			sequence = nodes[1:]
+		startX, startY = nodes[first][0], nodes[first][1]
+		offcurves = []
+		for x, y, typeCode in sequence:
+			if typeCode == offcurveCode:
+				offcurves.append((x, y))
+				continue
+			if not offcurves:
+				points = (x, y)
+			elif typeCode == curveCode and len(offcurves) == 2:
+				(x2, y2), (x3, y3) = offcurves
+				points = flattenedCurve(startX, startY, x2, y2, x3, y3, x, y, self.tolerance)
+			else:
+				points = flattenedQuadraticSpline(startX, startY, offcurves, x, y, self.tolerance)
+			for i in range(0, len(points), 2):
+				segments.extend((startX, startY, points[i], points[i + 1]))
+				startX, startY = points[i], points[i + 1]
+			offcurves = []
+
+	def buildHierarchy(self, segments):
+		"""
+		Sorts the segments into a binary tree of bounding boxes, split at the median of the longer side.
+		boxes: xMin, yMin, xMax, yMax per tree node. Leaves have a count > 0 and first is the index of their
+		first segment; inner nodes have a count of 0, their left child follows them and first is their right child.
+		"""
+		order = list(range(len(segments) // 4))
+		self.boxes = array("d")
+		self.firsts = array("l")
+		self.counts = array("l")
+
+		def buildNode(start, end):
+			node = len(self.counts)
+			xMin = yMin = math.inf
+			xMax = yMax = -math.inf
+			for index in order[start:end]:
+				x1, y1, x2, y2 = segments[4 * index:4 * index + 4]
+				xMin, xMax = min(xMin, x1, x2), max(xMax, x1, x2)
+				yMin, yMax = min(yMin, y1, y2), max(yMax, y1, y2)
+			self.boxes.extend((xMin, yMin, xMax, yMax))
+			self.firsts.append(start)
+			self.counts.append(end - start)
+			if end - start > self.leafSize:
+				axis = 0 if xMax - xMin >= yMax - yMin else 1
+				order[start:end] = sorted(order[start:end], key=lambda index: segments[4 * index + axis] + segments[4 * index + axis + 2])
+				middle = (start + end) // 2
+				self.counts[node] = 0
+				buildNode(start, middle)
+				self.firsts[node] = buildNode(middle, end)
+			return node
+
+		if order:
+			buildNode(0, len(order))
+		# store segments in tree order, so every leaf is a contiguous run:
+		self.segments = array("d")
+		for index in order:
+			self.segments.extend(segments[4 * index:4 * index + 4])
+
+	def intersectionsOfLines(self, lines):
+		"""
+		For every (x1, y1, x2, y2) in lines, returns a list of (t, x, y) where the line crosses the outline,
+		sorted by t, the position along the line from 0.0 at x1, y1 to 1.0 at x2, y2.
+		"""
+		boxes, firsts, counts, segments = self.boxes, self.firsts, self.counts, self.segments
+		results = []
+		for x1, y1, x2, y2 in lines:
+			dx, dy = x2 - x1, y2 - y1
+			hits = []
+			stack = [0] if counts else []
+			while stack:
+				node = stack.pop()
+				# does the line pass through the box of the node (slab test)?
+				xMin, yMin, xMax, yMax = boxes[4 * node:4 * node + 4]
+				tMin, tMax = 0.0, 1.0
+				if dx:
+					ta, tb = (xMin - x1) / dx, (xMax - x1) / dx
+					tMin, tMax = max(tMin, min(ta, tb)), min(tMax, max(ta, tb))
+				elif not xMin <= x1 <= xMax:
+					continue
+				if dy:
+					ta, tb = (yMin - y1) / dy, (yMax - y1) / dy
+					tMin, tMax = max(tMin, min(ta, tb)), min(tMax, max(ta, tb))
+				elif not yMin <= y1 <= yMax:
+					continue
+				if tMin > tMax:
+					continue
+				count = counts[node]
+				if not count:
+					stack.append(firsts[node])
+					stack.append(node + 1)
+					continue
+				first = firsts[node]
+				for i in range(4 * first, 4 * (first + count), 4):
+					ax, ay, bx, by = segments[i:i + 4]
+					ex, ey = bx - ax, by - ay
+					denominator = dx * ey - dy * ex
+					if not denominator:
+						continue  # parallel
+					qx, qy = ax - x1, ay - y1
+					t = (qx * ey - qy * ex) / denominator
+					u = (qx * dy - qy * dx) / denominator
+					# u < 1.0 so the joint of two consecutive segments counts only once:
+					if 0.0 <= t <= 1.0 and 0.0 <= u < 1.0:
+						hits.append((t, x1 + t * dx, y1 + t * dy))
+			hits.sort()
+			results.append(hits)
+		return results
+
+	def intersectionsBetweenPointPairs(self, pointPairs):
+		"""
+		For every (p1, p2) in pointPairs, returns the NSPoints p1, the crossings with the outline from p1 to p2, and p2,
+		like GSLayer.intersectionsBetweenPoints() but without NSValues. Crossings at p1 or p2 are left out.
+		"""
+		pointPairs = list(pointPairs)
+		lines = [(p1.x, p1.y, p2.x, p2.y) for p1, p2 in pointPairs]
+		results = []
+		for (p1, p2), hits in zip(pointPairs, self.intersectionsOfLines(lines)):
+			epsilon = 1e-6 / max(1e-6, math.hypot(p2.x - p1.x, p2.y - p1.y))
+			results.append([p1] + [NSPoint(x, y) for t, x, y in hits if epsilon < t < 1.0 - epsilon] + [p2])
+		return results
+
+	def intersectionsBetweenPoints(self, p1, p2):
+		return self.intersectionsBetweenPointPairs(((p1, p2), ))[0]
+
+	def horizontalExtents(self, heights):
+		"""
+		For every y in heights, returns (xMin, xMax) of the outline at that height, i.e. the horizontal distance
+		of the first crossing from the origin and of the last one, or None if the outline does not reach y.
+		"""
+		boxes, firsts, counts, segments = self.boxes, self.firsts, self.counts, self.segments
+		results = []
+		for y in heights:
+			left, right = math.inf, -math.inf
+			stack = [0] if counts else []
+			while stack:
+				node = stack.pop()
+				if not boxes[4 * node + 1] <= y <= boxes[4 * node + 3]:
+					continue
+				if left <= boxes[4 * node] and boxes[4 * node + 2] <= right:
+					continue  # cannot widen the extent
+				count = counts[node]
+				if not count:
+					stack.append(firsts[node])
+					stack.append(node + 1)
+					continue
+				first = firsts[node]
+				for i in range(4 * first, 4 * (first + count), 4):
+					ax, ay, bx, by = segments[i:i + 4]
+					if ay == by:
+						if ay == y:
+							left, right = min(left, ax, bx), max(right, ax, bx)
+					elif min(ay, by) <= y <= max(ay, by):
+						x = ax + (y - ay) * (bx - ax) / (by - ay)
+						left, right = min(left, x), max(right, x)
+			results.append((left, right) if left <= right else None)
+		return results
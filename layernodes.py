@@ -0,0 +1,56 @@
+from array import array
+from GlyphsApp import GSLINE, GSCURVE, GSOFFCURVE, QCURVE
+
+# node types as small integers, for bytearrays:
+lineCode, curveCode, offcurveCode, qcurveCode = range(4)
+typeCodes = {
+	GSLINE: lineCode,
+	GSCURVE: curveCode,
+	GSOFFCURVE: offcurveCode,
+	QCURVE: qcurveCode,
+}
+nodeTypeOfCode = (GSLINE, GSCURVE, GSOFFCURVE, QCURVE)
+
+
+class LayerNodes:
+	"""
+	All nodes of all paths of a layer (not its components), read through the bridge once,
+	for analysing outlines in pure Python:
+	x, y: array("d") of coordinates
+	types: bytearray of type codes (lineCode, curveCode, offcurveCode, qcurveCode), other node types count as lines
+	smooth: bytearray, 1 for smooth nodes
+	paths: list of (firstIndex, nodeCount, closed) for every path
+	Used by Path Problem Finder, geometry.FlatOutline and the interpolation and comparison scripts.
+	"""
+	__slots__ = ("x", "y", "types", "smooth", "paths")
+
+	def __init__(self, layer):
+		self.x = array("d")
+		self.y = array("d")
+		self.types = bytearray()
+		self.smooth = bytearray()
+		self.paths = []
+		for path in layer.paths:
+			nodes = path.nodes
+			self.paths.append((len(self.types), len(nodes), path.closed))
+			for node in nodes:
+				position = node.position
+				self.x.append(position.x)
+				self.y.append(position.y)
+				self.types.append(typeCodes.get(node.type, lineCode))
+				self.smooth.append(1 if node.smooth else 0)
+
+	def coordinates(self):
+		"""x0, y0, x1, y1, ... of all nodes in one array("d")."""
+		coordinates = array("d", bytes(16 * len(self.x)))
+		coordinates[0::2] = self.x
+		coordinates[1::2] = self.y
+		return coordinates
+
+	def structure(self):
+		"""((closed, node types), ...) per path, with node types like GSOFFCURVE. Equal in compatible layers."""
+		types = self.types
+		return tuple(
+			(bool(closed), tuple(nodeTypeOfCode[code] for code in types[firstIndex:firstIndex + nodeCount]))
+			for firstIndex, nodeCount, closed in self.paths
+		)
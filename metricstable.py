@@ -0,0 +1,253 @@
+from array import array
+from collections import namedtuple
+
+nan = float("nan")
+metricColumns = ("width", "LSB", "RSB", "xMin", "yMin", "xMax", "yMax")
+anchorColumns = ("top", "bottom", "_top", "_bottom")  # y of the first anchor with this name, traversing components
+allColumns = metricColumns + anchorColumns
+
+GlyphInfo = namedtuple("GlyphInfo", ("name", "export", "category", "case", "script"))
+
+# one table per font, kept between runs of the scripts, so a rerun only measures changed glyphs:
+metricsTables = []
+maxTableCount = 8
+
+
+def isMeasuredLayer(layer):
+	return layer.isMasterLayer or layer.isSpecialLayer
+
+
+def metricsOfLayer(layer):
+	"""Values of allColumns for one layer, NaN for missing anchors."""
+	bounds = layer.bounds
+	xMin, yMin = bounds.origin.x, bounds.origin.y
+	values = [layer.width, layer.LSB, layer.RSB, xMin, yMin, xMin + bounds.size.width, yMin + bounds.size.height]
+	anchorY = {}
+	for anchor in layer.anchorsTraversingComponents() or ():
+		if anchor.name in anchorColumns and anchor.name not in anchorY:
+			anchorY[anchor.name] = anchor.position.y
+	values.extend(anchorY.get(name, nan) for name in anchorColumns)
+	return values
+
+
+def componentNamesOfGlyph(glyph):
+	return frozenset(component.componentName for layer in glyph.layers for component in layer.components)
+
+
+class MetricsTable:
+	"""
+	Columnar metrics of the master and special (brace and bracket) layers of a font, one row per layer.
+	columns: {name: array('d')} for allColumns, NaN where a layer has no such anchor.
+	Every row also has a master ID, layer ID, layer name, master layer flag and a glyph slot with the GlyphInfo of its glyph.
+	refresh() measures only glyphs whose lastChange differs from the last refresh, plus composites built from them.
+	Rows of unchanged glyphs keep their index, so reports can collect row indexes and ask for layers later.
+	"""
+
+	def __init__(self, font):
+		self.font = font
+		self.clear()
+		self.refresh()
+
+	def clear(self):
+		self.masterIDs = tuple(master.id for master in self.font.masters)
+		self.columns = {name: array("d") for name in allColumns}
+		self.rowSlot = array("l")  # glyph slot of every row, -1 for unused rows
+		self.rowMasterIDs = []
+		self.rowLayerIDs = []
+		self.rowLayerNames = []
+		self.rowIsMasterLayer = array("b")
+		self.freeRows = []
+		self.slotOfGlyphID = {}
+		self.slotInfo = []  # slot -> GlyphInfo
+		self.slotRows = []  # slot -> row indexes, in layer order
+		self.slotLastChange = []
+		self.slotComponentNames = []
+		self.freeSlots = []
+		self.glyphOrder = []  # slots in font order
+		self.slotOfName = {}
+
+	def refresh(self):
+		"""Re-measures changed glyphs and composites of changed glyphs. Returns the number of re-measured glyphs."""
+		font = self.font
+		if tuple(master.id for master in font.masters) != self.masterIDs:
+			self.clear()
+
+		glyphOrder = []
+		glyphOfSlot = {}
+		staleSlots = set()
+		for glyph in font.glyphs:
+			glyphID = glyph.id
+			slot = self.slotOfGlyphID.get(glyphID)
+			if slot is None:
+				slot = self.newSlot(glyphID)
+			glyphOrder.append(slot)
+			glyphOfSlot[slot] = glyph
+			self.slotInfo[slot] = GlyphInfo(glyph.name, bool(glyph.export), glyph.category, glyph.case, glyph.script)
+			lastChange = getattr(glyph, "lastChange", None)
+			if lastChange is None or lastChange != self.slotLastChange[slot]:
+				self.slotLastChange[slot] = lastChange
+				staleSlots.add(slot)
+
+		# deleted glyphs:
+		for glyphID, slot in list(self.slotOfGlyphID.items()):
+			if slot not in glyphOfSlot:
+				self.freeSlot(glyphID, slot)
+
+		self.glyphOrder = glyphOrder
+		self.slotOfName = {self.slotInfo[slot].name: slot for slot in glyphOrder}
+
+		# components may have changed the sidebearings, bounds and anchors of composites:
+		staleNames = set(self.slotInfo[slot].name for slot in staleSlots)
+		composites = [slot for slot in glyphOrder if self.slotComponentNames[slot]]
+		foundMore = bool(staleNames)
+		while foundMore:
+			foundMore = False
+			for slot in composites:
+				if slot not in staleSlots and not self.slotComponentNames[slot].isdisjoint(staleNames):
+					staleSlots.add(slot)
+					staleNames.add(self.slotInfo[slot].name)
+					foundMore = True
+
+		for slot in staleSlots:
+			self.measureGlyph(slot, glyphOfSlot[slot])
+		return len(staleSlots)
+
+	def newSlot(self, glyphID):
+		if self.freeSlots:
+			slot = self.freeSlots.pop()
+		else:
+			slot = len(self.slotInfo)
+			self.slotInfo.append(None)
+			self.slotRows.append([])
+			self.slotLastChange.append(None)
+			self.slotComponentNames.append(frozenset())
+		self.slotOfGlyphID[glyphID] = slot
+		return slot
+
+	def freeSlot(self, glyphID, slot):
+		self.releaseRows(self.slotRows[slot])
+		self.slotRows[slot] = []
+		self.slotLastChange[slot] = None
+		self.slotComponentNames[slot] = frozenset()
+		del self.slotOfGlyphID[glyphID]
+		self.freeSlots.append(slot)
+
+	def releaseRows(self, rows):
+		for row in rows:
+			self.rowSlot[row] = -1
+		self.freeRows.extend(rows)
+
+	def newRow(self):
+		if self.freeRows:
+			return self.freeRows.pop()
+		for column in self.columns.values():
+			column.append(nan)
+		self.rowSlot.append(-1)
+		self.rowMasterIDs.append(None)
+		self.rowLayerIDs.append(None)
+		self.rowLayerNames.append(None)
+		self.rowIsMasterLayer.append(0)
+		return len(self.rowSlot) - 1
+
+	def measureGlyph(self, slot, glyph):
+		oldRows = self.slotRows[slot]
+		layers = [layer for layer in glyph.layers if isMeasuredLayer(layer)]
+		self.releaseRows(oldRows[len(layers):])
+		rows = oldRows[:len(layers)]
+		while len(rows) < len(layers):
+			rows.append(self.newRow())
+		columns = [self.columns[name] for name in allColumns]
+		for row, layer in zip(rows, layers):
+			for column, value in zip(columns, metricsOfLayer(layer)):
+				column[row] = value
+			self.rowSlot[row] = slot
+			self.rowMasterIDs[row] = layer.associatedMasterId
+			self.rowLayerIDs[row] = layer.layerId
+			self.rowLayerNames[row] = layer.name
+			self.rowIsMasterLayer[row] = bool(layer.isMasterLayer)
+		self.slotRows[slot] = rows
+		self.slotComponentNames[slot] = componentNamesOfGlyph(glyph)
+
+	def glyphInfos(self, exportingOnly=False):
+		"""GlyphInfo of all glyphs, in font order."""
+		infos = (self.slotInfo[slot] for slot in self.glyphOrder)
+		return [info for info in infos if info.export or not exportingOnly]
+
+	def rows(self, masterIDs=None, exportingOnly=False, specialLayers=True, glyphNames=None, glyphFilter=None):
+		"""
+		Row indexes in font order, then layer order. Limited to the layers associated with masterIDs,
+		to exporting glyphs, to master layers only (specialLayers=False), to glyphNames,
+		and to glyphs for which glyphFilter(GlyphInfo) is true.
+		"""
+		if glyphNames is not None:
+			glyphNames = set(glyphNames)
+			slots = [slot for slot in self.glyphOrder if self.slotInfo[slot].name in glyphNames]
+		else:
+			slots = self.glyphOrder
+		if exportingOnly or glyphFilter:
+			slots = [slot for slot in slots if (self.slotInfo[slot].export or not exportingOnly) and (not glyphFilter or glyphFilter(self.slotInfo[slot]))]
+		rows = [row for slot in slots for row in self.slotRows[slot]]
+		if masterIDs is not None:
+			masterIDs = set(masterIDs)
+			rowMasterIDs = self.rowMasterIDs
+			rows = [row for row in rows if rowMasterIDs[row] in masterIDs]
+		if not specialLayers:
+			isMasterLayer = self.rowIsMasterLayer
+			rows = [row for row in rows if isMasterLayer[row]]
+		return rows
+
+	def rowsOfGlyph(self, glyphName):
+		slot = self.slotOfName.get(glyphName)
+		return list(self.slotRows[slot]) if slot is not None else []
+
+	def values(self, columnName, rows):
+		column = self.columns[columnName]
+		return [column[row] for row in rows]
+
+	def extreme(self, columnName, rows, largest=True):
+		"""(value, row) of the largest (or smallest) value in rows, the first one on ties, ignoring NaN. (None, None) if there is none."""
+		column = self.columns[columnName]
+		bestValue, bestRow = None, None
+		for row in rows:
+			value = column[row]
+			if value != value:  # NaN
+				continue
+			if bestRow is None or (value > bestValue if largest else value < bestValue):
+				bestValue, bestRow = value, row
+		return bestValue, bestRow
+
+	def groupBy(self, rows, key, multipleKeys=False):
+		"""
+		{key(row): [rows]}, in the order of rows.
+		multipleKeys=True: key(row) returns several keys (or none), and the row is added to every one of them.
+		"""
+		groups = {}
+		for row in rows:
+			for rowKey in key(row) if multipleKeys else (key(row), ):
+				groups.setdefault(rowKey, []).append(row)
+		return groups
+
+	def info(self, row):
+		return self.slotInfo[self.rowSlot[row]]
+
+	def glyphName(self, row):
+		return self.slotInfo[self.rowSlot[row]].name
+
+	def layerName(self, row):
+		return self.rowLayerNames[row]
+
+	def layer(self, row):
+		"""The GSLayer of a row."""
+		return self.font.glyphs[self.glyphName(row)].layers[self.rowLayerIDs[row]]
+
+
+def metricsTableForFont(font):
+	"""The MetricsTable of font, refreshed. Tables are kept between script runs, so only changed glyphs get measured again."""
+	for table in metricsTables:
+		if table.font == font:
+			table.refresh()
+			return table
+	table = MetricsTable(font)
+	metricsTables.append(table)
+	del metricsTables[:-maxTableCount]
+	return table